@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+
+"""
+@package mi.core.checksum
+@file mi/core/checksum.py
+@brief Common checksum and CRC functions for drivers and parsers
+
+All functions accept str, bytearray or buffer data. The work is done in C,
+either by numpy or by binascii, rather than looping over bytes in python.
+"""
+
+__license__ = 'Apache 2.0'
+
+import binascii
+
+import numpy
+
+
+# below this size a python loop is faster than the numpy call overhead
+_SMALL_DATA = 48
+
+# maps each byte to the byte with its bits in reverse order
+_REVERSED_BITS = ''.join(chr(int('{0:08b}'.format(value)[::-1], 2)) for value in xrange(256))
+
+
+def _as_array(data, start=0, end=None):
+    if end is None:
+        end = len(data)
+    return numpy.frombuffer(data, numpy.uint8, end - start, start)
+
+
+def lrc(data, seed=0):
+    """
+    Longitudinal redundancy check, the XOR of all bytes in data
+    @param data input data
+    @param seed initial value, allows the LRC to be computed over several pieces
+    @retval The LRC as an int
+    """
+    if len(data) < _SMALL_DATA:
+        for value in bytearray(data):
+            seed ^= value
+        return seed
+    return seed ^ int(numpy.bitwise_xor.reduce(_as_array(data)))
+
+
+def byte_sum(data, start=0, end=None):
+    """
+    Additive checksum, the sum of the bytes in data[start:end]. The result is
+    not truncated, mask it to the size of the checksum being compared.
+    @param data input data
+    @param start index of the first byte to sum
+    @param end index one past the last byte to sum, defaults to the end of data
+    @retval The sum as an int
+    """
+    if end is None:
+        end = len(data)
+    if end <= start:
+        return 0
+    return int(_as_array(data, start, end).sum())
+
+
+def hex_sum(data):
+    """
+    Additive checksum over ASCII hex data, the sum of the values of each pair
+    of hex digits. A trailing unpaired digit is added as a single value.
+    @param data ASCII hex string
+    @retval The sum as an int, not truncated
+    @raise TypeError if data contains characters which are not hex digits
+    """
+    paired = len(data) & ~1
+    total = byte_sum(binascii.unhexlify(data[:paired]))
+    if paired != len(data):
+        total += int(data[-1], 16)
+    return total
+
+
+def _reverse16(value):
+    return int('{0:016b}'.format(value)[::-1], 2)
+
+
+def _crc16_reflected(data, crc):
+    """
+    Reflected CRC-16 with polynomial 0x8408 (CCITT, LSB first). This is the
+    mirror image of the MSB first CRC computed by binascii.crc_hqx, so the
+    input bytes and the register are bit reversed around a call to it.
+    """
+    return _reverse16(binascii.crc_hqx(str(data).translate(_REVERSED_BITS), _reverse16(crc)))
+
+
+def crc16_kermit(data):
+    """
+    Kermit CRC-16 (reflected CCITT polynomial, initial value 0)
+    @param data input data
+    @retval The CRC as an int
+    """
+    return _crc16_reflected(data, 0)
+
+
+def crc16_x25(data):
+    """
+    X.25 CRC-16 (reflected CCITT polynomial, initial value 0xffff, result
+    inverted), as used in SIO block headers
+    @param data input data
+    @retval The CRC as an int
+    """
+    return _crc16_reflected(data, 0xffff) ^ 0xffff
@@ -118,22 +118,43 @@ class BaseEnum(object):
     coupled with what the drivers can do. By putting the values here, they
     are quicker to execute and more compartmentalized so that code can be
     re-used more easily outside of a capability container as needed.
+
+    The members of each enum class are collected the first time they are
+    needed and cached on that class, so has() is a set lookup rather than a
+    scan of the class attributes. Enum classes must not be modified after
+    they are first used.
     """
-    
+
+    @classmethod
+    def _enum_cache(cls):
+        """
+        @retval (members, values, hashable value set, unhashable values)
+        """
+        cache = cls.__dict__.get('__enum_cache__')
+        if cache is None:
+            members = tuple((attr, getattr(cls, attr)) for attr in dir(cls)
+                            if not callable(getattr(cls, attr)) and not attr.startswith('__'))
+            values = tuple(value for _, value in members)
+            hashable = set()
+            unhashable = []
+            for value in values:
+                try:
+                    hashable.add(value)
+                except TypeError:
+                    unhashable.append(value)
+            cache = (members, values, frozenset(hashable), tuple(unhashable))
+            cls.__enum_cache__ = cache
+        return cache
+
     @classmethod
     def list(cls):
         """List the values of this enum."""
-        return [getattr(cls,attr) for attr in dir(cls) if\
-                not callable(getattr(cls,attr)) and not attr.startswith('__')]
+        return list(cls._enum_cache()[1])
 
     @classmethod
     def dict(cls):
         """Return a dict representation of this enum."""
-        result = {}
-        for attr in dir(cls):
-            if not callable(getattr(cls,attr)) and not attr.startswith('__'):
-                result[attr] = getattr(cls,attr)
-        return result
+        return dict(cls._enum_cache()[0])
 
     @classmethod
     def has(cls, item):
@@ -148,7 +169,12 @@ class BaseEnum(object):
         @retval True if one of the class attributes has value item, false
         otherwise.
         """
-        return item in cls.list()
+        _, values, hashable, unhashable = cls._enum_cache()
+        try:
+            return item in hashable or (bool(unhashable) and item in unhashable)
+        except TypeError:
+            # unhashable item
+            return item in values
 
 class EventKey(BaseEnum):
     """Keys to the event dictionary fields as used by the InstrumentProtocol
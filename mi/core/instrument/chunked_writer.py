@@ -0,0 +1,235 @@
+#!/usr/bin/env python
+
+"""
+@package mi.core.instrument.chunked_writer
+@file mi/core/instrument/chunked_writer.py
+@brief Compressed NetCDF4 and Parquet writers for particle streams. Particles
+    are written in row groups as they are collected, so a file can grow larger
+    than memory and single columns can be read back without loading the rest.
+
+The netCDF4 and pyarrow packages are only imported when a writer is created.
+"""
+
+__license__ = 'Apache 2.0'
+
+import json
+import os
+
+import numpy as np
+
+from mi.core.instrument.particle_columns import StreamColumns
+from mi.core.log import get_logger
+
+log = get_logger()
+
+
+# particles collected per stream before they are written as one row group
+ROW_GROUP_SIZE = 100000
+
+
+def _to_strings(data):
+    """
+    Convert an object column to strings, values which are not strings are JSON encoded and missing values are empty
+    """
+    result = np.empty(len(data), object)
+    for index, value in enumerate(data):
+        if value is None:
+            result[index] = ''
+        elif isinstance(value, basestring):
+            result[index] = value
+        else:
+            result[index] = json.dumps(value.tolist() if isinstance(value, np.ndarray) else value)
+    return result
+
+
+class ChunkedWriter(object):
+    """
+    Base class for a file holding the particles of one stream, written one row group at a time
+    """
+    extension = None
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.rows = 0
+
+    def write(self, columns):
+        """
+        Append the particles in a StreamColumns as one row group
+        """
+        if columns.size:
+            self._write(columns.arrays(masked=True), columns.size)
+            self.rows += columns.size
+
+    def _write(self, arrays, size):
+        raise NotImplementedError
+
+    def close(self):
+        raise NotImplementedError
+
+
+class NetcdfWriter(ChunkedWriter):
+    """
+    NetCDF4 file with an unlimited dim_0 dimension, one row per particle. Array parameters add a dimension for each
+    further axis, shared by all parameters of the same length. Variables are zlib compressed, object parameters are
+    stored as strings.
+    """
+    extension = 'nc'
+
+    def __init__(self, file_path, complevel=4):
+        import netCDF4
+        super(NetcdfWriter, self).__init__(file_path)
+        self.complevel = complevel
+        self._dataset = netCDF4.Dataset(file_path, 'w', format='NETCDF4')
+        self._dataset.createDimension('dim_0', None)
+
+    def _variable(self, name, data):
+        variable = self._dataset.variables.get(name)
+        if variable is not None:
+            return variable
+
+        dimensions = self._dataset.dimensions
+        dims = ['dim_0']
+        for axis, length in enumerate(data.shape[1:], 1):
+            dim = 'dim_%d' % axis
+            if dim in dimensions and len(dimensions[dim]) != length:
+                dim = '%s_dim_%d' % (name, axis)
+            if dim not in dimensions:
+                self._dataset.createDimension(dim, length)
+            dims.append(dim)
+
+        kind = data.dtype.kind
+        if kind == 'O':
+            dtype = str
+        elif kind == 'b':
+            dtype = np.int8
+        else:
+            dtype = data.dtype
+        variable = self._dataset.createVariable(name, dtype, dims, zlib=True, complevel=self.complevel)
+        if dtype is str and self.rows:
+            # unwritten rows of a string variable can not be read back, fill the rows before it first appeared
+            variable[:self.rows] = np.full(self.rows, '', object)
+        return variable
+
+    def _write(self, arrays, size):
+        start = self.rows
+        names = set()
+        for name, data in arrays:
+            names.add(name)
+            variable = self._variable(name, data)
+            if variable.dtype is str:
+                data = _to_strings(data)
+            elif data.dtype != variable.dtype:
+                if not np.can_cast(data.dtype, variable.dtype, 'same_kind'):
+                    log.warning('%s: writing %s values to %s variable %s',
+                                self.file_path, data.dtype, variable.dtype, name)
+                data = data.astype(variable.dtype)
+            variable[start:start + size] = data
+
+        for name, variable in self._dataset.variables.iteritems():
+            if name not in names and variable.dtype is str:
+                variable[start:start + size] = np.full(size, '', object)
+
+    def close(self):
+        self._dataset.close()
+
+
+class ParquetWriter(ChunkedWriter):
+    """
+    Parquet file with one row group per write. Array parameters are stored as list columns. The schema is fixed by
+    the first row group, later columns are cast to it, parameters missing from a row group are null and parameters
+    not in the schema are dropped.
+    """
+    extension = 'parquet'
+
+    def __init__(self, file_path, compression='snappy'):
+        import pyarrow
+        import pyarrow.parquet
+        super(ParquetWriter, self).__init__(file_path)
+        self.compression = compression
+        self._pa = pyarrow
+        self._pq = pyarrow.parquet
+        self._schema = None
+        self._writer = None
+
+    def _to_arrow(self, data):
+        pa = self._pa
+        if data.dtype.kind == 'O':
+            try:
+                return pa.array(data, from_pandas=True)
+            except (pa.ArrowException, TypeError, ValueError):
+                return pa.array(_to_strings(data), pa.string())
+        if data.ndim == 1:
+            return pa.array(np.ma.getdata(data), mask=np.ma.getmaskarray(data))
+        if data.ndim == 2 and not np.ma.is_masked(data):
+            data = np.ma.getdata(data)
+            offsets = np.arange(0, data.size + 1, data.shape[1], dtype=np.int32)
+            return pa.ListArray.from_arrays(pa.array(offsets), pa.array(data.ravel()))
+        return pa.array([None if row is np.ma.masked else row for row in data.tolist()])
+
+    def _write(self, arrays, size):
+        pa = self._pa
+        columns = dict((name, self._to_arrow(data)) for name, data in arrays)
+        if self._writer is None:
+            self._schema = pa.schema([pa.field(name, columns[name].type) for name, _ in arrays])
+            self._writer = self._pq.ParquetWriter(self.file_path, self._schema, compression=self.compression)
+
+        table_columns = []
+        for field in self._schema:
+            column = columns.pop(field.name, None)
+            if column is None:
+                column = pa.array([None] * size, field.type)
+            elif column.type != field.type:
+                log.warning('%s: writing %s values to %s column %s', self.file_path, column.type, field.type,
+                            field.name)
+                column = column.cast(field.type, safe=False)
+            table_columns.append(column)
+        if columns:
+            log.warning('%s: dropping columns not in the schema: %s', self.file_path, sorted(columns))
+
+        self._writer.write_table(pa.Table.from_arrays(table_columns, schema=self._schema))
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+WRITERS = {
+    'netcdf': NetcdfWriter,
+    'parquet': ParquetWriter,
+}
+
+
+class StreamWriters(object):
+    """
+    Chunked writers for a set of particle streams, one file per stream named after the stream in output_path
+    """
+    def __init__(self, writer_class, output_path, row_group_size=ROW_GROUP_SIZE):
+        self.writer_class = writer_class
+        self.output_path = output_path
+        self.row_group_size = row_group_size
+        self.writers = {}
+
+    def flush(self, samples, stream, force=False):
+        """
+        Write the collected particles of stream if they fill a row group, or if force is set
+        :param samples: dictionary of stream name to StreamColumns, the written stream is replaced with an empty one
+        """
+        columns = samples.get(stream)
+        if columns is None or columns.size < (1 if force else self.row_group_size):
+            return
+        writer = self.writers.get(stream)
+        if writer is None:
+            file_path = os.path.join(self.output_path, '%s.%s' % (stream, self.writer_class.extension))
+            writer = self.writers[stream] = self.writer_class(file_path)
+        writer.write(columns)
+        samples[stream] = StreamColumns()
+
+    def close(self, samples):
+        """
+        Write the remaining particles of all streams and close the files
+        """
+        for stream in samples.keys():
+            self.flush(samples, stream, force=True)
+        for writer in self.writers.itervalues():
+            writer.close()
+        self.writers = {}
@@ -11,10 +11,166 @@
 __author__ = 'Steve Foley'
 __license__ = 'Apache 2.0'
 
+import re
+import sre_compile
+import sre_constants
+import sre_parse
+import struct
+from bisect import bisect_right
+
 from mi.core.log import get_logger
 log = get_logger()
 
 
+class ChunkBuffer(object):
+    """
+    Byte buffer which data is appended to at the end and consumed from the
+    front. Data is held in a bytearray which grows in place, consuming data
+    only advances a start offset. The consumed space is reclaimed once it makes
+    up half the storage, so appending and pruning do not copy the whole buffer.
+
+    Slicing returns strings. view() returns a zero copy, read only buffer
+    object over the contents which can be handed to regexes and struct.
+    """
+    __slots__ = ('_data', '_start')
+
+    def __init__(self, data=''):
+        self._data = bytearray(data)
+        self._start = 0
+
+    def append(self, data):
+        """
+        Add data to the end of the buffer
+        """
+        self._data += data
+
+    def prune(self, count):
+        """
+        Discard count bytes from the front of the buffer
+        """
+        start = self._start + count
+        size = len(self._data)
+
+        if start >= size:
+            del self._data[:]
+            self._start = 0
+        elif start > size >> 1:
+            del self._data[:start]
+            self._start = 0
+        else:
+            self._start = start
+
+    def clear(self):
+        del self._data[:]
+        self._start = 0
+
+    def view(self, start=0):
+        """
+        Return a read only view of the buffer contents from start. The view is
+        only valid until the buffer is next modified.
+        """
+        return buffer(self._data, self._start + start)
+
+    def __len__(self):
+        return len(self._data) - self._start
+
+    def __getitem__(self, item):
+        return buffer(self._data, self._start)[item]
+
+    def __str__(self):
+        return str(buffer(self._data, self._start))
+
+    def __repr__(self):
+        return repr(str(self))
+
+    def __eq__(self, other):
+        return str(self) == str(other)
+
+    def __ne__(self, other):
+        return not self == other
+
+
+class TimestampIndex(object):
+    """
+    Index of the timestamps of consecutive blocks of data appended to a buffer.
+    Blocks are stored as cumulative end offsets so the timestamp for a buffer
+    index is found with a binary search. Pruning the front of the buffer only
+    moves the base offset, entries which have been pruned away are discarded
+    in bulk once they make up half the index.
+
+    Indexing returns (start, end, timestamp) tuples in buffer coordinates.
+    """
+    __slots__ = ('_ends', '_times', '_start', '_base', '_first')
+
+    def __init__(self):
+        self._ends = []
+        self._times = []
+        # absolute offset of the start of the first stored block
+        self._start = 0
+        # absolute offset of buffer index 0
+        self._base = 0
+        # index of the first stored block which has not been pruned
+        self._first = 0
+
+    def append(self, length, timestamp):
+        """
+        Record a block of data appended to the end of the buffer
+        @param length The length of the appended data
+        @param timestamp The time the data was collected at the port agent
+        """
+        ends = self._ends
+        ends.append((ends[-1] if ends else self._start) + length)
+        self._times.append(timestamp)
+
+    def find(self, index):
+        """
+        Given an index into the buffer, find the corresponding timestamp
+        @retval The timestamp or None if the index is beyond the last block
+        """
+        position = bisect_right(self._ends, index + self._base, self._first)
+        if position < len(self._ends):
+            return self._times[position]
+        return None
+
+    def rebase(self, index):
+        """
+        Buffer is going to be pruned, drop all blocks which end at or before index
+        """
+        ends = self._ends
+        self._base += index
+
+        if not ends or self._base >= ends[-1]:
+            # everything has been consumed, possibly more than was stored when
+            # an oversize block is truncated, so start the offsets afresh
+            del ends[:]
+            del self._times[:]
+            self._start = self._base = self._first = 0
+            return
+
+        first = bisect_right(ends, self._base, self._first)
+        if first > len(ends) >> 1:
+            self._start = ends[first - 1]
+            del ends[:first]
+            del self._times[:first]
+            first = 0
+        self._first = first
+
+    def clear(self):
+        self.__init__()
+
+    def __len__(self):
+        return len(self._ends) - self._first
+
+    def __getitem__(self, item):
+        position = self._first + xrange(len(self))[item]
+        start = self._ends[position - 1] if position else self._start
+        return (max(0, start - self._base), self._ends[position] - self._base, self._times[position])
+
+    def __iter__(self):
+        for item in xrange(len(self)):
+            yield self[item]
+
+
 class StringChunker(object):
     """
     A great big buffer that ingests incoming data from an instrument, then
@@ -23,15 +179,15 @@ class StringChunker(object):
     breaks apart collections of data segments so they can be broken into
     individual blocks.
     """
-    def __init__(self, data_sieve_fn, max_buff_size=8192):
+    def __init__(self, data_sieve_fn, max_buff_size=8192, sieve_overlap=None):
         """
         Initialize the buffer and indexing structures
         The lists keep track of the start and stop index values (inclusive)
         of the particular type in the data buffer. The lists are tuples with
         (start, stop)
 
-        @param data_sieve_fn A function that takes in a chunk of raw data (in
-            whatever format is needed by the Chunker subclass) and spits out
+        @param data_sieve_fn A function that takes in a chunk of raw data, as
+            a read only buffer over the chunker contents, and spits out
             a list of (start_index, end_index) tuples. start_index is the
             array index of the first item in the data list, end_index is one more
             than the last item's index. This allows
@@ -39,13 +195,27 @@ class StringChunker(object):
             If no data is present, return and empty list. If multiple data
             blocks are found, the returned list will contain multiple tuples,
             IN SEQUENTIAL ORDER and WITHOUT OVERLAP.
+        @param max_buff_size Maximum number of bytes retained in the buffer
+        @param sieve_overlap If not None, enables the resumable sieve. Only data
+            added since the last scan, plus this many bytes preceding it, are
+            passed to the sieve on each add_chunk. This must be at least the
+            length of the longest record the sieve can match. Sieves built with
+            regex_sieve_function or RegexSieve derive this value from their
+            regexes when it is not supplied.
         """
         self.sieve = data_sieve_fn
         self.max_buff_size = max_buff_size
 
-        self.buffer = ""
-        self.timestamps = []
+        self._regex_sieve = self._is_regex_sieve(data_sieve_fn)
+        if sieve_overlap is None and self._regex_sieve:
+            sieve_overlap = self.regex_sieve_overlap(self._sieve_regexes(data_sieve_fn))
+        self.sieve_overlap = sieve_overlap
+
+        self.buffer = ChunkBuffer()
+        self.timestamps = TimestampIndex()
         self.chunks = []
+        # buffer index up to which the sieve has already looked for data
+        self._scanned_index = 0
 
     def add_chunk(self, raw_data, timestamp):
         """
@@ -63,12 +233,13 @@ class StringChunker(object):
                      self.max_buff_size, oversize)
 
             self._rebase_times(oversize)
-            self.buffer = self.buffer[oversize:]
+            self.buffer.prune(oversize)
+            self._scanned_index = max(0, self._scanned_index - oversize)
             start_index -= oversize
             end_index -= oversize
 
-        self.timestamps.append((start_index, end_index, timestamp))
-        self.buffer += raw_data
+        self.timestamps.append(len(raw_data), timestamp)
+        self.buffer.append(raw_data)
         self._make_chunks()
 
     def get_next_data(self):
@@ -82,8 +253,9 @@ class StringChunker(object):
 
     def clean(self):
         self.chunks = []
-        self.timestamps = []
-        self.buffer = ''
+        self.timestamps.clear()
+        self.buffer.clear()
+        self._scanned_index = 0
 
     @staticmethod
     def _prune_overlaps(results):
@@ -114,31 +286,50 @@ class StringChunker(object):
         """
         Given an index into the buffer, find the corresponding timestamp
         """
-        for start, stop, timestamp in self.timestamps:
-            if start <= index < stop:
-                return timestamp
-        log.error('Failed to find timestamp for chunk!')
-        return 0
+        timestamp = self.timestamps.find(index)
+        if timestamp is None:
+            log.error('Failed to find timestamp for chunk!')
+            return 0
+        return timestamp
 
     def _rebase_times(self, index):
         """
         Buffer is going to be pruned, adjust all timestamp indexes to match
         """
-        new_times = []
-        for start, stop, timestamp in self.timestamps:
-            if stop <= index:
-                continue
-            start -= index
-            stop -= index
-            new_times.append((start, stop, timestamp))
-        self.timestamps = new_times
+        self.timestamps.rebase(index)
+
+    def _run_sieve(self):
+        """
+        Run the sieve over the portion of the buffer which may contain new data.
+        Without a sieve overlap the whole buffer is scanned. Otherwise the scan
+        resumes sieve_overlap bytes before the end of the previous scan, as no
+        record can start earlier than that and still be incomplete.
+        @retval A list of (start, end) tuples, relative to the start of the buffer
+        """
+        if self.sieve_overlap is None:
+            scan_index = 0
+        else:
+            scan_index = max(0, self._scanned_index - self.sieve_overlap)
+            self._scanned_index = len(self.buffer)
+
+        if self._regex_sieve:
+            # regexes resume in place over the whole view, keeping anchors and
+            # lookbehinds intact
+            return self.sieve(self.buffer.view(), start_index=scan_index)
+
+        # other sieves are handed a view starting where the scan resumes
+        results = self.sieve(self.buffer.view(scan_index))
+        if scan_index == 0:
+            return results
+
+        return [(start + scan_index, end + scan_index) for start, end in results]
 
     def _make_chunks(self):
         """
         Run the buffer through our sieve function. Generate a chunk (timestamp, data) for
         each non-overlapping result found. Prune the buffer to the index of the last found data.
         """
-        results = sorted(self.sieve(self.buffer))
+        results = sorted(self._run_sieve())
         results = self._prune_overlaps(results)
 
         end = 0
@@ -149,22 +340,281 @@ class StringChunker(object):
 
         if end > 0:
             self._rebase_times(end)
-            self.buffer = self.buffer[end:]
+            self.buffer.prune(end)
+            self._scanned_index = max(0, self._scanned_index - end)
 
     @staticmethod
-    def regex_sieve_function(raw_data, regex_list=None):
+    def regex_sieve_function(raw_data, regex_list=None, start_index=0):
         """
         Generate a sieve function given a list of regexes.
         Intended to be used with partial function application, as so:
         StringChunker(partial(self._chunker.regex_sieve_function, regex_list=[regex]))
         @param raw_data The raw data to run through this regex sieve
         @param regex_list a list of pre-compiled regexes
+        @param start_index index into raw_data at which to start searching
         @retval A list of (start, end) tuples for each match the regexs find
         """
         return_list = []
         if regex_list is not None:
             for matcher in regex_list:
-                for match in matcher.finditer(raw_data):
+                for match in matcher.finditer(raw_data, start_index):
                     return_list.append((match.start(), match.end()))
 
         return return_list
+
+    @staticmethod
+    def _is_regex_sieve(sieve):
+        """
+        Return True if the sieve is a RegexSieve or a partial application of
+        regex_sieve_function
+        """
+        return isinstance(sieve, RegexSieve) or getattr(sieve, 'func', None) is StringChunker.regex_sieve_function
+
+    @staticmethod
+    def _sieve_regexes(sieve):
+        """
+        Return the list of regexes a regex sieve matches with
+        """
+        if isinstance(sieve, RegexSieve):
+            return sieve.regex_list
+        return (sieve.keywords or {}).get('regex_list')
+
+    @staticmethod
+    def regex_sieve_overlap(regex_list):
+        """
+        Determine the sieve overlap needed to resume scanning with the given regexes.
+        This is the longest possible match, plus one byte so that word boundaries
+        at the end of a match see the byte which follows it.
+        @param regex_list a list of pre-compiled regexes
+        @retval The overlap in bytes, or None if any regex can match an unbounded
+            length or contains a lookahead or lookbehind assertion
+        """
+        if not regex_list:
+            return None
+
+        overlap = 0
+        for matcher in regex_list:
+            parsed = sre_parse.parse(matcher.pattern, matcher.flags)
+            if _has_assertion(parsed):
+                return None
+            _, max_width = parsed.getwidth()
+            if max_width >= sre_constants.MAXREPEAT:
+                return None
+            overlap = max(overlap, max_width + 1)
+
+        return overlap
+
+
+class RegexSieve(object):
+    """
+    Sieve function which finds the matches of a list of regexes in a single
+    pass over the data. The regexes are merged into one alternation with a
+    group per regex, so the sieve also knows which regex produced each match.
+    Use in place of regex_sieve_function:
+    StringChunker(RegexSieve([regex1, regex2]))
+
+    Where two regexes match at the same position the one listed first wins, and
+    the scan resumes after the end of each match. Regexes which use different
+    flags or refer back to their own groups cannot be merged, they are matched
+    one after the other as regex_sieve_function does.
+    """
+    def __init__(self, regex_list):
+        """
+        @param regex_list a list of pre-compiled regexes
+        """
+        self.regex_list = list(regex_list)
+        self._combined = _combine_regexes(self.regex_list)
+
+    def __call__(self, raw_data, start_index=0):
+        """
+        @param raw_data The raw data to run through this sieve
+        @param start_index index into raw_data at which to start searching
+        @retval A list of (start, end) tuples for each match found
+        """
+        if self._combined is None:
+            return StringChunker.regex_sieve_function(raw_data, self.regex_list, start_index)
+
+        return [match.span() for match in self._combined.finditer(raw_data, start_index)]
+
+    def match(self, chunk):
+        """
+        Determine which regex matches at the start of a chunk, so a protocol
+        can classify a chunk without trying each of its regexes in turn
+        @param chunk The data to match
+        @retval A (regex, match) tuple for the first regex in the list which
+            matches, or (None, None) if none of them do
+        """
+        regex_list = self.regex_list
+        if self._combined is not None:
+            match = self._combined.match(chunk)
+            if match is None:
+                return None, None
+            regex_list = [regex_list[match.lastindex - 1]]
+
+        for regex in regex_list:
+            match = regex.match(chunk)
+            if match:
+                return regex, match
+
+        return None, None
+
+
+class FrameSieve(object):
+    """
+    Sieve function for binary records which start with a sync word and carry
+    their own length. Sync words are located with a literal regex search, so
+    the sieve runs over strings and read only buffers alike, the length field
+    is read in place with struct and, if the record has a trailing checksum,
+    the checksum is verified before the record is accepted. Scanning resumes
+    after the end of each record found, so sync bytes within a record's
+    payload are never mistaken for the start of another record.
+
+    Records which extend past the end of the data are not returned, they will
+    be found once the rest of the record has been added to the chunker.
+    """
+    def __init__(self, sync, length_format='<H', length_offset=None, length_scale=1, length_adjust=0,
+                 checksum_format=None, checksum_fn=None):
+        """
+        @param sync The bytes every record starts with
+        @param length_format struct format of the length field
+        @param length_offset Offset of the length field from the start of the
+            record, defaults to immediately after the sync bytes
+        @param length_scale Number of bytes in each unit of the length field
+        @param length_adjust Number of bytes in the record not counted by the
+            length field
+        @param checksum_format struct format of the checksum stored in the last
+            bytes of the record, None if records have no checksum
+        @param checksum_fn Function (data, start, end) returning the checksum
+            of data[start:end], such as mi.core.checksum.byte_sum. It is
+            compared with the stored checksum after masking it to the size of
+            checksum_format
+        """
+        self.sync = sync
+        self._sync = re.compile(re.escape(sync))
+        self.length_offset = len(sync) if length_offset is None else length_offset
+        self.length_scale = length_scale
+        self.length_adjust = length_adjust
+        self.checksum_fn = checksum_fn
+
+        self._length = struct.Struct(length_format)
+        self._header_size = self.length_offset + self._length.size
+        self._checksum = struct.Struct(checksum_format) if checksum_format else None
+        self._min_size = self._header_size
+
+        if self._checksum is not None:
+            self._checksum_mask = (1 << 8 * self._checksum.size) - 1
+            self._min_size += self._checksum.size
+
+    def __call__(self, raw_data, start_index=0):
+        """
+        @param raw_data The raw data to run through this sieve
+        @param start_index index into raw_data at which to start searching
+        @retval A list of (start, end) tuples, one for each valid record
+        """
+        return_list = []
+        size = len(raw_data)
+
+        match = self._sync.search(raw_data, start_index)
+        while match is not None:
+            index = match.start()
+            end = self.frame_end(raw_data, index, size)
+            if end is None:
+                match = self._sync.search(raw_data, index + 1)
+            else:
+                return_list.append((index, end))
+                match = self._sync.search(raw_data, end)
+
+        return return_list
+
+    def frame_end(self, raw_data, index, size=None):
+        """
+        Determine the end of a record starting at index
+        @param raw_data The raw data containing the record
+        @param index Index of the sync bytes at the start of the record
+        @param size Length of raw_data
+        @retval Index one past the end of the record, or None if the record is
+            incomplete or fails its checksum
+        """
+        if size is None:
+            size = len(raw_data)
+
+        if index + self._header_size > size:
+            return None
+
+        length = self._length.unpack_from(raw_data, index + self.length_offset)[0] * self.length_scale
+        length += self.length_adjust
+        end = index + length
+        if length < self._min_size or end > size:
+            return None
+
+        if self._checksum is not None:
+            checksum_index = end - self._checksum.size
+            expected = self._checksum.unpack_from(raw_data, checksum_index)[0]
+            if self.checksum_fn(raw_data, index, checksum_index) & self._checksum_mask != expected:
+                return None
+
+        return end
+
+
+def _combine_regexes(regex_list):
+    """
+    Merge a list of compiled regexes into a single alternation. The branch for
+    each regex is captured by group index + 1, all groups within the regexes
+    are made non capturing.
+    @param regex_list a list of pre-compiled regexes
+    @retval The compiled alternation, or None if the regexes cannot be merged
+    """
+    if not regex_list:
+        return None
+
+    flags = regex_list[0].flags
+    if any(regex.flags != flags for regex in regex_list):
+        return None
+
+    state = sre_parse.Pattern()
+    state.flags = flags
+    branches = []
+    for regex in regex_list:
+        parsed = sre_parse.parse(regex.pattern, flags)
+        if not _strip_groups(parsed):
+            return None
+        group = state.opengroup()
+        state.closegroup(group)
+        branches.append(sre_parse.SubPattern(state, [(sre_constants.SUBPATTERN, (group, parsed))]))
+
+    return sre_compile.compile(sre_parse.SubPattern(state, [(sre_constants.BRANCH, (None, branches))]), flags)
+
+
+def _strip_groups(parsed):
+    """
+    Make all groups in a parsed regex non capturing, in place
+    @retval False if the regex contains a back reference to one of its groups
+    """
+    for index, (op, av) in enumerate(parsed.data):
+        if op in (sre_constants.GROUPREF, sre_constants.GROUPREF_EXISTS):
+            return False
+        if op == sre_constants.SUBPATTERN:
+            parsed.data[index] = (op, (None,) + tuple(av[1:]))
+        for item in av if isinstance(av, (tuple, list)) else (av,):
+            if isinstance(item, list):
+                if not all(_strip_groups(sub) for sub in item if isinstance(sub, sre_parse.SubPattern)):
+                    return False
+            elif isinstance(item, sre_parse.SubPattern) and not _strip_groups(item):
+                return False
+    return True
+
+
+def _has_assertion(parsed):
+    """
+    Return True if a parsed regex contains a lookahead or lookbehind assertion
+    """
+    for op, av in parsed:
+        if op in (sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+            return True
+        for item in av if isinstance(av, (tuple, list)) else (av,):
+            if isinstance(item, list):
+                if any(_has_assertion(sub) for sub in item if isinstance(sub, sre_parse.SubPattern)):
+                    return True
+            elif isinstance(item, sre_parse.SubPattern) and _has_assertion(item):
+                return True
+    return False
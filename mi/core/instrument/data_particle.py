@@ -10,6 +10,7 @@ the driver and agent. This involves a JSON interchange format
 import base64
 import json
 import time
+from collections import MutableMapping
 
 import ntplib
 from mi.core.common import BaseEnum
@@ -58,6 +59,86 @@ class DataParticleValue(BaseEnum):
     QUESTIONABLE = "questionable"
 
 
+class DataParticleContents(MutableMapping):
+    """
+    Mapping of the header fields of a particle, keyed by DataParticleKey. The
+    values are held in slots on the particle, this view reads and writes them
+    in place so the header is only built as a dict when the particle is
+    generated. The new sequence flag is only present when it has been set.
+    Any other key, or a change to the constant fields, is kept in a dict on
+    the particle which is only created on the first such write.
+    """
+    __slots__ = ('_particle',)
+
+    # fixed header values, identical for every particle
+    CONSTANTS = {
+        DataParticleKey.PKT_FORMAT_ID: DataParticleValue.JSON_DATA,
+        DataParticleKey.PKT_VERSION: 1,
+    }
+
+    SLOTS = {
+        DataParticleKey.PORT_TIMESTAMP: '_port_timestamp',
+        DataParticleKey.INTERNAL_TIMESTAMP: '_internal_timestamp',
+        DataParticleKey.DRIVER_TIMESTAMP: '_driver_timestamp',
+        DataParticleKey.PREFERRED_TIMESTAMP: '_preferred_timestamp',
+        DataParticleKey.QUALITY_FLAG: '_quality_flag',
+        DataParticleKey.NEW_SEQUENCE: '_new_sequence',
+    }
+
+    def __init__(self, particle):
+        self._particle = particle
+
+    def _extra(self):
+        """
+        @return the fields which are not held in slots, read only unless the
+            particle has its own copy
+        """
+        if self._particle._extra_contents is None:
+            return self.CONSTANTS
+        return self._particle._extra_contents
+
+    def _writable_extra(self):
+        if self._particle._extra_contents is None:
+            self._particle._extra_contents = dict(self.CONSTANTS)
+        return self._particle._extra_contents
+
+    def __getitem__(self, key):
+        if key not in self.SLOTS:
+            return self._extra()[key]
+        if key == DataParticleKey.NEW_SEQUENCE and self._particle._new_sequence is None:
+            raise KeyError(key)
+        return getattr(self._particle, self.SLOTS[key])
+
+    def __setitem__(self, key, value):
+        if key in self.SLOTS:
+            setattr(self._particle, self.SLOTS[key], value)
+        else:
+            self._writable_extra()[key] = value
+
+    def __delitem__(self, key):
+        if key not in self.SLOTS:
+            if key not in self._extra():
+                raise KeyError(key)
+            del self._writable_extra()[key]
+        elif key != DataParticleKey.NEW_SEQUENCE or self._particle._new_sequence is None:
+            raise KeyError(key)
+        else:
+            self._particle._new_sequence = None
+
+    def __iter__(self):
+        for key in self._extra():
+            yield key
+        for key in self.SLOTS:
+            if key != DataParticleKey.NEW_SEQUENCE or self._particle._new_sequence is not None:
+                yield key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
 class DataParticle(object):
     """
     This class is responsible for storing and ultimately generating data
@@ -68,7 +149,16 @@ class DataParticle(object):
     It is the intent that this class is subclassed as needed if an instrument must
     modify fields in the outgoing packet. The hope is to have most of the superclass
     code be called by the child class with just values overridden as needed.
+
+    The header fields are held in slots and exposed as a mapping through
+    contents. Subclasses which declare __slots__ = () carry no per instance
+    dictionary at all. A subclass may declare its parsed values in _schema as
+    a sequence of (value_id, encoding_function) pairs, raw_data is then the
+    sequence of unencoded values in the same order and the values list is only
+    built when the particle is generated.
     """
+    __slots__ = ('raw_data', '_encoding_errors', '_port_timestamp', '_internal_timestamp', '_driver_timestamp',
+                 '_preferred_timestamp', '_quality_flag', '_new_sequence', '_extra_contents')
 
     # data particle type is intended to be defined in each derived data particle class.
     # Note: This string should match the value in the corresponding EDEX CassandraParticle
@@ -78,6 +168,8 @@ class DataParticle(object):
     # data_particle_type()
     _data_particle_type = None
 
+    _schema = None
+
     def __init__(self, raw_data,
                  port_timestamp=None,
                  internal_timestamp=None,
@@ -91,21 +183,24 @@ class DataParticle(object):
         if new_sequence is not None and not isinstance(new_sequence, bool):
             raise TypeError("new_sequence is not a bool")
 
-        self.contents = {
-            DataParticleKey.PKT_FORMAT_ID: DataParticleValue.JSON_DATA,
-            DataParticleKey.PKT_VERSION: 1,
-            DataParticleKey.PORT_TIMESTAMP: port_timestamp,
-            DataParticleKey.INTERNAL_TIMESTAMP: internal_timestamp,
-            DataParticleKey.DRIVER_TIMESTAMP: ntplib.system_to_ntp_time(time.time()),
-            DataParticleKey.PREFERRED_TIMESTAMP: preferred_timestamp,
-            DataParticleKey.QUALITY_FLAG: quality_flag,
-        }
+        self._port_timestamp = port_timestamp
+        self._internal_timestamp = internal_timestamp
+        self._driver_timestamp = ntplib.system_to_ntp_time(time.time())
+        self._preferred_timestamp = preferred_timestamp
+        self._quality_flag = quality_flag
+        self._new_sequence = new_sequence
+        self._extra_contents = None
         self._encoding_errors = []
-        if new_sequence is not None:
-            self.contents[DataParticleKey.NEW_SEQUENCE] = new_sequence
 
         self.raw_data = raw_data
 
+    @property
+    def contents(self):
+        """
+        The particle header fields, as a mapping keyed by DataParticleKey
+        """
+        return DataParticleContents(self)
+
     def __eq__(self, arg):
         """
         Equality check for testing purposes.
@@ -165,7 +260,7 @@ class DataParticle(object):
         if unix_time is not None:
             timestamp = ntplib.system_to_ntp_time(unix_time)
 
-        self.contents[DataParticleKey.INTERNAL_TIMESTAMP] = float(timestamp)
+        self._internal_timestamp = float(timestamp)
 
     def set_value(self, value_id, value):
         """
@@ -176,7 +271,7 @@ class DataParticle(object):
         @raises ReadOnlyException If the parameter cannot be set
         """
         if (value_id == DataParticleKey.INTERNAL_TIMESTAMP) and (self._check_timestamp(value)):
-            self.contents[DataParticleKey.INTERNAL_TIMESTAMP] = value
+            self._internal_timestamp = value
         else:
             raise ReadOnlyException("Parameter %s not able to be set to %s after object creation!" %
                                     (value_id, value))
@@ -226,10 +321,10 @@ class DataParticle(object):
         self._encoding_errors = []
         values = self._build_parsed_values()
 
-        if all([self.contents[DataParticleKey.PREFERRED_TIMESTAMP] == DataParticleKey.PORT_TIMESTAMP,
-                self.contents[DataParticleKey.PORT_TIMESTAMP] == 0,
-                self.contents[DataParticleKey.INTERNAL_TIMESTAMP] is not None]):
-            self.contents[DataParticleKey.PREFERRED_TIMESTAMP] = DataParticleKey.INTERNAL_TIMESTAMP
+        if all([self._preferred_timestamp == DataParticleKey.PORT_TIMESTAMP,
+                self._port_timestamp == 0,
+                self._internal_timestamp is not None]):
+            self._preferred_timestamp = DataParticleKey.INTERNAL_TIMESTAMP
 
         result = self._build_base_structure()
         result[DataParticleKey.STREAM_NAME] = self.data_particle_type()
@@ -256,7 +351,14 @@ class DataParticle(object):
         @return the values tag for this data structure ready to JSONify
         @raises SampleException when parsed values can not be properly returned
         """
-        raise SampleException("Parsed values block not overridden")
+        if self._schema is None:
+            raise SampleException("Parsed values block not overridden")
+
+        if len(self.raw_data) != len(self._schema):
+            raise SampleException("Expected %d values, received %d" % (len(self._schema), len(self.raw_data)))
+
+        return [self._encode_value(name, value, encoding_function)
+                for (name, encoding_function), value in zip(self._schema, self.raw_data)]
 
     def _build_base_structure(self):
         """
@@ -265,12 +367,25 @@ class DataParticle(object):
 
         @return A fresh copy of a core structure to be exported
         """
-        result = dict(self.contents)
-        # clean out optional fields that were missing
-        if not self.contents[DataParticleKey.PORT_TIMESTAMP]:
-            del result[DataParticleKey.PORT_TIMESTAMP]
-        if not self.contents[DataParticleKey.INTERNAL_TIMESTAMP]:
-            del result[DataParticleKey.INTERNAL_TIMESTAMP]
+        result = {
+            DataParticleKey.PKT_FORMAT_ID: DataParticleValue.JSON_DATA,
+            DataParticleKey.PKT_VERSION: 1,
+            DataParticleKey.DRIVER_TIMESTAMP: self._driver_timestamp,
+            DataParticleKey.PREFERRED_TIMESTAMP: self._preferred_timestamp,
+            DataParticleKey.QUALITY_FLAG: self._quality_flag,
+        }
+        # fields written to contents which are not held in slots replace the constants
+        if self._extra_contents is not None:
+            for key in DataParticleContents.CONSTANTS:
+                del result[key]
+            result.update(self._extra_contents)
+        # optional fields are only included when present
+        if self._port_timestamp:
+            result[DataParticleKey.PORT_TIMESTAMP] = self._port_timestamp
+        if self._internal_timestamp:
+            result[DataParticleKey.INTERNAL_TIMESTAMP] = self._internal_timestamp
+        if self._new_sequence is not None:
+            result[DataParticleKey.NEW_SEQUENCE] = self._new_sequence
         return result
 
     def _check_timestamp(self, timestamp):
@@ -300,9 +415,8 @@ class DataParticle(object):
         @throws SampleException When there is a problem with the preferred
             timestamp in the sample.
         """
-        if self.contents[DataParticleKey.PREFERRED_TIMESTAMP] is None:
-            raise SampleException("Missing preferred timestamp, %s, in particle" %
-                                  self.contents[DataParticleKey.PREFERRED_TIMESTAMP])
+        if self._preferred_timestamp is None:
+            raise SampleException("Missing preferred timestamp, %s, in particle" % self._preferred_timestamp)
 
         # This should be handled downstream.  Don't want to not publish data because
         # the port agent stopped putting out timestamps
@@ -347,6 +461,8 @@ class RawDataParticle(DataParticle):
 
     It essentially is a translation of the port agent packet
     """
+    __slots__ = ()
+
     _data_particle_type = CommonDataParticleType.RAW
 
     def _build_parsed_values(self):
@@ -11,9 +11,124 @@
 __author__ = 'Steve Foley'
 __license__ = 'Apache 2.0'
 
+from bisect import bisect_left, bisect_right
+
 from mi.core.log import get_logger ; log = get_logger()
 
 from mi.core.exceptions import SampleException
+from mi.core.instrument.chunker import ChunkBuffer, TimestampIndex
+
+
+class ChunkIndex(object):
+    """
+    Sorted list of non overlapping (start, end, timestamp) chunks of a buffer.
+    Offsets are stored from the start of the stream, so pruning the front of
+    the buffer only moves the base offset and finds the chunks which have been
+    consumed with a binary search. Consumed chunks are discarded in bulk once
+    they make up half the index.
+
+    Indexing returns (start, end, timestamp) tuples in buffer coordinates, a
+    chunk which was partly pruned starts at 0.
+    """
+    __slots__ = ('_starts', '_ends', '_times', '_base', '_first')
+
+    def __init__(self):
+        self._starts = []
+        self._ends = []
+        self._times = []
+        # absolute offset of buffer index 0
+        self._base = 0
+        # index of the first stored chunk which has not been consumed
+        self._first = 0
+
+    def append(self, start, end, timestamp):
+        """
+        Add a chunk after all the others
+        """
+        self._starts.append(start + self._base)
+        self._ends.append(end + self._base)
+        self._times.append(timestamp)
+
+    def popleft(self):
+        """
+        Remove and return the first chunk
+        """
+        chunk = self[0]
+        self._first += 1
+        self._compact()
+        return chunk
+
+    def remove_start(self, index):
+        """
+        Remove the chunks which start at index
+        """
+        starts = self._starts
+        position = self._first
+        if position < len(starts) and max(starts[position], self._base) - self._base != index:
+            # only the first chunk can start before the buffer
+            position = bisect_left(starts, index + self._base, position)
+        while position < len(starts) and max(starts[position], self._base) - self._base == index:
+            self._delete(position, position + 1)
+
+    def splice(self, chunks):
+        """
+        Merge a list of new chunks onto the end. The first chunk which ends at
+        or after the start of the first new one is extended to the end of it,
+        the chunks after that are replaced by the rest of the new chunks.
+        """
+        if not chunks:
+            return
+        (first_start, first_end, _) = chunks[0]
+        position = bisect_left(self._ends, first_start + self._base, self._first)
+        if position < len(self._ends):
+            self._delete(position + 1, len(self._ends))
+            self._ends[position] = first_end + self._base
+            chunks = chunks[1:]
+        for (start, end, timestamp) in chunks:
+            self.append(start, end, timestamp)
+
+    def rebase(self, index):
+        """
+        Buffer is going to be pruned, drop all chunks which end at or before
+        index, except empty chunks at index
+        """
+        self._base += index
+        first = self._first
+        self._first = min(bisect_right(self._ends, self._base, first),
+                          bisect_left(self._starts, self._base, first))
+        self._compact()
+
+    def clear(self):
+        self.__init__()
+
+    def _delete(self, start, end):
+        del self._starts[start:end]
+        del self._ends[start:end]
+        del self._times[start:end]
+
+    def _compact(self):
+        first = self._first
+        if first == len(self._ends):
+            self.clear()
+        elif first > len(self._ends) >> 1:
+            self._delete(0, first)
+            self._first = 0
+
+    def __len__(self):
+        return len(self._ends) - self._first
+
+    def __getitem__(self, item):
+        position = self._first + xrange(len(self))[item]
+        base = self._base
+        return (max(0, self._starts[position] - base), self._ends[position] - base, self._times[position])
+
+    def __iter__(self):
+        for item in xrange(len(self)):
+            yield self[item]
+
+    def __repr__(self):
+        return repr(list(self))
+
 
 class Chunker(object):
     """
@@ -28,7 +143,7 @@ class Chunker(object):
         Initialize the buffer and indexing structures 
         The lists keep track of the start and stop index values (inclusive)
         of the particular type in the data buffer. The lists are tuples with
-        (start, stop)
+        (start, stop, timestamp)
         
         @param data_sieve_fn A function that takes in a chunk of raw data (in
             whatever format is needed by the Chunker subclass) and spits out
@@ -42,9 +157,9 @@ class Chunker(object):
         """
         self.sieve = data_sieve_fn
         
-        self.raw_chunk_list = []
-        self.data_chunk_list = []
-        self.nondata_chunk_list = []
+        self.raw_chunk_list = TimestampIndex()
+        self.data_chunk_list = ChunkIndex()
+        self.nondata_chunk_list = ChunkIndex()
         
         """ To be filled out by the subclass """
         self.buffer = None
@@ -60,23 +175,23 @@ class Chunker(object):
         @param timestamp The time (in NTP4 float format) that the data was
             collected at the port agent
         """
-        assert isinstance(self.buffer, str) or isinstance(self.buffer, list)
+        assert isinstance(self.buffer, ChunkBuffer) or isinstance(self.buffer, list)
         assert isinstance(timestamp, float)
         # Append raw
         start_index = len(self.buffer)
         
-        if self.data_chunk_list == []:
+        if not self.data_chunk_list:
             last_data_index = 0
         else:
             last_data_index = self.data_chunk_list[-1][1] 
         end_index = start_index + len(raw_data)
         
-        if isinstance(self.buffer, str):
-            self.buffer += raw_data
+        if isinstance(self.buffer, ChunkBuffer):
+            self.buffer.append(raw_data)
         else:
             self.buffer.append(raw_data)
             
-        self.raw_chunk_list.append((start_index, end_index, timestamp))
+        self.raw_chunk_list.append(end_index - start_index, timestamp)
 
         # find data
         result = self._generate_data_lists(timestamp,
@@ -85,35 +200,15 @@ class Chunker(object):
         
         # rebase onto existing buffer
         for (s, e, t) in result['data_chunk_list']:
-            self.data_chunk_list.append((s, e, t))
+            self.data_chunk_list.append(s, e, t)
         
             # remove first fragment part from non-data array if we completed a fragment
-            for (nds, nde, ndt) in self.nondata_chunk_list:
-                if (nds == s):
-                    self.nondata_chunk_list.remove((nds, nde, ndt))
+            self.nondata_chunk_list.remove_start(s)
         
         # splice non-data blocks in, combining with
         # other blocks as needed
-        if result['non_data_chunk_list'] != []:
-            new_nondata_list = []
-            (first_new_s, first_new_e, first_new_t) = result['non_data_chunk_list'][0]
-            
-            if self.nondata_chunk_list == []:
-                self.nondata_chunk_list = result['non_data_chunk_list']
-                log.debug("Added chunk, data_chunk_list: %s, nondata_chunk_list: %s",
-                      self.data_chunk_list, self.nondata_chunk_list)
-                return
-            for (s, e, t) in self.nondata_chunk_list:
-                if e >= first_new_s:
-                    new_nondata_list.append((s, first_new_e, t))
-                    result['non_data_chunk_list'].pop(0) # already used it
-                    break
-                if e < first_new_s:
-                    new_nondata_list.append((s, e, t))
-            # all done, merging, so add the rest of what is left
-            new_nondata_list.extend(result['non_data_chunk_list'])
-            
-            self.nondata_chunk_list = new_nondata_list
+        if result['non_data_chunk_list']:
+            self.nondata_chunk_list.splice(result['non_data_chunk_list'])
             log.debug("Added chunk, data_chunk_list: %s, nondata_chunk_list: %s",
                       self.data_chunk_list, self.nondata_chunk_list)
          
@@ -133,7 +228,12 @@ class Chunker(object):
         """
         log.debug("Generating data lists with start index %s", start_index)
         return_list = {'data_chunk_list':[], 'non_data_chunk_list':[]}
-        result = self.sieve(self.buffer[start_index:])
+        if isinstance(self.buffer, ChunkBuffer):
+            # sieve a read only view of the new part of the buffer rather than a copy of it, the view starts at
+            # start_index just as the copy did so anchored regexes match the same
+            result = self.sieve(self.buffer.view(start_index))
+        else:
+            result = self.sieve(self.buffer[start_index:])
         # assert no overlap!
         if (self.overlaps(result)):
             raise SampleException("Overlapping blocks in sieve list: %s" % result)
@@ -143,8 +243,7 @@ class Chunker(object):
         # rebase to buffer coordinates
         return_list['data_chunk_list'] = [(s+start_index, e+start_index) for (s, e) in result]
         return_list['data_chunk_list'] = self.add_timestamps(return_list['data_chunk_list'])
-        # Look up the timestamps from the old list - could be made more efficient
-        
+
         if result == []:
             return_list['non_data_chunk_list'].append((start_index,
                                                        len(self.buffer),
@@ -189,12 +288,9 @@ class Chunker(object):
             else:
                 raise SampleException("Invalid pair encountered!")
                 
-            for (raw_s, raw_e, raw_t) in self.raw_chunk_list:
-                if (s >= raw_e):
-                    continue
-                else:
-                    result_list.append((s, e, raw_t))
-                    break
+            raw_t = self.raw_chunk_list.find(s)
+            if raw_t is not None:
+                result_list.append((s, e, raw_t))
                     
         log.trace("add_timestamp returning result_list: %s", result_list)
         return result_list
@@ -248,82 +344,34 @@ class Chunker(object):
             float format and data chunk is a section of buffer with indices
             between (start, end). If no data, returns (None, None, None, None)
         """
-        if self.data_chunk_list == []:
+        if not self.data_chunk_list:
             return (None, None, None, None)
 
         if clean:    
-            (next_start, next_end, timestamp) = self.data_chunk_list.pop(0)
+            (next_start, next_end, timestamp) = self.data_chunk_list.popleft()
         else:
             (next_start, next_end, timestamp) = self.data_chunk_list[0]
         
         next_block = self.buffer[next_start:next_end]
 
         if clean:    
-            self._clean_buffer(next_end)
-            self.raw_chunk_list = self._clean_chunk_list(self.raw_chunk_list,
-                                                         next_end)
-            self.data_chunk_list = self._clean_chunk_list(self.data_chunk_list,
-                                                         next_end)
-            self.nondata_chunk_list = self._clean_chunk_list(self.nondata_chunk_list,
-                                                             next_end)
+            self._clean(next_end)
                 
         return (timestamp, next_block, next_start, next_end)
     
-    def _clean_chunk_list(self, list, end_index):
-        """
-        Cleans up the given chunk list based on the start and end indexes of
-        that are being removed. The idea is to keep the given list of indices
-        in sync with other lists that are having elements removed from them.
-        For example, if the list looks like
-        [(3, 5, time), (8, 12, time), (20, 25, time)]
-        and the end index is 10, the resulting list will be:
-        [(0, 2, time), (10, 15, time)]
-        as items up to 10 have been removed (only [10:25] remain)
-        and popped off the front so they are now [0:2] and [10:15].
-        
-        @param list A list of (start, end) tuples of indices that needs to be
-            cleaned up.
-        @param end_index The end index of what is being removed.
-        @retval The new list after it has been cleaned
-        """
-        return_list = []
-        for (s, e, time) in list:
-            if s >= end_index:
-                return_list.append((s-end_index, e-end_index, time))
-            else:
-                if e > end_index:
-                    return_list.append((0,e-end_index, time))
-        return return_list
-    
-    def _clean_data_list(self, index):
+    def _clean(self, end_index):
         """
-        Clean up the data list in place so that it, if a fragment is consumed
-        by a get_next_raw call, the data chunk is remove and added back to the
-        non-data list.
-        
-        @param index The index that things are being cleared up to
-        """
-        new_nondata_list = []
-
-        log.debug("Cleaning data chunk, data_chunk_list: %s, nondata_chunk_list: %s",
-                  self.data_chunk_list, self.nondata_chunk_list)
+        Clean up the buffer and move the chunk lists to match, so that a chunk
+        which was at [20:25] is at [10:15] once [0:10] has been removed. Chunks
+        which end at or before end_index are dropped, a chunk which straddles
+        it now starts at 0.
 
-        for (s, e, t) in self.data_chunk_list:
-            if (e <= index):
-                self.data_chunk_list.remove((s, e, t))
-                
-            if (e > index):
-                self.data_chunk_list.remove((s, e, t))
-                # add remaining to non data
-                for (nds, nde, ndt) in self.nondata_chunk_list:
-                    if (nde < s):
-                        new_nondata_list.append((nds, nde, ndt))
-                    elif (nde == s):
-                        new_nondata_list.append((nds, e, ndt))
-                    elif (nde > s):
-                        new_nondata_list.append((nds, nde, ndt))
-        
-        self.nondata_chunk_list = new_nondata_list
+        @param end_index The end index of what is being removed.
+        """
+        self._clean_buffer(end_index)
+        self.raw_chunk_list.rebase(end_index)
+        self.data_chunk_list.rebase(end_index)
+        self.nondata_chunk_list.rebase(end_index)
     
     def _clean_buffer(self, end_index):
         """
@@ -331,8 +379,8 @@ class Chunker(object):
         @param end_index the last index used...clean up to here
         """
         # Clean up buffer
-        if isinstance(self.buffer, str):
-            self.buffer = self.buffer[end_index:]
+        if isinstance(self.buffer, ChunkBuffer):
+            self.buffer.prune(end_index)
         else:
             self.buffer[0:end_index] = []
         
@@ -347,24 +395,18 @@ class Chunker(object):
             where timestamp is in NTP4 float format and data chunk is a 
             (start, end) tuple, (None, None) if no data
         """
-        if self.nondata_chunk_list == []:
+        if not self.nondata_chunk_list:
             return (None, None, None, None)
 
         if clean:    
-            (next_start, next_end, next_time) = self.nondata_chunk_list.pop(0)
+            (next_start, next_end, next_time) = self.nondata_chunk_list.popleft()
         else:
             (next_start, next_end, next_time) = self.nondata_chunk_list[0]
         
         next_block = self.buffer[next_start:next_end]
 
         if clean:    
-            self._clean_buffer(next_end)
-            self.raw_chunk_list = self._clean_chunk_list(self.raw_chunk_list,
-                                                         next_end)
-            self.data_chunk_list = self._clean_chunk_list(self.data_chunk_list,
-                                                         next_end)
-            self.nondata_chunk_list = self._clean_chunk_list(self.nondata_chunk_list,
-                                                             next_end)
+            self._clean(next_end)
                         
         return (next_time, next_block, next_start, next_end)
 
@@ -393,23 +435,19 @@ class Chunker(object):
             float format and data chunk is a (start, end) tuple,
             (None, None) if empty list
         """
-        if self.raw_chunk_list == []:
+        if not self.raw_chunk_list:
             return (None, None)
 
-        if clean:    
-            (next_start, next_end, next_time) = self.raw_chunk_list.pop(0)
-        else:
-            (next_start, next_end, next_time) = self.raw_chunk_list[0]
+        (next_start, next_end, next_time) = self.raw_chunk_list[0]
         
         next_block = self.buffer[next_start:next_end]
 
         if clean:
-            self._clean_buffer(next_end)
-            self.raw_chunk_list = self._clean_chunk_list(self.raw_chunk_list,
-                                                         next_end)
-            self._clean_data_list(next_end)
-            self.nondata_chunk_list = self._clean_chunk_list(self.nondata_chunk_list,
-                                                             next_end)
+            # a data chunk which is cut by removing the raw chunk can not be
+            # returned whole any more, so drop it along with the consumed ones
+            while self.data_chunk_list and self.data_chunk_list[0][0] < next_end:
+                self.data_chunk_list.popleft()
+            self._clean(next_end)
 
         return (next_time, next_block)
 
@@ -417,18 +455,10 @@ class Chunker(object):
         """
         Clean all data out of the non_data, raw, and data lists
         """
-        # clear out any non matching data.
-        (nd_timestamp, non_data) = self.get_next_non_data(clean=True)
-        while non_data is not None:
-            (nd_timestamp, non_data) = self.get_next_non_data(clean=True)
-        # clean out raw data
-        (nd_timestamp, raw_data) = self.get_next_raw(clean=True)
-        while raw_data is not None:
-            (nd_timestamp, raw_data) = self.get_next_raw(clean=True)
-        # clean out data
-        (nd_timestamp, data) = self.get_next_data(clean=True)
-        while data is not None:
-            (nd_timestamp, data) = self.get_next_data(clean=True)
+        self._clean_buffer(len(self.buffer))
+        self.raw_chunk_list.clear()
+        self.data_chunk_list.clear()
+        self.nondata_chunk_list.clear()
 
     @staticmethod
     def regex_sieve_function(raw_data, regex_list=[]):
@@ -462,7 +492,7 @@ class StringChunker(Chunker):
     """
     def __init__(self, data_sieve_fn):
         Chunker.__init__(self, data_sieve_fn)
-        self.buffer = ""
+        self.buffer = ChunkBuffer()
     
     
 class BinaryChunker(Chunker):
@@ -9,12 +9,14 @@ the driver and agent. This involves a JSON interchange format
 """
 
 import time
+import threading
 import ntplib
 import base64
 import json
 
 from mi.core.common import BaseEnum
 from mi.core.exceptions import SampleException, ReadOnlyException, NotImplementedException, InstrumentParameterException
+from mi.core.instrument.data_particle import DataParticleContents
 from mi.core.log import get_logger
 
 log = get_logger()
@@ -57,6 +59,71 @@ class DataParticleValue(BaseEnum):
     QUESTIONABLE = "questionable"
 
 
+# timestamps more than this far in the future are rejected
+MAX_FUTURE_SECONDS = 86400 * 365
+
+
+class ParticleBatch(object):
+    """
+    Context in which all particles constructed on the current thread share one
+    driver timestamp, and timestamp checks share one upper bound, instead of
+    reading the clock for every particle. Outside of a batch each particle
+    reads the clock when it is constructed, as live drivers expect.
+
+        with ParticleBatch():
+            records = parser.get_records(1000)
+
+    Batches may be nested, the innermost batch applies.
+    """
+    _local = threading.local()
+
+    def __init__(self, unix_time=None):
+        """
+        @param unix_time The time to stamp the batch with, defaults to now
+        """
+        if unix_time is None:
+            unix_time = time.time()
+        self.driver_timestamp = ntplib.system_to_ntp_time(unix_time)
+        self.max_timestamp = ntplib.system_to_ntp_time(unix_time + MAX_FUTURE_SECONDS)
+        self._outer = None
+
+    def __enter__(self):
+        self._outer = self.current()
+        self._local.batch = self
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._local.batch = self._outer
+        self._outer = None
+
+    @classmethod
+    def current(cls):
+        """
+        @retval The batch active on this thread, or None
+        """
+        return getattr(cls._local, 'batch', None)
+
+    @classmethod
+    def driver_timestamp_now(cls):
+        """
+        @retval The driver timestamp for a particle constructed now
+        """
+        batch = cls.current()
+        if batch is None:
+            return ntplib.system_to_ntp_time(time.time())
+        return batch.driver_timestamp
+
+    @classmethod
+    def max_timestamp_now(cls):
+        """
+        @retval The latest timestamp accepted as reasonable now
+        """
+        batch = cls.current()
+        if batch is None:
+            return ntplib.system_to_ntp_time(time.time() + MAX_FUTURE_SECONDS)
+        return batch.max_timestamp
+
+
 class DataParticle(object):
     """
     This class is responsible for storing and ultimately generating data
@@ -67,13 +134,21 @@ class DataParticle(object):
     It is the intent that this class is subclassed as needed if an instrument must
     modify fields in the outgoing packet. The hope is to have most of the superclass
     code be called by the child class with just values overridden as needed.
+
+    Header fields and the optional _schema work as for
+    mi.core.instrument.data_particle.DataParticle.
     """
+    __slots__ = ('raw_data', '_encoding_errors', '_values', '_port_timestamp', '_internal_timestamp',
+                 '_driver_timestamp', '_preferred_timestamp', '_quality_flag', '_new_sequence',
+                 '_extra_contents')
 
     # data particle type is intended to be defined in each derived data particle class.  This value should be unique
     # for all data particles.  Best practice is to access this variable using the accessor method:
     # data_particle_type()
     _data_particle_type = None
 
+    _schema = None
+
     def __init__(self, raw_data,
                  port_timestamp=None,
                  internal_timestamp=None,
@@ -87,22 +162,25 @@ class DataParticle(object):
         if new_sequence is not None and not isinstance(new_sequence, bool):
             raise TypeError("new_sequence is not a bool")
 
-        self.contents = {
-            DataParticleKey.PKT_FORMAT_ID: DataParticleValue.JSON_DATA,
-            DataParticleKey.PKT_VERSION: 1,
-            DataParticleKey.PORT_TIMESTAMP: port_timestamp,
-            DataParticleKey.INTERNAL_TIMESTAMP: internal_timestamp,
-            DataParticleKey.DRIVER_TIMESTAMP: ntplib.system_to_ntp_time(time.time()),
-            DataParticleKey.PREFERRED_TIMESTAMP: preferred_timestamp,
-            DataParticleKey.QUALITY_FLAG: quality_flag,
-        }
+        self._port_timestamp = port_timestamp
+        self._internal_timestamp = internal_timestamp
+        self._driver_timestamp = ParticleBatch.driver_timestamp_now()
+        self._preferred_timestamp = preferred_timestamp
+        self._quality_flag = quality_flag
+        self._new_sequence = new_sequence
+        self._extra_contents = None
         self._encoding_errors = []
-        if new_sequence is not None:
-            self.contents[DataParticleKey.NEW_SEQUENCE] = new_sequence
 
         self.raw_data = raw_data
         self._values = None
 
+    @property
+    def contents(self):
+        """
+        The particle header fields, as a mapping keyed by DataParticleKey
+        """
+        return DataParticleContents(self)
+
     def __eq__(self, arg):
         """
         Quick equality check for testing purposes. If they have the same raw
@@ -117,7 +195,7 @@ class DataParticle(object):
             log.debug('Raw data does not match')
             return False
 
-        t1 = self.contents[DataParticleKey.INTERNAL_TIMESTAMP]
+        t1 = self._internal_timestamp
         t2 = arg.contents[DataParticleKey.INTERNAL_TIMESTAMP]
 
         if (t1 is None) or (t2 is None):
@@ -172,7 +250,7 @@ class DataParticle(object):
         # if(not self._check_timestamp(timestamp)):
         #    raise InstrumentParameterException("invalid timestamp")
 
-        self.contents[DataParticleKey.INTERNAL_TIMESTAMP] = float(timestamp)
+        self._internal_timestamp = float(timestamp)
 
     def set_port_timestamp(self, timestamp=None, unix_time=None):
         """
@@ -191,7 +269,7 @@ class DataParticle(object):
         if not self._check_timestamp(timestamp):
             raise InstrumentParameterException("invalid timestamp")
 
-        self.contents[DataParticleKey.PORT_TIMESTAMP] = float(timestamp)
+        self._port_timestamp = float(timestamp)
 
     def set_value(self, id, value):
         """
@@ -202,7 +280,7 @@ class DataParticle(object):
         @raises ReadOnlyException If the parameter cannot be set
         """
         if (id == DataParticleKey.INTERNAL_TIMESTAMP) and (self._check_timestamp(value)):
-            self.contents[DataParticleKey.INTERNAL_TIMESTAMP] = value
+            self._internal_timestamp = value
         else:
             raise ReadOnlyException("Parameter %s not able to be set to %s after object creation!" %
                                     (id, value))
@@ -287,7 +365,14 @@ class DataParticle(object):
         @return the values tag for this data structure ready to JSONify
         @raises SampleException when parsed values can not be properly returned
         """
-        raise SampleException("Parsed values block not overridden")
+        if self._schema is None:
+            raise SampleException("Parsed values block not overridden")
+
+        if len(self.raw_data) != len(self._schema):
+            raise SampleException("Expected %d values, received %d" % (len(self._schema), len(self.raw_data)))
+
+        return [self._encode_value(name, value, encoding_function)
+                for (name, encoding_function), value in zip(self._schema, self.raw_data)]
 
     def _build_base_structure(self):
         """
@@ -296,12 +381,25 @@ class DataParticle(object):
 
         @return A fresh copy of a core structure to be exported
         """
-        result = dict(self.contents)
-        # clean out optional fields that were missing
-        if not self.contents[DataParticleKey.PORT_TIMESTAMP]:
-            del result[DataParticleKey.PORT_TIMESTAMP]
-        if not self.contents[DataParticleKey.INTERNAL_TIMESTAMP]:
-            del result[DataParticleKey.INTERNAL_TIMESTAMP]
+        result = {
+            DataParticleKey.PKT_FORMAT_ID: DataParticleValue.JSON_DATA,
+            DataParticleKey.PKT_VERSION: 1,
+            DataParticleKey.DRIVER_TIMESTAMP: self._driver_timestamp,
+            DataParticleKey.PREFERRED_TIMESTAMP: self._preferred_timestamp,
+            DataParticleKey.QUALITY_FLAG: self._quality_flag,
+        }
+        # fields written to contents which are not held in slots replace the constants
+        if self._extra_contents is not None:
+            for key in DataParticleContents.CONSTANTS:
+                del result[key]
+            result.update(self._extra_contents)
+        # optional fields are only included when present
+        if self._port_timestamp:
+            result[DataParticleKey.PORT_TIMESTAMP] = self._port_timestamp
+        if self._internal_timestamp:
+            result[DataParticleKey.INTERNAL_TIMESTAMP] = self._internal_timestamp
+        if self._new_sequence is not None:
+            result[DataParticleKey.NEW_SEQUENCE] = self._new_sequence
         return result
 
     def _check_timestamp(self, timestamp):
@@ -317,7 +415,7 @@ class DataParticle(object):
             return False
 
         # is it sufficiently in the future to be unreasonable?
-        if timestamp > ntplib.system_to_ntp_time(time.time() + (86400 * 365)):
+        if timestamp > ParticleBatch.max_timestamp_now():
             return False
         else:
             return True
@@ -331,9 +429,8 @@ class DataParticle(object):
         @throws SampleException When there is a problem with the preferred
             timestamp in the sample.
         """
-        if self.contents[DataParticleKey.PREFERRED_TIMESTAMP] is None:
-            raise SampleException("Missing preferred timestamp, %s, in particle" %
-                                  self.contents[DataParticleKey.PREFERRED_TIMESTAMP])
+        if self._preferred_timestamp is None:
+            raise SampleException("Missing preferred timestamp, %s, in particle" % self._preferred_timestamp)
 
         # This should be handled downstream.  Don't want to not publish data because
         # the port agent stopped putting out timestamps
@@ -419,6 +516,8 @@ class RawDataParticle(DataParticle):
 
     It essentially is a translation of the port agent packet
     """
+    __slots__ = ()
+
     _data_particle_type = CommonDataParticleType.RAW
 
     def _build_parsed_values(self):
@@ -11,8 +11,8 @@ import cPickle as pickle
 import json
 
 import numpy as np
-import pandas as pd
-import xarray as xr
+from mi.core.instrument.chunked_writer import NetcdfWriter, ParquetWriter, StreamWriters
+from mi.core.instrument.particle_columns import StreamColumns
 from mi.core.instrument.publisher import Publisher
 from mi.logging import log
 
@@ -38,12 +38,11 @@ class FilePublisher(Publisher):
         super(FilePublisher, self).__init__(*args, **kwargs)
         self.samples = {}
 
-    @staticmethod
-    def _flatten(sample):
-        values = sample.pop('values')
-        for each in values:
-            sample[each['value_id']] = each['value']
-        return sample
+    def _add_sample(self, stream, particle):
+        columns = self.samples.get(stream)
+        if columns is None:
+            columns = self.samples[stream] = StreamColumns()
+        columns.append(particle)
 
     def _publish(self, events, headers):
         for event in events:
@@ -54,35 +53,20 @@ class FilePublisher(Publisher):
             particle = event.get('value', {})
             stream = particle.get('stream_name')
             if stream:
-                particle = self._flatten(particle)
-                self.samples.setdefault(stream, []).append(particle)
+                self._add_sample(stream, particle)
 
     def to_dataframes(self):
         data_frames = {}
         for particle_type in self.samples:
-            data_frames[particle_type] = self.fix_arrays(pd.DataFrame(self.samples[particle_type]))
+            data_frames[particle_type] = self.samples[particle_type].to_dataset().to_dataframe()
         return data_frames
 
     def to_datasets(self):
         datasets = {}
         for particle_type in self.samples:
-            datasets[particle_type] = self.fix_arrays(pd.DataFrame(self.samples[particle_type]), return_as_xr=True)
+            datasets[particle_type] = self.samples[particle_type].to_dataset()
         return datasets
 
-    @staticmethod
-    def fix_arrays(data_frame, return_as_xr=False):
-        # round-trip the dataframe through xray to get the multidimensional indexing correct
-        new_ds = xr.Dataset()
-        for each in data_frame:
-            if data_frame[each].dtype == 'object' and isinstance(data_frame[each].values[0], list):
-                data = np.array([np.array(x) for x in data_frame[each].values])
-                new_ds[each] = xr.DataArray(data)
-            else:
-                new_ds[each] = data_frame[each]
-        if return_as_xr:
-            return new_ds
-        return new_ds.to_dataframe()
-
     def write(self):
         log.info('Writing output files...')
         self._write()
@@ -127,3 +111,31 @@ class XarrayPublisher(FilePublisher):
             file_path = '%s.xr' % particle_type
             with open(file_path, 'w') as fh:
                 pickle.dump(datasets[particle_type], fh, protocol=-1)
+
+
+class ChunkedPublisher(FilePublisher):
+    """
+    Writes each stream to a file in row groups as particles are published, rather than holding all of them until
+    write is called
+    """
+    writer_class = None
+
+    def __init__(self, *args, **kwargs):
+        super(ChunkedPublisher, self).__init__(*args, **kwargs)
+        self.writers = StreamWriters(self.writer_class, '.')
+
+    def _add_sample(self, stream, particle):
+        super(ChunkedPublisher, self)._add_sample(stream, particle)
+        if self.samples[stream].size >= self.writers.row_group_size:
+            self.writers.flush(self.samples, stream)
+
+    def _write(self):
+        self.writers.close(self.samples)
+
+
+class NetcdfPublisher(ChunkedPublisher):
+    writer_class = NetcdfWriter
+
+
+class ParquetPublisher(ChunkedPublisher):
+    writer_class = ParquetWriter
@@ -0,0 +1,293 @@
+#!/usr/bin/env python
+
+"""
+@package mi.core.instrument.particle_columns
+@file mi/core/instrument/particle_columns.py
+@brief Columnar storage of data particles by stream. Each particle header
+    field and value_id is held in a typed numpy array, so large numbers of
+    particles can be collected and converted without per particle dicts.
+"""
+
+__license__ = 'Apache 2.0'
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+
+# rows allocated when a column first grows
+INITIAL_CAPACITY = 1024
+# values buffered by a column before they are converted to an array together
+CONVERT_BATCH_SIZE = 1024
+
+
+def _to_block(values):
+    """
+    Convert a list of parameter values to an array, numeric values and equal length numeric lists are given a numeric
+    type and any other values are kept as python objects in a 1-D array
+    """
+    block = np.array(values)
+    if block.dtype.kind in 'biuf':
+        return block
+    result = np.empty(len(values), object)
+    if block.ndim == 1:
+        result[:] = values
+    else:
+        for index, value in enumerate(values):
+            result[index] = value
+    return result
+
+
+def _common_type(data, block):
+    """
+    :return: the dtype which can hold the rows of both data and block
+    """
+    kinds = data.dtype.kind + block.dtype.kind
+    if data.shape[1:] != block.shape[1:] or 'O' in kinds or 'b' in kinds and kinds != 'bb':
+        return np.dtype(object)
+    return np.promote_types(data.dtype, block.dtype)
+
+
+def _as_type(data, dtype):
+    if dtype.kind != 'O':
+        return data.astype(dtype)
+    if data.dtype.kind == 'O':
+        return data.copy()
+    result = np.empty(len(data), object)
+    if data.ndim == 1:
+        result[:] = data.tolist()
+    else:
+        for index, row in enumerate(data):
+            result[index] = row.tolist()
+    return result
+
+
+def _resize(data, capacity):
+    result = np.zeros((capacity,) + data.shape[1:], data.dtype)
+    size = min(len(data), capacity)
+    result[:size] = data[:size]
+    return result
+
+
+class Column(object):
+    """
+    Growable typed array holding one parameter of a stream, one row per particle. Scalar values are stored in a 1-D
+    array and list values in a 2-D block. Values are buffered and converted in batches, the type is taken from the
+    first batch and widened, from int to float or from anything to object, when a later batch does not fit. Rows where
+    the parameter is missing or None are masked and read back as NaN in numeric columns and None otherwise. Rows where
+    the particle had the parameter, even with a None value, are kept apart so records can be rebuilt with only the
+    keys the particle had.
+    """
+    __slots__ = ('_data', '_valid', '_present', '_rows', '_values', '_null_rows', 'size')
+
+    def __init__(self):
+        self._data = None
+        self._valid = np.zeros(0, bool)
+        self._present = np.zeros(0, bool)
+        self._rows = []
+        self._values = []
+        self._null_rows = []
+        self.size = 0
+
+    def __getstate__(self):
+        self._flush()
+        self._trim()
+        return self._data, self._valid, self._present, self.size
+
+    def __setstate__(self, state):
+        self._data, self._valid, self._present, self.size = state
+        self._rows = []
+        self._values = []
+        self._null_rows = []
+
+    def _reserve(self, size):
+        capacity = len(self._valid)
+        if size <= capacity:
+            return
+        capacity = max(size, capacity * 2, INITIAL_CAPACITY)
+        self._valid = _resize(self._valid, capacity)
+        self._present = _resize(self._present, capacity)
+        if self._data is not None:
+            self._data = _resize(self._data, capacity)
+
+    def _trim(self):
+        self._valid = _resize(self._valid, self.size)
+        self._present = _resize(self._present, self.size)
+        if self._data is not None:
+            self._data = _resize(self._data, self.size)
+
+    def _store(self, rows, block):
+        """
+        Store the rows of block at index rows, widening the column type if needed
+        """
+        self._reserve(self.size)
+        if self._data is None:
+            self._data = np.zeros((len(self._valid),) + block.shape[1:], block.dtype)
+        elif self._data.dtype != block.dtype or self._data.shape[1:] != block.shape[1:]:
+            dtype = _common_type(self._data, block)
+            if self._data.dtype != dtype:
+                self._data = _as_type(self._data, dtype)
+            if block.dtype != dtype:
+                block = _as_type(block, dtype)
+        self._data[rows] = block
+        self._valid[rows] = True
+        self._present[rows] = True
+
+    def _flush(self):
+        if self._rows:
+            rows, values = self._rows, self._values
+            self._rows = []
+            self._values = []
+            self._store(rows, _to_block(values))
+        if self._null_rows:
+            self._reserve(self.size)
+            self._present[self._null_rows] = True
+            self._null_rows = []
+
+    def set(self, row, value):
+        """
+        Store value in row, rows skipped since the last value was stored are missing
+        """
+        if value is not None:
+            self._rows.append(row)
+            self._values.append(value)
+            if len(self._rows) >= CONVERT_BATCH_SIZE:
+                self._flush()
+        else:
+            self._null_rows.append(row)
+        if row >= self.size:
+            self.size = row + 1
+
+    def extend(self, other, row):
+        """
+        Copy all rows of other into this column starting at row
+        """
+        other._flush()
+        self._flush()
+        size = other.size
+        self.size = max(self.size, row + size)
+        self._reserve(self.size)
+        self._present[row + np.flatnonzero(other._present[:size])] = True
+        if other._data is not None:
+            valid = other._valid[:size]
+            self._store(row + np.flatnonzero(valid), other._data[:size][valid])
+
+    def values(self, size=None, masked=False):
+        """
+        :param size: number of rows to return, rows past the last value stored are missing
+        :param masked: return missing rows of numeric and bool columns as a masked array of the column type, rather
+            than widening to float with NaN
+        :return: array of the column values, one row per particle
+        """
+        self._flush()
+        if size is None:
+            size = self.size
+        self._reserve(size)
+        valid = self._valid[:size]
+        if self._data is None:
+            return np.full(size, None, object)
+        data = self._data[:size]
+        if valid.all():
+            return data
+        if masked and data.dtype.kind in 'biuf':
+            mask = np.broadcast_to(~valid.reshape((-1,) + (1,) * (data.ndim - 1)), data.shape)
+            return np.ma.masked_array(data, mask.copy())
+        if data.dtype.kind in 'iuf':
+            data = data.astype(np.float64)
+            data[~valid] = np.nan
+        else:
+            data = _as_type(data, np.dtype(object))
+            data[~valid] = None
+        return data
+
+    def present(self, size=None):
+        """
+        :return: bool array which is True in the rows where the particle had the parameter, even with a None value
+        """
+        self._flush()
+        if size is None:
+            size = self.size
+        self._reserve(size)
+        return self._present[:size]
+
+    def tolist(self, size=None):
+        """
+        :return: list of the column values as python objects, with None in missing rows
+        """
+        self._flush()
+        if size is None:
+            size = self.size
+        self._reserve(size)
+        if self._data is None:
+            return [None] * size
+        values = self._data[:size].tolist()
+        for row in np.flatnonzero(~self._valid[:size]):
+            values[row] = None
+        return values
+
+
+class StreamColumns(object):
+    """
+    Columnar store of the particles of one stream. Each header field and each value_id in the particle values list
+    is a Column, no per particle dictionary is kept.
+    """
+    def __init__(self):
+        self.columns = {}
+        self.size = 0
+
+    def _column(self, name):
+        column = self.columns.get(name)
+        if column is None:
+            column = self.columns[name] = Column()
+        return column
+
+    def append(self, sample):
+        """
+        Append one particle dictionary, as returned by DataParticle.generate_dict
+        """
+        row = self.size
+        for key, value in sample.iteritems():
+            if key == 'values':
+                for each in value:
+                    self._column(each['value_id']).set(row, each['value'])
+            else:
+                self._column(key).set(row, value)
+        self.size = row + 1
+
+    def extend(self, other):
+        """
+        Append all particles of another StreamColumns
+        """
+        for name, column in other.columns.iteritems():
+            self._column(name).extend(column, self.size)
+        self.size += other.size
+
+    def arrays(self, masked=False):
+        """
+        :param masked: passed to Column.values
+        :return: list of (name, values) for each column, sorted by name
+        """
+        return [(name, self.columns[name].values(self.size, masked)) for name in sorted(self.columns)]
+
+    def to_dataset(self):
+        """
+        Scalar parameters are indexed by dim_0, array parameters by dim_0 and dim_1
+        :return: xarray Dataset of the stream
+        """
+        dataset = xr.Dataset()
+        for name, data in self.arrays():
+            if data.ndim > 1:
+                dataset[name] = xr.DataArray(data)
+            else:
+                dataset[name] = pd.Series(data)
+        return dataset
+
+    def iter_records(self):
+        """
+        Yield each particle as a flat dictionary of parameter name to value, with only the parameters the particle had
+        """
+        names = sorted(self.columns)
+        columns = [self.columns[name].tolist(self.size) for name in names]
+        present = [self.columns[name].present(self.size).tolist() for name in names]
+        for row, flags in zip(zip(*columns), zip(*present)):
+            yield {name: value for name, value, flag in zip(names, row, flags) if flag}
@@ -0,0 +1,821 @@
+#!/usr/bin/env python
+
+"""
+@package mi.core.instrument.pd0_decoder
+@file mi/core/instrument/pd0_decoder.py
+@author Peter Cable
+@brief Decoder for Teledyne RDI PD0 ensembles, shared by the workhorse
+    instrument drivers and the PD0 dataset parsers. The layout of an
+    ensemble is described by a numpy structured dtype, so a run of back to
+    back ensembles with the same layout is decoded as one view of the buffer
+    holding them.
+"""
+
+__license__ = 'Apache 2.0'
+
+import mmap
+import os
+import pprint
+from collections import namedtuple
+
+import numpy as np
+
+namedtuple_store = {}
+bitmapped_namedtuple_store = {}
+
+# header id and data source id bytes starting each ensemble
+HEADER_ID = 0x7f
+# beams of the cell data blocks
+NUM_BEAMS = 4
+# most ensembles decoded together by decode_ensembles
+ENSEMBLE_RUN = 1000
+# layouts held before the cache is cleared, a corrupt file can have many
+LAYOUT_CACHE_SIZE = 256
+
+
+class PD0ParsingException(Exception):
+    pass
+
+
+class InsufficientDataException(PD0ParsingException):
+    pass
+
+
+class UnhandledBlockException(PD0ParsingException):
+    pass
+
+
+class ChecksumException(PD0ParsingException):
+    pass
+
+
+class BadHeaderException(PD0ParsingException):
+    pass
+
+
+class BadOffsetException(PD0ParsingException):
+    pass
+
+
+class BlockId(object):
+    FIXED_DATA = 0
+    VARIABLE_DATA = 128
+    VELOCITY_DATA = 256
+    CORRELATION_DATA = 512
+    ECHO_INTENSITY_DATA = 768
+    PERCENT_GOOD_DATA = 1024
+    STATUS_DATA_ID = 1280
+    BOTTOM_TRACK = 1536
+    AUV_NAV_DATA = 8192
+
+
+VALID_BLOCK_IDS = frozenset(value for name, value in vars(BlockId).items() if not name.startswith('_'))
+
+
+def count_zero_bits(bitmask):
+    if not bitmask:
+        return 0
+    zero_digits = 0
+    submask = 1
+    while True:
+        x = bitmask & submask
+        submask <<= 1
+        if x != 0:
+            break
+        zero_digits += 1
+    return zero_digits
+
+
+HEADER_FORMAT = (
+    ('id', 'B'),
+    ('data_source', 'B'),
+    ('num_bytes', 'H'),
+    ('spare', 'B'),
+    ('num_data_types', 'B')
+)
+
+FIXED_FORMAT = (
+    ('id', 'H'),
+    ('cpu_firmware_version', 'B'),
+    ('cpu_firmware_revision', 'B'),
+    ('system_configuration', 'H'),
+    ('simulation_data_flag', 'B'),
+    ('lag_length', 'B'),
+    ('number_of_beams', 'B'),
+    ('number_of_cells', 'B'),
+    ('pings_per_ensemble', 'H'),
+    ('depth_cell_length', 'H'),
+    ('blank_after_transmit', 'H'),
+    ('signal_processing_mode', 'B'),
+    ('low_corr_threshold', 'B'),
+    ('num_code_reps', 'B'),
+    ('minimum_percentage', 'B'),
+    ('error_velocity_max', 'H'),
+    ('tpp_minutes', 'B'),
+    ('tpp_seconds', 'B'),
+    ('tpp_hundredths', 'B'),
+    ('coord_transform', 'B'),
+    ('heading_alignment', 'H'),
+    ('heading_bias', 'H'),
+    ('sensor_source', 'B'),
+    ('sensor_available', 'B'),
+    ('bin_1_distance', 'H'),
+    ('transmit_pulse_length', 'H'),
+    ('starting_depth_cell', 'B'),
+    ('ending_depth_cell', 'B'),
+    ('false_target_threshold', 'B'),
+    ('spare1', 'B'),
+    ('transmit_lag_distance', 'H'),
+    ('cpu_board_serial_number', 'Q'),
+    ('system_bandwidth', 'H'),
+    ('system_power', 'B'),
+    ('spare2', 'B'),
+    ('serial_number', 'I'),
+    ('beam_angle', 'B')
+)
+
+VARIABLE_FORMAT = (
+    ('id', 'H'),
+    ('ensemble_number', 'H'),
+    ('rtc_year', 'B'),
+    ('rtc_month', 'B'),
+    ('rtc_day', 'B'),
+    ('rtc_hour', 'B'),
+    ('rtc_minute', 'B'),
+    ('rtc_second', 'B'),
+    ('rtc_hundredths', 'B'),
+    ('ensemble_roll_over', 'B'),
+    ('bit_result', 'H'),
+    ('speed_of_sound', 'H'),
+    ('depth_of_transducer', 'H'),
+    ('heading', 'H'),
+    ('pitch', 'h'),
+    ('roll', 'h'),
+    ('salinity', 'H'),
+    ('temperature', 'h'),
+    ('mpt_minutes', 'B'),
+    ('mpt_seconds', 'B'),
+    ('mpt_hundredths', 'B'),
+    ('heading_standard_deviation', 'B'),
+    ('pitch_standard_deviation', 'B'),
+    ('roll_standard_deviation', 'B'),
+    ('transmit_current', 'B'),
+    ('transmit_voltage', 'B'),
+    ('ambient_temperature', 'B'),
+    ('pressure_positive', 'B'),
+    ('pressure_negative', 'B'),
+    ('attitude_temperature', 'B'),
+    ('attitude', 'B'),
+    ('contamination_sensor', 'B'),
+    ('error_status_word', 'I'),
+    ('reserved', 'H'),
+    ('pressure', 'I'),
+    ('pressure_variance', 'I'),
+    ('spare', 'B'),
+    ('rtc_y2k_century', 'B'),
+    ('rtc_y2k_year', 'B'),
+    ('rtc_y2k_month', 'B'),
+    ('rtc_y2k_day', 'B'),
+    ('rtc_y2k_hour', 'B'),
+    ('rtc_y2k_minute', 'B'),
+    ('rtc_y2k_seconds', 'B'),
+    ('rtc_y2k_hundredths', 'B')
+)
+
+BOTTOM_TRACK_FORMAT = (
+    ('id', 'H'),
+    ('pings_per_ensemble', 'H'),
+    ('delay_before_reacquire', 'H'),
+    ('correlation_mag_min', 'B'),
+    ('eval_amplitude_min', 'B'),
+    ('percent_good_minimum', 'B'),
+    ('mode', 'B'),
+    ('error_velocity_max', 'H'),
+    ('reserved', 'I'),
+    ('range_1', 'H'),
+    ('range_2', 'H'),
+    ('range_3', 'H'),
+    ('range_4', 'H'),
+    ('velocity_1', 'h'),
+    ('velocity_2', 'h'),
+    ('velocity_3', 'h'),
+    ('velocity_4', 'h'),
+    ('corr_1', 'B'),
+    ('corr_2', 'B'),
+    ('corr_3', 'B'),
+    ('corr_4', 'B'),
+    ('amp_1', 'B'),
+    ('amp_2', 'B'),
+    ('amp_3', 'B'),
+    ('amp_4', 'B'),
+    ('pcnt_1', 'B'),
+    ('pcnt_2', 'B'),
+    ('pcnt_3', 'B'),
+    ('pcnt_4', 'B'),
+    ('ref_layer_min', 'H'),
+    ('ref_layer_near', 'H'),
+    ('ref_layer_far', 'H'),
+    ('ref_velocity_1', 'h'),
+    ('ref_velocity_2', 'h'),
+    ('ref_velocity_3', 'h'),
+    ('ref_velocity_4', 'h'),
+    ('ref_corr_1', 'B'),
+    ('ref_corr_2', 'B'),
+    ('ref_corr_3', 'B'),
+    ('ref_corr_4', 'B'),
+    ('ref_amp_1', 'B'),
+    ('ref_amp_2', 'B'),
+    ('ref_amp_3', 'B'),
+    ('ref_amp_4', 'B'),
+    ('ref_pcnt_1', 'B'),
+    ('ref_pcnt_2', 'B'),
+    ('ref_pcnt_3', 'B'),
+    ('ref_pcnt_4', 'B'),
+    ('max_depth', 'H'),
+    ('rssi_1', 'B'),
+    ('rssi_2', 'B'),
+    ('rssi_3', 'B'),
+    ('rssi_4', 'B'),
+    ('gain', 'B'),
+    ('range_msb_1', 'B'),
+    ('range_msb_2', 'B'),
+    ('range_msb_3', 'B'),
+    ('range_msb_4', 'B'),
+)
+
+# little endian numpy types of the struct format codes
+NUMPY_TYPES = {'B': 'u1', 'b': 'i1', 'H': '<u2', 'h': '<i2', 'I': '<u4', 'i': '<i4', 'Q': '<u8'}
+
+
+def format_dtype(formatter):
+    """
+    Packed structured dtype of a tuple of (field name, struct format code)
+    """
+    return np.dtype([(name, NUMPY_TYPES[code]) for name, code in formatter])
+
+
+HEADER_DTYPE = format_dtype(HEADER_FORMAT)
+
+# attribute, namedtuple name and dtype of the blocks decoded to a namedtuple of their fields
+LEADER_BLOCKS = {
+    BlockId.FIXED_DATA: ('fixed_data', 'fixed', format_dtype(FIXED_FORMAT)),
+    BlockId.VARIABLE_DATA: ('variable_data', 'variable', format_dtype(VARIABLE_FORMAT)),
+    BlockId.BOTTOM_TRACK: ('bottom_track', 'bottom_track', format_dtype(BOTTOM_TRACK_FORMAT)),
+}
+
+# attribute, namedtuple name and value type of the blocks holding a value per cell and beam
+CELL_BLOCKS = {
+    BlockId.VELOCITY_DATA: ('velocities', 'velocity', '<i2'),
+    BlockId.CORRELATION_DATA: ('correlation_magnitudes', 'correlation', 'u1'),
+    BlockId.ECHO_INTENSITY_DATA: ('echo_intensity', 'echo_intensity', 'u1'),
+    BlockId.PERCENT_GOOD_DATA: ('percent_good', 'percent_good', 'u1'),
+}
+
+# offset of number_of_cells in the fixed leader
+NUMBER_OF_CELLS_OFFSET = 9
+FIXED_DATA_ID = '\x00\x00'
+
+
+def _namedtuple_class(name, fields):
+    _class = namedtuple_store.get(name)
+    if _class is None:
+        _class = namedtuple_store[name] = namedtuple(name, fields)
+    return _class
+
+
+def _leading(mask):
+    """
+    Number of leading True values of a boolean array
+    """
+    return len(mask) if mask.all() else int(mask.argmin())
+
+
+class Pd0Layout(object):
+    """
+    Structured dtype of all ensembles with the same header, offset table, block ids and number of cells. Checks which
+    only depend on these bytes are made once per layout. Layouts are cached by those bytes.
+
+    With strict set, the header, offset table and block ids are checked before the checksum as the PD0 dataset parsers
+    require. Otherwise only a short ensemble is rejected before the checksum. Errors found decoding the blocks are
+    raised after the checksum is checked, by decode_ensembles.
+    """
+    _cache = {}
+
+    def __init__(self, ensemble, strict=True):
+        size = self.size = len(ensemble)
+        self.error = None
+        self.dtype = None
+        # attribute, namedtuple name and whether the block holds cell data, in block order
+        self.blocks = []
+
+        if size < HEADER_DTYPE.itemsize:
+            raise BadOffsetException('PD0 record of %d bytes is shorter than its header' % size)
+        num_data_types = int(ensemble[5])
+        if strict and not 5 < num_data_types < 10:
+            raise BadHeaderException
+
+        table_end = HEADER_DTYPE.itemsize + 2 * num_data_types
+        columns = range(table_end)
+        if table_end > size:
+            self._fail(BadOffsetException('Offset table extends past the end of the PD0 record'), strict)
+            self.key_columns = np.array(columns[:size], np.intp)
+            return
+        offsets = ensemble[HEADER_DTYPE.itemsize:table_end].view('<u2').tolist()
+
+        fields = {'header': (HEADER_DTYPE, 0), 'offsets': (('<u2', (num_data_types,)), HEADER_DTYPE.itemsize)}
+        number_of_cells = None
+        for offset in offsets:
+            if offset > size - 2:
+                self._fail(BadOffsetException('Block offset %d is past the end of the PD0 record' % offset), strict)
+                continue
+            columns.extend((offset, offset + 1))
+            block_id = int(ensemble[offset]) | int(ensemble[offset + 1]) << 8
+            if block_id not in VALID_BLOCK_IDS:
+                self._fail(UnhandledBlockException('Found unhandled data type id: %d' % block_id), strict)
+                continue
+
+            if block_id in LEADER_BLOCKS:
+                attribute, name, dtype = LEADER_BLOCKS[block_id]
+                if block_id == BlockId.FIXED_DATA and offset + NUMBER_OF_CELLS_OFFSET < size:
+                    columns.append(offset + NUMBER_OF_CELLS_OFFSET)
+                    number_of_cells = int(ensemble[offset + NUMBER_OF_CELLS_OFFSET])
+                is_cells = False
+            elif block_id in CELL_BLOCKS:
+                attribute, name, value_type = CELL_BLOCKS[block_id]
+                if number_of_cells is None:
+                    self._fail(PD0ParsingException('Cell data found before the fixed leader'), False)
+                    continue
+                dtype = np.dtype([('id', '<u2'), ('data', value_type, (number_of_cells, NUM_BEAMS))])
+                is_cells = True
+            else:
+                continue
+
+            if offset + dtype.itemsize > size:
+                self._fail(BadOffsetException('Block %d extends past the end of the PD0 record' % block_id), False)
+                continue
+            fields[attribute] = (dtype, offset)
+            self.blocks.append((attribute, name, is_cells))
+
+        self.key_columns = np.array(columns, np.intp)
+        if 'fixed_data' not in fields or 'variable_data' not in fields:
+            self._fail(PD0ParsingException('PD0 record is missing the fixed or variable leader'), False)
+        if self.error is not None:
+            return
+
+        fields['checksum'] = ('<u2', size - 2)
+        names = sorted(fields)
+        self.dtype = np.dtype({'names': names,
+                               'formats': [fields[name][0] for name in names],
+                               'offsets': [fields[name][1] for name in names],
+                               'itemsize': size})
+
+    def _fail(self, error, immediate):
+        """
+        Raise error now, or keep it to raise once the checksum is checked if it is the first one found
+        """
+        if immediate:
+            raise error
+        if self.error is None:
+            self.error = error
+
+    @classmethod
+    def get(cls, ensemble, strict=True):
+        """
+        Layout of the single ensemble held in a uint8 array
+        """
+        size = len(ensemble)
+        key_size = HEADER_DTYPE.itemsize
+        if size >= key_size:
+            key_size += 2 * int(ensemble[5])
+        # the offset table alone does not identify a layout, also compare the block ids and number of cells
+        key = [strict, ensemble[:key_size].tostring()]
+        if key_size <= size:
+            for offset in ensemble[HEADER_DTYPE.itemsize:key_size].view('<u2').tolist():
+                block_id = ensemble[offset:offset + 2].tostring()
+                key.append(block_id)
+                if block_id == FIXED_DATA_ID:
+                    key.append(ensemble[offset + NUMBER_OF_CELLS_OFFSET:offset + NUMBER_OF_CELLS_OFFSET + 1].tostring())
+        key = tuple(key)
+
+        layout = cls._cache.get(key)
+        if layout is None:
+            layout = cls(ensemble, strict)
+            if len(cls._cache) >= LAYOUT_CACHE_SIZE:
+                cls._cache.clear()
+            cls._cache[key] = layout
+        return layout
+
+
+class Pd0Ensembles(object):
+    """
+    Run of back to back ensembles with the same layout, held as a structured array viewing the buffer they were
+    decoded from
+    """
+    def __init__(self, layout, array, position):
+        self.layout = layout
+        self.array = array
+        self.position = position
+        self.end = position + len(array) * layout.size
+
+    def __len__(self):
+        return len(self.array)
+
+    def cells(self, attribute):
+        """
+        View of a cell data block, such as 'velocities', shaped (ensembles, cells, beams)
+        """
+        return self.array[attribute]['data']
+
+    def beam(self, attribute, beam):
+        """
+        View of the values of one beam (numbered from 1) of a cell data block, shaped (ensembles, cells)
+        """
+        return self.array[attribute]['data'][:, :, beam - 1]
+
+    def records(self, glider=False, record_class=None):
+        """
+        Generate an AdcpPd0Record for each ensemble
+        """
+        if record_class is None:
+            record_class = AdcpPd0Record
+        for index in xrange(len(self.array)):
+            yield record_class.from_ensembles(self, index, glider)
+
+
+def decode_ensembles(data, position=0, strict=True, max_count=ENSEMBLE_RUN):
+    """
+    Decode the ensemble starting at position in a uint8 array, along with the ensembles following it which have the
+    same layout and a valid checksum, up to max_count ensembles
+    @return Pd0Ensembles
+    @throws PD0ParsingException if the first ensemble can not be decoded
+    """
+    available = len(data) - position
+    if available < 4:
+        raise InsufficientDataException('Insufficient data in PD0 record (expected at least 4 bytes, found %d)' %
+                                        available)
+    size = (int(data[position + 2]) | int(data[position + 3]) << 8) + 2
+    if available < size:
+        raise InsufficientDataException('Insufficient data in PD0 record (expected %d bytes, found %d)' %
+                                        (size, available))
+
+    first = data[position:position + size]
+    layout = Pd0Layout.get(first, strict)
+    count = min(max_count, available // size)
+    ensembles = data[position:position + count * size].reshape(count, size)
+    if count > 1:
+        columns = layout.key_columns
+        count = _leading((ensembles[:, columns] == first[columns]).all(axis=1))
+        ensembles = ensembles[:count]
+
+    calculated = ensembles[:, :-2].sum(axis=1, dtype=np.uint32) & 0xFFFF
+    stored = ensembles[:, -2].astype(np.uint32) | ensembles[:, -1].astype(np.uint32) << 8
+    valid = calculated == stored
+    if not valid[0]:
+        raise ChecksumException('Checksum failure in PD0 data (expected %d, calculated %d' %
+                                (stored[0], calculated[0]))
+    if layout.error is not None:
+        raise layout.error
+
+    count = _leading(valid)
+    return Pd0Ensembles(layout, data[position:position + count * size].view(layout.dtype), position)
+
+
+def map_stream(stream_handle):
+    """
+    Contents of a stream as a read only uint8 array, memory mapped if the stream is a file
+    """
+    try:
+        fileno = stream_handle.fileno()
+    except (AttributeError, IOError):
+        return np.frombuffer(stream_handle.read(), np.uint8)
+    if not os.fstat(fileno).st_size:
+        return np.zeros(0, np.uint8)
+    return np.frombuffer(mmap.mmap(fileno, 0, access=mmap.ACCESS_READ), np.uint8)
+
+
+class HeaderScanner(object):
+    """
+    Positions of the ensemble header id bytes in a uint8 array, as found stepping two bytes at a time from the start
+    of the array or from the end of an ensemble
+    """
+    def __init__(self, data):
+        positions = np.flatnonzero((data[:-1] == HEADER_ID) & (data[1:] == HEADER_ID))
+        self._positions = (positions[positions % 2 == 0], positions[positions % 2 == 1])
+
+    def next(self, position):
+        """
+        First header at or after position reached stepping two bytes at a time, or None
+        """
+        positions = self._positions[position % 2]
+        index = positions.searchsorted(position)
+        if index < len(positions):
+            return int(positions[index])
+        return None
+
+
+class AdcpPd0Record(object):
+    # check the header, offset table and block ids before the checksum
+    strict = True
+
+    def __init__(self, data, glider=False):
+        ensembles = decode_ensembles(np.frombuffer(data, np.uint8), strict=self.strict, max_count=1)
+        self._load(ensembles, 0, glider)
+
+    @classmethod
+    def from_ensembles(cls, ensembles, index, glider=False):
+        """
+        Record of one ensemble of a Pd0Ensembles
+        """
+        record = cls.__new__(cls)
+        record._load(ensembles, index, glider)
+        return record
+
+    def __str__(self):
+        return repr(self)
+
+    def __repr__(self):
+        return pprint.pformat(self.__dict__)
+
+    def _load(self, ensembles, index, glider):
+        ensemble = ensembles.array[index]
+        self.data = ensembles.array[index:index + 1].view(np.uint8).tostring()
+        self.header = _namedtuple_class('header', HEADER_DTYPE.names)(*ensemble['header'].item())
+        self.offsets = tuple(ensemble['offsets'].tolist())
+        self.fixed_data = None
+        self.variable_data = None
+        self.echo_intensity = None
+        self.velocities = None
+        self.correlation_magnitudes = None
+        self.percent_good = None
+        self.stored_checksum = int(ensemble['checksum'])
+
+        for attribute, name, is_cells in ensembles.layout.blocks:
+            values = ensemble[attribute]
+            if is_cells:
+                _class = _namedtuple_class(name, ('id', 'beam1', 'beam2', 'beam3', 'beam4'))
+                value = _class(int(values['id']), *values['data'].T.tolist())
+            else:
+                # numpy gives longs for 32 and 64 bit fields, struct only for values which do not fit an int
+                value = _namedtuple_class(name, values.dtype.names)(*[int(field) for field in values.item()])
+            setattr(self, attribute, value)
+
+        self._parse_sysconfig()
+        self._parse_coord_transform()
+        self._parse_sensor_source(glider)
+        self._parse_sensor_avail(glider)
+        self._parse_bit_result()
+        self._parse_error_word()
+
+    @staticmethod
+    def _unpack_bitmapped(name, formatter, source_data):
+        # short circuit if we've seen this bitmap before
+        short_circuit_key = (name, source_data)
+        if short_circuit_key in bitmapped_namedtuple_store:
+            return bitmapped_namedtuple_store[short_circuit_key]
+
+        # create the namedtuple class if it doesn't already exist
+        _class = _namedtuple_class(name, [item[0] for item in formatter])
+
+        # create an instance of the namedtuple for this data
+        data = []
+        for _, bitmask, lookup_table in formatter:
+            raw = (source_data & bitmask) >> count_zero_bits(bitmask)
+            if lookup_table is not None:
+                data.append(lookup_table[raw])
+            else:
+                data.append(raw)
+        value = _class(*data)
+
+        # store this value for future short circuit operations
+        bitmapped_namedtuple_store[short_circuit_key] = value
+        return value
+
+    def _parse_sysconfig(self):
+        """
+        LSB
+        BITS 7 6 5 4 3 2 1 0
+         - - - - - 0 0 0 75-kHz SYSTEM
+         - - - - - 0 0 1 150-kHz SYSTEM
+         - - - - - 0 1 0 300-kHz SYSTEM
+         - - - - - 0 1 1 600-kHz SYSTEM
+         - - - - - 1 0 0 1200-kHz SYSTEM
+         - - - - - 1 0 1 2400-kHz SYSTEM
+         - - - - 0 - - - CONCAVE BEAM PAT.
+         - - - - 1 - - - CONVEX BEAM PAT.
+         - - 0 0 - - - - SENSOR CONFIG #1
+         - - 0 1 - - - - SENSOR CONFIG #2
+         - - 1 0 - - - - SENSOR CONFIG #3
+         - 0 - - - - - - XDCR HD NOT ATT.
+         - 1 - - - - - - XDCR HD ATTACHED
+         0 - - - - - - - DOWN FACING BEAM
+         1 - - - - - - - UP-FACING BEAM
+        MSB
+        BITS 7 6 5 4 3 2 1 0
+         - - - - - - 0 0 15E BEAM ANGLE
+         - - - - - - 0 1 20E BEAM ANGLE
+         - - - - - - 1 0 30E BEAM ANGLE
+         - - - - - - 1 1 OTHER BEAM ANGLE
+         0 1 0 0 - - - - 4-BEAM JANUS CONFIG
+         0 1 0 1 - - - - 5-BM JANUS CFIG DEMOD)
+         1 1 1 1 - - - - 5-BM JANUS CFIG.(2 DEMD)
+        """
+        frequencies = [75, 150, 300, 600, 1200, 2400]
+        sysconfig_format = (
+            ('frequency', 0b111, frequencies),
+            ('beam_pattern', 0b1000, None),
+            ('sensor_config', 0b110000, None),
+            ('xdcr_head_attached', 0b1000000, None),
+            ('beam_facing', 0b10000000, None),
+            ('beam_angle', 0b11 << 8, None),
+            ('janus_config', 0b11110000 << 8, None))
+
+        self.sysconfig = self._unpack_bitmapped('sysconfig', sysconfig_format, self.fixed_data.system_configuration)
+
+    def _parse_coord_transform(self):
+        """
+         xxx00xxx = NO TRANSFORMATION (BEAM COORDINATES)
+         xxx01xxx = INSTRUMENT COORDINATES
+         xxx10xxx = SHIP COORDINATES
+         xxx11xxx = EARTH COORDINATES
+         xxxxx1xx = TILTS (PITCH AND ROLL) USED IN SHIP OR EARTH TRANSFORMATION
+         xxxxxx1x = 3-BEAM SOLUTION USED IF ONE BEAM IS BELOW THE CORRELATION THRESHOLD SET BY THE WC-COMMAND
+         xxxxxxx1 = BIN MAPPING USED
+        """
+        coord_transform_format = (
+            ('coord_transform', 0b11000, None),
+            ('tilts_used', 0b100, None),
+            ('three_beam_used', 0b10, None),
+            ('bin_mapping_used', 0b1, None))
+
+        self.coord_transform = self._unpack_bitmapped('coord_transform', coord_transform_format,
+                                                      self.fixed_data.coord_transform)
+
+    def _parse_sensor_source(self, glider):
+        """
+        FIELD DESCRIPTION
+         x1xxxxxx = CALCULATES EC (SPEED OF SOUND) FROM ED, ES, AND ET
+         xx1xxxxx = USES ED FROM DEPTH SENSOR
+         xxx1xxxx = USES EH FROM TRANSDUCER HEADING SENSOR
+         xxxx1xxx = USES EP FROM TRANSDUCER PITCH SENSOR
+         xxxxx1xx = USES ER FROM TRANSDUCER ROLL SENSOR
+         xxxxxx1x = USES ES (SALINITY) FROM CONDUCTIVITY SENSOR
+         xxxxxxx1 = USES ET FROM TRANSDUCER TEMPERATURE SENSOR
+
+         FIELD DESCRIPTION (ExplorerDVL)
+         1xxxxxxx = CALCULATES EC (SPEED OF SOUND) FROM ED, ES, AND ET
+         x1xxxxxx = USES ED FROM DEPTH SENSOR
+         xx1xxxxx = USES EH FROM TRANSDUCER HEADING SENSOR
+         xxx1xxxx = USES EP FROM TRANSDUCER PITCH SENSOR
+         xxxx1xxx = USES ER FROM TRANSDUCER ROLL SENSOR
+         xxxxx1xx = USES ES (SALINITY) FROM CONDUCTIVITY SENSOR
+         xxxxxx1x = USES ET FROM TRANSDUCER TEMPERATURE SENSOR
+         xxxxxxx1 = USES EU FROM TRANSDUCER TEMPERATURE SENSOR
+        """
+        if glider:
+            sensor_source_format = (
+                ('calculate_ec', 0b10000000, None),
+                ('depth_used', 0b1000000, None),
+                ('heading_used', 0b100000, None),
+                ('pitch_used', 0b10000, None),
+                ('roll_used', 0b1000, None),
+                ('conductivity_used', 0b100, None),
+                ('temperature_used', 0b10, None),
+                ('temperature_eu_used', 0b1, None))
+
+            self.sensor_source = self._unpack_bitmapped('sensor_source_glider', sensor_source_format,
+                                                        self.fixed_data.sensor_source)
+
+        else:
+            sensor_source_format = (
+                ('calculate_ec', 0b1000000, None),
+                ('depth_used', 0b100000, None),
+                ('heading_used', 0b10000, None),
+                ('pitch_used', 0b1000, None),
+                ('roll_used', 0b100, None),
+                ('conductivity_used', 0b10, None),
+                ('temperature_used', 0b1, None))
+
+            self.sensor_source = self._unpack_bitmapped('sensor_source', sensor_source_format,
+                                                        self.fixed_data.sensor_source)
+
+    def _parse_sensor_avail(self, glider):
+        """
+        Fields match sensor source above
+        """
+        if glider:
+            sensor_avail_format = (
+                ('speed_avail', 0b10000000, None),
+                ('depth_avail', 0b1000000, None),
+                ('heading_avail', 0b100000, None),
+                ('pitch_avail', 0b10000, None),
+                ('roll_avail', 0b1000, None),
+                ('conductivity_avail', 0b100, None),
+                ('temperature_avail', 0b10, None),
+                ('temperature_eu_avail', 0b1, None))
+
+            self.sensor_avail = self._unpack_bitmapped('sensor_avail_glider', sensor_avail_format,
+                                                       self.fixed_data.sensor_available)
+
+        else:
+            sensor_avail_format = (
+                ('speed_avail', 0b1000000, None),
+                ('depth_avail', 0b100000, None),
+                ('heading_avail', 0b10000, None),
+                ('pitch_avail', 0b1000, None),
+                ('roll_avail', 0b100, None),
+                ('conductivity_avail', 0b10, None),
+                ('temperature_avail', 0b1, None))
+
+            self.sensor_avail = self._unpack_bitmapped('sensor_avail', sensor_avail_format,
+                                                       self.fixed_data.sensor_available)
+
+    def _parse_bit_result(self):
+        """
+        BYTE 13 BYTE 14 (BYTE 14 RESERVED FOR FUTURE USE)
+        1xxxxxxx xxxxxxxx = RESERVED
+        x1xxxxxx xxxxxxxx = RESERVED
+        xx1xxxxx xxxxxxxx = RESERVED
+        xxx1xxxx xxxxxxxx = DEMOD 1 ERROR
+        xxxx1xxx xxxxxxxx = DEMOD 0 ERROR
+        xxxxx1xx xxxxxxxx = RESERVED
+        xxxxxx1x xxxxxxxx = TIMING CARD ERROR
+        xxxxxxx1 xxxxxxxx = RESERVED
+        """
+        bit_result_format = (
+            ('demod1_error', 0b10000, None),
+            ('demod0_error', 0b1000, None),
+            ('timing_card_error', 0b10, None))
+
+        self.bit_result = self._unpack_bitmapped('bit_result', bit_result_format, self.variable_data.bit_result)
+
+    def _parse_error_word(self):
+        """
+        Low 16 BITS
+        LSB
+        BITS 07 06 05 04 03 02 01 00
+         x x x x x x x 1 Bus Error exception
+         x x x x x x 1 x Address Error exception
+         x x x x x 1 x x Illegal Instruction exception
+         x x x x 1 x x x Zero Divide exception
+         x x x 1 x x x x Emulator exception
+         x x 1 x x x x x Unassigned exception
+         x 1 x x x x x x Watchdog restart occurred
+         1 x x x x x x x Battery Saver power
+        87-88 44 Low 16 BITS
+        MSB
+        BITS 15 14 13 12 11 10 09 08
+         x x x x x x x 1 Pinging
+         x x x x x x 1 x Not Used
+         x x x x x 1 x x Not Used
+         x x x x 1 x x x Not Used
+         x x x 1 x x x x Not Used
+         x x 1 x x x x x Not Used
+         x 1 x x x x x x Cold Wakeup occurred
+         1 x x x x x x x Unknown Wakeup occurred
+        89-90 45 High 16 BITS
+        LSB
+        BITS 24 23 22 21 20 19 18 17
+         x x x x x x x 1 Clock Read error occurred
+         x x x x x x 1 x Unexpected alarm
+         x x x x x 1 x x Clock jump forward
+         x x x x 1 x x x Clock jump backward
+         x x x 1 x x x x Not Used
+         x x 1 x x x x x Not Used
+         x 1 x x x x x x Not Used
+         1 x x x x x x x Not Used
+                High 16 BITS
+        MSB
+        BITS 32 31 30 29 28 27 26 25
+         x x x x x x x 1 Not Used
+         x x x x x x 1 x Not Used
+         x x x x x 1 x x Not Used
+         x x x x 1 x x x Power Fail (Unrecorded)
+         x x x 1 x x x x Spurious level 4 intr (DSP)
+         x x 1 x x x x x Spurious level 5 intr (UART)
+         x 1 x x x x x x Spurious level 6 intr (CLOCK)
+         1 x x x x x x x Level 7 interrupt occurred
+        """
+        error_word_format = (
+            ('bus_error', 0b1, None),
+            ('address_error', 0b10, None),
+            ('illegal_instruction', 0b100, None),
+            ('zero_divide', 0b1000, None),
+            ('emulator', 0b10000, None),
+            ('unassigned', 0b100000, None),
+            ('watchdog_restart', 0b1000000, None),
+            ('battery_saver', 0b10000000, None),
+            ('pinging', 0b1 << 8, None),
+            ('cold_wakeup', 0b1000000 << 8, None),
+            ('unknown_wakeup', 0b10000000 << 8, None),
+            ('clock_read', 0b1 << 16, None),
+            ('unexpected_alarm', 0b10 << 16, None),
+            ('clock_jump_forward', 0b100 << 16, None),
+            ('clock_jump_backward', 0b1000 << 16, None),
+            ('power_fail', 0b1000 << 24, None),
+            ('spurious_dsp', 0b10000 << 24, None),
+            ('spurious_uart', 0b100000 << 24, None),
+            ('spurious_clock', 0b1000000 << 24, None),
+            ('level_7_interrupt', 0b10000000 << 24, None),
+        )
+
+        self.error_word = self._unpack_bitmapped('error_word', error_word_format, self.variable_data.error_status_word)
@@ -20,6 +20,7 @@ Options:
 """
 import glob
 import importlib
+import operator
 import sys
 import time
 from datetime import datetime
@@ -33,6 +34,7 @@ from mi.core.instrument.instrument_protocol import \
     CommandResponseInstrumentProtocol, \
     InstrumentProtocol
 from mi.core.instrument.publisher import Publisher
+from mi.core.time_tools import ISO8601_TIMESTAMP
 from mi.logging import log
 from ooi_port_agent.common import PacketType
 from ooi_port_agent.packet import Packet, PacketHeader
@@ -76,8 +78,14 @@ def string_to_ntp_date_time(datestr):
         if datestr[-1:] != 'Z':
             datestr += 'Z'
 
-        dt = datetime.strptime(datestr, DATE_FORMAT)
-        timestamp = (dt - datetime(1900, 1, 1)).total_seconds()
+        fields = ISO8601_TIMESTAMP.parse(datestr)
+        if fields is not None:
+            # the same division of total microseconds timedelta.total_seconds does
+            timestamp = (int(NTP_DIFF) + fields[0]) * 1000000 + fields[1]
+            timestamp = operator.truediv(timestamp, 1000000)
+        else:
+            dt = datetime.strptime(datestr, DATE_FORMAT)
+            timestamp = (dt - datetime(1900, 1, 1)).total_seconds()
 
     except ValueError as e:
         raise ValueError('Value %s could not be formatted to a date. %s' % (str(datestr), e))
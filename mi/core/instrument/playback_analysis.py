@@ -7,6 +7,8 @@ from datetime import datetime, timedelta
 import sys
 from tqdm import tqdm
 
+from mi.core.checksum import lrc
+
 
 """
 Usage: python_analysis <root> [sensor]
@@ -20,12 +22,6 @@ binary_sync = '\xa3\x9d\x7a'
 file_scan_depth = 256000
 
 
-def lrc(data, seed=0):
-    for b in bytearray(data):
-        seed ^= b
-    return seed
-
-
 def find_sensor(filename):
     if '_' in filename:
         return filename.split('_')[0]
@@ -25,17 +25,10 @@ __license__ = 'Apache 2.0'
 log = get_logger()
 
 
-# pure python LRC in case we don't have ooi_port_agent
-def py_lrc(data, seed=0):
-    for val in bytearray(data):
-        seed ^= val
-    return seed
-
 try:
     from ooi_port_agent.lrc import lrc
 except ImportError:
-    log.error('Unable to import compiled LRC function, falling back to pure python implementation (SLOW!)')
-    lrc = py_lrc
+    from mi.core.checksum import lrc
 
 
 HEADER_FORMAT = '>4BHHII'
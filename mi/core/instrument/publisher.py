@@ -183,6 +183,14 @@ class Publisher(object):
         elif result.scheme == 'xarray':
             from file_publisher import XarrayPublisher
             return XarrayPublisher(allowed, **kwargs)
+
+        elif result.scheme == 'netcdf':
+            from file_publisher import NetcdfPublisher
+            return NetcdfPublisher(allowed, **kwargs)
+
+        elif result.scheme == 'parquet':
+            from file_publisher import ParquetPublisher
+            return ParquetPublisher(allowed, **kwargs)
         
         elif result.scheme == 'ingest':
             return IngestEnginePublisher(handler, allowed, **kwargs)
@@ -12,8 +12,14 @@ __license__ = 'Apache 2.0'
 
 from functools import partial
 
+import random
+
+import struct
+
 import re
-from mi.core.instrument.chunker import StringChunker
+import timeit
+from mi.core.checksum import byte_sum
+from mi.core.instrument.chunker import ChunkBuffer, FrameSieve, RegexSieve, StringChunker, TimestampIndex
 from mi.core.unit_test import MiUnitTestCase
 from mi.logging import log
 from nose.plugins.attrib import attr
@@ -88,6 +94,79 @@ class UnitTestStringChunker(MiUnitTestCase):
         self.assertEquals([(0,31), (33, 64)],
                           self._chunker.regex_sieve_function(self.MULTI_SAMPLE_1, [regex]))
 
+    def test_multi_regex_sieve(self):
+        """
+        Verify the single pass regex sieve finds the same chunks as the regex sieve
+        function, and reports which regex matched each chunk
+        """
+        par_regex = re.compile(r'SATPAR(?P<sernum>\d{4}),(?P<timer>\d{1,7}.\d\d),(?P<counts>\d{10}),(?P<checksum>\d{3})')
+        foo_regex = re.compile(r'Foo(\d{2})?')
+        bar_regex = re.compile(r'Ba(?P<letter>[rt])')
+        regex_list = [par_regex, foo_regex, bar_regex]
+        sieve = RegexSieve(regex_list)
+        data = "Foo%s\r\nBar%s\r\n%sBat%sFoo12" % (self.SAMPLE_1, self.SAMPLE_2, self.SAMPLE_3, self.FRAGMENT_SAMPLE)
+
+        expected = sorted(StringChunker.regex_sieve_function(data, regex_list))
+        self.assertEqual(sieve(data), expected)
+        self.assertEqual(sieve(data, 40), [span for span in expected if span[0] >= 40])
+
+        for start, end in expected:
+            regex, match = sieve.match(data[start:end])
+            self.assertTrue(regex.match(data[start:end]))
+            self.assertEqual(match.group(), data[start:end])
+
+        regex, match = sieve.match(self.SAMPLE_2)
+        self.assertIs(regex, par_regex)
+        self.assertEqual(match.group('checksum'), '222')
+        self.assertEqual(sieve.match('Bat')[1].group('letter'), 't')
+        self.assertEqual(sieve.match(self.FRAGMENT_1), (None, None))
+
+        # regexes with back references or differing flags are matched one at a time
+        for fallback in [RegexSieve([par_regex, re.compile(r'(Ba)\1')]),
+                         RegexSieve([par_regex, re.compile(r'bar', re.IGNORECASE)])]:
+            self.assertEqual(fallback(self.MULTI_SAMPLE_1), [(0, 31), (33, 64)])
+            self.assertEqual(fallback.match(self.SAMPLE_1)[0], par_regex)
+
+        chunker = StringChunker(sieve)
+        self.assertEqual(chunker.sieve_overlap, 37)
+        chunker.add_chunk(data, self.TIMESTAMP_1)
+        self.assertEqual([chunk for _, chunk in chunker.chunks], [data[start:end] for start, end in expected])
+
+    def test_frame_sieve(self):
+        """
+        Verify the frame sieve finds length prefixed records with valid checksums
+        """
+        def frame(payload):
+            record = '\x7f\x7f' + struct.pack('<H', len(payload) + 4) + payload
+            return record + struct.pack('<H', sum(bytearray(record)) & 0xffff)
+
+        sieve = FrameSieve('\x7f\x7f', '<H', length_adjust=2, checksum_format='<H', checksum_fn=byte_sum)
+        record_1 = frame(self.SAMPLE_1)
+        # sync bytes within a record are not the start of another record
+        record_2 = frame('\x7f\x7f\x06\x00' + '\xff' * 300)
+        corrupt = record_1[:10] + 'X' + record_1[11:]
+
+        data = 'Foo' + record_1 + '\x7f\x7f' + record_2 + corrupt + record_1 + record_2[:20]
+        first = 3
+        second = first + len(record_1) + 2
+        third = second + len(record_2) + len(corrupt)
+        self.assertEqual(sieve(data), [(first, first + len(record_1)),
+                                       (second, second + len(record_2)),
+                                       (third, third + len(record_1))])
+        self.assertEqual(sieve(data, second + 1), [(third, third + len(record_1))])
+        self.assertEqual(sieve(record_2[:-1]), [])
+        self.assertEqual(sieve(buffer(data), second + 1), [(third, third + len(record_1))])
+
+        # length in words, no checksum
+        sieve = FrameSieve('\xa5\x10', '<H', length_scale=2)
+        self.assertEqual(sieve('\x00\xa5\x10\x03\x00\x01\x02\xa5\x10\xff\xff'), [(1, 7)])
+
+        chunker = StringChunker(FrameSieve('\x7f\x7f', '<H', length_adjust=2, checksum_format='<H',
+                                           checksum_fn=byte_sum))
+        for index in xrange(0, len(data), 7):
+            chunker.add_chunk(data[index:index + 7], index)
+        self.assertEqual([chunk for _, chunk in chunker.chunks], [record_1, record_2, record_1])
+
     def test_make_chunks(self):
         sample_string = "Foo%sBar%sBat" % (self.SAMPLE_1, self.SAMPLE_2)
         self._chunker.add_chunk(sample_string, self.TIMESTAMP_1)
@@ -130,6 +209,15 @@ class UnitTestStringChunker(MiUnitTestCase):
         self.assertEqual(timestamps[0][1], 4)
         self.assertEqual(timestamps[0][2], self.TIMESTAMP_2)
 
+    def test_oversize_sample(self):
+        """
+        Test a sample which on its own exceeds the maximum buffer size
+        """
+        chunker = StringChunker(self.sieve_function, max_buff_size=len(self.SAMPLE_1) - 1)
+        chunker.add_chunk("BLEH", self.TIMESTAMP_1)
+        chunker.add_chunk(self.SAMPLE_2, self.TIMESTAMP_2)
+        self.assertEqual(chunker.get_next_data(), (self.TIMESTAMP_2, self.SAMPLE_2))
+
     def test_add_many_get_simple(self):
         """
         Add a few simple strings of data to the buffer, get the chunks out
@@ -195,8 +283,278 @@ class UnitTestStringChunker(MiUnitTestCase):
         self.assertEquals(result, "Foo")
         self.assertEquals(time, self.TIMESTAMP_1)
 
+    def test_sieve_view(self):
+        """
+        Verify sieves are handed a view of the buffer rather than a copy, starting
+        where the scan resumes when a sieve overlap is given
+        """
+        sieved = []
+
+        def recording_sieve(raw_data):
+            self.assertIsInstance(raw_data, buffer)
+            sieved.append(str(raw_data))
+            return self.sieve_function(raw_data)
+
+        chunker = StringChunker(recording_sieve)
+        chunker.add_chunk('Foo', self.TIMESTAMP_1)
+        chunker.add_chunk(self.SAMPLE_1, self.TIMESTAMP_2)
+        self.assertEqual(sieved, ['Foo', 'Foo' + self.SAMPLE_1])
+        self.assertEqual(chunker.get_next_data(), (self.TIMESTAMP_2, self.SAMPLE_1))
+
+        del sieved[:]
+        chunker = StringChunker(recording_sieve, sieve_overlap=3)
+        chunker.add_chunk('Foo' * 4, self.TIMESTAMP_1)
+        chunker.add_chunk('Bar', self.TIMESTAMP_2)
+        self.assertEqual(sieved, ['Foo' * 4, 'FooBar'])
+
     def test_overlap(self):
         self.assertEqual([(0, 5)], StringChunker._prune_overlaps([(0, 5)]))
         self.assertEqual([], StringChunker._prune_overlaps([]))
         self.assertEqual([(0, 5)], StringChunker._prune_overlaps([(0, 5), (3, 6)]))
         self.assertEqual([(0, 5), (5, 7)], StringChunker._prune_overlaps([(0, 5), (5, 7), (6, 8)]))
+
+    def test_regex_sieve_overlap(self):
+        """
+        Verify the sieve overlap derived from regexes
+        """
+        bounded = re.compile(r'SATPAR(?P<sernum>\d{4}),(?P<timer>\d{1,7}.\d\d),(?P<counts>\d{10}),(?P<checksum>\d{1,3})')
+        unbounded = re.compile(r'SATPAR.*?\r\n')
+        lookahead = re.compile(r'SATPAR\d{4}(?=\r\n)')
+
+        self.assertEqual(StringChunker.regex_sieve_overlap([bounded]), 37)
+        self.assertEqual(StringChunker.regex_sieve_overlap([bounded, re.compile('AB')]), 37)
+        self.assertIsNone(StringChunker.regex_sieve_overlap([bounded, unbounded]))
+        self.assertIsNone(StringChunker.regex_sieve_overlap([lookahead]))
+        self.assertIsNone(StringChunker.regex_sieve_overlap([]))
+
+        chunker = StringChunker(partial(StringChunker.regex_sieve_function, regex_list=[bounded]))
+        self.assertEqual(chunker.sieve_overlap, 37)
+        chunker = StringChunker(partial(StringChunker.regex_sieve_function, regex_list=[unbounded]))
+        self.assertIsNone(chunker.sieve_overlap)
+
+    def test_resumable_sieve(self):
+        """
+        Feed samples a byte at a time through a resumable chunker, verify the
+        results match the full scan chunker
+        """
+        data = "Foo%s\r\nBar%s\r\n%sBat%s" % (self.SAMPLE_1, self.SAMPLE_2, self.SAMPLE_3, self.FRAGMENT_SAMPLE)
+        pattern = r'SATPAR(?P<sernum>\d{4}),(?P<timer>\d{1,7}.\d\d),(?P<counts>\d{10}),(?P<checksum>\d{1,3})'
+        regex = re.compile(pattern)
+
+        chunkers = [
+            StringChunker(self.sieve_function),
+            StringChunker(self.sieve_function, sieve_overlap=38),
+            StringChunker(partial(StringChunker.regex_sieve_function, regex_list=[regex])),
+            StringChunker(RegexSieve([regex])),
+        ]
+
+        for index, char in enumerate(data):
+            for chunker in chunkers:
+                chunker.add_chunk(char, index)
+
+        expected = chunkers[0].chunks
+        self.assertEqual(len(expected), 4)
+        for chunker in chunkers[1:]:
+            self.assertEqual(chunker.chunks, expected)
+            self.assertEqual(chunker.buffer, chunkers[0].buffer)
+
+    def test_resumable_sieve_truncate(self):
+        """
+        Verify the resumable sieve still finds data after the buffer is truncated
+        """
+        chunker = StringChunker(self.sieve_function, max_buff_size=40, sieve_overlap=38)
+        for char in 'X' * 100:
+            chunker.add_chunk(char, self.TIMESTAMP_1)
+        chunker.add_chunk(self.SAMPLE_1, self.TIMESTAMP_1)
+
+        self.assertEqual(chunker.get_next_data(), (self.TIMESTAMP_1, self.SAMPLE_1))
+
+        chunker.clean()
+        chunker.add_chunk(self.SAMPLE_2, self.TIMESTAMP_2)
+        self.assertEqual(chunker.get_next_data(), (self.TIMESTAMP_2, self.SAMPLE_2))
+
+    def test_resumable_sieve_rate(self):
+        """
+        Feed unmatched data a few bytes at a time with increasing buffer sizes. The
+        bytes scanned per byte added should stay flat with the resumable sieve and
+        grow with the buffer size without it.
+        """
+        scanned = []
+
+        def counting_sieve(raw_data):
+            scanned.append(len(raw_data))
+            return self.sieve_function(raw_data)
+
+        def feed(chunker, size):
+            for _ in xrange(size / 4):
+                chunker.add_chunk('ABCD', self.TIMESTAMP_1)
+
+        for max_buff_size in [512, 2048, 8192]:
+            for overlap in [None, 37]:
+                del scanned[:]
+                chunker = StringChunker(counting_sieve, max_buff_size=max_buff_size, sieve_overlap=overlap)
+                elapsed = timeit.timeit(partial(feed, chunker, max_buff_size), number=1)
+                per_byte = float(sum(scanned)) / max_buff_size
+                log.info('max_buff_size: %d overlap: %r bytes scanned per byte: %.2f elapsed: %.4f',
+                         max_buff_size, overlap, per_byte, elapsed)
+
+                if overlap is None:
+                    self.assertGreater(per_byte, max_buff_size / 16)
+                else:
+                    self.assertLess(per_byte, 11)
+
+    def test_timestamp_index(self):
+        """
+        Verify timestamp lookups and rebasing in the timestamp index
+        """
+        index = TimestampIndex()
+        index.append(4, self.TIMESTAMP_1)
+        index.append(0, self.TIMESTAMP_2)
+        index.append(6, self.TIMESTAMP_3)
+
+        self.assertEqual(list(index), [(0, 4, self.TIMESTAMP_1),
+                                       (4, 4, self.TIMESTAMP_2),
+                                       (4, 10, self.TIMESTAMP_3)])
+        self.assertEqual(index.find(0), self.TIMESTAMP_1)
+        self.assertEqual(index.find(3), self.TIMESTAMP_1)
+        self.assertEqual(index.find(4), self.TIMESTAMP_3)
+        self.assertIsNone(index.find(10))
+
+        index.rebase(2)
+        self.assertEqual(len(index), 3)
+        self.assertEqual(index[0], (0, 2, self.TIMESTAMP_1))
+        self.assertEqual(index[-1], (2, 8, self.TIMESTAMP_3))
+        self.assertEqual(index.find(1), self.TIMESTAMP_1)
+
+        index.rebase(4)
+        self.assertEqual(list(index), [(0, 4, self.TIMESTAMP_3)])
+        self.assertEqual(index.find(0), self.TIMESTAMP_3)
+
+        index.append(5, self.TIMESTAMP_1)
+        self.assertEqual(index[1], (4, 9, self.TIMESTAMP_1))
+        index.rebase(9)
+        self.assertEqual(len(index), 0)
+        self.assertIsNone(index.find(0))
+
+        index.append(3, self.TIMESTAMP_2)
+        self.assertEqual(list(index), [(0, 3, self.TIMESTAMP_2)])
+
+        index.clear()
+        self.assertEqual(len(index), 0)
+
+    def test_timestamp_index_truncate(self):
+        """
+        Rebasing past the end of the stored blocks, as when an oversize add is
+        truncated, starts the offsets afresh for the blocks added after it
+        """
+        index = TimestampIndex()
+        index.append(4, self.TIMESTAMP_1)
+        index.append(3, self.TIMESTAMP_2)
+
+        index.rebase(10)
+        self.assertEqual(len(index), 0)
+        self.assertIsNone(index.find(0))
+
+        index.append(3, self.TIMESTAMP_3)
+        index.append(2, self.TIMESTAMP_1)
+        self.assertEqual(list(index), [(0, 3, self.TIMESTAMP_3), (3, 5, self.TIMESTAMP_1)])
+        self.assertEqual(index.find(0), self.TIMESTAMP_3)
+        self.assertEqual(index.find(3), self.TIMESTAMP_1)
+
+        index.rebase(3)
+        self.assertEqual(list(index), [(0, 2, self.TIMESTAMP_1)])
+
+    def test_many_fragments(self):
+        """
+        Feed samples in several fragments each, verify each chunk gets the timestamp
+        of the fragment it started in
+        """
+        for count in xrange(200):
+            sample = self.SAMPLE_1 if count % 2 == 0 else self.SAMPLE_2
+            self._chunker.add_chunk('\r\n' + sample[:10], float(count))
+            self._chunker.add_chunk(sample[10:20], float(count) + 0.1)
+            self._chunker.add_chunk(sample[20:], float(count) + 0.2)
+
+        self.assertEqual(len(self._chunker.chunks), 200)
+        for count, (timestamp, chunk) in enumerate(self._chunker.chunks):
+            self.assertEqual(chunk, self.SAMPLE_1 if count % 2 == 0 else self.SAMPLE_2)
+            self.assertEqual(timestamp, float(count))
+
+    def test_chunk_buffer(self):
+        """
+        Verify appending, pruning and slicing the chunk buffer
+        """
+        chunk_buffer = ChunkBuffer()
+        self.assertEqual(chunk_buffer, '')
+
+        chunk_buffer.append(self.SAMPLE_1)
+        chunk_buffer.append(self.SAMPLE_2)
+        self.assertEqual(len(chunk_buffer), 62)
+        self.assertEqual(chunk_buffer, self.SAMPLE_1 + self.SAMPLE_2)
+        self.assertEqual(chunk_buffer[31:], self.SAMPLE_2)
+        self.assertEqual(chunk_buffer[:6], 'SATPAR')
+
+        chunk_buffer.prune(10)
+        self.assertEqual(chunk_buffer, self.SAMPLE_1[10:] + self.SAMPLE_2)
+        self.assertEqual(chunk_buffer[0], ',')
+        self.assertEqual(str(chunk_buffer.view(21)), self.SAMPLE_2)
+
+        regex = re.compile(r'SATPAR\d{4}')
+        self.assertEqual([match.span() for match in regex.finditer(chunk_buffer.view())], [(21, 31)])
+
+        # prune past the midpoint to compact the storage
+        chunk_buffer.prune(30)
+        self.assertEqual(chunk_buffer, self.SAMPLE_2[9:])
+        chunk_buffer.append(self.SAMPLE_3)
+        self.assertEqual(chunk_buffer, self.SAMPLE_2[9:] + self.SAMPLE_3)
+
+        chunk_buffer.prune(100)
+        self.assertEqual(len(chunk_buffer), 0)
+
+        chunk_buffer.append(self.SAMPLE_1)
+        chunk_buffer.clear()
+        self.assertEqual(chunk_buffer, '')
+
+    def test_chunker_throughput(self):
+        """
+        Replay a stream of samples split into port agent sized packets through the
+        chunker and report the throughput, along with the throughput of the buffer
+        operations using a string buffer and the chunk buffer.
+        """
+        random.seed(1)
+        data = ''.join(random.choice([self.SAMPLE_1, self.SAMPLE_2, self.SAMPLE_3]) + '\r\n'
+                       for _ in xrange(10000))
+        packets = []
+        index = 0
+        while index < len(data):
+            size = random.randint(1, 64)
+            packets.append(data[index:index + size])
+            index += size
+
+        megabytes = len(data) / 1e6
+        pattern = r'SATPAR(?P<sernum>\d{4}),(?P<timer>\d{1,7}.\d\d),(?P<counts>\d{10}),(?P<checksum>\d{3})'
+        regex = re.compile(pattern)
+
+        def replay():
+            chunker = StringChunker(partial(StringChunker.regex_sieve_function, regex_list=[regex]))
+            for packet in packets:
+                chunker.add_chunk(packet, self.TIMESTAMP_1)
+            return chunker
+
+        def string_buffer():
+            string = ''
+            for packet in packets:
+                string += packet
+                string = string[len(packet) / 2:]
+
+        def chunk_buffer():
+            chunk_buffer = ChunkBuffer()
+            for packet in packets:
+                chunk_buffer.append(packet)
+                chunk_buffer.prune(len(packet) / 2)
+
+        self.assertEqual(len(replay().chunks), 10000)
+
+        for name, function in [('chunker', replay), ('string buffer', string_buffer), ('chunk buffer', chunk_buffer)]:
+            elapsed = timeit.timeit(function, number=1)
+            log.info('%s throughput: %.2f MB/s', name, megabytes / elapsed)
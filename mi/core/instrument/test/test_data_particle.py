@@ -232,3 +232,76 @@ class TestUnitDataParticle(MiUnitTestCase):
 
         with self.assertRaises(NotImplementedException):
             particle.data_particle_type()
+
+    def test_contents(self):
+        """
+        Test the header mapping view on the particle slots
+        """
+        particle = self.TestDataParticle(self.sample_raw_data,
+                                         port_timestamp=self.sample_port_timestamp,
+                                         quality_flag=DataParticleValue.INVALID,
+                                         preferred_timestamp=DataParticleKey.DRIVER_TIMESTAMP)
+        contents = particle.contents
+        self.assertEqual(contents[DataParticleKey.PKT_VERSION], TEST_PARTICLE_VERSION)
+        self.assertEqual(contents[DataParticleKey.PORT_TIMESTAMP], self.sample_port_timestamp)
+        self.assertIsNone(contents[DataParticleKey.INTERNAL_TIMESTAMP])
+        self.assertNotIn(DataParticleKey.NEW_SEQUENCE, contents)
+        self.assertEqual(len(contents), 7)
+
+        contents[DataParticleKey.QUALITY_FLAG] = DataParticleValue.CHECKSUM_FAILED
+        self.assertEqual(particle.generate_dict()[DataParticleKey.QUALITY_FLAG], DataParticleValue.CHECKSUM_FAILED)
+
+        contents[DataParticleKey.NEW_SEQUENCE] = True
+        self.assertTrue(particle.contents[DataParticleKey.NEW_SEQUENCE])
+        del contents[DataParticleKey.NEW_SEQUENCE]
+        self.assertNotIn(DataParticleKey.NEW_SEQUENCE, particle.generate_dict())
+
+        self.assertRaises(KeyError, contents.__delitem__, DataParticleKey.QUALITY_FLAG)
+        self.assertRaises(KeyError, contents.__getitem__, "extra_key")
+        self.assertFalse(hasattr(self.raw_test_particle, '__dict__'))
+
+    def test_contents_extra_keys(self):
+        """
+        Test writing keys which are not held in slots, or the constant fields, to the header mapping
+        """
+        particle = self.TestDataParticle(self.sample_raw_data,
+                                         preferred_timestamp=DataParticleKey.DRIVER_TIMESTAMP)
+        particle.contents["extra_key"] = 1
+        particle.contents[DataParticleKey.PKT_VERSION] = 2
+        self.assertEqual(particle.contents["extra_key"], 1)
+        self.assertEqual(len(particle.contents), 8)
+
+        result = particle.generate_dict()
+        self.assertEqual(result["extra_key"], 1)
+        self.assertEqual(result[DataParticleKey.PKT_VERSION], 2)
+        self.assertEqual(result[DataParticleKey.PKT_FORMAT_ID], DataParticleValue.JSON_DATA)
+
+        del particle.contents["extra_key"]
+        self.assertNotIn("extra_key", particle.generate_dict())
+        self.assertRaises(KeyError, particle.contents.__delitem__, "extra_key")
+
+        # other particles still share the constant fields
+        particle = self.TestDataParticle(self.sample_raw_data)
+        self.assertEqual(particle.contents[DataParticleKey.PKT_VERSION], TEST_PARTICLE_VERSION)
+        self.assertNotIn("extra_key", particle.contents)
+
+    def test_schema(self):
+        """
+        Test a particle declaring its values with _schema
+        """
+        class SchemaDataParticle(DataParticle):
+            __slots__ = ()
+            _data_particle_type = TEST_PARTICLE_TYPE
+            _schema = (('temp', str), ('cond', str), ('depth', str))
+
+        particle = SchemaDataParticle(('23.45', '15.9', '305.16'),
+                                      port_timestamp=self.sample_port_timestamp,
+                                      quality_flag=DataParticleValue.INVALID,
+                                      preferred_timestamp=DataParticleKey.DRIVER_TIMESTAMP)
+        particle.contents[DataParticleKey.DRIVER_TIMESTAMP] = self.sample_driver_timestamp
+        self.assertFalse(hasattr(particle, '__dict__'))
+        self.assertEqual(particle.generate_dict(), self.sample_parsed_particle)
+
+        particle = SchemaDataParticle(('23.45', '15.9'),
+                                      preferred_timestamp=DataParticleKey.DRIVER_TIMESTAMP)
+        self.assertRaises(SampleException, particle.generate_dict)
@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+
+"""
+@package mi.core.instrument.test.test_dataset_chunker
+@file mi/core/instrument/test/test_dataset_chunker.py
+@brief Test cases for the dataset chunker module
+"""
+
+__license__ = 'Apache 2.0'
+
+import re
+from functools import partial
+
+from nose.plugins.attrib import attr
+
+from mi.core.exceptions import SampleException
+from mi.core.instrument.dataset_chunker import ChunkIndex, Chunker, StringChunker
+from mi.core.unit_test import MiUnitTestCase
+
+
+@attr('UNIT', group='mi')
+class UnitTestDatasetChunker(MiUnitTestCase):
+    """
+    Test the chunk index and the string chunker built on it
+    """
+    SAMPLE_1 = "SATPAR0229,10.01,2206748111,111"
+    SAMPLE_2 = "SATPAR0229,10.02,2206748222,222"
+
+    FRAGMENT_1 = "SATPAR0229,10.01,"
+    FRAGMENT_2 = "2206748544,123"
+
+    TIMESTAMP_1 = 3569168821.102485
+    TIMESTAMP_2 = 3569168822.202485
+    TIMESTAMP_3 = 3569168823.302485
+
+    def setUp(self):
+        regex = re.compile(r'SATPAR\d{4},\d{1,7}.\d\d,\d{10},\d{1,3}')
+        self._chunker = StringChunker(partial(Chunker.regex_sieve_function, regex_list=[regex]))
+
+    def test_chunk_index(self):
+        """
+        Verify appending, removing, splicing and rebasing chunks
+        """
+        index = ChunkIndex()
+        index.append(0, 4, self.TIMESTAMP_1)
+        index.append(6, 10, self.TIMESTAMP_2)
+        index.append(12, 20, self.TIMESTAMP_3)
+        self.assertEqual(len(index), 3)
+        self.assertEqual(index[-1], (12, 20, self.TIMESTAMP_3))
+
+        index.remove_start(6)
+        self.assertEqual(list(index), [(0, 4, self.TIMESTAMP_1), (12, 20, self.TIMESTAMP_3)])
+
+        # the first chunk ending at or after the new one is extended, later ones are replaced
+        index.splice([(10, 22, self.TIMESTAMP_2), (25, 30, self.TIMESTAMP_2)])
+        self.assertEqual(list(index), [(0, 4, self.TIMESTAMP_1), (12, 22, self.TIMESTAMP_3),
+                                       (25, 30, self.TIMESTAMP_2)])
+
+        # a chunk cut by the rebase starts at 0
+        index.rebase(15)
+        self.assertEqual(list(index), [(0, 7, self.TIMESTAMP_3), (10, 15, self.TIMESTAMP_2)])
+        index.remove_start(0)
+        self.assertEqual(index.popleft(), (10, 15, self.TIMESTAMP_2))
+        self.assertEqual(len(index), 0)
+
+        # empty chunks at the rebase index are kept
+        index.append(3, 3, self.TIMESTAMP_1)
+        index.rebase(3)
+        self.assertEqual(list(index), [(0, 0, self.TIMESTAMP_1)])
+        index.rebase(1)
+        self.assertEqual(len(index), 0)
+
+    def test_fragment(self):
+        """
+        A fragment is non-data until it is completed
+        """
+        self._chunker.add_chunk('junk' + self.FRAGMENT_1, self.TIMESTAMP_1)
+        self.assertEqual(list(self._chunker.nondata_chunk_list), [(0, 21, self.TIMESTAMP_1)])
+
+        self._chunker.add_chunk(self.FRAGMENT_2 + self.SAMPLE_2 + 'more', self.TIMESTAMP_2)
+        self.assertEqual(self._chunker.get_next_non_data_with_index(clean=False),
+                         (self.TIMESTAMP_1, 'junk', 0, 4))
+        self.assertEqual(self._chunker.get_next_data_with_index(),
+                         (self.TIMESTAMP_1, self.FRAGMENT_1 + self.FRAGMENT_2, 4, 35))
+        self.assertEqual(self._chunker.get_next_non_data(), (None, None))
+        self.assertEqual(self._chunker.get_next_data(), (self.TIMESTAMP_2, self.SAMPLE_2))
+        self.assertEqual(self._chunker.get_next_data(), (None, None))
+
+    def test_clean(self):
+        """
+        Taking non-data rebases the data after it, cleaning all chunks empties the buffer
+        """
+        self._chunker.add_chunk('ab' + self.SAMPLE_1 + 'cd' + self.SAMPLE_2 + 'ef', self.TIMESTAMP_1)
+        self.assertEqual(self._chunker.get_next_non_data(), (self.TIMESTAMP_1, 'ab'))
+        self.assertEqual(self._chunker.get_next_data_with_index(clean=False),
+                         (self.TIMESTAMP_1, self.SAMPLE_1, 0, len(self.SAMPLE_1)))
+        self.assertEqual(self._chunker.get_next_non_data_with_index(),
+                         (self.TIMESTAMP_1, 'cd', len(self.SAMPLE_1), len(self.SAMPLE_1) + 2))
+        self.assertEqual(self._chunker.get_next_data_with_index(),
+                         (self.TIMESTAMP_1, self.SAMPLE_2, 0, len(self.SAMPLE_2)))
+
+        self._chunker.add_chunk(self.SAMPLE_1, self.TIMESTAMP_2)
+        self._chunker.clean_all_chunks()
+        self.assertEqual(len(self._chunker.buffer), 0)
+        self.assertEqual(self._chunker.get_next_data(), (None, None))
+        self.assertEqual(self._chunker.get_next_non_data(), (None, None))
+        self.assertEqual(self._chunker.get_next_raw(), (None, None))
+
+    def test_overlap(self):
+        """
+        Overlapping blocks from the sieve are rejected
+        """
+        chunker = StringChunker(lambda raw_data: [(0, 4), (2, 6)])
+        self.assertRaises(SampleException, chunker.add_chunk, 'abcdefgh', self.TIMESTAMP_1)
@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+
+"""
+@package mi.core.instrument.test.test_dataset_data_particle
+@file mi/core/instrument/test/test_dataset_data_particle.py
+@brief Test cases for the dataset data_particle module
+"""
+
+__license__ = 'Apache 2.0'
+
+import threading
+import time
+import timeit
+
+import ntplib
+from nose.plugins.attrib import attr
+
+from mi.core.instrument.dataset_data_particle import DataParticle, DataParticleKey, ParticleBatch
+from mi.core.log import get_logger
+from mi.core.unit_test import MiUnitTestCase
+
+log = get_logger()
+
+
+class BatchTestParticle(DataParticle):
+    __slots__ = ()
+    _data_particle_type = 'test_particle_foo'
+    _schema = (('temp', float),)
+
+
+@attr('UNIT', group='mi')
+class TestParticleBatch(MiUnitTestCase):
+    """
+    Test particles constructed inside and outside of a ParticleBatch
+    """
+    def make_particle(self):
+        return BatchTestParticle(('23.45',), preferred_timestamp=DataParticleKey.DRIVER_TIMESTAMP)
+
+    def test_batch_driver_timestamp(self):
+        """
+        All particles in a batch share the batch driver timestamp
+        """
+        with ParticleBatch(unix_time=1000.0) as batch:
+            self.assertIs(ParticleBatch.current(), batch)
+            particles = [self.make_particle() for _ in xrange(5)]
+
+        self.assertIsNone(ParticleBatch.current())
+        for particle in particles:
+            self.assertEqual(particle.get_value(DataParticleKey.DRIVER_TIMESTAMP),
+                             ntplib.system_to_ntp_time(1000.0))
+
+        before = ntplib.system_to_ntp_time(time.time())
+        particle = self.make_particle()
+        self.assertGreaterEqual(particle.get_value(DataParticleKey.DRIVER_TIMESTAMP), before)
+
+    def test_nested_batch(self):
+        """
+        The innermost batch applies and the outer batch is restored on exit
+        """
+        with ParticleBatch(unix_time=1000.0) as outer:
+            with ParticleBatch(unix_time=2000.0):
+                inner_particle = self.make_particle()
+            self.assertIs(ParticleBatch.current(), outer)
+            outer_particle = self.make_particle()
+
+        self.assertEqual(inner_particle.get_value(DataParticleKey.DRIVER_TIMESTAMP),
+                         ntplib.system_to_ntp_time(2000.0))
+        self.assertEqual(outer_particle.get_value(DataParticleKey.DRIVER_TIMESTAMP),
+                         ntplib.system_to_ntp_time(1000.0))
+
+    def test_batch_thread_local(self):
+        """
+        A batch on one thread does not affect particles built on another
+        """
+        result = []
+        with ParticleBatch(unix_time=1000.0):
+            thread = threading.Thread(target=lambda: result.append(ParticleBatch.current()))
+            thread.start()
+            thread.join()
+        self.assertEqual(result, [None])
+
+    def test_batch_timestamp_check(self):
+        """
+        Timestamps are checked against the batch bound
+        """
+        with ParticleBatch(unix_time=1000.0):
+            particle = self.make_particle()
+            particle.set_value(DataParticleKey.INTERNAL_TIMESTAMP, ntplib.system_to_ntp_time(2000.0))
+            self.assertFalse(particle._check_timestamp(ntplib.system_to_ntp_time(1000.0 + 86400 * 366)))
+
+        self.assertTrue(particle._check_timestamp(ntplib.system_to_ntp_time(1000.0 + 86400 * 366)))
+
+    def test_batch_rate(self):
+        """
+        Log the particle construction rate with and without a batch
+        """
+        count = 100000
+        elapsed = timeit.timeit(self.make_particle, number=count)
+        log.info('unbatched particles: %.0f/s', count / elapsed)
+        with ParticleBatch():
+            elapsed = timeit.timeit(self.make_particle, number=count)
+        log.info('batched particles: %.0f/s', count / elapsed)
@@ -0,0 +1,218 @@
+#!/usr/bin/env python
+
+"""
+@package mi.core.instrument.test.test_particle_columns
+@file mi/core/instrument/test/test_particle_columns.py
+@brief Test cases for the columnar particle store and the chunked writers
+"""
+
+__license__ = 'Apache 2.0'
+
+import os
+import pickle
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+from nose.plugins.attrib import attr
+
+from mi.core.instrument.chunked_writer import NetcdfWriter, ParquetWriter, StreamWriters
+from mi.core.instrument.particle_columns import Column, StreamColumns
+from mi.core.unit_test import MiUnitTestCase
+
+
+def make_sample(index, **extra):
+    values = [{'value_id': 'count', 'value': index},
+              {'value_id': 'spectrum', 'value': [index, index + 1, index + 2]}]
+    values.extend({'value_id': key, 'value': value} for key, value in extra.iteritems())
+    return {'stream_name': 'test_stream', 'internal_timestamp': 3.6e9 + index, 'values': values}
+
+
+def fix_arrays(data_frame):
+    """
+    The dataset parse_file built from a DataFrame of flattened particles before the columnar store was added
+    """
+    new_ds = xr.Dataset()
+    for each in data_frame:
+        if data_frame[each].dtype == 'object' and isinstance(data_frame[each].values[0], list):
+            data = np.array([np.array(x) for x in data_frame[each].values])
+            new_ds[each] = xr.DataArray(data)
+        else:
+            new_ds[each] = data_frame[each]
+    return new_ds
+
+
+def flatten(sample):
+    record = dict(sample)
+    for each in record.pop('values'):
+        record[each['value_id']] = each['value']
+    return record
+
+
+@attr('UNIT', group='mi')
+class TestParticleColumns(MiUnitTestCase):
+    """
+    Test typed column storage of particle values
+    """
+    def test_column_types(self):
+        column = Column()
+        for row, value in enumerate([1, 2, 3]):
+            column.set(row, value)
+        self.assertEqual(column.values().dtype, np.int64)
+
+        # int widens to float, then to object
+        column.set(3, 4.5)
+        self.assertEqual(column.values().tolist(), [1.0, 2.0, 3.0, 4.5])
+        column.set(4, 'x')
+        self.assertEqual(column.values().tolist(), [1, 2, 3, 4.5, 'x'])
+
+        column = Column()
+        column.set(0, [1, 2])
+        column.set(1, [3, 4])
+        self.assertEqual(column.values().shape, (2, 2))
+        column.set(2, [5])
+        self.assertEqual(column.values().tolist(), [[1, 2], [3, 4], [5]])
+
+    def test_column_growth(self):
+        # a later convert batch widens the rows already stored, across several capacity increases
+        column = Column()
+        for row in xrange(3000):
+            column.set(row, row)
+        column.set(3000, 0.5)
+        values = column.values()
+        self.assertEqual(values.dtype, np.float64)
+        self.assertEqual(values[[0, 2999, 3000]].tolist(), [0.0, 2999.0, 0.5])
+
+        column = Column()
+        for row in xrange(3000):
+            column.set(row, [row, row])
+        column.set(3000, [0.5, 1.5])
+        values = column.values()
+        self.assertEqual(values.shape, (3001, 2))
+        self.assertEqual(values.dtype, np.float64)
+        self.assertEqual(values[[0, 3000]].tolist(), [[0.0, 0.0], [0.5, 1.5]])
+
+    def test_missing_values(self):
+        column = Column()
+        column.set(1, 5)
+        column.set(2, None)
+        self.assertEqual(column.tolist(4), [None, 5, None, None])
+        values = column.values(4)
+        self.assertEqual(values.dtype, np.float64)
+        self.assertEqual(np.isnan(values).tolist(), [True, False, True, True])
+        masked = column.values(4, masked=True)
+        self.assertEqual(masked.dtype, np.int64)
+        self.assertEqual(masked.mask.tolist(), [True, False, True, True])
+
+        column = Column()
+        column.set(0, [1, 2])
+        column.set(2, [3, 4])
+        self.assertEqual(column.values(masked=True).mask.tolist(), [[False, False], [True, True], [False, False]])
+
+    def test_stream_columns(self):
+        stream = StreamColumns()
+        for index in xrange(3000):
+            stream.append(make_sample(index))
+        stream.append(make_sample(3000, extra='a'))
+        stream.append(make_sample(3001, extra=None))
+
+        dataset = stream.to_dataset()
+        self.assertEqual(dict(dataset.dims), {'dim_0': 3002, 'dim_1': 3})
+        self.assertEqual(dataset.spectrum.dims, ('dim_0', 'dim_1'))
+        self.assertEqual(dataset.spectrum.values[2999].tolist(), [2999, 3000, 3001])
+        self.assertEqual(dataset['count'].dtype, np.int64)
+        self.assertEqual(dataset.extra.values[[0, 3000, 3001]].tolist(), [None, 'a', None])
+
+        records = list(stream.iter_records())
+        self.assertEqual(records[3000], {'stream_name': 'test_stream', 'internal_timestamp': 3.6e9 + 3000,
+                                         'count': 3000, 'spectrum': [3000, 3001, 3002], 'extra': 'a'})
+        # records only have the keys the particle had, a None value is kept
+        self.assertNotIn('extra', records[0])
+        self.assertEqual(records[3001]['extra'], None)
+
+    def test_extend_pickle(self):
+        first = StreamColumns()
+        first.append(make_sample(0))
+        second = StreamColumns()
+        second.append(make_sample(1, extra=1.5))
+        second.append(make_sample(2))
+        second = pickle.loads(pickle.dumps(second, -1))
+
+        first.extend(second)
+        self.assertEqual(first.size, 3)
+        self.assertEqual(first.columns['count'].tolist(), [0, 1, 2])
+        self.assertEqual(first.columns['extra'].tolist(3), [None, 1.5, None])
+        self.assertEqual(first.columns['extra'].present(3).tolist(), [False, True, False])
+        self.assertEqual(first.columns['spectrum'].values().tolist(), [[0, 1, 2], [1, 2, 3], [2, 3, 4]])
+
+    def test_matches_data_frame(self):
+        samples = [make_sample(index, temperature=index * 0.5, serial='SN%d' % index) for index in xrange(2500)]
+        samples.append(make_sample(2500))
+        stream = StreamColumns()
+        for sample in samples:
+            stream.append(sample)
+        expected = fix_arrays(pd.DataFrame([flatten(sample) for sample in samples]))
+
+        dataset = stream.to_dataset()
+        self.assertEqual(sorted(dataset.data_vars), sorted(expected.data_vars))
+        for name in expected.data_vars:
+            self.assertEqual(dataset[name].dims, expected[name].dims, name)
+            self.assertEqual(dataset[name].dtype, expected[name].dtype, name)
+        self.assertEqual(dataset.spectrum.values.tolist(), expected.spectrum.values.tolist())
+        self.assertTrue(np.isnan(dataset.temperature.values[2500]))
+
+        self.assertTrue(dataset.to_dataframe().equals(expected.to_dataframe()))
+        self.assertEqual(dataset.to_dataframe().to_csv(), expected.to_dataframe().to_csv())
+
+
+@attr('UNIT', group='mi')
+class TestChunkedWriter(MiUnitTestCase):
+    """
+    Write streams in several row groups and read them back
+    """
+    def setUp(self):
+        self.output_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.output_path)
+
+    def write_stream(self, writer_class, count=2500, row_group_size=1000):
+        samples = {}
+        writers = StreamWriters(writer_class, self.output_path, row_group_size)
+        for index in xrange(count):
+            if index == count - 1:
+                sample = make_sample(index, extra='last', flag=True)
+            else:
+                sample = make_sample(index)
+            samples.setdefault('test_stream', StreamColumns()).append(sample)
+            writers.flush(samples, 'test_stream')
+            # full row groups are written out as they fill
+            self.assertLess(samples['test_stream'].size, row_group_size)
+        writers.close(samples)
+        return os.path.join(self.output_path, 'test_stream.%s' % writer_class.extension)
+
+    def test_netcdf(self):
+        import netCDF4
+        with netCDF4.Dataset(self.write_stream(NetcdfWriter)) as dataset:
+            self.assertEqual(len(dataset.dimensions['dim_0']), 2500)
+            self.assertEqual(dataset.variables['spectrum'].dimensions, ('dim_0', 'dim_1'))
+            self.assertEqual(dataset.variables['count'][:].tolist(), range(2500))
+            self.assertEqual(dataset.variables['spectrum'][1234].tolist(), [1234, 1235, 1236])
+            self.assertEqual(dataset.variables['stream_name'][0], 'test_stream')
+            # parameters first seen in the last row group are empty or masked before it
+            extra = dataset.variables['extra'][:]
+            self.assertEqual((extra[0], extra[-1]), ('', 'last'))
+            flag = dataset.variables['flag'][:]
+            self.assertTrue(flag.mask[0])
+            self.assertEqual(flag[-1], 1)
+
+    def test_parquet(self):
+        import pyarrow.parquet
+        file_path = self.write_stream(ParquetWriter, count=2000)
+        parquet_file = pyarrow.parquet.ParquetFile(file_path)
+        self.assertEqual(parquet_file.num_row_groups, 2)
+
+        table = pyarrow.parquet.read_table(file_path, columns=['count', 'spectrum'])
+        self.assertEqual(table.column_names, ['count', 'spectrum'])
+        self.assertEqual(table.column('count').to_pylist(), range(2000))
+        self.assertEqual(table.column('spectrum').to_pylist()[1234], [1234, 1235, 1236])
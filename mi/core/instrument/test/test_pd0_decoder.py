@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+
+"""
+@package mi.core.instrument.test.test_pd0_decoder
+@file mi/core/instrument/test/test_pd0_decoder.py
+@brief Test cases for the PD0 ensemble decoder
+"""
+
+__license__ = 'Apache 2.0'
+
+import struct
+
+import numpy as np
+from nose.plugins.attrib import attr
+
+from mi.core.instrument.pd0_decoder import AdcpPd0Record, BadHeaderException, BlockId, ChecksumException, \
+    HeaderScanner, InsufficientDataException, LEADER_BLOCKS, decode_ensembles
+from mi.core.unit_test import MiUnitTestCase
+
+
+def make_ensemble(number, cells=3, block_ids=None):
+    """
+    Ensemble with zeroed leaders apart from the block ids, number of cells and ensemble number. Cell values are
+    derived from the ensemble number, cell and beam.
+    """
+    if block_ids is None:
+        block_ids = [BlockId.FIXED_DATA, BlockId.VARIABLE_DATA, BlockId.VELOCITY_DATA, BlockId.CORRELATION_DATA,
+                     BlockId.ECHO_INTENSITY_DATA, BlockId.PERCENT_GOOD_DATA]
+    blocks = []
+    for block_id in block_ids:
+        if block_id in LEADER_BLOCKS:
+            block = bytearray(LEADER_BLOCKS[block_id][2].itemsize)
+            block[:2] = struct.pack('<H', block_id)
+            if block_id == BlockId.FIXED_DATA:
+                block[8:10] = [4, cells]
+            elif block_id == BlockId.VARIABLE_DATA:
+                block[2:4] = struct.pack('<H', number)
+        else:
+            fmt = 'h' if block_id == BlockId.VELOCITY_DATA else 'B'
+            values = [(number + cell * 4 + beam) % 100 for cell in range(cells) for beam in range(4)]
+            block = bytearray(struct.pack('<H%d%s' % (len(values), fmt), block_id, *values))
+        blocks.append(block)
+
+    offset = 6 + 2 * len(blocks)
+    offsets = []
+    for block in blocks:
+        offsets.append(offset)
+        offset += len(block)
+
+    ensemble = bytearray(struct.pack('<BBHBB%dH' % len(blocks), 0x7f, 0x7f, offset, 0, len(blocks), *offsets))
+    for block in blocks:
+        ensemble += block
+    ensemble += struct.pack('<H', sum(ensemble) & 0xFFFF)
+    return str(ensemble)
+
+
+def to_array(data):
+    return np.frombuffer(data, np.uint8)
+
+
+@attr('UNIT', group='mi')
+class TestPd0Decoder(MiUnitTestCase):
+    """
+    Test decoding runs of PD0 ensembles
+    """
+    def test_decode_run(self):
+        data = ''.join(make_ensemble(number) for number in range(5))
+        ensembles = decode_ensembles(to_array(data))
+        self.assertEqual(len(ensembles), 5)
+        self.assertEqual(ensembles.end, len(data))
+
+        # beam views share the buffer
+        beam2 = ensembles.beam('velocities', 2)
+        self.assertEqual(beam2.shape, (5, 3))
+        self.assertEqual(beam2[4].tolist(), [5, 9, 13])
+        self.assertEqual(ensembles.cells('echo_intensity').shape, (5, 3, 4))
+        self.assertFalse(beam2.flags.owndata)
+
+        records = list(ensembles.records())
+        self.assertEqual([record.variable_data.ensemble_number for record in records], range(5))
+        self.assertEqual(records[4].velocities.beam2, [5, 9, 13])
+        self.assertEqual(records[4].percent_good.beam4, [7, 11, 15])
+        self.assertEqual(records[4].fixed_data.number_of_cells, 3)
+        self.assertFalse(hasattr(records[4], 'bottom_track'))
+
+        # the record of a single ensemble is the same as the one decoded in a run
+        record = AdcpPd0Record(make_ensemble(4))
+        self.assertEqual(repr(record), repr(records[4]))
+
+    def test_run_ends(self):
+        """
+        A run ends at a change of layout, a bad checksum or max_count
+        """
+        bad = bytearray(make_ensemble(3))
+        bad[-1] ^= 1
+        data = ''.join([make_ensemble(0), make_ensemble(1), make_ensemble(2, cells=4), str(bad)])
+        array = to_array(data)
+
+        first = decode_ensembles(array)
+        self.assertEqual(len(first), 2)
+        second = decode_ensembles(array, first.end)
+        self.assertEqual(len(second), 1)
+        self.assertEqual(second.beam('correlation_magnitudes', 1).shape, (1, 4))
+        self.assertRaises(ChecksumException, decode_ensembles, array, second.end)
+
+        self.assertEqual(len(decode_ensembles(array, max_count=1)), 1)
+        self.assertRaises(InsufficientDataException, decode_ensembles, array[:first.end - 1], first.end / 2)
+
+    def test_strict(self):
+        """
+        Only strict decoding checks the number of data types
+        """
+        data = make_ensemble(0, block_ids=[BlockId.FIXED_DATA, BlockId.VARIABLE_DATA, BlockId.VELOCITY_DATA])
+        self.assertRaises(BadHeaderException, decode_ensembles, to_array(data))
+        ensembles = decode_ensembles(to_array(data), strict=False)
+        self.assertEqual(list(ensembles.records())[0].correlation_magnitudes, None)
+
+    def test_header_scanner(self):
+        data = to_array('\x7f\x7f\x00\x7f\x7f\x00\x00\x7f\x7f')
+        headers = HeaderScanner(data)
+        self.assertEqual(headers.next(0), 0)
+        # stepping two bytes at a time from 2 does not reach the odd header at 3
+        self.assertEqual(headers.next(2), None)
+        self.assertEqual(headers.next(1), 3)
+        self.assertEqual(headers.next(4), None)
+        self.assertEqual(headers.next(5), 7)
@@ -25,12 +25,12 @@ from mi.core.port_agent_simulator import TCPSimulatorServer
 from mi.core.unit_test import MiUnitTest
 from mi.idk.unit_test import InstrumentDriverTestCase
 from mi.idk.unit_test import InstrumentDriverUnitTestCase
-from ooi_port_agent.lrc import lrc
+from mi.core.checksum import lrc
 from mi.core.instrument.instrument_driver import DriverConnectionState
 from mi.idk.exceptions import IDKException
 from mi.core.instrument.port_agent_client import PortAgentClient, PortAgentPacket, Listener
 from mi.core.instrument.port_agent_client import HEADER_SIZE
-from mi.core.instrument.port_agent_client import py_lrc
+from mi.core.instrument.port_agent_client import lrc as port_agent_lrc
 from mi.core.exceptions import InstrumentConnectionException
 from mi.instrument.seabird.sbe16plus_v2.ctdpf_jb.driver import InstrumentDriver
 from mi.core.log import get_logger
@@ -304,7 +304,11 @@ class PAClientUnitTestCase(InstrumentDriverUnitTestCase):
     def test_lrc(self):
         test_data = 'this is a test'
 
-        assert lrc(test_data) == py_lrc(test_data)
+        # XOR of the bytes of test_data, whichever LRC implementation is installed
+        assert port_agent_lrc(test_data) == 75
+        assert lrc(test_data) == 75
+        assert lrc(test_data * 100) == 0
+        assert lrc(test_data, seed=75) == 0
 
 
 @attr('UNIT', group='mi')
@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+
+__license__ = 'Apache 2.0'
+
+import random
+import struct
+import timeit
+
+from mi.core.log import get_logger ; log = get_logger()
+
+from mi.core.checksum import lrc, byte_sum, hex_sum, crc16_kermit, crc16_x25
+from nose.plugins.attrib import attr
+from mi.core.unit_test import MiUnitTest
+
+
+def reference_lrc(data, seed=0):
+    for val in bytearray(data):
+        seed ^= val
+    return seed
+
+
+def reference_kermit(buf):
+    """
+    hpies crclib.crc3kerm
+    """
+    crcta = [0, 4225, 8450, 12675, 16900, 21125, 25350, 29575,
+             33800, 38025, 42250, 46475, 50700, 54925, 59150, 63375]
+    crctb = [0, 4489, 8978, 12955, 17956, 22445, 25910, 29887,
+             35912, 40385, 44890, 48851, 51820, 56293, 59774, 63735]
+    crc = 0
+    for i in range(0, len(buf)):
+        c = crc ^ ord(buf[i])
+        hi4 = (c & 240) >> 4
+        lo4 = c & 15
+        crc = (crc >> 8) ^ (crcta[hi4] ^ crctb[lo4])
+    return crc
+
+
+def reference_sio(data):
+    """
+    SioParser.calc_checksum
+    """
+    crc = 65535
+    if len(data) == 0:
+        return '0000'
+    for iData in range(0, len(data)):
+        short = struct.unpack('H', data[iData] + '\x00')
+        point = 255 & short[0]
+        crc ^= point
+        for i in range(7, -1, -1):
+            if crc & 1:
+                crc = (crc >> 1) ^ 33800
+            else:
+                crc >>= 1
+    crc = ~crc
+    if crc < 0:
+        crc += 65536
+    return '%04X' % crc
+
+
+def reference_hex_sum(s):
+    """
+    sunburst Protocol.calc_crc
+    """
+    cs = 0
+    for index in xrange(0, len(s), 2):
+        cs += int(s[index:index + 2], 16)
+    return cs
+
+
+@attr('UNIT', group='mi')
+class TestChecksum(MiUnitTest):
+    """
+    Verify the checksum functions against the implementations they replaced
+    """
+    def setUp(self):
+        random.seed(1)
+        self.samples = ['', '\x00', 'this is a test', '\xff' * 3] + \
+                       [''.join(chr(random.randint(0, 255)) for _ in xrange(random.randint(1, 600)))
+                        for _ in xrange(50)]
+
+    def test_lrc(self):
+        for data in self.samples:
+            self.assertEqual(lrc(data), reference_lrc(data))
+            self.assertEqual(lrc(bytearray(data), 0x5a), reference_lrc(data, 0x5a))
+
+    def test_byte_sum(self):
+        for data in self.samples:
+            self.assertEqual(byte_sum(data), sum(bytearray(data)))
+            self.assertEqual(byte_sum(data, 1, len(data) / 2), sum(bytearray(data[1:len(data) / 2])))
+
+    def test_hex_sum(self):
+        for data in self.samples:
+            hex_data = data.encode('hex').upper()
+            self.assertEqual(hex_sum(hex_data), reference_hex_sum(hex_data))
+            self.assertEqual(hex_sum(hex_data[:-1]), reference_hex_sum(hex_data[:-1]))
+        self.assertRaises(TypeError, hex_sum, '0G')
+
+    def test_crc(self):
+        for data in self.samples:
+            self.assertEqual(crc16_kermit(data), reference_kermit(data))
+            self.assertEqual('%04X' % crc16_x25(data), reference_sio(data))
+        # standard check values for '123456789'
+        self.assertEqual(crc16_kermit('123456789'), 0x2189)
+        self.assertEqual(crc16_x25('123456789'), 0x906e)
+
+    def test_throughput(self):
+        """
+        Log the throughput of each function and the python loop it replaced
+        """
+        data = self.samples[-1] * 2000
+        megabytes = len(data) / 1e6
+        for name, function in [('lrc', lrc), ('reference lrc', reference_lrc),
+                               ('crc16_x25', crc16_x25), ('reference sio crc', reference_sio),
+                               ('crc16_kermit', crc16_kermit), ('reference kermit', reference_kermit)]:
+            elapsed = timeit.timeit(lambda: function(data), number=1)
+            log.info('%s throughput: %.2f MB/s', name, megabytes / elapsed)
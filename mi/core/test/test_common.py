@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+
+__license__ = 'Apache 2.0'
+
+import timeit
+
+from mock import patch
+
+from mi.core.log import get_logger ; log = get_logger()
+
+from nose.plugins.attrib import attr
+from mi.core.common import BaseEnum
+from mi.core.instrument.instrument_fsm import InstrumentFSM
+from mi.core.instrument.protocol_param_dict import ParameterDictType
+from mi.core.unit_test import MiUnitTest
+
+
+class SampleEnum(BaseEnum):
+    ONE = 'one'
+    TWO = 'two'
+    LIST = ['a', 'b']
+
+
+class SampleChildEnum(SampleEnum):
+    THREE = 'three'
+
+
+class SampleState(BaseEnum):
+    UNKNOWN = 'STATE_UNKNOWN'
+    COMMAND = 'STATE_COMMAND'
+    AUTOSAMPLE = 'STATE_AUTOSAMPLE'
+
+
+class SampleEvent(BaseEnum):
+    ENTER = 'EVENT_ENTER'
+    EXIT = 'EVENT_EXIT'
+    GET = 'EVENT_GET'
+    SET = 'EVENT_SET'
+    START_AUTOSAMPLE = 'EVENT_START_AUTOSAMPLE'
+    STOP_AUTOSAMPLE = 'EVENT_STOP_AUTOSAMPLE'
+
+
+def uncached_has(cls, item):
+    """
+    BaseEnum.has before the values were cached
+    """
+    return item in [getattr(cls, attr) for attr in dir(cls)
+                    if not callable(getattr(cls, attr)) and not attr.startswith('__')]
+
+
+@attr('UNIT', group='mi')
+class TestBaseEnum(MiUnitTest):
+    """
+    Test the cached enum membership
+    """
+    def test_list_dict_has(self):
+        self.assertEqual(SampleEnum.list(), [['a', 'b'], 'one', 'two'])
+        self.assertEqual(SampleEnum.dict(), {'ONE': 'one', 'TWO': 'two', 'LIST': ['a', 'b']})
+        self.assertTrue(SampleEnum.has('one'))
+        self.assertTrue(SampleEnum.has(['a', 'b']))
+        self.assertFalse(SampleEnum.has('three'))
+        self.assertFalse(SampleEnum.has({}))
+        self.assertTrue(SampleChildEnum.has('one'))
+        self.assertTrue(SampleChildEnum.has('three'))
+        self.assertTrue(ParameterDictType.has(ParameterDictType.INT))
+
+        # the cached list is not shared with callers
+        SampleEnum.list().append('four')
+        self.assertFalse(SampleEnum.has('four'))
+
+    def test_fsm_dispatch_rate(self):
+        """
+        Log the cost of FSM event dispatch with and without the enum cache
+        """
+        fsm = InstrumentFSM(SampleState, SampleEvent, SampleEvent.ENTER, SampleEvent.EXIT)
+        fsm.add_handler(SampleState.COMMAND, SampleEvent.GET, lambda: (None, None))
+        fsm.start(SampleState.COMMAND)
+
+        count = 20000
+        cached = timeit.timeit(lambda: fsm.on_event(SampleEvent.GET), number=count)
+        with patch.object(BaseEnum, 'has', classmethod(uncached_has)):
+            uncached = timeit.timeit(lambda: fsm.on_event(SampleEvent.GET), number=count)
+
+        log.info('FSM dispatch: %.2f us cached, %.2f us uncached',
+                 cached / count * 1e6, uncached / count * 1e6)
@@ -14,8 +14,11 @@ from nose.plugins.attrib import attr
 from mi.core.time_tools import *
 import unittest
 from mi.core.unit_test import MiUnitTest
+import calendar
 import datetime
 import time as system_time
+
+import ntplib
 from mi.idk.exceptions import InvalidParameters
 
 @attr('UNIT', group='mi')
@@ -65,3 +68,36 @@ class TestTime(MiUnitTest):
             now = datetime.datetime.utcnow()
             self.assertLess(now.microsecond, 100)
             system_time.sleep(0.1)
+
+    def test_fixed_width_timestamp(self):
+        """
+        Fixed width timestamps convert to the same time as strptime, other
+        layouts are left for strptime
+        """
+        timestamp_format = FixedWidthTimestampFormat("%Y-%m-%dT%H:%M:%S.%fZ")
+        timestamps = ['2014-08-17T00:57:10.648Z', '2016-02-29T23:59:59.1Z', '2014-08-17T00:57:10.000001Z',
+                      '2014-08-17T00:57:10.1234567Z', '2014-8-17T00:57:10.6Z', '2014-02-30T00:00:00.0Z',
+                      '2014-08-17T24:00:00.0Z', '2014-08-17T00:57:10.648']
+        for timestamp in timestamps[:3]:
+            dt = datetime.datetime.strptime(timestamp, "%Y-%m-%dT%H:%M:%S.%fZ")
+            self.assertEqual(timestamp_format.parse(timestamp),
+                             (calendar.timegm(dt.timetuple()), dt.microsecond))
+        for timestamp in timestamps[3:]:
+            self.assertIsNone(timestamp_format.parse(timestamp))
+
+        seconds, microsecond, valid = timestamp_format.parse_array(timestamps)
+        self.assertEqual(list(valid), [True] * 3 + [False] * 5)
+        self.assertEqual(zip(seconds[:3], microsecond[:3]), [timestamp_format.parse(t) for t in timestamps[:3]])
+
+        # two digit years and leap seconds follow strptime
+        self.assertEqual(FixedWidthTimestampFormat("%m/%d/%y").parse('03/04/69'),
+                         (calendar.timegm((1969, 3, 4, 0, 0, 0)), 0))
+        self.assertIsNone(FixedWidthTimestampFormat("%H:%M:%S").parse('23:59:60'))
+        self.assertEqual(FixedWidthTimestampFormat("%H:%M:%S", max_second=61).parse('23:59:60'),
+                         (calendar.timegm((1900, 1, 1, 23, 59, 60)), 0))
+
+        # unsupported directives always go through strptime
+        self.assertIsNone(FixedWidthTimestampFormat("%d %b %Y").parse('17 Aug 2014'))
+
+        self.assertEqual(string_to_ntp_date_time('2014-08-17T00:57:10Z'),
+                         ntplib.system_to_ntp_time(calendar.timegm((2014, 8, 17, 0, 57, 10))))
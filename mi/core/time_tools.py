@@ -14,6 +14,7 @@ import re
 import time
 
 import ntplib
+import numpy
 import pytz
 
 DATE_PATTERN = r'^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(\.\d+)?Z?$'
@@ -100,9 +101,13 @@ def string_to_ntp_date_time(time_format):
         if time_format[-1:] != 'Z':
             time_format += 'Z'
 
-        dt = datetime.datetime.strptime(time_format, DATE_FORMAT)
+        fields = ISO8601_TIMESTAMP.parse(time_format)
+        if fields is not None:
+            unix_timestamp = fields[0] + fields[1] / 1000000.0
+        else:
+            dt = datetime.datetime.strptime(time_format, DATE_FORMAT)
 
-        unix_timestamp = calendar.timegm(dt.timetuple()) + (dt.microsecond / 1000000.0)
+            unix_timestamp = calendar.timegm(dt.timetuple()) + (dt.microsecond / 1000000.0)
 
         # convert to ntp (seconds since gmt jan 1 1900)
         timestamp = ntplib.system_to_ntp_time(unix_timestamp)
@@ -160,3 +165,248 @@ def ntp_to_string(timestamp, time_format=DATE_FORMAT):
     unix_time = ntplib.ntp_to_system_time(timestamp)
     dt = datetime.datetime.utcfromtimestamp(unix_time)
     return dt.strftime(time_format)
+
+
+# str.translate table which replaces each digit with 0
+_DIGITS_TO_ZERO = ''.join('0' if chr(code).isdigit() else chr(code) for code in range(256))
+
+
+class FixedWidthTimestampFormat(object):
+    """
+    Fast path for a strptime format made of %Y, %y, %m, %d, %H, %M, %S and %f
+    directives and literal characters, for timestamps in which every field
+    has its full width. The start of each day is cached, so converting a
+    timestamp only adds up the time of day.
+
+    A timestamp in any other layout, or one strptime would reject, is not
+    converted and has to go through strptime, so the result is always the
+    same as strptime gives.
+    """
+    _FIELD_WIDTHS = {'Y': 4, 'y': 2, 'm': 2, 'd': 2, 'H': 2, 'M': 2, 'S': 2}
+    _DATE_FIELDS = 'Yymd'
+    _MAX_CACHED_DAYS = 4096
+
+    def __init__(self, format_str, max_second=59):
+        """
+        @param format_str strptime format of the timestamps
+        @param max_second Largest seconds value strptime accepts, 61 for
+            time.strptime and 59 for datetime.strptime
+        """
+        self.format_str = format_str
+        self.max_second = max_second
+        self._day_starts = {}
+
+        # (directive, offset, width) of each numeric field
+        self._fields = []
+        # (offset, text) of each literal between fields
+        self._literals = []
+        # offset of a %f fraction and the literal text after it
+        self._fraction = None
+        self._suffix = ''
+        self._length = 0
+
+        offset = 0
+        literal = ''
+        index = 0
+        while index < len(format_str):
+            char = format_str[index]
+            if char != '%':
+                literal += char
+                index += 1
+                continue
+
+            directive = format_str[index + 1:index + 2]
+            if self._fraction is not None or \
+                    (directive not in self._FIELD_WIDTHS and directive != 'f') or \
+                    directive in [field[0] for field in self._fields]:
+                # only literals may follow the fraction
+                self._fields = None
+                return
+
+            if literal:
+                self._literals.append((offset, literal))
+                offset += len(literal)
+                literal = ''
+
+            if directive == 'f':
+                self._fraction = offset
+            else:
+                width = self._FIELD_WIDTHS[directive]
+                self._fields.append((directive, offset, width))
+                offset += width
+            index += 2
+
+        if self._fraction is None:
+            if literal:
+                self._literals.append((offset, literal))
+            self._length = offset + len(literal)
+        else:
+            self._suffix = literal
+            self._length = offset + 1 + len(literal)
+
+        # the layout of a timestamp with each digit replaced by 0, one for
+        # each number of fraction digits strptime accepts
+        shape = list('0' * self._length)
+        for (offset, text) in self._literals:
+            shape[offset:offset + len(text)] = text
+        shape = ''.join(shape)
+        if self._fraction is None:
+            self._shapes = set([shape])
+        else:
+            self._shapes = set(shape[:self._fraction] + '0' * digits + self._suffix for digits in range(1, 7))
+        if any(char.isdigit() for (offset, text) in self._literals for char in text + self._suffix):
+            self._fields = None
+
+        # (start, end, seconds per unit, largest value) of the time of day fields
+        limits = {'H': (3600, 23), 'M': (60, 59), 'S': (1, max_second)}
+        self._time_fields = [(start, start + width) + limits[directive]
+                             for (directive, start, width) in self._fields or [] if directive in limits]
+
+        date_fields = [(start, start + width) for (directive, start, width) in self._fields or []
+                       if directive in self._DATE_FIELDS]
+        if date_fields:
+            # the day is cached by the text of its fields, which must not
+            # have a time field between them
+            self._day_key = (min(date_fields)[0], max(date_fields)[1])
+            if any(self._day_key[0] < start < self._day_key[1] for (start, _, _, _) in self._time_fields):
+                self._fields = None
+        else:
+            self._day_key = (0, 0)
+
+    def parse(self, timestamp_str):
+        """
+        Convert a timestamp in the fixed layout of the format
+        @param timestamp_str The timestamp string
+        @retval A (seconds, microsecond) tuple of UTC integer seconds and the
+            microseconds of the fraction, or None if the timestamp is not
+            in the fixed layout
+        """
+        if self._fields is None or not isinstance(timestamp_str, str) or \
+                timestamp_str.translate(_DIGITS_TO_ZERO) not in self._shapes:
+            return None
+
+        seconds = 0
+        for (start, end, unit, largest) in self._time_fields:
+            value = int(timestamp_str[start:end])
+            if value > largest:
+                return None
+            seconds += value * unit
+
+        day_key = timestamp_str[self._day_key[0]:self._day_key[1]]
+        day_start = self._day_starts.get(day_key)
+        if day_start is None:
+            day_start = self._day_start(dict((directive, int(timestamp_str[start:start + width]))
+                                             for (directive, start, width) in self._fields
+                                             if directive in self._DATE_FIELDS))
+            if day_start is None:
+                return None
+            if len(self._day_starts) >= self._MAX_CACHED_DAYS:
+                self._day_starts.clear()
+            self._day_starts[day_key] = day_start
+
+        if self._fraction is None:
+            return day_start + seconds, 0
+
+        fraction = timestamp_str[self._fraction:len(timestamp_str) - len(self._suffix)]
+        return day_start + seconds, int(fraction) * 10 ** (6 - len(fraction))
+
+    def parse_array(self, timestamps):
+        """
+        Convert an array of timestamps in the fixed layout of the format
+        @param timestamps Array of timestamp strings
+        @retval A tuple of (seconds, microsecond, valid) arrays, valid is False
+            for the timestamps which are not in the fixed layout and have to
+            be converted one at a time
+        """
+        timestamps = numpy.asarray(timestamps, dtype=str)
+        count = timestamps.size
+        seconds = numpy.zeros(count, dtype=numpy.int64)
+        microsecond = numpy.zeros(count, dtype=numpy.int64)
+        valid = numpy.zeros(count, dtype=bool)
+        if self._fields is None or not count:
+            return seconds, microsecond, valid
+
+        timestamps = timestamps.ravel()
+        chars = timestamps.view(numpy.uint8).reshape(count, timestamps.dtype.itemsize)
+        lengths = numpy.char.str_len(timestamps)
+
+        if self._fraction is None:
+            layouts = [self._length]
+        else:
+            layouts = [length for length in numpy.unique(lengths)
+                       if self._length <= length <= self._length + 5]
+
+        for length in layouts:
+            rows = numpy.flatnonzero(lengths == length)
+            if not rows.size or chars.shape[1] < length:
+                continue
+            row_chars = chars[rows]
+            ok = numpy.ones(rows.size, dtype=bool)
+
+            literals = list(self._literals)
+            if self._suffix:
+                literals.append((length - len(self._suffix), self._suffix))
+            for (offset, text) in literals:
+                expected = numpy.frombuffer(text, dtype=numpy.uint8)
+                ok &= (row_chars[:, offset:offset + len(text)] == expected).all(axis=1)
+
+            values = {}
+            fields = list(self._fields)
+            if self._fraction is not None:
+                fields.append(('f', self._fraction, length - len(self._suffix) - self._fraction))
+            for (directive, offset, width) in fields:
+                digits = row_chars[:, offset:offset + width].astype(numpy.int64) - ord('0')
+                ok &= ((digits >= 0) & (digits <= 9)).all(axis=1)
+                values[directive] = digits.dot(10 ** numpy.arange(width - 1, -1, -1, dtype=numpy.int64))
+
+            zeros = numpy.zeros(rows.size, dtype=numpy.int64)
+            hour = values.get('H', zeros)
+            minute = values.get('M', zeros)
+            second = values.get('S', zeros)
+            ok &= (hour <= 23) & (minute <= 59) & (second <= self.max_second)
+
+            # look up the start of each distinct day once
+            day_keys = numpy.zeros(rows.size, dtype=numpy.int64)
+            for directive in self._DATE_FIELDS:
+                if directive in values:
+                    day_keys = day_keys * 10000 + values[directive]
+            day_keys[~ok] = -1
+            (unique_keys, first_rows, inverse) = numpy.unique(day_keys, return_index=True, return_inverse=True)
+            day_starts = numpy.zeros(unique_keys.size, dtype=numpy.int64)
+            day_ok = numpy.zeros(unique_keys.size, dtype=bool)
+            for (index, row) in enumerate(first_rows):
+                if unique_keys[index] < 0:
+                    continue
+                day_start = self._day_start(dict((directive, int(values[directive][row]))
+                                                 for directive in self._DATE_FIELDS if directive in values))
+                if day_start is not None:
+                    day_starts[index] = day_start
+                    day_ok[index] = True
+            ok &= day_ok[inverse]
+
+            rows = rows[ok]
+            seconds[rows] = (day_starts[inverse] + hour * 3600 + minute * 60 + second)[ok]
+            if 'f' in values:
+                microsecond[rows] = values['f'][ok] * 10 ** (6 - (length - len(self._suffix) - self._fraction))
+            valid[rows] = True
+
+        return seconds, microsecond, valid
+
+    @staticmethod
+    def _day_start(values):
+        """
+        UTC seconds at the start of the day given by the date fields, as
+        strptime fills them in, or None if the date is not valid
+        """
+        year = values.get('Y', 1900)
+        if 'y' in values:
+            year = values['y'] + (2000 if values['y'] <= 68 else 1900)
+        try:
+            day = datetime.date(year, values.get('m', 1), values.get('d', 1))
+        except ValueError:
+            return None
+        return calendar.timegm((day.year, day.month, day.day, 0, 0, 0))
+
+
+# Fast path for ISO8601 date strings once they have a fraction and trailing Z
+ISO8601_TIMESTAMP = FixedWidthTimestampFormat(DATE_FORMAT)
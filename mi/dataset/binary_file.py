@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+
+"""
+@package mi.dataset.binary_file
+@file mi/dataset/binary_file.py
+@brief Random access to the contents of a binary dataset file. A real file is
+    memory mapped, so a parser can search, unpack and slice it without a
+    read call per record. Other streams are read into memory once.
+"""
+
+__license__ = 'Apache 2.0'
+
+import mmap
+import os
+import struct
+
+
+class BinaryFile(object):
+    """
+    Contents of a binary stream, addressed by offset from the start of the stream. If the stream can not seek, offsets
+    are from its position when the BinaryFile was created. The stream is left at its end.
+    """
+    def __init__(self, stream_handle):
+        try:
+            fileno = stream_handle.fileno()
+        except (AttributeError, IOError):
+            fileno = None
+
+        if fileno is not None and os.fstat(fileno).st_size:
+            self.start = stream_handle.tell()
+            self._data = mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+            stream_handle.seek(0, os.SEEK_END)
+        else:
+            try:
+                self.start = stream_handle.tell()
+                stream_handle.seek(0)
+            except (AttributeError, IOError):
+                self.start = 0
+            self._data = stream_handle.read()
+
+        self.size = len(self._data)
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, key):
+        """
+        Copy of a slice of the contents as a string
+        """
+        return self._data[key]
+
+    def find(self, sub, start=0, end=None):
+        """
+        Lowest offset of sub in the contents between start and end, or -1
+        """
+        if end is None:
+            end = self.size
+        return self._data.find(sub, start, end)
+
+    def unpack_at(self, fmt, offset):
+        """
+        Unpack a struct format string or Struct at offset
+        @throws struct.error if the contents end before the format
+        """
+        if isinstance(fmt, struct.Struct):
+            return fmt.unpack_from(self._data, offset)
+        return struct.unpack_from(fmt, self._data, offset)
+
+    def view(self, start, end=None):
+        """
+        Read only buffer of the contents between start and end, sharing the memory of the file
+        """
+        if end is None:
+            end = self.size
+        start = min(start, self.size)
+        return buffer(self._data, start, max(0, min(end, self.size) - start))
@@ -1,8 +1,12 @@
+import json
 import os
+from itertools import groupby
 
 from mi.logging import config
 from mi.core.log import get_logger
 from mi.core.exceptions import NotImplementedException
+from mi.core.instrument.dataset_data_particle import ParticleBatch
+from mi.dataset.dataset_parser import RECORD_BATCH_SIZE
 from mi.core.common import BaseEnum
 
 
@@ -21,6 +25,21 @@ class ProcessingInfoKey(BaseEnum):
     WARNING_MESSAGE = "warning_message"
 
 
+class ParticleFormat(BaseEnum):
+    """
+    Forms in which DataSetDriver passes particles to a particle data handler,
+    chosen by the handler's particle_format attribute. Handlers without one,
+    such as the Java handler passed in from uFrame, are given JSON.
+    """
+    # addParticleSample(stream, json) with one JSON object per particle
+    JSON = "json"
+    # addParticleSample(stream, dict) with the particle dictionary, nothing is encoded
+    DICT = "dict"
+    # addParticleSamples(stream, json) with one JSON array for each run of consecutive records of a stream,
+    # the calls are made in file order
+    JSON_BATCH = "json_batch"
+
+
 class ParticleDataHandler(object):
     def __init__(self):
         self._samples = {}
@@ -41,6 +60,10 @@ class ParticleDataHandler(object):
         else:
             log.error("Invalid ProcessingInfoKey: %s", str(processing_info_key))
 
+    def addParticleSamples(self, sample_type, samples):
+        for sample in json.loads(samples):
+            self.addParticleSample(sample_type, sample)
+
 
 class DataSetDriver(object):
     """
@@ -50,30 +73,66 @@ class DataSetDriver(object):
     which is called directly from uFrame
     """
 
-    def __init__(self, parser, particle_data_handler):
-
+    def __init__(self, parser, particle_data_handler, batch_size=RECORD_BATCH_SIZE, particle_format=None):
+        """
+        @param parser The parser to retrieve records from
+        @param particle_data_handler The handler the records are passed to
+        @param batch_size The number of records to request from the parser at a time
+        @param particle_format The ParticleFormat to pass records to the handler in,
+            defaults to the handler's particle_format or JSON if it has none
+        """
         self._parser = parser
         self._particle_data_handler = particle_data_handler
+        self._batch_size = batch_size
+
+        if particle_format is None:
+            particle_format = getattr(particle_data_handler, 'particle_format', ParticleFormat.JSON)
+        if not ParticleFormat.has(particle_format):
+            raise ValueError("Invalid ParticleFormat: %s" % particle_format)
+        self._particle_format = particle_format
+
+    def _publish_records(self, records):
+        """
+        Pass records to the particle data handler in the driver's particle format
+        @param records list of data particles
+        """
+        handler = self._particle_data_handler
+
+        if self._particle_format == ParticleFormat.JSON:
+            for record in records:
+                handler.addParticleSample(record.data_particle_type(), record.generate())
+
+        elif self._particle_format == ParticleFormat.DICT:
+            for record in records:
+                handler.addParticleSample(record.data_particle_type(), record.generate_dict())
+
+        else:
+            # one array per run of records of the same stream, so the handler receives the particles in file order
+            for stream, run in groupby(records, lambda record: record.data_particle_type()):
+                handler.addParticleSamples(stream, json.dumps([record.generate_dict() for record in run]))
 
     def processFileStream(self):
         """
         Method to extract records from a parser's get_records method
-        and pass them to the Java particle_data_handler passed in from uFrame
+        and pass them to the Java particle_data_handler passed in from uFrame.
+        The particles built while the parser retrieves each batch of records are stamped
+        with one driver timestamp, taken when the parser starts on the batch. A parser
+        which parses the whole file on its first get_records builds all its particles there.
         """
-        while True:
-            try:
-                records = self._parser.get_records(1)
-
-                if len(records) == 0:
-                    log.debug("Done retrieving records.")
-                    break
-
-                for record in records:
-                    self._particle_data_handler.addParticleSample(record.data_particle_type(), record.generate())
-            except Exception as e:
-                log.error(e)
-                self._particle_data_handler.setParticleDataCaptureFailure()
-                break
+        try:
+            batches = self._parser.iter_batches(self._batch_size)
+            while True:
+                # the batch must be current while the parser builds the records
+                with ParticleBatch():
+                    records = next(batches, None)
+                    if records is None:
+                        break
+                    self._publish_records(records)
+
+            log.debug("Done retrieving records.")
+        except Exception as e:
+            log.error(e)
+            self._particle_data_handler.setParticleDataCaptureFailure()
 
 
 class SimpleDatasetDriver(DataSetDriver):
@@ -22,6 +22,9 @@ from mi.core.exceptions import RecoverableSampleException, SampleEncodingExcepti
 from mi.core.exceptions import NotImplementedException, UnexpectedDataException
 from mi.core.common import BaseEnum
 
+# number of records requested at a time by iter_records
+RECORD_BATCH_SIZE = 1000
+
 
 class DataSetDriverConfigKeys(BaseEnum):
     PARTICLE_MODULE = "particle_module"
@@ -43,6 +46,9 @@ class DataSetDriverConfigKeys(BaseEnum):
 class Parser(object):
     """ abstract class to show API needed for plugin poller objects """
 
+    # index of the first record in _record_buffer which has not been returned yet
+    _record_index = 0
+
     def __init__(self, config, stream_handle, state, sieve_fn,
                  state_callback, publish_callback, exception_callback=None):
         """
@@ -91,6 +97,63 @@ class Parser(object):
         """
         raise NotImplementedException("get_records() not overridden!")
 
+    def iter_batches(self, batch_size=RECORD_BATCH_SIZE):
+        """
+        Generator over all the remaining particles in lists of up to batch_size,
+        as returned by get_records.
+        @param batch_size The number of records to request from get_records at a time
+        """
+        while True:
+            records = self.get_records(batch_size)
+            if not records:
+                return
+            yield records
+
+    def iter_records(self, batch_size=RECORD_BATCH_SIZE):
+        """
+        Generator over all the remaining particles, requested from get_records
+        batch_size at a time.
+        @param batch_size The number of records to request from get_records at a time
+        """
+        for records in self.iter_batches(batch_size):
+            for record in records:
+                yield record
+
+    def _buffered_record_count(self):
+        """
+        @retval The number of records in _record_buffer which have not been returned
+        """
+        return len(self._record_buffer) - self._record_index
+
+    def _clear_record_buffer(self):
+        """
+        Discard all the records in _record_buffer, including any which have not
+        been returned, such as when the parser moves to a new state
+        """
+        self._record_buffer = []
+        self._record_index = 0
+
+    def _pop_records(self, count):
+        """
+        Remove up to count records from the front of _record_buffer. Records are
+        not removed from the list one at a time, which costs O(n) each, but are
+        dropped in bulk once they make up at least half of the list, so
+        draining a buffer of n records costs O(n) in total.
+        @param count The maximum number of records to return
+        @retval A list of the records removed
+        """
+        start = self._record_index
+        end = min(start + max(count, 0), len(self._record_buffer))
+        records = self._record_buffer[start:end]
+
+        if end * 2 >= len(self._record_buffer):
+            del self._record_buffer[:end]
+            self._record_index = 0
+        else:
+            self._record_index = end
+
+        return records
+
     def _publish_sample(self, samples):
         """
         Publish the samples with the given publishing callback.
@@ -190,8 +253,8 @@ class BufferLoadingParser(Parser):
         if num_records <= 0:
             return []
         try:
-            while len(self._record_buffer) < num_records:
-                self._load_particle_buffer()        
+            while self._buffered_record_count() < num_records:
+                self._load_particle_buffer()
         except EOFError:
             self._process_end_of_file()
         return self._yank_particles(num_records)
@@ -218,17 +281,12 @@ class BufferLoadingParser(Parser):
         cannot be collected (perhaps due to an EOF), the list will have the
         elements it was able to collect.
         """
-        if len(self._record_buffer) < num_records:
-            num_to_fetch = len(self._record_buffer)
-        else:
-            num_to_fetch = num_records
+        records_to_return = self._pop_records(num_records)
         log.trace("Yanking %s records of %s requested",
-                  num_to_fetch,
+                  len(records_to_return),
                   num_records)
 
         return_list = []
-        records_to_return = self._record_buffer[:num_to_fetch]
-        self._record_buffer = self._record_buffer[num_to_fetch:]
         if len(records_to_return) > 0:
             self._state = records_to_return[-1][1]  # state side of tuple of last entry
             # strip the state info off of them now that we have what we need
@@ -238,7 +296,7 @@ class BufferLoadingParser(Parser):
             self._publish_sample(return_list)
             log.trace("Sending parser state [%s] to driver", self._state)
             file_ingested = False
-            if self.file_complete and len(self._record_buffer) == 0:
+            if self.file_complete and self._buffered_record_count() == 0:
                 # file has been read completely and all records pulled out of the record buffer
                 file_ingested = True
             self._state_callback(self._state, file_ingested)  # push new state to driver
@@ -284,6 +342,9 @@ class BufferLoadingParser(Parser):
 
 class SimpleParser(Parser):
 
+    # the particles still to come from a streaming iter_particles
+    _particle_generator = None
+
     def __init__(self, config, stream_handle, exception_callback):
         """
         Initialize the simple parser, which does not use state or the chunker
@@ -308,11 +369,27 @@ class SimpleParser(Parser):
 
     def parse_file(self):
         """
-        This method must be overridden.  This method should open and read the file and parser the data within, and at
-        the end of this method self._record_buffer will be filled with all the particles in the file.
+        This method must be overridden, unless iter_particles is.  This method should open and read the file and
+        parser the data within, and at the end of this method self._record_buffer will be filled with all the
+        particles in the file.
+        """
+        self._record_buffer.extend(self.iter_particles())
+
+    def iter_particles(self):
+        """
+        Generator which yields the particles in the file as they are parsed. A parser may override this in place of
+        parse_file, get_records then only parses as far into the file as is needed to return the number of records
+        requested, so the particles for the whole file are never held in memory at once. parse_file still fills
+        self._record_buffer with all the particles in the file.
         """
         raise NotImplementedException("parse_file() not overridden!")
 
+    def _streaming(self):
+        """
+        @retval True if the parser overrides iter_particles
+        """
+        return self.iter_particles.im_func is not SimpleParser.iter_particles.im_func
+
     def get_records(self, number_requested=1):
         """
         Initiate parsing the file if it has not been done already, and pop particles off the record buffer to
@@ -320,14 +397,20 @@ class SimpleParser(Parser):
         @param number_requested the number of records requested to be returned
         @return an array of particles, with a length of the number requested or less
         """
-        particles_to_return = []
+        if number_requested <= 0:
+            return []
 
-        if number_requested > 0:
-            if self._file_parsed is False:
+        if self._file_parsed is False:
+            if self._streaming():
+                self._particle_generator = self.iter_particles()
+            else:
                 self.parse_file()
-                self._file_parsed = True
+            self._file_parsed = True
 
-        while len(particles_to_return) < number_requested and len(self._record_buffer) > 0:
-            particles_to_return.append(self._record_buffer.pop(0))
+        while self._particle_generator is not None and self._buffered_record_count() < number_requested:
+            try:
+                self._record_buffer.append(next(self._particle_generator))
+            except StopIteration:
+                self._particle_generator = None
 
-        return particles_to_return
+        return self._pop_records(number_requested)
@@ -84,13 +84,12 @@ class Vel3dlWfpRecoveredDriver(SimpleDatasetDriver):
                     if record.data_particle_type() == Vel3dLWfpDataParticleType.WFP_INSTRUMENT_PARTICLE:
                         self._data_particle_record_buffer.append(record)
                     else:
-                        self._particle_data_handler.addParticleSample(record.data_particle_type(), record.generate())
+                        self._publish_records([record])
 
             # Adjust the timestamps of the records in the _data_particle_record_buffer
             self.adjust_sample_times()
 
-            for record in self._data_particle_record_buffer:
-                self._particle_data_handler.addParticleSample(record.data_particle_type(), record.generate())
+            self._publish_records(self._data_particle_record_buffer)
 
         except Exception as e:
             log.error(e)
@@ -50,13 +50,12 @@ class WfpCFileDriver(SimpleDatasetDriver):
                     if record.data_particle_type() == self.pressure_containing_data_particle_stream():
                         self._data_particle_record_buffer.append(record)
                     else:
-                        self._particle_data_handler.addParticleSample(record.data_particle_type(), record.generate())
+                        self._publish_records([record])
 
             # Adjust the timestamps of the records in the _data_particle_record_buffer
             self.adjust_c_file_sample_times()
 
-            for record in self._data_particle_record_buffer:
-                self._particle_data_handler.addParticleSample(record.data_particle_type(), record.generate())
+            self._publish_records(self._data_particle_record_buffer)
 
         except Exception as e:
             log.error(e)
@@ -283,7 +282,7 @@ class WfpSioCFileDriver(SimpleDatasetDriver):
                     if record.data_particle_type() == self.pressure_containing_data_particle_stream():
                         self._data_particle_record_buffer.append(record)
                     else:
-                        self._particle_data_handler.addParticleSample(record.data_particle_type(), record.generate())
+                        self._publish_records([record])
 
             self._c_file_profiles = self.get_c_file_profiles(self._data_particle_record_buffer)
             self._missing_e_profile_indexes = range(len(self._c_file_profiles))
@@ -294,8 +293,7 @@ class WfpSioCFileDriver(SimpleDatasetDriver):
             self._particle_data_handler._samples = {}
 
     def populate_particle_data_handler(self):
-        for record in self._data_particle_record_buffer:
-            self._particle_data_handler.addParticleSample(record.data_particle_type(), record.generate())
+        self._publish_records(self._data_particle_record_buffer)
 
     def adjust_c_file_sample_times(self):
         """
@@ -72,82 +72,99 @@ class ZPLSCCEchogram(object):
         self.cc = ZplscCCalibrationCoefficients()
         self.params = ZplscCParameters()
 
-    def compute_backscatter(self, profile_hdr, chan_data, sound_speed, depth_range, sea_absorb):
+    def compute_backscatter(self, profile_hdrs, chan_data, sound_speed, depth_range, sea_absorb):
         """
-        Compute the backscatter volumes values for one zplsc_c profile data record.
+        Compute the backscatter volumes values for zplsc_c profile data records with the same channels and bins.
         This code was borrowed from ASL MatLab code that reads in zplsc-c raw data
         and performs calculations in order to compute the backscatter volume in db.
 
-        :param profile_hdr: Raw profile header with metadata from the zplsc-c instrument.
-        :param chan_data: Raw frequency data from the zplsc-c instrument.
+        :param profile_hdrs: Array of raw profile headers with metadata from the zplsc-c instrument.
+        :param chan_data: Raw frequency data from the zplsc-c instrument, a (records x bins) array per channel.
         :param sound_speed: Speed of sound at based on speed of sound, pressure and salinity.
         :param depth_range: Range of the depth of the measurements
         :param sea_absorb: Seawater absorption coefficient for each frequency
-        :return: sv: Volume backscatter in db
+        :return: sv: Volume backscatter in db, a (records x bins) array per channel
         """
 
+        num_channels = len(chan_data)
+        sound_speed = sound_speed[:, np.newaxis]
+
         __N = []
         if self.params.Bins2Avg > 1:
-            for chan in range(profile_hdr.num_channels):
-                el = self.cc.EL[chan] - 2.5/self.cc.DS[chan] + np.array(chan_data[chan])/(26214*self.cc.DS[chan])
+            for chan in range(num_channels):
+                el = self.cc.EL[chan] - 2.5/self.cc.DS[chan] + chan_data[chan]/(26214*self.cc.DS[chan])
                 power = 10**(el/10)
 
                 # Perform bin averaging
-                num_bins = len(chan_data[chan])/self.params.Bins2Avg
-                pwr_avg = []
-                for _bin in range(num_bins):
-                    pwr_avg.append(np.mean(power[_bin*self.params.Bins2Avg:(_bin+1)*self.params.Bins2Avg]))
+                num_bins = power.shape[1]/self.params.Bins2Avg
+                pwr_avg = power[:, :num_bins*self.params.Bins2Avg].reshape(
+                    len(power), num_bins, self.params.Bins2Avg).mean(axis=2)
 
                 el_avg = 10*np.log10(pwr_avg)
                 __N.append(np.round(26214*self.cc.DS[chan]*(el_avg - self.cc.EL[chan] + 2.5/self.cc.DS[chan])))
 
         else:
-            for chan in range(profile_hdr.num_channels):
-                __N.append(np.array(chan_data[chan]))
+            __N = chan_data
 
         sv = []
-        for chan in range(profile_hdr.num_channels):
+        for chan in range(num_channels):
+            frequency = profile_hdrs['frequency'][:, chan]
+            pulse_length = profile_hdrs['pulse_length'][:, chan].astype(np.int64)[:, np.newaxis]
+
             # Calculate correction to Sv due to non square transmit pulse
-            sv_offset = zf.compute_sv_offset(profile_hdr.frequency[chan], profile_hdr.pulse_length[chan])
+            sv_offsets = {}
+            for key in set(zip(frequency, pulse_length[:, 0])):
+                sv_offsets[key] = zf.compute_sv_offset(*key)
+            sv_offset = np.array([sv_offsets[key] for key in zip(frequency, pulse_length[:, 0])])[:, np.newaxis]
+
             sv.append(self.cc.EL[chan]-2.5/self.cc.DS[chan] + __N[chan]/(26214*self.cc.DS[chan]) - self.cc.TVR[chan] -
                       20*np.log10(self.cc.VTX[chan]) + 20*np.log10(depth_range[chan]) +
-                      2*sea_absorb[chan]*depth_range[chan] -
-                      10*np.log10(0.5*sound_speed*profile_hdr.pulse_length[chan]/1e6*self.cc.BP[chan]) +
+                      2*sea_absorb[chan][:, np.newaxis]*depth_range[chan] -
+                      10*np.log10(0.5*sound_speed*pulse_length/1e6*self.cc.BP[chan]) +
                       sv_offset)
 
         return sv
 
-    def compute_echogram_metadata(self, profile_hdr):
+    def compute_echogram_metadata(self, profile_hdrs):
         """
-        Compute the metadata parameters needed to compute the zplsc-c volume backscatter values.
+        Compute the metadata parameters needed to compute the zplsc-c volume backscatter values of profile data
+        records with the same channels and bins.
 
-        :param  profile_hdr: Raw profile header with metadata from the zplsc-c instrument.
-        :return: sound_speed : Speed of sound based on temperature, pressure and salinity.
-                 depth_range : Range of depth values of the zplsc-c data.
-                 sea_absorb : Sea absorption based on temperature, pressure, salinity and frequency.
+        :param  profile_hdrs: Array of raw profile headers with metadata from the zplsc-c instrument.
+        :return: sound_speed : Speed of sound based on temperature, pressure and salinity, per record.
+                 depth_range : Range of depth values of the zplsc-c data, a (records x bins) array per channel.
+                 sea_absorb : Sea absorption based on temperature, pressure, salinity and frequency, per record.
         """
 
         # If the temperature sensor is available, compute the temperature from the counts.
-        temperature = 0
-        if profile_hdr.is_sensor_available:
-            temperature = zf.zplsc_c_temperature(profile_hdr.temperature, self.cc.ka, self.cc.kb, self.cc.kc,
-                                                 self.cc.A, self.cc.B, self.cc.C)
+        temperature = np.zeros(len(profile_hdrs))
+        is_sensor_available = profile_hdrs['is_sensor_available'] != 0
+        if is_sensor_available.any():
+            temperature[is_sensor_available] = zf.zplsc_c_temperature(
+                profile_hdrs['temperature'][is_sensor_available].astype(np.int64),
+                self.cc.ka, self.cc.kb, self.cc.kc, self.cc.A, self.cc.B, self.cc.C)
 
         sound_speed = zf.zplsc_c_ss(temperature, self.params.Pressure, self.params.Salinity)
 
-        _m = []
+        # The depth range of every channel is computed from the settings of the first channel.
+        speed = sound_speed[:, np.newaxis]
+        lockout_index = profile_hdrs['lockout_index'][:, 0].astype(np.int64)[:, np.newaxis]
+        digitization_rate = profile_hdrs['digitization_rate'][:, 0].astype(np.int64)[:, np.newaxis]
+        range_samples = profile_hdrs['range_samples'][:, 0].astype(np.int64)[:, np.newaxis]
+        pulse_length = profile_hdrs['pulse_length'][:, 0].astype(np.int64)[:, np.newaxis]
+
         depth_range = []
-        for chan in range(profile_hdr.num_channels):
-            _m.append(np.array([x for x in range(1, (profile_hdr.num_bins[chan]/self.params.Bins2Avg)+1)]))
-            depth_range.append(sound_speed*profile_hdr.lockout_index[0]/(2*profile_hdr.digitization_rate[0]) +
-                               (sound_speed/4)*(((2*_m[chan]-1)*profile_hdr.range_samples[0]*self.params.Bins2Avg-1) /
-                                                float(profile_hdr.digitization_rate[0]) +
-                                                profile_hdr.pulse_length[0]/1e6))
+        for chan in range(profile_hdrs['num_channels'][0]):
+            _m = np.arange(1, int(profile_hdrs['num_bins'][0, chan])/self.params.Bins2Avg + 1)
+            depth_range.append(speed*lockout_index/(2*digitization_rate) +
+                               (speed/4)*(((2*_m-1)*range_samples*self.params.Bins2Avg-1) /
+                                           digitization_rate.astype(float) +
+                                           pulse_length/1e6))
 
         sea_absorb = []
-        for chan in range(profile_hdr.num_channels):
+        for chan in range(profile_hdrs['num_channels'][0]):
             # Calculate absorption coefficient for each frequency.
             sea_absorb.append(zf.zplsc_c_absorbtion(temperature, self.params.Pressure, self.params.Salinity,
-                                                    profile_hdr.frequency[chan]))
+                                                    profile_hdrs['frequency'][:, chan].astype(np.int64)))
 
         return sound_speed, depth_range, sea_absorb
@@ -143,7 +143,7 @@ class WfpEFileParser(BufferLoadingParser):
         if not (StateKey.POSITION in state_obj):
             raise DatasetParserException("Invalid state keys")
         self._chunker.clean_all_chunks()
-        self._record_buffer = []
+        self._clear_record_buffer()
         self._state = state_obj
         self._read_state = state_obj
         self._stream_handle.seek(state_obj[StateKey.POSITION])
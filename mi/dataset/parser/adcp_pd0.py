@@ -10,17 +10,16 @@ Release notes:
 initial release
 """
 import datetime as dt
-import struct
 
 from mi.core.common import BaseEnum
 from mi.core.exceptions import RecoverableSampleException
 from mi.core.exceptions import UnexpectedDataException
 from mi.core.instrument.dataset_data_particle import DataParticle, DataParticleKey
+from mi.core.instrument.pd0_decoder import HeaderScanner, decode_ensembles, map_stream
 from mi.core.log import get_logger
 from mi.dataset.dataset_parser import SimpleParser, DataSetDriverConfigKeys
-from mi.dataset.parser.pd0_parser import AdcpPd0Record, \
-    PD0ParsingException, BadHeaderException, \
-    BadOffsetException, ChecksumException, UnhandledBlockException
+from mi.dataset.parser.pd0_parser import PD0ParsingException, BadHeaderException, \
+    BadOffsetException, InsufficientDataException, UnhandledBlockException
 
 __author__ = 'Jeff Roy'
 __license__ = 'Apache 2.0'
@@ -644,66 +643,55 @@ class AdcpPd0Parser(SimpleParser):
         self._last_values[stream] = values
         return True
 
-    def parse_file(self):
+    def iter_particles(self):
         """
         Entry point into parsing the file
-        Loop through the file one ensemble at a time
+        Step through the file two bytes at a time looking for ensembles, decoding each run of back to back ensembles
+        with the same layout together and yielding particles as they are parsed
         """
-
-        position = 0  # set position to beginning of file
-        header_id_bytes = self._stream_handle.read(2)  # read the first two bytes of the file
-
-        while header_id_bytes:  # will be None when EOF is found
-
-            if header_id_bytes == ADCPS_PD0_HEADER_REGEX:
-
-                # get the ensemble size from the next 2 bytes (excludes checksum bytes)
-                num_bytes = struct.unpack("<H", self._stream_handle.read(2))[0]
-
-                self._stream_handle.seek(position)  # reset to beginning of ensemble
-                input_buffer = self._stream_handle.read(num_bytes + 2)  # read entire ensemble
-
-                if len(input_buffer) == num_bytes + 2:  # make sure there are enough bytes including checksum
-
-                    try:
-                        pd0 = AdcpPd0Record(input_buffer, glider=self._glider)
-
-                        velocity = self._particle_classes['velocity'](pd0)
-                        self._record_buffer.append(velocity)
-
-                        config = self._particle_classes['config'](pd0)
-                        engineering = self._particle_classes['engineering'](pd0)
-
-                        for particle in [config, engineering]:
-                            if self._changed(particle):
-                                self._record_buffer.append(particle)
-
-                        if hasattr(pd0, 'bottom_track'):
-                            bt = self._particle_classes['bottom_track'](pd0)
-                            bt_config = self._particle_classes['bottom_track_config'](pd0)
-                            self._record_buffer.append(bt)
-
-                            if self._changed(bt_config):
-                                self._record_buffer.append(bt_config)
-
-                    except (BadOffsetException, UnhandledBlockException, BadHeaderException, struct.error):
-                        self._stream_handle.seek(position + 2)
-
-                    except PD0ParsingException:
-                        # seek to just past this header match
-                        self._stream_handle.seek(position + 2)
-                        self._exception_callback(RecoverableSampleException("Exception parsing PD0"))
-
-                else:  # reached EOF
-                    log.warn("not enough bytes left for complete ensemble")
-                    self._exception_callback(UnexpectedDataException("Found incomplete ensemble at end of file"))
-
-            else:  # did not get header ID bytes
-                # if we do not find the header ID bytes go to next bytes and try again
-                # we are not logging anything or passing an exception back to reduce
-                # log noise.
-                pass
-
-            position = self._stream_handle.tell()  # set the new file position
-            header_id_bytes = self._stream_handle.read(2)  # read the next two bytes of the file
+        data = map_stream(self._stream_handle)
+        headers = HeaderScanner(data)
+        position = headers.next(0)
+
+        while position is not None:
+            try:
+                ensembles = decode_ensembles(data, position)
+
+            except InsufficientDataException:  # reached EOF
+                log.warn("not enough bytes left for complete ensemble")
+                self._exception_callback(UnexpectedDataException("Found incomplete ensemble at end of file"))
+                break
+
+            except (BadOffsetException, UnhandledBlockException, BadHeaderException):
+                # go to just past this header match and try again
+                # we are not logging anything or passing an exception back to reduce log noise.
+                position = headers.next(position + 2)
+                continue
+
+            except PD0ParsingException:
+                # seek to just past this header match
+                position = headers.next(position + 2)
+                self._exception_callback(RecoverableSampleException("Exception parsing PD0"))
+                continue
+
+            for pd0 in ensembles.records(glider=self._glider):
+                velocity = self._particle_classes['velocity'](pd0)
+                yield velocity
+
+                config = self._particle_classes['config'](pd0)
+                engineering = self._particle_classes['engineering'](pd0)
+
+                for particle in [config, engineering]:
+                    if self._changed(particle):
+                        yield particle
+
+                if hasattr(pd0, 'bottom_track'):
+                    bt = self._particle_classes['bottom_track'](pd0)
+                    bt_config = self._particle_classes['bottom_track_config'](pd0)
+                    yield bt
+
+                    if self._changed(bt_config):
+                        yield bt_config
+
+            position = headers.next(ensembles.end)
 
@@ -48,8 +48,10 @@ from mi.core.instrument.dataset_data_particle import \
 
 from mi.core.exceptions import \
     RecoverableSampleException
+from mi.core.instrument.chunker import RegexSieve
 
 from mi.dataset.dataset_parser import SimpleParser
+from mi.dataset.parser.dcl_file_common import dcl_lines
 
 from mi.dataset.parser.utilities import  \
     dcl_time_to_ntp, \
@@ -169,6 +171,9 @@ CTDBP_FLORT_REGEX += DATE_TIME_STR + ZERO_OR_MORE_WHITESPACE_REGEX
 CTDBP_FLORT_REGEX += END_OF_LINE_REGEX
 CTDBP_FLORT_MATCHER = re.compile(CTDBP_FLORT_REGEX)
 
+# The record patterns in the order they are tried, matched in a single pass
+DATA_MATCHERS = RegexSieve([UNCORR_MATCHER, ENDURANCE_CORR_MATCHER, PIONEER_MATCHER, CTDBP_FLORT_MATCHER])
+
 # This table is used in the generation of the data particle.
 # Column 1 - particle parameter name & match group name
 # Column 2 - data encoding function (conversion required - int, float, etc)
@@ -251,18 +256,10 @@ class CtdbpCdefDclParser(SimpleParser):
         generating particles for data lines
         """
 
-        for line in self._stream_handle:
-            # first check for a match against the uncorrected pattern
-            match = UNCORR_MATCHER.match(line)
-            if match is None:
-                # check for a match against corrected Endurance pattern
-                match = ENDURANCE_CORR_MATCHER.match(line)
-            if match is None:
-                # check for a match against Pioneer pattern
-                match = PIONEER_MATCHER.match(line)
-            if match is None:
-                # check for a match against CTDBP_FLORT pattern
-                match = CTDBP_FLORT_MATCHER.match(line)
+        for line in dcl_lines(self._stream_handle):
+            # check for a match against the uncorrected, corrected Endurance,
+            # Pioneer and CTDBP_FLORT patterns, in that order
+            (_, match) = DATA_MATCHERS.match(line)
 
             if match is not None:
                 log.debug('record found')
@@ -28,7 +28,9 @@ import binascii
 import re
 import struct
 
-from mi.dataset.parser.utilities import zulu_timestamp_to_ntp_time
+import numpy
+
+from mi.dataset.parser.utilities import hex_records_to_array, zulu_timestamp_to_ntp_time
 
 from mi.core.log import get_logger
 log = get_logger()
@@ -127,6 +129,11 @@ CO_MATCHER = re.compile(CO_REGEX)
 CO_GROUP_ID = 1
 CO_GROUP_TIME_OFFSET = 2
 
+# Recovered host CT Data record (hex ASCII, records separated by white space):
+#   Temperature (5 digits), Conductivity (5 digits), then the bytes of the
+#   Pressure (2 bytes) and Time since Jan 1, 2000 (4 bytes), least significant first
+REC_HOST_CT_FIELD_WIDTHS = [5, 5, 2, 2, 2, 2, 2, 2]
+
 # Indices into raw_data tuples for recovered CT data
 RAW_INDEX_REC_CT_ID = 0
 RAW_INDEX_REC_CT_SERIAL = 1
@@ -149,6 +156,9 @@ RAW_INDEX_CO_TIME_OFFSET = 2
 
 INDUCTIVE_ID_KEY = 'inductive_id'
 
+# Seconds from Jan 1, 1900 to Jan 1, 2000
+SECONDS_1900_TO_2000 = (datetime.datetime(2000, 1, 1) - datetime.datetime(1900, 1, 1)).total_seconds()
+
 
 def convert_hex_ascii_to_int(int_val):
     """
@@ -199,6 +209,25 @@ class CtdmoGhqrRecoveredInstrumentDataParticle(DataParticle):
     """
     _data_particle_type = DataParticleType.REC_CT_PARTICLE
 
+    #
+    # Raw data for this particle consists of the following fields (hex ASCII
+    # unless noted otherwise):
+    #   inductive ID (hex)
+    #   serial number (hex)
+    #   temperature
+    #   conductivity
+    #   pressure
+    #   pressure temperature
+    #   time of science data
+    #
+    _schema = ((CtdmoInstrumentDataParticleKey.INDUCTIVE_ID, int),
+               (CtdmoInstrumentDataParticleKey.SERIAL_NUMBER, str),
+               (CtdmoInstrumentDataParticleKey.TEMPERATURE, convert_hex_ascii_to_int),
+               (CtdmoInstrumentDataParticleKey.CONDUCTIVITY, convert_hex_ascii_to_int),
+               (CtdmoInstrumentDataParticleKey.PRESSURE, convert_hex_ascii_to_int),
+               (CtdmoInstrumentDataParticleKey.PRESSURE_TEMP, convert_hex_ascii_to_int),
+               (CtdmoInstrumentDataParticleKey.CTD_TIME, convert_hex_ascii_to_int))
+
     def _build_parsed_values(self):
         """
         Build parsed values for Telemetered Data Particle.
@@ -214,40 +243,7 @@ class CtdmoGhqrRecoveredInstrumentDataParticle(DataParticle):
         time_stamp = generate_particle_timestamp(self.raw_data[RAW_INDEX_REC_CT_TIME])
         self.set_internal_timestamp(timestamp=time_stamp)
 
-        #
-        # Raw data for this particle consists of the following fields (hex ASCII
-        # unless noted otherwise):
-        #   inductive ID (hex)
-        #   serial number (hex)
-        #   temperature
-        #   conductivity
-        #   pressure
-        #   pressure temperature
-        #   time of science data
-        #
-        particle = [
-            self._encode_value(CtdmoInstrumentDataParticleKey.INDUCTIVE_ID,
-                               self.raw_data[RAW_INDEX_REC_CT_ID], int),
-            self._encode_value(CtdmoInstrumentDataParticleKey.SERIAL_NUMBER,
-                               self.raw_data[RAW_INDEX_REC_CT_SERIAL], str),
-            self._encode_value(CtdmoInstrumentDataParticleKey.TEMPERATURE,
-                               self.raw_data[RAW_INDEX_REC_CT_TEMPERATURE],
-                               convert_hex_ascii_to_int),
-            self._encode_value(CtdmoInstrumentDataParticleKey.CONDUCTIVITY,
-                               self.raw_data[RAW_INDEX_REC_CT_CONDUCTIVITY],
-                               convert_hex_ascii_to_int),
-            self._encode_value(CtdmoInstrumentDataParticleKey.PRESSURE,
-                               self.raw_data[RAW_INDEX_REC_CT_PRESSURE],
-                               convert_hex_ascii_to_int),
-            self._encode_value(CtdmoInstrumentDataParticleKey.PRESSURE_TEMP,
-                               self.raw_data[RAW_INDEX_REC_CT_PRESSURE_TEMP],
-                               convert_hex_ascii_to_int),
-            self._encode_value(CtdmoInstrumentDataParticleKey.CTD_TIME,
-                               self.raw_data[RAW_INDEX_REC_CT_TIME],
-                               convert_hex_ascii_to_int)
-        ]
-
-        return particle
+        return super(CtdmoGhqrRecoveredInstrumentDataParticle, self)._build_parsed_values()
 
 
 class CtdmoGhqrSioTelemeteredInstrumentDataParticle(DataParticle):
@@ -320,6 +316,19 @@ class CtdmoGhqrRecoveredHostInstrumentDataParticle(DataParticle):
     """
     _data_particle_type = DataParticleType.REC_HOST_CT_PARTICLE
 
+    #
+    # Raw data for this particle is the SIO header timestamp (hex ASCII),
+    # then the inductive ID, temperature, conductivity, pressure and time
+    # decoded from the CT record.
+    # Here, sio_controller_timestamp is deprecated, use port timestamp instead
+    #
+    _schema = ((CtdmoInstrumentDataParticleKey.CONTROLLER_TIMESTAMP, convert_hex_ascii_to_int),
+               (CtdmoInstrumentDataParticleKey.INDUCTIVE_ID, int),
+               (CtdmoInstrumentDataParticleKey.TEMPERATURE, int),
+               (CtdmoInstrumentDataParticleKey.CONDUCTIVITY, int),
+               (CtdmoInstrumentDataParticleKey.PRESSURE, int),
+               (CtdmoInstrumentDataParticleKey.CTD_TIME, int))
+
     def _build_parsed_values(self):
         """
         Build parsed values for Recovered Instrument Data Particle.
@@ -327,42 +336,14 @@ class CtdmoGhqrRecoveredHostInstrumentDataParticle(DataParticle):
         particle with the appropriate tag.
         @throws SampleException If there is a problem with sample creation
         """
-        SECONDS_1900_TO_2000 = (datetime.datetime(2000, 1, 1) - datetime.datetime(1900, 1, 1)).total_seconds()
+        header_timestamp = self.raw_data[0]
+        secs = self.raw_data[-1]
 
-        header_timestamp, inductive_id, data = self.raw_data
-
-        temp = int(data[:5], 16)
-        cond = int(data[5:10], 16)
-        pressure, secs = struct.unpack('<HI', binascii.a2b_hex(data[10:22]))
         self.set_internal_timestamp(timestamp=secs + SECONDS_1900_TO_2000)
-        port_timestamp = float (convert_hex_ascii_to_int(header_timestamp))
-        self.set_port_timestamp(unix_time = port_timestamp)
+        port_timestamp = float(convert_hex_ascii_to_int(header_timestamp))
+        self.set_port_timestamp(unix_time=port_timestamp)
 
-        """
-        Here, sio_controller_timestamp is deprecated, use port timestamp instead
-        """
-        particle = [
-            self._encode_value(CtdmoInstrumentDataParticleKey.CONTROLLER_TIMESTAMP,
-                               header_timestamp,
-                               convert_hex_ascii_to_int),
-            self._encode_value(CtdmoInstrumentDataParticleKey.INDUCTIVE_ID,
-                               inductive_id,
-                               int),
-            self._encode_value(CtdmoInstrumentDataParticleKey.TEMPERATURE,
-                               temp,
-                               int),
-            self._encode_value(CtdmoInstrumentDataParticleKey.CONDUCTIVITY,
-                               cond,
-                               int),
-            self._encode_value(CtdmoInstrumentDataParticleKey.PRESSURE,
-                               pressure,
-                               int),
-            self._encode_value(CtdmoInstrumentDataParticleKey.CTD_TIME,
-                               secs,
-                               int)
-        ]
-
-        return particle
+        return super(CtdmoGhqrRecoveredHostInstrumentDataParticle, self)._build_parsed_values()
 
 
 class CtdmoOffsetDataParticleKey(BaseEnum):
@@ -477,6 +458,31 @@ def parse_co_data(particle_class, chunk, sio_header_timestamp, extract_sample):
     return particles, had_error
 
 
+def decode_ct_record(item):
+    """
+    This function decodes one recovered host CT record into its
+    temperature, conductivity, pressure and time.
+    @throws ValueError, TypeError If the record is not hex ASCII
+    """
+    binascii.a2b_hex(item)
+    temp = int(item[:5], 16)
+    cond = int(item[5:10], 16)
+    pressure, secs = struct.unpack('<HI', binascii.a2b_hex(item[10:22]))
+    return temp, cond, pressure, secs
+
+
+def decode_ct_records(sample_list):
+    """
+    This function decodes a list of recovered host CT records in one pass
+    and returns a list of temperature, conductivity, pressure and time rows.
+    @throws ValueError If any record is not a full CT record of hex ASCII
+    """
+    fields = hex_records_to_array(sample_list, REC_HOST_CT_FIELD_WIDTHS)
+    pressure = fields[:, 2] | fields[:, 3] << 8
+    secs = fields[:, 4] | fields[:, 5] << 8 | fields[:, 6] << 16 | fields[:, 7] << 24
+    return numpy.column_stack((fields[:, 0], fields[:, 1], pressure, secs)).tolist()
+
+
 def parse_ct_data(particle_class, chunk, sio_header_timestamp, extract_sample, inductive_id):
     """
     This function parses a CT record and returns a list of samples.
@@ -486,10 +492,24 @@ def parse_ct_data(particle_class, chunk, sio_header_timestamp, extract_sample, i
     had_error = (False, 0)
 
     sample_list = chunk.split()
-    for item in sample_list:
+
+    #
+    # Decode all the records of the chunk at once. If any of them is bad,
+    # decode them one at a time so only the bad records are left out.
+    #
+    try:
+        decoded_list = decode_ct_records(sample_list)
+    except ValueError:
+        decoded_list = None
+
+    for index, item in enumerate(sample_list):
         try:
-            binascii.a2b_hex(item)
-            sample = extract_sample(particle_class, None, (sio_header_timestamp, inductive_id, item), None)
+            if decoded_list is None:
+                temp, cond, pressure, secs = decode_ct_record(item)
+            else:
+                temp, cond, pressure, secs = decoded_list[index]
+            sample = extract_sample(particle_class, None, (sio_header_timestamp, inductive_id,
+                                                           temp, cond, pressure, secs), None)
             particles.append(sample)
         except (ValueError, TypeError):
             had_error = (True, 0)
@@ -622,10 +642,10 @@ class CtdmoGhqrRecoveredCtParser(SimpleParser):
         if match is not None:
             self._serial_number = int(match.group(REC_CT_SERIAL_GROUP_SERIAL_NUMBER))
 
-    def parse_file(self):
+    def iter_particles(self):
         """
         Parser the file for the recovered CT parser
-        :return: list of result particles
+        :return: generator of result particles
         """
 
         # read the first line in the file
@@ -654,7 +674,7 @@ class CtdmoGhqrRecoveredCtParser(SimpleParser):
             else:
                 particle = self.parse_ct_record(line)
                 if particle is not None:
-                    self._record_buffer.append(particle)
+                    yield particle
 
             # read the next line in the file
             line = self._stream_handle.readline()
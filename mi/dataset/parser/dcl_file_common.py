@@ -16,6 +16,7 @@ from mi.core.log import get_logger
 
 from mi.core.instrument.dataset_data_particle import DataParticle, DataParticleKey
 from mi.core.exceptions import UnexpectedDataException, InstrumentParameterException
+from mi.core.instrument.chunker import RegexSieve
 
 from mi.dataset.dataset_parser import SimpleParser, DataSetDriverConfigKeys
 from mi.dataset.parser.common_regexes import END_OF_LINE_REGEX, SPACE_REGEX, \
@@ -56,6 +57,64 @@ SENSOR_GROUP_MINUTE = 5
 SENSOR_GROUP_SECOND = 6
 SENSOR_GROUP_MILLISECOND = 7
 
+# Number of bytes read at a time from a stream which is not a file
+DCL_READ_SIZE = 65536
+
+
+def dcl_lines(stream_handle, read_size=DCL_READ_SIZE):
+    """
+    Iterate over the newline terminated lines of a DCL log, as iterating over
+    the stream does. A file already reads ahead in large blocks, other streams
+    are read read_size bytes at a time and split into lines.
+    @param stream_handle The stream to read
+    @param read_size Number of bytes to read at a time
+    """
+    if isinstance(stream_handle, file):
+        for line in stream_handle:
+            yield line
+        return
+
+    remainder = ''
+    while True:
+        block = stream_handle.read(read_size)
+        if not block:
+            break
+        lines = (remainder + block).split('\n')
+        remainder = lines.pop()
+        for line in lines:
+            yield line + '\n'
+
+    if remainder:
+        yield remainder
+
+
+class DclLineDispatcher(object):
+    """
+    Matches a line against the data matchers of a list of particle classes
+    with one combined regex, rather than trying each matcher in turn.
+    """
+
+    def __init__(self, matchers, particle_classes):
+        """
+        @param matchers Compiled regexes, in the order they are to be tried
+        @param particle_classes The particle class for each regex
+        """
+        self._sieve = RegexSieve(matchers)
+        self._particle_classes = {}
+        for matcher, particle_class in reversed(zip(matchers, particle_classes)):
+            self._particle_classes[matcher] = particle_class
+
+    def match(self, line):
+        """
+        @param line The line to match
+        @retval A (particle_class, match) tuple for the first matcher which
+            matches the start of the line, or (None, None) if none of them do
+        """
+        matcher, match = self._sieve.match(line)
+        if match is None:
+            return None, None
+        return self._particle_classes[matcher], match
+
 
 class DclInstrumentDataParticle(DataParticle):
     """
@@ -129,17 +188,18 @@ class DclFileCommonParser(SimpleParser):
         if self.particle_classes is None:
             self.particle_classes = (self._particle_class,)
 
-        for line in self._stream_handle:
+        matchers = []
+        for particle_class in self.particle_classes:
+            if hasattr(particle_class, "data_matcher"):
+                self.sensor_data_matcher = particle_class.data_matcher
+            matchers.append(self.sensor_data_matcher)
+        dispatcher = DclLineDispatcher(matchers, self.particle_classes)
 
-            for particle_class in self.particle_classes:
-                if hasattr(particle_class, "data_matcher"):
-                    self.sensor_data_matcher = particle_class.data_matcher
+        for line in dcl_lines(self._stream_handle):
 
-                # If this is a valid sensor data record,
-                # use the extracted fields to generate a particle.
-                sensor_match = self.sensor_data_matcher.match(line)
-                if sensor_match is not None:
-                    break
+            # If this is a valid sensor data record,
+            # use the extracted fields to generate a particle.
+            particle_class, sensor_match = dispatcher.match(line)
 
             if sensor_match is not None:
                 particle = self._extract_sample(particle_class,
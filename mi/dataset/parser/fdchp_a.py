@@ -8,7 +8,6 @@
 __author__ = 'Emily Hahn'
 __license__ = 'Apache 2.0'
 
-import io
 import struct
 import calendar
 
@@ -17,6 +16,7 @@ log = get_logger()
 from mi.core.exceptions import SampleException
 from mi.core.instrument.dataset_data_particle import DataParticle
 
+from mi.dataset.binary_file import BinaryFile
 from mi.dataset.dataset_parser import SimpleParser
 
 # records are 55 bytes long
@@ -88,14 +88,14 @@ class FdchpAParser(SimpleParser):
                                            stream_handle,
                                            exception_callback)
 
-    def parse_file(self):
+    def iter_particles(self):
         """
-        Entry point into parsing the file, loop over each line and interpret it until the entire file is parsed
+        Entry point into parsing the file, loop over each line and interpret it until the entire file is parsed,
+        yielding a particle for each record
         """
 
-        # find out the file size by getting the last offset from the stream handle
-        self._stream_handle.seek(0, io.SEEK_END)
-        end_offset = self._stream_handle.tell()
+        binary_file = BinaryFile(self._stream_handle)
+        end_offset = binary_file.size
 
         # the file must be a multiple of 55 bytes since this is how long a record it, if it is not there is no way to
         # parse this file
@@ -104,13 +104,5 @@ class FdchpAParser(SimpleParser):
             log.error(msg)
             raise SampleException(msg)
 
-        # seek back to the beginning of the file
-        self._stream_handle.seek(0, io.SEEK_SET)
-
-        record = self._stream_handle.read(RECORD_SIZE)
-
-        while record:
-            particle = self._extract_sample(FdchpADataParticle, None, record)
-            self._record_buffer.append(particle)
-
-            record = self._stream_handle.read(RECORD_SIZE)
+        for offset in xrange(0, end_offset, RECORD_SIZE):
+            yield self._extract_sample(FdchpADataParticle, None, binary_file[offset:offset + RECORD_SIZE])
@@ -112,6 +112,8 @@ class FlordLWfpSioParser(SioParser):
         @retval a list of tuples with sample particles encountered in this
         parsing, plus the state. An empty list of nothing was parsed.
         """
+        # return only the particles parsed from the chunks in this call
+        self._result_particles = []
 
         (timestamp, chunk) = self._chunker.get_next_data()
 
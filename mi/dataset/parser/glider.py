@@ -7,6 +7,8 @@
 """
 import re
 import ntplib
+import numpy as np
+from collections import namedtuple
 from math import copysign, isnan
 import scipy.interpolate as interpolate
 from mi.core.log import get_logger
@@ -23,6 +25,13 @@ log = get_logger()
 __author__ = 'Stuart Pearce, Chris Wingard, Nick Almonte, Rene Gelinas'
 __license__ = 'Apache 2.0'
 
+# number of data rows read and checked for science data together
+DATA_BLOCK_SIZE = 1000
+
+# Raw data of a GliderParticle: the column strings of one data row, the dictionary of column label to index in the
+# row, and the column plan of the particle class compiled from those labels
+GliderRecord = namedtuple('GliderRecord', ['values', 'label_columns', 'plan'])
+
 
 class DataParticleType(BaseEnum):
     # Data particle types for the Open Ocean (aka Global) and Coastal gliders.
@@ -81,13 +90,59 @@ class GliderParticle(DataParticle):
     associated with the glider.
     """
 
-    def _parsed_values(self, key_list):
+    # parameters of the particle, in order
+    parameter_keys = []
+    # labels which replace the label of a parameter in newer files
+    _particle_key_to_renamed_label_map = {}
 
-        value_list = [self.raw_data.get(key, None) for key in key_list]
+    @classmethod
+    def column_plan(cls, label_columns):
+        """
+        Compile the decoding of the particle parameters from the rows of a file
+        @param label_columns dictionary of the file's column labels to their column index
+        @returns tuple of (parameter, column index or None if the file does not have it, latitude/longitude flag)
+        """
+        return GliderParticle._column_plan(cls.parameter_keys, label_columns, cls._particle_key_to_renamed_label_map)
 
+    @staticmethod
+    def _column_plan(key_list, label_columns, renamed_labels=None):
+        plan = []
+        for key in key_list:
+            label = renamed_labels.get(key) if renamed_labels else None
+            if label not in label_columns:
+                label = key
+            plan.append((key, label_columns.get(label), '_lat' in label or '_lon' in label))
+        return tuple(plan)
+
+    def _columns(self):
+        """
+        @returns the row values and the dictionary of label to column in them, raw data is either a GliderRecord or
+        a dictionary of label to value
+        """
+        if isinstance(self.raw_data, GliderRecord):
+            return self.raw_data.values, self.raw_data.label_columns
+        return self.raw_data, dict((label, label) for label in self.raw_data)
+
+    def _build_parsed_values(self):
+        """
+        Decode the parameter_keys values from the glider data row
+
+        @returns A list of dictionaries of particle data
+        """
+        if isinstance(self.raw_data, GliderRecord):
+            return self._decode(self.raw_data.plan, self.raw_data.values)
+        values, label_columns = self._columns()
+        return self._decode(self.column_plan(label_columns), values)
+
+    def _parsed_values(self, key_list):
+        values, label_columns = self._columns()
+        return self._decode(GliderParticle._column_plan(key_list, label_columns), values)
+
+    def _decode(self, plan, values):
         result = []
-        for key, value in zip(key_list, value_list):
+        for key, column, lat_lon in plan:
             # encode strings into float or int
+            value = None if column is None else values[column]
             if value is None:
                 # this key was not present in this file, there is no value
                 result.append({DataParticleKey.VALUE_ID: key, DataParticleKey.VALUE: None})
@@ -97,7 +152,7 @@ class GliderParticle(DataParticle):
             elif value == '69696969':
                 # guard against '69696969' parameter values used as fill values
                 result.append({DataParticleKey.VALUE_ID: key, DataParticleKey.VALUE: None})
-            elif '_lat' in key or '_lon' in key:
+            elif lat_lon:
                 # special encoding for latitude and longitude
                 result.append(self._encode_value(key, value, GliderParticle._string_to_ddegrees))
             elif isnan(float(value)) or '.' in value or 'e' in value:
@@ -138,31 +193,13 @@ class CtdgvParticleKey(GliderParticleKey):
 class CtdgvTelemeteredDataParticle(GliderParticle):
     _data_particle_type = DataParticleType.CTDGV_M_GLIDER_INSTRUMENT
     science_parameters = CtdgvParticleKey.science_parameter_list()
-
-    def _build_parsed_values(self):
-        """
-        Extracts CTDGV data from the glider data dictionary initialized with
-        the particle class and puts the data into a CTDGV Telemetered Data Particle.
-
-        @returns A list of dictionaries of particle data
-        @throws SampleException if the data is not a glider data dictionary
-        """
-        return self._parsed_values(CtdgvParticleKey.list())
+    parameter_keys = CtdgvParticleKey.list()
 
 
 class CtdgvRecoveredDataParticle(GliderParticle):
     _data_particle_type = DataParticleType.CTDGV_M_GLIDER_INSTRUMENT_RECOVERED
     science_parameters = CtdgvParticleKey.science_parameter_list()
-
-    def _build_parsed_values(self):
-        """
-        Extracts CTDGV data from the glider data dictionary initialized with
-        the particle class and puts the data into a CTDGV Recovered Data Particle.
-
-        @returns A list of dictionaries of particle data
-        @throws SampleException if the data is not a glider data dictionary
-        """
-        return self._parsed_values(CtdgvParticleKey.list())
+    parameter_keys = CtdgvParticleKey.list()
 
 
 class DostaTelemeteredParticleKey(GliderParticleKey):
@@ -189,31 +226,13 @@ class DostaRecoveredParticleKey(GliderParticleKey):
 class DostaTelemeteredDataParticle(GliderParticle):
     _data_particle_type = DataParticleType.DOSTA_ABCDJM_GLIDER_INSTRUMENT
     science_parameters = DostaTelemeteredParticleKey.science_parameter_list()
-
-    def _build_parsed_values(self):
-        """
-        Takes a GliderParser object and extracts DOSTA data from the
-        data dictionary and puts the data into a DOSTA Data Particle.
-
-        @returns A list of dictionaries of particle data
-        @throws SampleException if the data is not a glider data dictionary
-        """
-        return self._parsed_values(DostaTelemeteredParticleKey.list())
+    parameter_keys = DostaTelemeteredParticleKey.list()
 
 
 class DostaRecoveredDataParticle(GliderParticle):
     _data_particle_type = DataParticleType.DOSTA_ABCDJM_GLIDER_RECOVERED
     science_parameters = DostaRecoveredParticleKey.science_parameter_list()
-
-    def _build_parsed_values(self):
-        """
-        Takes a GliderParser object and extracts DOSTA data from the
-        data dictionary and puts the data into a DOSTA Data Particle.
-
-        @returns A list of dictionaries of particle data
-        @throws SampleException if the data is not a glider data dictionary
-        """
-        return self._parsed_values(DostaRecoveredParticleKey.list())
+    parameter_keys = DostaRecoveredParticleKey.list()
 
 
 class FlordParticleKey(GliderParticleKey):
@@ -231,31 +250,13 @@ class FlordParticleKey(GliderParticleKey):
 class FlordTelemeteredDataParticle(GliderParticle):
     _data_particle_type = DataParticleType.FLORD_M_GLIDER_INSTRUMENT
     science_parameters = FlordParticleKey.science_parameter_list()
-
-    def _build_parsed_values(self):
-        """
-        Takes a GliderParser object and extracts FLORD data from the
-        data dictionary and puts the data into a FLORD Telemetered Data Particle.
-
-        @returns A list of dictionaries of particle data
-        @throws SampleException if the data is not a glider data dictionary
-        """
-        return self._parsed_values(FlordParticleKey.list())
+    parameter_keys = FlordParticleKey.list()
 
 
 class FlordRecoveredDataParticle(GliderParticle):
     _data_particle_type = DataParticleType.FLORD_M_GLIDER_INSTRUMENT_RECOVERED
     science_parameters = FlordParticleKey.science_parameter_list()
-
-    def _build_parsed_values(self):
-        """
-        Takes a GliderParser object and extracts FLORD data from the
-        data dictionary and puts the data into a FLORD Recovered Data Particle.
-
-        @returns A list of dictionaries of particle data
-        @throws SampleException if the data is not a glider data dictionary
-        """
-        return self._parsed_values(FlordParticleKey.list())
+    parameter_keys = FlordParticleKey.list()
 
 
 class FlortTelemeteredParticleKey(GliderParticleKey):
@@ -283,31 +284,13 @@ class FlortRecoveredParticleKey(GliderParticleKey):
 class FlortTelemeteredDataParticle(GliderParticle):
     _data_particle_type = DataParticleType.FLORT_M_GLIDER_INSTRUMENT
     science_parameters = FlortTelemeteredParticleKey.science_parameter_list()
-
-    def _build_parsed_values(self):
-        """
-        Takes a GliderParser object and extracts FLORT data from the
-        data dictionary and puts the data into a FLORT Data Particle.
-
-        @returns A list of dictionaries of particle data
-        @throws SampleException if the data is not a glider data dictionary
-        """
-        return self._parsed_values(FlortTelemeteredParticleKey.list())
+    parameter_keys = FlortTelemeteredParticleKey.list()
 
 
 class FlortRecoveredDataParticle(GliderParticle):
     _data_particle_type = DataParticleType.FLORT_M_GLIDER_RECOVERED
     science_parameters = FlortRecoveredParticleKey.science_parameter_list()
-
-    def _build_parsed_values(self):
-        """
-        Takes a GliderParser object and extracts FLORT data from the
-        data dictionary and puts the data into a FLORT Data Particle.
-
-        @returns A list of dictionaries of particle data
-        @throws SampleException if the data is not a glider data dictionary
-        """
-        return self._parsed_values(FlortRecoveredParticleKey.list())
+    parameter_keys = FlortRecoveredParticleKey.list()
 
 
 class FlortODataParticleKey(GliderParticleKey):
@@ -320,16 +303,7 @@ class FlortODataParticleKey(GliderParticleKey):
 class FlortODataParticle(GliderParticle):
     _data_particle_type = DataParticleType.FLORT_O_GLIDER_DATA
     science_parameters = FlortODataParticleKey.science_parameter_list()
-
-    def _build_parsed_values(self):
-        """
-        Takes a GliderParser object and extracts FLORT data from the
-        data dictionary and puts the data into a FLORT Data Particle.
-
-        @returns A list of dictionaries of particle data
-        @throws SampleException if the data is not a glider data dictionary
-        """
-        return self._parsed_values(FlortODataParticleKey.list())
+    parameter_keys = FlortODataParticleKey.list()
 
 
 class ParadTelemeteredParticleKey(GliderParticleKey):
@@ -348,31 +322,13 @@ class ParadRecoveredParticleKey(GliderParticleKey):
 class ParadTelemeteredDataParticle(GliderParticle):
     _data_particle_type = DataParticleType.PARAD_M_GLIDER_INSTRUMENT
     science_parameters = ParadTelemeteredParticleKey.science_parameter_list()
-
-    def _build_parsed_values(self):
-        """
-        Takes a GliderParser object and extracts PARAD data from the
-        data dictionary and puts the data into a PARAD Data Particle.
-
-        @returns A list of dictionaries of particle data
-        @throws SampleException if the data is not a glider data dictionary
-        """
-        return self._parsed_values(ParadTelemeteredParticleKey.list())
+    parameter_keys = ParadTelemeteredParticleKey.list()
 
 
 class ParadRecoveredDataParticle(GliderParticle):
     _data_particle_type = DataParticleType.PARAD_M_GLIDER_RECOVERED
     science_parameters = ParadRecoveredParticleKey.science_parameter_list()
-
-    def _build_parsed_values(self):
-        """
-        Takes a GliderParser object and extracts PARAD data from the
-        data dictionary and puts the data into a PARAD Data Particle.
-
-        @returns A list of dictionaries of particle data
-        @throws SampleException if the data is not a glider data dictionary
-        """
-        return self._parsed_values(ParadRecoveredParticleKey.list())
+    parameter_keys = ParadRecoveredParticleKey.list()
 
 
 class EngineeringRecoveredParticleKey(GliderParticleKey):
@@ -722,17 +678,7 @@ class GpsPositionDataParticle(GliderParticle):
     keys_exclude_all_times.remove(GliderParticleKey.M_PRESENT_TIME)
     keys_exclude_all_times.remove(GliderParticleKey.SCI_M_PRESENT_TIME)
     keys_exclude_all_times.remove(GliderParticleKey.SCI_M_PRESENT_SECS_INTO_MISSION)
-
-    def _build_parsed_values(self):
-        """
-        Takes a GliderParser object and extracts engineering data from the
-        data dictionary and puts the data into a engineering Data Particle.
-
-        @returns A list of dictionaries of particle data
-        @throws SampleException if the data is not a glider data dictionary
-        """
-        # need to exclude sci times
-        return self._parsed_values(GpsPositionDataParticle.keys_exclude_all_times)
+    parameter_keys = keys_exclude_all_times
 
 
 class EngineeringTelemeteredDataParticle(GliderParticle):
@@ -742,17 +688,7 @@ class EngineeringTelemeteredDataParticle(GliderParticle):
     keys_exclude_sci_times = EngineeringTelemeteredParticleKey.list()
     keys_exclude_sci_times.remove(GliderParticleKey.SCI_M_PRESENT_TIME)
     keys_exclude_sci_times.remove(GliderParticleKey.SCI_M_PRESENT_SECS_INTO_MISSION)
-
-    def _build_parsed_values(self):
-        """
-        Takes a GliderParser object and extracts engineering data from the
-        data dictionary and puts the data into a engineering Data Particle.
-
-        @returns A list of dictionaries of particle data
-        @throws SampleException if the data is not a glider data dictionary
-        """
-        # need to exclude sci times
-        return self._parsed_values(EngineeringTelemeteredDataParticle.keys_exclude_sci_times)
+    parameter_keys = keys_exclude_sci_times
 
 
 class EngineeringMetadataCommonDataParticle(DataParticle):
@@ -786,17 +722,7 @@ class EngineeringScienceTelemeteredDataParticle(GliderParticle):
     keys_exclude_times = EngineeringScienceTelemeteredParticleKey.list()
     keys_exclude_times.remove(GliderParticleKey.M_PRESENT_TIME)
     keys_exclude_times.remove(GliderParticleKey.M_PRESENT_SECS_INTO_MISSION)
-
-    def _build_parsed_values(self):
-        """
-        Takes a GliderParser object and extracts engineering data from the
-        data dictionary and puts the data into a engineering Data Particle.
-
-        @returns A list of dictionaries of particle data
-        @throws SampleException if the data is not a glider data dictionary
-        """
-        # need to exclude m times
-        return self._parsed_values(EngineeringScienceTelemeteredDataParticle.keys_exclude_times)
+    parameter_keys = keys_exclude_times
 
 
 class EngineeringRecoveredDataParticle(GliderParticle):
@@ -806,17 +732,7 @@ class EngineeringRecoveredDataParticle(GliderParticle):
     keys_exclude_sci_times = EngineeringRecoveredParticleKey.list()
     keys_exclude_sci_times.remove(GliderParticleKey.SCI_M_PRESENT_TIME)
     keys_exclude_sci_times.remove(GliderParticleKey.SCI_M_PRESENT_SECS_INTO_MISSION)
-
-    def _build_parsed_values(self):
-        """
-        Takes a GliderParser object and extracts engineering data from the
-        data dictionary and puts the data into a engineering Data Particle.
-
-        @returns A list of dictionaries of particle data
-        @throws SampleException if the data is not a glider data dictionary
-        """
-        # need to exclude sci times
-        return self._parsed_values(EngineeringRecoveredDataParticle.keys_exclude_sci_times)
+    parameter_keys = keys_exclude_sci_times
 
 
 class EngineeringScienceRecoveredDataParticle(GliderParticle):
@@ -826,17 +742,7 @@ class EngineeringScienceRecoveredDataParticle(GliderParticle):
     keys_exclude_times = EngineeringScienceRecoveredParticleKey.list()
     keys_exclude_times.remove(GliderParticleKey.M_PRESENT_TIME)
     keys_exclude_times.remove(GliderParticleKey.M_PRESENT_SECS_INTO_MISSION)
-
-    def _build_parsed_values(self):
-        """
-        Takes a GliderParser object and extracts engineering data from the
-        data dictionary and puts the data into a engineering Data Particle.
-
-        @returns A list of dictionaries of particle data
-        @throws SampleException if the data is not a glider data dictionary
-        """
-        # need to exclude m times
-        return self._parsed_values(EngineeringScienceRecoveredDataParticle.keys_exclude_times)
+    parameter_keys = keys_exclude_times
 
 
 class NutnrMParticleKey(GliderParticleKey):
@@ -859,36 +765,11 @@ class NutnrMDataParticle(GliderParticle):
     # sensor: sci_suna_nitrogen_in_nitrate(mgN/L) 0 # Nitrogen in nitrate in mgN/L.
     #
     # The map below is used to convert the data field name from the new value back to the original
-    # since that is the name of the parameter used in the stream.
+    # since that is the name of the parameter used in the stream. When the file contains a renamed label its column
+    # is used for the parameter in place of the original label.
     _particle_key_to_renamed_label_map = {NutnrMParticleKey.SCI_SUNA_NITRATE_UM: 'sci_suna_nitrate_concentration',
                                           NutnrMParticleKey.SCI_SUNA_NITRATE_MG: 'sci_suna_nitrogen_in_nitrate'}
-
-    def _build_parsed_values(self):
-        """
-        Takes a GliderParser object and extracts NUTNR data from the
-        data dictionary and puts the data into a NUTNR Data Particle.
-
-        @returns A list of dictionaries of particle data
-        @throws SampleException if the data is not a glider data dictionary
-        """
-        field_value_list = self._parsed_values(NutnrMParticleKey.list())
-
-        # Get a list of particles keys that correspond to any renamed labels found in the data file
-        particle_keys_with_renamed_labels = [k for k, v in self._particle_key_to_renamed_label_map.items()
-                                             if v in self.raw_data.keys()]
-
-        # If the file contains the renamed labels, the data values pulled using the original labels will be missing.
-        # Get a list of these labels for which we need to pull the data from the raw_data dict using the renamed labels.
-        field_value_reevaluate_list = [field_value for field_value in field_value_list
-                                       if field_value[DataParticleKey.VALUE_ID] in particle_keys_with_renamed_labels]
-
-        # Get the data using the new (renamed) label and assign it to the field using the particle key.
-        for field_value in field_value_reevaluate_list:
-            renamed_field_id = self._particle_key_to_renamed_label_map[field_value[DataParticleKey.VALUE_ID]]
-            renamed_field_value = self._parsed_values([renamed_field_id])[0]
-            field_value[DataParticleKey.VALUE] = renamed_field_value[DataParticleKey.VALUE]
-
-        return field_value_list
+    parameter_keys = NutnrMParticleKey.list()
 
 
 # noinspection PyPackageRequirements
@@ -911,6 +792,11 @@ class GliderParser(SimpleParser):
         if not hasattr(self, '_particle_class'):
             self._particle_class = None
         self.num_columns = None
+        # index of the column of each label, and the column plan and science parameter columns of each particle
+        # class, compiled from the labels in the header
+        self._label_columns = {}
+        self._column_plans = {}
+        self._science_columns = {}
 
         super(GliderParser, self).__init__(config,
                                            stream_handle,
@@ -1001,11 +887,19 @@ class GliderParser(SimpleParser):
         label_list = self._stream_handle.readline().strip().split()
         self.num_columns = len(label_list)
         self._header_dict['labels'] = label_list
+        # a repeated label refers to its last column, as in the data dictionary
+        self._label_columns = dict((label, index) for index, label in enumerate(label_list))
 
         # the m_present_time label is required to generate particles, raise an exception if it is not found
         if GliderParticleKey.M_PRESENT_TIME not in label_list:
             raise DatasetParserException('The m_present_time label has not been found, which means the timestamp '
                                          'cannot be determined for any particles')
+        self._time_column = self._label_columns[GliderParticleKey.M_PRESENT_TIME]
+
+        for particle_class in self._data_particle_classes():
+            self._column_plans[particle_class] = particle_class.column_plan(self._label_columns)
+            self._science_columns[particle_class] = sorted(set(
+                self._label_columns[key] for key in particle_class.science_parameters if key in self._label_columns))
 
         # read the units line (should be at row 16 of the file at this point)
         data_unit_list = self._stream_handle.readline().strip().split()
@@ -1036,42 +930,88 @@ class GliderParser(SimpleParser):
         Read in the column labels, data type, number of bytes of each
         data type, and the data from an ASCII glider data file.
         """
-        data_dict = {}
-        data_labels = self._header_dict['labels']
         data = data_record.strip().split()
+        self._check_columns(data)
 
+        # extract record to dictionary
+        return dict(zip(self._header_dict['labels'], data))
+
+    def _check_columns(self, data):
         if self.num_columns != len(data):
             err_msg = "GliderParser._read_data(): Num Of Columns NOT EQUAL to Num of Data items: " + \
                       "Expected Columns= %s vs Actual Data= %s" % (self.num_columns, len(data))
             log.error(err_msg)
             raise DatasetParserException(err_msg)
 
-        # extract record to dictionary
-        for ii, value in enumerate(data):
-            label = data_labels[ii]
-            data_dict[label] = value
+    def _read_blocks(self):
+        """
+        Generator over the data rows of the file, split into column strings, in lists of up to DATA_BLOCK_SIZE
+        rows. A row with the wrong number of columns raises a DatasetParserException once the rows before it have
+        been returned.
+        """
+        block = []
+        for line in self._stream_handle:
+            data = line.split()
+            if len(data) != self.num_columns:
+                if block:
+                    yield block
+                    block = []
+                self._check_columns(data)
+            block.append(data)
+            if len(block) == DATA_BLOCK_SIZE:
+                yield block
+                block = []
+        if block:
+            yield block
+
+    def _science_mask(self, values, block, particle_class):
+        """
+        Vector form of _has_science_data over a block of rows
+        @param values 2-D string array of the block
+        @param block list of rows of column strings
+        @param particle_class particle class to check the science parameters of
+        @return boolean array, true for each row with a science parameter value which is not NaN
+        """
+        columns = self._science_columns[particle_class]
+        if not columns:
+            return np.zeros(len(block), bool)
+        try:
+            science_values = values[:, columns].astype(np.float64)
+        except ValueError:
+            # a value which is not a number, check the rows one at a time
+            labels = self._header_dict['labels']
+            return np.array([GliderParser._has_science_data(dict(zip(labels, data)), particle_class)
+                             for data in block], bool)
+        return ~np.isnan(science_values).all(axis=1)
+
+    def _data_particle_classes(self):
+        """
+        @returns the particle classes built from data rows
+        """
+        return [self._particle_class]
 
-        return data_dict
+    def _extract_row(self, particle_class, data, timestamp):
+        """
+        Build a particle of particle_class from a row of column strings, using the column plan of the class
+        """
+        record = GliderRecord(data, self._label_columns, self._column_plans[particle_class])
+        return self._extract_sample(particle_class, None, record, internal_timestamp=timestamp)
 
-    def parse_file(self):
+    def iter_particles(self):
         """
-        Create particles from the data in the file
+        Create particles from the data in the file, yielding each as it is parsed. Rows are read a block at a time
+        and particles are only built for the rows with science data.
         """
         # the header was already read in the init, start at the first sample line
+        for block in self._read_blocks():
+            mask = self._science_mask(np.array(block), block, self._particle_class)
 
-        for line in self._stream_handle:
-
-            # create the dictionary of key/value pairs composed of the labels and the values from the
-            # record being parsed
-            # ex: data_dict = {'sci_bsipar_temp':10.67, n1, n2, nn}
-            data_dict = self._read_data(line)
-
-            if GliderParser._has_science_data(data_dict, self._particle_class):
+            for index in np.flatnonzero(mask):
+                data = block[index]
                 # create the timestamp
-                timestamp = ntplib.system_to_ntp_time(float(data_dict[GliderParticleKey.M_PRESENT_TIME]))
+                timestamp = ntplib.system_to_ntp_time(float(data[self._time_column]))
                 # create the particle
-                self._record_buffer.append(self._extract_sample(
-                    self._particle_class, None, data_dict, internal_timestamp=timestamp))
+                yield self._extract_row(self._particle_class, data, timestamp)
 
     @staticmethod
     def _has_science_data(data_dict, particle_class):
@@ -1138,49 +1078,55 @@ class GliderEngineeringParser(GliderParser):
                                                       stream_handle,
                                                       exception_callback)
 
-    def parse_file(self):
+    def iter_particles(self):
         """
-        Create particles out of the data in the file
+        Create particles out of the data in the file, yielding each as it is parsed. GPS position particles are
+        interpolated over the whole file so they are yielded at the end.
         """
 
         # Create the gps position interpolator
         gps_interpolator = GpsInterpolator()
 
         # the header was already read in the init, start at the samples
-        for data_record in self._stream_handle:
-            # create the dictionary of key/value pairs composed of the labels and the values from the
-            # record being parsed
-            data_dict = self._read_data(data_record)
-            timestamp = ntplib.system_to_ntp_time(float(data_dict[GliderParticleKey.M_PRESENT_TIME]))
-
-            # handle this particle if it is an engineering metadata particle
-            # this is the glider_eng_metadata* particle
+        for block in self._read_blocks():
+            values = np.array(block)
+
+            # check for the presence of engineering data (glider_eng*), GPS data (glider_gps_position)
+            # and science data (glider_eng_sci*) in each row of the block
+            data_mask = self._science_mask(values, block, self._particle_class)
+            gps_mask = self._science_mask(values, block, self._gps_class)
+            science_mask = self._science_mask(values, block, self._science_class)
+
+            rows = data_mask | gps_mask | science_mask
             if not self._metadata_sent:
-                self._record_buffer.append(self.handle_metadata_particle(timestamp))
-
-            # check for the presence of engineering data in the raw data row before continuing
-            # This is the glider_eng* particle
-            if GliderParser._has_science_data(data_dict, self._particle_class):
-                self._record_buffer.append(self._extract_sample(
-                    self._particle_class, None, data_dict, internal_timestamp=timestamp))
-
-            # check for the presence of GPS data in the raw data row before continuing
-            # This is the glider_gps_position particle
-            if GliderParser._has_science_data(data_dict, self._gps_class):
-                gps_interpolator.append_to_buffer(
-                    self._extract_sample(self._gps_class, None, data_dict, internal_timestamp=timestamp))
-            else:
-                log.info("GPS data no-find: ")
+                # the metadata particle takes the timestamp of the first row
+                rows[0] = True
 
-            # check for the presence of science particle data in the raw data row before continuing
-            # This is the glider_eng_sci* particle
-            if GliderParser._has_science_data(data_dict, self._science_class):
-                self._record_buffer.append(self._extract_sample(
-                    self._science_class, None, data_dict, internal_timestamp=timestamp))
+            for index in np.flatnonzero(rows):
+                data = block[index]
+                timestamp = ntplib.system_to_ntp_time(float(data[self._time_column]))
+
+                # handle this particle if it is an engineering metadata particle
+                # this is the glider_eng_metadata* particle
+                if not self._metadata_sent:
+                    yield self.handle_metadata_particle(timestamp)
+
+                if data_mask[index]:
+                    yield self._extract_row(self._particle_class, data, timestamp)
+
+                if gps_mask[index]:
+                    gps_interpolator.append_to_buffer(self._extract_row(self._gps_class, data, timestamp))
+
+                if science_mask[index]:
+                    yield self._extract_row(self._science_class, data, timestamp)
 
         # If there are GPS entries, interpolate them if they contain gps lat/lon values
         if gps_interpolator.get_size() > 0:
-            self._record_buffer.extend(gps_interpolator.process_and_get_objects())
+            for particle in gps_interpolator.process_and_get_objects():
+                yield particle
+
+    def _data_particle_classes(self):
+        return [self._particle_class, self._gps_class, self._science_class]
 
     def handle_metadata_particle(self, timestamp):
         """
@@ -25,6 +25,7 @@ log = get_logger()
 
 from mi.core.exceptions import SampleException, UnexpectedDataException
 
+from mi.dataset.binary_file import BinaryFile
 from mi.dataset.parser.WFP_E_file_common import WfpEFileParser, HEADER_BYTES, STATUS_BYTES_AUGMENTED, \
     STATUS_BYTES, STATUS_START_MATCHER, WFP_E_GLOBAL_RECOVERED_ENG_DATA_SAMPLE_MATCHER, \
     WFP_E_GLOBAL_FLAGS_HEADER_MATCHER, WFP_E_GLOBAL_RECOVERED_ENG_DATA_SAMPLE_BYTES
@@ -76,16 +77,8 @@ class GlobalWfpEFileParser(WfpEFileParser):
           The length of data retrieved.
         An EOFError is raised when the end of the file is reached.
         """
-        # Read in data in blocks so as to not tie up the CPU.
-        block_size = 1024
-        eof = False
-        data = ''
-        while not eof:
-            next_block = self._stream_handle.read(block_size)
-            if next_block:
-                data = data + next_block
-            else:
-                eof = True
+        binary_file = BinaryFile(self._stream_handle)
+        data = binary_file[binary_file.start:]
 
         if data != '':
             self._chunker.add_chunk(data, ntplib.system_to_ntp_time(time.time()))
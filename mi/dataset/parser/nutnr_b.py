@@ -440,9 +440,7 @@ class NutnrBParser(Parser):
             if self._file_parsed is False:
                 self.parse_file()
 
-            # Iterate through the particles returned, and pop them off from the beginning of the record
-            # buffer to the end
-            while len(particles_to_return) < num_records_requested and len(self._record_buffer) > 0:
-                particles_to_return.append(self._record_buffer.pop(0))
+            # Take the particles off the beginning of the record buffer
+            particles_to_return = self._pop_records(num_records_requested)
 
         return particles_to_return
@@ -154,7 +154,7 @@ class NutnrbParser(BufferLoadingParser):
             raise DatasetParserException("Invalid state structure")
         if not (StateKey.POSITION in state_obj):
             raise DatasetParserException("Invalid state keys")
-        self._record_buffer = []
+        self._clear_record_buffer()
         self._state = state_obj
         self._read_state = state_obj
 
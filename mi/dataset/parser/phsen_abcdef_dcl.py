@@ -20,7 +20,7 @@ from mi.dataset.dataset_parser import SimpleParser
 from mi.dataset.dataset_parser import DataSetDriverConfigKeys
 from mi.dataset.parser.common_regexes import ONE_OR_MORE_WHITESPACE_REGEX
 from mi.dataset.parser.utilities import convert_to_signed_int_16_bit, dcl_time_to_ntp, \
-    time_1904_to_ntp
+    hex_records_to_array, time_1904_to_ntp
 
 __author__ = 'Nick Almonte'
 __license__ = 'Apache 2.0'
@@ -281,24 +281,26 @@ class PhsenAbcdefDclMetadataDataParticleKey(BaseEnum):
 class PhsenAbcdefDclInstrumentDataParticle(DataParticle):
     measurement_num_of_chars = 4
 
+    def _convert_measurements(self, measurements_chunk):
+        """
+        Converts a chunk of ascii hex measurements to a list of signed 16 bit integers
+        @returns list a list of measurement values
+        """
+        try:
+            return hex_records_to_array(measurements_chunk, [self.measurement_num_of_chars],
+                                        signed=True)[:, 0].tolist()
+        except ValueError:
+            # a chunk with a partial or non hex measurement is converted one value at a time
+            return [convert_to_signed_int_16_bit(measurements_chunk[i:i+self.measurement_num_of_chars])
+                    for i in range(0, len(measurements_chunk), self.measurement_num_of_chars)]
+
     def _create_light_measurements_array(self, working_record):
         """
         Creates a light measurement array from raw data for a PHSEN DCL Instrument record
         @returns list a list of light measurement values.  From the IDD: (an) array of 92 light measurements
                       (23 sets of 4 measurements)
         """
-        light_measurements_list_int = []
-
-        light_measurements_chunk = working_record[83:-14]
-        light_measurements_ascii_hex = [light_measurements_chunk[i:i+self.measurement_num_of_chars]
-                                        for i in range(0, len(light_measurements_chunk),
-                                                       self.measurement_num_of_chars)]
-
-        for ascii_hex_value in light_measurements_ascii_hex:
-            light_measurements_int = convert_to_signed_int_16_bit(ascii_hex_value)
-            light_measurements_list_int.append(light_measurements_int)
-
-        return light_measurements_list_int
+        return self._convert_measurements(working_record[83:-14])
 
     def _create_reference_light_measurements_array(self, working_record):
         """
@@ -306,18 +308,7 @@ class PhsenAbcdefDclInstrumentDataParticle(DataParticle):
         @returns list a list of light measurement values.  From the IDD: (an) array of 16 measurements
                       (4 sets of 4 measurements)
         """
-        reference_light_measurements_list_int = []
-
-        reference_light_measurements_chunk = working_record[19:-382]
-        reference_light_measurements_ascii_hex = [reference_light_measurements_chunk[i:i+self.measurement_num_of_chars]
-                                                  for i in range(0, len(reference_light_measurements_chunk),
-                                                                 self.measurement_num_of_chars)]
-
-        for ascii_hex_value in reference_light_measurements_ascii_hex:
-            reference_light_measurements_int = convert_to_signed_int_16_bit(ascii_hex_value)
-            reference_light_measurements_list_int.append(reference_light_measurements_int)
-
-        return reference_light_measurements_list_int
+        return self._convert_measurements(working_record[19:-382])
 
     def _build_parsed_values(self):
         """
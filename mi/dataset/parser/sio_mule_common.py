@@ -12,10 +12,13 @@ __author__ = 'Emily Hahn'
 __license__ = 'Apache 2.0'
 
 import re
-import struct
 import time
+from collections import deque
+from itertools import islice
+
 import ntplib
 
+from mi.core.checksum import crc16_x25
 from mi.core.log import get_logger
 log = get_logger()
 from mi.dataset.dataset_parser import BufferLoadingParser
@@ -64,6 +67,13 @@ SIO_HEADER_GROUP_CHECKSUM = 5       # checksum
 # since block numbers roll over after 255
 # each block may contain multiple data samples
 
+# The SIO header is a fixed length
+SIO_HEADER_BYTES = 33
+
+# Size of each read from the stream, and the number of SIO blocks parsed at a time
+SIO_READ_SIZE = 65536
+SIO_BLOCKS_PER_LOAD = 64
+
 # constants for accessing unprocessed and in process data
 START_IDX = 0
 END_IDX = 1
@@ -71,6 +81,172 @@ SAMPLES_PARSED = 2
 SAMPLES_RETURNED = 3
 
 
+def sio_block_end(raw_data, match):
+    """
+    Check the SIO block of a header match: the end of block byte must follow the number of data bytes in the header,
+    and the checksum of the data must match the header.
+    @param: raw_data The data containing the block
+    @param: match The SIO_HEADER_MATCHER match of the header
+    @returns: the index after the end of block byte, or None if the block is not valid or not all in raw_data
+    """
+    data_len = int(match.group(SIO_HEADER_GROUP_DATA_LENGTH), 16)
+    end_packet_idx = match.end(0) + data_len
+
+    if end_packet_idx >= len(raw_data):
+        return None
+
+    #
+    # Get the last byte of the SIO block
+    # and make sure it matches the expected value.
+    #
+    if raw_data[end_packet_idx] != SIO_BLOCK_END:
+        log.debug('End packet at %d is not x03 for header %s', end_packet_idx, match.group(0)[1:32])
+        return None
+
+    #
+    # Calculate the checksum on the data portion of the
+    # SIO block (excludes start of header, header,
+    # and end of header).
+    #
+    actual_checksum = SioParser.calc_checksum(raw_data[match.end(0):end_packet_idx])
+    expected_checksum = match.group(SIO_HEADER_GROUP_CHECKSUM)
+    if actual_checksum != expected_checksum:
+        log.debug("Calculated checksum %s != received checksum %s for header %s and packet %d to %d",
+                  actual_checksum, expected_checksum, match.group(0)[1:32], match.end(0), end_packet_idx)
+        return None
+
+    # The end of SIO block byte is included.
+    return end_packet_idx + 1
+
+
+class SioFramer(object):
+    """
+    Reads the valid SIO blocks of a stream in order. The stream is read SIO_READ_SIZE bytes at a time, and only the
+    unsearched data, an incomplete block and the non-data since the last block are held in memory.
+    """
+
+    def __init__(self, stream_handle, read_size=SIO_READ_SIZE):
+        """
+        @param: stream_handle An already open file-like file handle
+        @param: read_size The number of bytes to read from the stream at a time
+        """
+        self._stream_handle = stream_handle
+        self._read_size = read_size
+
+    def __iter__(self):
+        """
+        Generator of (start, end, non_data, block) for each valid SIO block, where start and end are the offsets of
+        the block in the stream and non_data is everything between the previous block (or the start of the stream)
+        and this one. Non-data after the last block is not returned.
+        """
+        buff = ''
+        offset = 0       # offset of the buffer in the stream
+        position = 0     # where the search for the next header continues
+        non_data = []    # non-data preceding buff[non_data_position]
+        non_data_position = 0
+        eof = False
+
+        while True:
+            match = SIO_HEADER_MATCHER.search(buff, position)
+
+            if match is not None:
+                block_end = sio_block_end(buff, match)
+                if block_end is not None:
+                    non_data.append(buff[non_data_position:match.start(0)])
+                    yield offset + match.start(0), offset + block_end, ''.join(non_data), buff[match.start(0):block_end]
+                    non_data = []
+                    non_data_position = position = block_end
+                    continue
+
+                if eof or match.end(0) + int(match.group(SIO_HEADER_GROUP_DATA_LENGTH), 16) < len(buff):
+                    # this header does not start a valid block, continue after it
+                    position = match.end(0)
+                    continue
+
+                # the block may continue past the buffer, keep it and read more
+                keep = match.start(0)
+
+            elif eof:
+                return
+
+            else:
+                # keep the end of the buffer, which may be the start of a header
+                keep = max(position, len(buff) - SIO_HEADER_BYTES + 1)
+
+            non_data.append(buff[non_data_position:keep])
+            data = self._stream_handle.read(self._read_size)
+            eof = not data
+            buff = buff[keep:] + data
+            offset += keep
+            position = non_data_position = 0
+
+
+class SioChunker(object):
+    """
+    Holds framed SIO blocks for the parse_chunks method of a SioParser, with the same interface as the Chunker.
+    Blocks are added along with the non-data preceding them. Indices are relative to the end of the last block or
+    non-data removed from the chunker, as they are relative to the start of the buffer in the Chunker.
+    """
+
+    def __init__(self):
+        self._data = deque()       # (start, end, timestamp, block) in stream offsets
+        self._non_data = deque()
+        self._base = 0             # stream offset that indices are relative to
+
+    def add_block(self, start, end, non_data, block, timestamp):
+        """
+        Add an SIO block and the non-data preceding it
+        @param: start The offset of the block in the stream
+        @param: end The offset of the end of the block in the stream
+        @param: non_data The non-data up to the start of the block
+        @param: block The SIO block
+        @param: timestamp The time (in NTP4 float format) the block was read
+        """
+        if non_data:
+            self._non_data.append((start - len(non_data), start, timestamp, non_data))
+        self._data.append((start, end, timestamp, block))
+
+    def _get_next(self, chunks, clean):
+        if not chunks:
+            return None, None, None, None
+
+        (start, end, timestamp, chunk) = chunks[0]
+        base = self._base
+
+        if clean:
+            # remove everything up to the end of this chunk
+            self._base = end
+            for chunk_list in (self._data, self._non_data):
+                while chunk_list and chunk_list[0][1] <= end:
+                    chunk_list.popleft()
+
+        return timestamp, chunk, start - base, end - base
+
+    def get_next_data_with_index(self, clean=True):
+        """
+        Get the next SIO block
+        @param: clean Remove the block and anything before it
+        @returns: (timestamp, block, start index, end index), (None, None, None, None) if there are no blocks
+        """
+        return self._get_next(self._data, clean)
+
+    def get_next_data(self, clean=True):
+        (timestamp, chunk, _, _) = self.get_next_data_with_index(clean)
+        return timestamp, chunk
+
+    def get_next_non_data_with_index(self, clean=True):
+        """
+        Get the next non-data
+        @param: clean Remove the non-data and anything before it
+        @returns: (timestamp, non-data, start index, end index), (None, None, None, None) if there is no non-data
+        """
+        return self._get_next(self._non_data, clean)
+
+    def get_next_non_data(self, clean=True):
+        (timestamp, chunk, _, _) = self.get_next_non_data_with_index(clean)
+        return timestamp, chunk
+
+
 class SioParser(BufferLoadingParser):
 
     def __init__(self, config, stream_handle, exception_callback):
@@ -88,7 +264,8 @@ class SioParser(BufferLoadingParser):
                                         None,
                                         exception_callback)
 
-        self.all_data = None
+        self._chunker = SioChunker()
+        self._blocks = None
         self.input_file = stream_handle
         self._record_buffer = []  # holds list of records
 
@@ -98,90 +275,44 @@ class SioParser(BufferLoadingParser):
         Calculate SIO header checksum of data
         @param: data input data to calculate the checksum on
         """
-        crc = 65535
-        if len(data) == 0:
-            return '0000'
-        for iData in range(0, len(data)):
-            short = struct.unpack('H', data[iData] + '\x00')
-            point = 255 & short[0]
-            crc ^= point
-            for i in range(7, -1, -1):
-                if crc & 1:
-                    crc = (crc >> 1) ^ 33800
-                else:
-                    crc >>= 1
-        crc = ~crc
-        # convert to unsigned
-        if crc < 0:
-            crc += 65536
-        # get rid of the '0x' from the hex string
-        crc = "%s" % hex(crc)[2:].upper()
-        # make sure we have the right format for comparing, must be 4 hex digits
-        if len(crc) == 3:
-            crc = '0' + crc
-        elif len(crc) == 2:
-            crc = '00' + crc
-        elif len(crc) == 1:
-            crc = '000' + crc
-        return crc
+        return '%04X' % crc16_x25(data)
 
     def get_records(self, num_records):
         """
         Go ahead and execute the data parsing loop up to a point. This involves
-        getting data from the file, stuffing it in to the chunker, then parsing
-        it and publishing.
+        framing SIO blocks from the file, adding them to the chunker, then parsing
+        them and publishing.
         @param: num_records The number of records to gather
         @returns: Return the list of particles requested, [] if none available
         """
         if num_records <= 0:
             return []
 
-        if self.all_data is None:
-            # need to read in the entire data file first and store it because escape sequences shift position of
-            # in process and unprocessed blocks
-            self.all_data = self.read_file()
-            self.file_complete = True
-
-            # there is more data, add it to the chunker
-            self._chunker.add_chunk(self.all_data, ntplib.system_to_ntp_time(time.time()))
+        if self._blocks is None:
+            self._blocks = iter(SioFramer(self._stream_handle))
 
-            # parse the chunks now that there is new data in the chunker
-            result = self.parse_chunks()
+        while self._buffered_record_count() < num_records and not self.file_complete:
+            self.load_blocks()
 
-            # clear out any non matching data.  Don't do this during parsing because
-            # it cleans out actual data too because of the way the chunker works
-            (nd_timestamp, non_data) = self._chunker.get_next_non_data(clean=True)
-            while non_data is not None:
-                (nd_timestamp, non_data) = self._chunker.get_next_non_data(clean=True)
-
-            # add the parsed chunks to the record_buffer
-            self._record_buffer.extend(result)
-
-        if len(self._record_buffer) < num_records:
-            num_to_fetch = len(self._record_buffer)
-        else:
-            num_to_fetch = num_records
         # pull particles out of record_buffer and publish
-        return_list = self._yank_particles(num_to_fetch)
-
-        return return_list
+        return self._yank_particles(num_records)
 
-    def read_file(self):
+    def load_blocks(self, num_blocks=SIO_BLOCKS_PER_LOAD):
         """
-        This function reads the entire input file.
-        @returns: A string containing the contents of the entire file.
+        Frame the next SIO blocks from the file, add them to the chunker and parse them into the record buffer.
+        @param: num_blocks The number of blocks to add
         """
-        input_buffer = ''
+        timestamp = ntplib.system_to_ntp_time(time.time())
+        count = 0
+        for (start, end, non_data, block) in islice(self._blocks, num_blocks):
+            self._chunker.add_block(start, end, non_data, block, timestamp)
+            count += 1
 
-        while True:
-            # read data in small blocks in order to not block processing
-            next_data = self._stream_handle.read(1024)
-            if next_data != '':
-                input_buffer = input_buffer + next_data
-            else:
-                break
+        if count < num_blocks:
+            self.file_complete = True
 
-        return input_buffer
+        # parse the chunks now that there is new data in the chunker
+        self._record_buffer.extend(self.parse_chunks())
 
     def sieve_function(self, raw_data):
         """
@@ -199,48 +330,11 @@ class SioParser(BufferLoadingParser):
         # Search the entire input buffer to find all possible SIO headers.
         #
         for match in SIO_HEADER_MATCHER.finditer(raw_data):
-            #
-            # Calculate the expected end index of the SIO block.
-            # If there are enough bytes to comprise an entire SIO block,
-            # continue processing.
-            # If there are not enough bytes, we're done parsing this input.
-            #
-            data_len = int(match.group(SIO_HEADER_GROUP_DATA_LENGTH), 16)
-            end_packet_idx = match.end(0) + data_len
-
-            if end_packet_idx < len(raw_data):
-                #
-                # Get the last byte of the SIO block
-                # and make sure it matches the expected value.
-                #
-                end_packet = raw_data[end_packet_idx]
-                if end_packet == SIO_BLOCK_END:
-                    #
-                    # Calculate the checksum on the data portion of the
-                    # SIO block (excludes start of header, header,
-                    # and end of header).
-                    #
-                    actual_checksum = SioParser.calc_checksum(
-                        raw_data[match.end(0):end_packet_idx])
-
-                    expected_checksum = match.group(SIO_HEADER_GROUP_CHECKSUM)
-
-                    #
-                    # If the checksums match, add the start,end indices to
-                    # the return list.  The end of SIO block byte is included.
-                    #
-                    if actual_checksum == expected_checksum:
-                        # even if this is not the right instrument, keep track that
-                        # this packet was processed
-                        return_list.append((match.start(0), end_packet_idx+1))
-                    else:
-                        log.debug("Calculated checksum %s != received checksum %s for header %s and packet %d to %d",
-                                  actual_checksum, expected_checksum,
-                                  match.group(0)[1:32],
-                                  match.end(0), end_packet_idx)
-                else:
-                    log.debug('End packet at %d is not x03 for header %s',
-                              end_packet_idx, match.group(0)[1:32])
+            end = sio_block_end(raw_data, match)
+            if end is not None:
+                # even if this is not the right instrument, keep track that
+                # this packet was processed
+                return_list.append((match.start(0), end))
 
         return return_list
 
@@ -253,14 +347,4 @@ class SioParser(BufferLoadingParser):
         cannot be collected (perhaps due to an EOF), the list will have the
         elements it was able to collect.
         """
-        return_list = []
-        if len(self._record_buffer) < num_to_fetch:
-            num_to_fetch = len(self._record_buffer)
-
-        records_to_return = self._record_buffer[:num_to_fetch]
-        self._record_buffer = self._record_buffer[num_to_fetch:]
-        if len(records_to_return) > 0:
-            for item in records_to_return:
-                return_list.append(item)
-
-        return return_list
+        return self._pop_records(num_to_fetch)
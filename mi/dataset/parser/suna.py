@@ -201,9 +201,7 @@ class SunaParser(Parser):
             if not self._file_parsed:
                 self.parse_file()
 
-            # Iterate through the particles returned, and pop them off from the beginning of the record
-            # buffer to the end
-            while len(particles_to_return) is not num_records_requested and self._record_buffer:
-                particles_to_return.append(self._record_buffer.pop(0))
+            # Take the particles off the beginning of the record buffer
+            particles_to_return = self._pop_records(num_records_requested)
 
         return particles_to_return
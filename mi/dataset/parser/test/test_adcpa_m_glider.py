@@ -129,9 +129,12 @@ class AdcpsMGliderParserUnitTestCase(ParserUnitTestCase):
 
             parser = AdcpPd0Parser(self.config_recov, stream_handle, self.exception_callback)
 
-            # try to get 3 particles, should only get 2 back
-            # the second one should correspond to ensemble 3
+            # the first ensemble gives the first 3 particles, the corrupted 2nd record has not been parsed yet
             parser.get_records(3)
+            self.assertEqual(self.exception_callback_value, [])
+
+            # the corrupted record is reported once the parser reaches it
+            parser.get_records(30)
 
             log.debug('Exceptions : %s', self.exception_callback_value[0])
 
@@ -49,7 +49,11 @@ from mi.dataset.parser.ctdmo_ghqr_sio import \
     CtdmoGhqrRecoveredCtParser, \
     CtdmoGhqrSioTelemeteredParser, \
     INDUCTIVE_ID_KEY, \
-    DataParticleType
+    DataParticleType, \
+    decode_ct_record, \
+    decode_ct_records, \
+    parse_ct_data
+from mi.dataset.parser.utilities import hex_records_to_array
 
 from mi.dataset.dataset_parser import DataSetDriverConfigKeys
 from mi.core.exceptions import DatasetParserException, UnexpectedDataException
@@ -140,6 +144,20 @@ class CtdmoGhqrSioParserUnitTestCase(ParserUnitTestCase):
 
         self.assertEqual(self.exception_callback_value, [])
 
+    def test_long_stream_batches(self):
+        """
+        Each get_records call returns the full number requested until the file runs out, the records left in the
+        buffer by an earlier call count towards the next
+        """
+        with open(os.path.join(RESOURCE_PATH, 'node59p1_0.ctdmo.dat'), 'rb') as stream_handle:
+            parser = CtdmoGhqrSioTelemeteredParser(self.config, stream_handle, self.exception_callback)
+
+            self.assertEqual(len(parser.get_records(300)), 300)
+            self.assertEqual(len(parser.get_records(700)), 700)
+            self.assertEqual(len(parser.get_records(2000)), 668)
+
+        self.assertEqual(self.exception_callback_value, [])
+
     def test_unexpected_id(self):
         """
         Read test data from the file including an sio block with an unexpected id.
@@ -447,3 +465,29 @@ class CtdmoGhqrSioParserUnitTestCase(ParserUnitTestCase):
             self.assertEqual(len(particles), 482)
 
             self.assertEqual(self.exception_callback_value, [])
+
+    def test_decode_ct_records(self):
+        """
+        Verify a block of CT records decodes the same as one record at a time,
+        and that bad records in a block are left out on their own.
+        """
+        self.assertEqual(hex_records_to_array('7fff8000ff', [4, 4, 2], signed=[True, True, False]).tolist(),
+                         [[32767, -32768, 255]])
+        self.assertEqual(hex_records_to_array(['0aF', 'fff'], [2, 1], signed=True).tolist(), [[10, -1], [-1, -1]])
+        self.assertRaises(ValueError, hex_records_to_array, '0g', [2])
+        self.assertRaises(ValueError, hex_records_to_array, ['01', '012'], [2])
+
+        records = ['401e0b858a57f168415f83', '1f81b5921b2a49415f8319', '2099959a156239415f8319']
+        self.assertEqual(decode_ct_records(records), [list(decode_ct_record(record)) for record in records])
+
+        def extract_sample(particle_class, regex, raw_data, timestamp):
+            return raw_data
+
+        (particles, had_error) = parse_ct_data(None, '\n'.join(records), '51EC7601', extract_sample, '01')
+        self.assertEqual(particles, [('51EC7601', '01') + decode_ct_record(record) for record in records])
+        self.assertEqual(had_error, (False, 0))
+
+        (particles, had_error) = parse_ct_data(None, '%s\nnot-hex\n%s\n' % (records[0], records[2]), '51EC7601',
+                                               extract_sample, '01')
+        self.assertEqual(particles, [('51EC7601', '01') + decode_ct_record(record) for record in records[::2]])
+        self.assertEqual(had_error, (True, 0))
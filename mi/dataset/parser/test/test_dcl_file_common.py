@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+
+"""
+@package mi.dataset.parser.test.test_dcl_file_common
+@file mi/dataset/parser/test/test_dcl_file_common.py
+@brief Test code for the line reading, dispatch and timestamps shared by DCL parsers
+"""
+
+__license__ = 'Apache 2.0'
+
+import os
+import re
+import time
+import calendar
+import tempfile
+from StringIO import StringIO
+
+import ntplib
+from nose.plugins.attrib import attr
+
+from mi.core.unit_test import MiUnitTest
+from mi.dataset.parser.dcl_file_common import dcl_lines, DclLineDispatcher
+from mi.dataset.parser.utilities import dcl_time_to_ntp, dcl_time_to_ntp_array
+
+LOG = '2014/08/17 00:57:10.648 first\n\n2014/08/17 00:57:11.648 [dcl:DLOGP6]:second\r\nlast'
+
+
+@attr('UNIT', group='mi')
+class DclFileCommonUnitTestCase(MiUnitTest):
+
+    def test_lines(self):
+        """
+        Lines from streams and files are the same as iterating over them
+        """
+        expected = list(StringIO(LOG))
+        for read_size in (1, 7, 65536):
+            self.assertEqual(list(dcl_lines(StringIO(LOG), read_size)), expected)
+        self.assertEqual(list(dcl_lines(StringIO(''))), [])
+
+        handle, file_path = tempfile.mkstemp()
+        os.write(handle, LOG)
+        os.close(handle)
+        self.addCleanup(os.remove, file_path)
+        with open(file_path, 'rb') as stream_handle:
+            self.assertEqual(list(dcl_lines(stream_handle)), expected)
+
+    def test_dispatch(self):
+        """
+        The first matcher in order which matches a line selects its particle class
+        """
+        number = re.compile(r'(\d+)\n')
+        word = re.compile(r'(?P<word>\w+)\n')
+        dispatcher = DclLineDispatcher([number, word, number], ['number', 'word', 'again'])
+
+        (particle_class, match) = dispatcher.match('123\n')
+        self.assertEqual((particle_class, match.groups()), ('number', ('123',)))
+        (particle_class, match) = dispatcher.match('abc\n')
+        self.assertEqual((particle_class, match.group('word')), ('word', 'abc'))
+        self.assertEqual(dispatcher.match('a b\n'), (None, None))
+
+    def test_timestamp(self):
+        """
+        Cached day timestamps match strptime, values strptime rejects still raise
+        """
+        def strptime_ntp(timestamp_str):
+            no_frac, frac = timestamp_str.split('.')
+            utc_time = calendar.timegm(time.strptime(no_frac, '%Y/%m/%d %H:%M:%S')) + float('.' + frac)
+            return float(ntplib.system_to_ntp_time(utc_time))
+
+        for timestamp_str in ('2014/08/17 00:57:10.648', '2014/08/17 23:59:60.999', '2014/08/17 7:05:03.1',
+                              '2016/02/29 12:00:00.000', '2014/08/17 00:57:10.648'):
+            self.assertEqual(dcl_time_to_ntp(timestamp_str), strptime_ntp(timestamp_str))
+
+        for timestamp_str in ('2014/08/17 24:00:00.000', '2014/08/17 00:60:00.000', '2014/08/17 00:57:10',
+                              '2014/08/17 00:57:10.', '2014/02/30 00:00:00.000'):
+            self.assertRaises(ValueError, dcl_time_to_ntp, timestamp_str)
+
+        timestamps = ['2014/08/17 00:57:10.648', '2014/08/17 7:05:03.1', '2014/08/18 23:59:61.123456789']
+        self.assertEqual(list(dcl_time_to_ntp_array(timestamps)), [strptime_ntp(t) for t in timestamps])
+        self.assertRaises(ValueError, dcl_time_to_ntp_array, timestamps + ['2014/08/17 24:00:00.000'])
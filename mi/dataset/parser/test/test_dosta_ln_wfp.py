@@ -280,6 +280,27 @@ class DostaLnWfpParserUnitTestCase(ParserUnitTestCase):
 
         self.stream_handle.close()
 
+    def test_set_state_reread(self):
+        """
+        Test setting the state back to the position of the last record returned,
+        the records read after that continue from that record
+        """
+        filepath = os.path.join(RESOURCE_PATH, 'E0000001.DAT')
+
+        with open(filepath, 'rb') as stream_handle:
+            parser = DostaLnWfpParser(self.config, {StateKey.POSITION: 0}, stream_handle,
+                                      self.state_callback, self.pub_callback, self.exception_callback)
+            expected = [particle.raw_data for particle in parser.get_records(5)]
+
+        with open(filepath, 'rb') as stream_handle:
+            parser = DostaLnWfpParser(self.config, {StateKey.POSITION: 0}, stream_handle,
+                                      self.state_callback, self.pub_callback, self.exception_callback)
+            particles = parser.get_records(1)
+            parser.set_state(self.state_callback_value)
+            particles.extend(parser.get_records(4))
+
+        self.assertEqual([particle.raw_data for particle in particles], expected)
+
     def test_bad_data(self):
         """
         Ensure that bad data is skipped when it exists.
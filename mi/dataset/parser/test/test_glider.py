@@ -9,6 +9,7 @@
 
 import os
 from StringIO import StringIO
+from mock import patch
 from nose.plugins.attrib import attr
 
 from mi.core.exceptions import ConfigurationException
@@ -1289,6 +1290,23 @@ class ENGRecoveredGliderTest(GliderParserUnitTestCase):
             #                       ENG_RESOURCE_PATH)
             self.assertEquals(self.exception_callback_value, [])
 
+    def test_data_blocks(self):
+        """
+        Test that reading rows in small blocks gives the same particles as the default block size
+        """
+        def parse():
+            with open(os.path.join(ENG_RESOURCE_PATH, 'cp_388_2014_280_0_312.full.mrg'), 'rU') as file_handle:
+                parser = GliderEngineeringParser(self.config, file_handle, self.exception_callback)
+                particles = [particle.generate_dict() for particle in parser.get_records(32000)]
+            for particle in particles:
+                del particle['driver_timestamp']
+            return particles
+
+        expected = parse()
+        with patch('mi.dataset.parser.glider.DATA_BLOCK_SIZE', 7):
+            self.assertEqual(parse(), expected)
+        self.assertEquals(self.exception_callback_value, [])
+
     def test_for_69_file(self):
         """
         Test a real file and confirm no exceptions occur with file containing 69696969 fill values
@@ -5,6 +5,7 @@
 @brief A test parser for the nutnr series m instrument through a glider
 """
 import os
+from StringIO import StringIO
 from nose.plugins.attrib import attr
 
 from mi.core.exceptions import SampleException, ConfigurationException, DatasetParserException
@@ -42,6 +43,23 @@ class NutnrMGliderParserUnitTestCase(ParserUnitTestCase):
 
             self.assertEqual(self.exception_callback_value, [])
 
+    def test_renamed_labels(self):
+        """
+        Test that the nitrate parameters are read from the columns of the labels used in newer files
+        """
+        with open(os.path.join(RESOURCE_PATH, 'single.mrg'), 'rU') as file_handle:
+            contents = file_handle.read()
+        contents = contents.replace('sci_suna_nitrate_um', 'sci_suna_nitrate_concentration')
+        contents = contents.replace('sci_suna_nitrate_mg', 'sci_suna_nitrogen_in_nitrate')
+
+        parser = GliderParser(self.config, StringIO(contents), self.exception_callback)
+
+        particles = parser.get_records(1)
+
+        self.assert_particles(particles, "single.yml", RESOURCE_PATH)
+
+        self.assertEqual(self.exception_callback_value, [])
+
     def test_many(self):
         """
         Test a simple case with more messages
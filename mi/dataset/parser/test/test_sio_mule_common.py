@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+
+"""
+@package mi.dataset.parser.test.test_sio_mule_common
+@file mi/dataset/parser/test/test_sio_mule_common.py
+@brief Test code for framing SIO blocks
+"""
+
+__license__ = 'Apache 2.0'
+
+from StringIO import StringIO
+
+from nose.plugins.attrib import attr
+
+from mi.core.unit_test import MiUnitTest
+from mi.dataset.parser.sio_mule_common import SioChunker, SioFramer, SioParser, SIO_HEADER_BYTES
+
+
+def make_block(data, instrument_id='FL', block_number=1):
+    """
+    SIO block of data with a valid header
+    """
+    header = '\x01%s1234501_%04Xu51EC7601_%02X_%s\x02' % (instrument_id, len(data), block_number,
+                                                         SioParser.calc_checksum(data))
+    assert len(header) == SIO_HEADER_BYTES
+    return header + data + '\x03'
+
+
+@attr('UNIT', group='mi')
+class SioFramerUnitTestCase(MiUnitTest):
+
+    def setUp(self):
+        self.block_a = make_block('first block')
+        self.block_b = make_block('second block', block_number=2)
+        bad_checksum = self.block_a.replace('first', 'worst')
+        self.data = 'junk' + self.block_a + self.block_b + bad_checksum + self.block_a + make_block('truncated')[:-4]
+
+    def test_frame(self):
+        """
+        Valid blocks are framed with the non-data before them, at any read size
+        """
+        start_b = 4 + len(self.block_a)
+        start_c = start_b + len(self.block_b) + len(self.block_a)
+        expected = [(4, start_b, 'junk', self.block_a),
+                    (start_b, start_b + len(self.block_b), '', self.block_b),
+                    (start_c, start_c + len(self.block_a), self.block_a.replace('first', 'worst'), self.block_a)]
+
+        for read_size in (1, 5, SIO_HEADER_BYTES, 65536):
+            self.assertEqual(list(SioFramer(StringIO(self.data), read_size)), expected)
+
+        self.assertEqual(list(SioFramer(StringIO('no blocks'))), [])
+
+    def test_chunker(self):
+        """
+        The chunker returns blocks and non-data with indices after the last block removed
+        """
+        chunker = SioChunker()
+        for (start, end, non_data, block) in SioFramer(StringIO(self.data)):
+            chunker.add_block(start, end, non_data, block, 1.0)
+
+        self.assertEqual(chunker.get_next_non_data_with_index(clean=False), (1.0, 'junk', 0, 4))
+        self.assertEqual(chunker.get_next_data_with_index(), (1.0, self.block_a, 4, 4 + len(self.block_a)))
+
+        # the next non-data follows the second block
+        (_, non_data, non_start, non_end) = chunker.get_next_non_data_with_index(clean=False)
+        (_, block, start, end) = chunker.get_next_data_with_index()
+        self.assertEqual((block, start, end), (self.block_b, 0, len(self.block_b)))
+        self.assertEqual((non_start, non_end), (len(self.block_b), len(self.block_b) + len(self.block_a)))
+
+        self.assertEqual(chunker.get_next_data(), (1.0, self.block_a))
+        self.assertEqual(chunker.get_next_non_data(), (None, None))
+        self.assertEqual(chunker.get_next_data_with_index(), (None, None, None, None))
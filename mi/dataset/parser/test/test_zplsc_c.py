@@ -9,6 +9,7 @@
 
 import os
 
+from mock import patch
 from nose.plugins.attrib import attr
 
 from mi.core.log import get_logger
@@ -145,6 +146,27 @@ class ZplscCParserUnitTestCase(ParserUnitTestCase):
 
         log.debug('===== END TEST VARIABLE NUM OF CHANNELS =====')
 
+    @patch('mi.dataset.parser.zplsc_c.DECODE_BATCH_SIZE', 3)
+    def test_decode_batches(self):
+        """
+        Records are decoded in batches, each batch grouped by the number of bins of the channels.
+        Batches of 3 records split both the records with modified channels and the bad timestamp.
+        """
+        with open(self.file_path('15100520-Test-Var_Chans.01A')) as in_file:
+            parser = self.create_zplsc_c_parser(in_file)
+            result = parser.get_records(10)
+
+            self.assertEqual(len(result), 10)
+            self.assert_particles(result, '15100520-Test-Var_Chans.01A.yml', RESOURCE_PATH)
+
+        with open(self.file_path('15100520-Test-Corrupt.01A')) as in_file:
+            parser = self.create_zplsc_c_parser(in_file)
+            result = parser.get_records(10)
+
+            self.assertEqual(len(result), 8)
+            self.assert_particles(result, '15100520-Test-Corrupt.01A.yml', RESOURCE_PATH)
+            self.assertEqual(len(self.exception_callback_value), 2)
+
     def test_bad_timestamp(self):
         """
         Ensure that bad data is skipped when it exists.
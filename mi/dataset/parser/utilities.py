@@ -7,13 +7,17 @@ Release notes:
 
 initial release
 """
+import binascii
 from datetime import datetime
+import operator
 import time
 import ntplib
 import calendar
 
+import numpy
 
 from mi.core.log import get_logger
+from mi.core.time_tools import FixedWidthTimestampFormat
 
 __author__ = 'Joe Padula'
 __license__ = 'Apache 2.0'
@@ -28,6 +32,58 @@ ZULU_TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S.%fZ"
 # Example: 2014/08/17 00:57:10.648
 DCL_CONTROLLER_TIMESTAMP_FORMAT = "%Y/%m/%d %H:%M:%S.%f"
 
+# Seconds from the NTP epoch to the UNIX epoch
+NTP_UNIX_EPOCH_OFFSET = (datetime(1970, 1, 1) - datetime(1900, 1, 1)).days * 86400
+
+# DCL Controller Timestamps go through time.strptime, which allows leap seconds
+_DCL_TIMESTAMP = FixedWidthTimestampFormat(DCL_CONTROLLER_TIMESTAMP_FORMAT, max_second=61)
+
+# Fast path for each datetime.strptime format converted so far
+_timestamp_formats = {}
+
+
+def _timestamp_format(format_str):
+    """
+    :param format_str: a datetime.strptime format string
+    :return: the FixedWidthTimestampFormat for format_str
+    """
+    timestamp_format = _timestamp_formats.get(format_str)
+    if timestamp_format is None:
+        timestamp_format = _timestamp_formats[format_str] = FixedWidthTimestampFormat(format_str)
+    return timestamp_format
+
+
+def _timestamp_to_ntp(timestamp_str, format_str):
+    """
+    Converts a formatted timestamp string to NTP time, as the seconds from
+    datetime(1900, 1, 1) to the datetime parsed with format_str
+    :param timestamp_str: a formatted timestamp string
+    :param format_str: format string used to decode the timestamp_str
+    :return: Time (float64) in seconds from epoch 01-01-1900.
+    """
+
+    fields = _timestamp_format(format_str).parse(timestamp_str)
+    if fields is None:
+        timestamp = datetime.strptime(timestamp_str, format_str)
+        return (timestamp - datetime(1900, 1, 1)).total_seconds()
+
+    # the same division of total microseconds timedelta.total_seconds does
+    seconds, microsecond = fields
+    return operator.truediv((seconds + NTP_UNIX_EPOCH_OFFSET) * 1000000 + microsecond, 1000000)
+
+
+def _timestamps_to_utc_array(timestamps, timestamp_format, convert):
+    """
+    Converts an array of timestamp strings to UTC times, using convert for
+    the timestamps which are not in the fixed layout of timestamp_format
+    """
+    timestamps = numpy.asarray(timestamps)
+    seconds, microsecond, valid = timestamp_format.parse_array(timestamps)
+    utc_times = seconds + microsecond / 1000000.0
+    for index in numpy.flatnonzero(~valid):
+        utc_times[index] = convert(timestamps.flat[index])
+    return utc_times.reshape(timestamps.shape)
+
 
 def formatted_timestamp_utc_time(timestamp_str, format_str):
     """
@@ -39,11 +95,28 @@ def formatted_timestamp_utc_time(timestamp_str, format_str):
     :return: utc time value
     """
 
+    fields = _timestamp_format(format_str).parse(timestamp_str)
+    if fields is not None:
+        return fields[0] + fields[1] / 1000000.0
+
     dt = datetime.strptime(timestamp_str, format_str)
 
     return calendar.timegm(dt.timetuple()) + (dt.microsecond / 1000000.0)
 
 
+def formatted_timestamp_utc_time_array(timestamps, format_str):
+    """
+    Converts an array of formatted timestamp strings to UTC times, the same
+    as formatted_timestamp_utc_time gives for each of them
+    :param timestamps: array of formatted timestamp strings
+    :param format_str: format string used to decode the timestamps
+    :return: array of utc time values
+    """
+
+    return _timestamps_to_utc_array(timestamps, _timestamp_format(format_str),
+                                    lambda timestamp_str: formatted_timestamp_utc_time(timestamp_str, format_str))
+
+
 def zulu_timestamp_to_utc_time(zulu_timestamp_str):
     """
     Converts a zulu formatted timestamp timestamp string to UTC time.
@@ -104,10 +177,17 @@ def time_2000_to_ntp(time_2000):
 def dcl_time_to_utc(dcl_controller_timestamp_str):
     """
     Converts a DCL controller timestamp string to UTC time.
+    A timestamp in the fixed YYYY/MM/DD HH:MM:SS.ffffff layout is converted
+    by adding the time of day to the cached start of its day, anything else
+    goes through strptime.
     :param dcl_controller_timestamp_str: a DCL controller timestamp string
     :return: UTC time in seconds and microseconds precision
     """
 
+    fields = _DCL_TIMESTAMP.parse(dcl_controller_timestamp_str)
+    if fields is not None:
+        return fields[0] + fields[1] / 1000000.0
+
     no_frac_timestamp_str, frac_timestamp_str = dcl_controller_timestamp_str.split('.')
     no_frac_format_str, frac_format_str = DCL_CONTROLLER_TIMESTAMP_FORMAT.split('.')
 
@@ -130,6 +210,19 @@ def dcl_time_to_ntp(dcl_controller_timestamp_str):
     return float(ntplib.system_to_ntp_time(utc_time))
 
 
+def dcl_time_to_ntp_array(dcl_controller_timestamps):
+    """
+    Converts an array of DCL controller timestamp strings to NTP times, the
+    same as dcl_time_to_ntp gives for each of them
+    :param dcl_controller_timestamps: array of DCL controller timestamp strings
+    :return: NTP times (float64 array) in seconds and microseconds precision
+    """
+
+    utc_times = _timestamps_to_utc_array(dcl_controller_timestamps, _DCL_TIMESTAMP, dcl_time_to_utc)
+
+    return ntplib.system_to_ntp_time(utc_times)
+
+
 def timestamp_yyyymmddhhmmss_to_ntp(timestamp_str):
     """
     Converts a timestamp string, in the YYYYMMDDHHMMSS format, to NTP time.
@@ -137,9 +230,7 @@ def timestamp_yyyymmddhhmmss_to_ntp(timestamp_str):
     :return: Time (float64) in seconds from epoch 01-01-1900.
     """
 
-    timestamp = datetime.strptime(timestamp_str, "%Y%m%d%H%M%S")
-
-    return (timestamp - datetime(1900, 1, 1)).total_seconds()
+    return _timestamp_to_ntp(timestamp_str, "%Y%m%d%H%M%S")
 
 
 def timestamp_yyyy_mm_dd_hh_mm_ss_to_ntp(timestamp_str):
@@ -149,9 +240,7 @@ def timestamp_yyyy_mm_dd_hh_mm_ss_to_ntp(timestamp_str):
     :return: Time (float64) in seconds from epoch 01-01-1900.
     """
 
-    timestamp = datetime.strptime(timestamp_str, "%Y/%m/%d %H:%M:%S")
-
-    return (timestamp - datetime(1900, 1, 1)).total_seconds()
+    return _timestamp_to_ntp(timestamp_str, "%Y/%m/%d %H:%M:%S")
 
 
 def timestamp_yyyy_mm_dd_hh_mm_ss_csv_to_ntp(timestamp_str):
@@ -161,9 +250,7 @@ def timestamp_yyyy_mm_dd_hh_mm_ss_csv_to_ntp(timestamp_str):
     :return: Time (float64) in seconds from epoch 01-01-1900.
     """
 
-    timestamp = datetime.strptime(timestamp_str, "%Y,%m,%d,%H,%M,%S")
-
-    return (timestamp - datetime(1900, 1, 1)).total_seconds()
+    return _timestamp_to_ntp(timestamp_str, "%Y,%m,%d,%H,%M,%S")
 
 
 def timestamp_ddmmyyyyhhmmss_to_ntp(timestamp_str):
@@ -172,8 +259,7 @@ def timestamp_ddmmyyyyhhmmss_to_ntp(timestamp_str):
     :param timestamp_str: a timestamp string in the format DD Mon YYYY HH:MM:SS
     :return: Time (float64) in seconds from epoch 01-01-1900.
     """
-    timestamp = datetime.strptime(timestamp_str, "%d %b %Y %H:%M:%S")
-    return (timestamp - datetime(1900, 1, 1)).total_seconds()
+    return _timestamp_to_ntp(timestamp_str, "%d %b %Y %H:%M:%S")
 
 
 def timestamp_mmddyyhhmmss_to_ntp(timestamp_str):
@@ -183,9 +269,7 @@ def timestamp_mmddyyhhmmss_to_ntp(timestamp_str):
     :return: Time (float64) in seconds from epoch 01-01-1900.
     """
 
-    timestamp = datetime.strptime(timestamp_str, "%m/%d/%y %H:%M:%S")
-
-    return (timestamp - datetime(1900, 1, 1)).total_seconds()
+    return _timestamp_to_ntp(timestamp_str, "%m/%d/%y %H:%M:%S")
 
 
 def timestamp_ddmmyyhhmmss_to_ntp(timestamp_str):
@@ -195,9 +279,7 @@ def timestamp_ddmmyyhhmmss_to_ntp(timestamp_str):
     :return: Time (float64) in seconds from epoch 01-01-1900.
     """
 
-    timestamp = datetime.strptime(timestamp_str, "%d/%m/%y %H:%M:%S")
-
-    return (timestamp - datetime(1900, 1, 1)).total_seconds()
+    return _timestamp_to_ntp(timestamp_str, "%d/%m/%y %H:%M:%S")
 
 def mac_timestamp_to_utc_timestamp(mac_timestamp):
     """
@@ -261,6 +343,13 @@ def sum_hex_digits(ascii_hex_str):
     if len_of_ascii_hex % 2 != 0:
         raise ValueError("The ASCII Hex string is not divisible by 2.")
 
+    # Sum the bytes in one pass when the string is all hex digits, int() also
+    # allows signs and whitespace so anything else takes the loop below
+    try:
+        return hex(sum(bytearray(binascii.a2b_hex(ascii_hex_str))))
+    except (TypeError, ValueError):
+        pass
+
     x = 0
 
     # Iterate through each byte of ascii hex
@@ -272,6 +361,57 @@ def sum_hex_digits(ascii_hex_str):
     return hex(x)
 
 
+# Value of each hex digit character, -1 for any other character
+_HEX_DIGIT_VALUES = numpy.full(256, -1, dtype=numpy.int64)
+for _digits, _first_value in (('0123456789', 0), ('abcdef', 10), ('ABCDEF', 10)):
+    _HEX_DIGIT_VALUES[numpy.frombuffer(_digits, dtype=numpy.uint8)] = numpy.arange(_first_value,
+                                                                                 _first_value + len(_digits))
+
+# Number of hex digits in the widest field which fits in an int64
+MAX_HEX_FIELD_WIDTH = 15
+
+
+def hex_records_to_array(records, field_widths, signed=False):
+    """
+    Decode a block of fixed width hex ascii records into integers in one call
+    :param records: string of records back to back, or a sequence of record strings
+    :param field_widths: number of hex digits in each field of a record
+    :param signed: True if the fields are two's complement signed integers of 4 bits per
+        digit, or a sequence with a flag for each field (default: all unsigned)
+    :return: int64 array with a row for each record and a column for each field
+    :raises ValueError: if a record is not the sum of the field widths long or has
+        a character which is not a hex digit
+    """
+    if not field_widths or min(field_widths) < 1 or max(field_widths) > MAX_HEX_FIELD_WIDTH:
+        raise ValueError("Hex field widths must be from 1 to %d digits" % MAX_HEX_FIELD_WIDTH)
+    if isinstance(signed, bool):
+        signed = [signed] * len(field_widths)
+
+    record_width = sum(field_widths)
+    if isinstance(records, basestring):
+        if len(records) % record_width:
+            raise ValueError("Hex records are not a multiple of %d digits" % record_width)
+    else:
+        if any(len(record) != record_width for record in records):
+            raise ValueError("Hex records are not all %d digits" % record_width)
+        records = ''.join(records)
+
+    digits = _HEX_DIGIT_VALUES[numpy.frombuffer(records, dtype=numpy.uint8)].reshape(-1, record_width)
+    if (digits < 0).any():
+        raise ValueError("Hex records contain a character which is not a hex digit")
+
+    values = numpy.empty((len(digits), len(field_widths)), dtype=numpy.int64)
+    start = 0
+    for column, (width, is_signed) in enumerate(zip(field_widths, signed)):
+        field = digits[:, start:start + width].dot(16 ** numpy.arange(width - 1, -1, -1, dtype=numpy.int64))
+        if is_signed:
+            field[field >= 1 << (4 * width - 1)] -= 1 << (4 * width)
+        values[:, column] = field
+        start += width
+
+    return values
+
+
 def particle_to_yml(particles, filename, mode='w+'):
     """
     This function write particles to .yml file and create .yml file for testing
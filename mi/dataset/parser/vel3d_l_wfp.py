@@ -25,6 +25,7 @@ from mi.core.common import BaseEnum
 from mi.core.instrument.dataset_data_particle import DataParticle, DataParticleKey
 from mi.core.exceptions import SampleException
 
+from mi.dataset.binary_file import BinaryFile
 from mi.dataset.dataset_parser import \
     Parser, \
     SimpleParser
@@ -512,13 +513,16 @@ class Vel3dLWfpParser(SimpleParser, Vel3dLParser):
 
     def parse_file(self):
 
+        binary_file = BinaryFile(self._stream_handle)
+        position = binary_file.start
+
         while True:
 
             # Extract the number of data_bytes.
             # This is the number of bytes in the FSI Header and FSI records,
             # and excludes the data_bytes field and the time fields.
 
-            size_header = self._stream_handle.read(DATA_BYTES_SIZE)
+            size_header = binary_file[position:position + DATA_BYTES_SIZE]
 
             # exit loop when we hit EOF
             if len(size_header) < DATA_BYTES_SIZE:
@@ -534,7 +538,9 @@ class Vel3dLWfpParser(SimpleParser, Vel3dLParser):
             # followed by the Time Record to the parent class
             # parse_vel3d_data method
 
-            data_buffer = size_header + self._stream_handle.read(data_bytes + TIME_RECORD_SIZE)
+            end = position + DATA_BYTES_SIZE + data_bytes + TIME_RECORD_SIZE
+            data_buffer = binary_file[position:end]
+            position = end
 
             if len(data_buffer) != DATA_BYTES_SIZE + data_bytes + TIME_RECORD_SIZE:
                 message = 'unexpectedly hit EOF parsing data block'
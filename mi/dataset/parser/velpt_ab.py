@@ -183,9 +183,9 @@ class VelptAbParser(SimpleParser):
         self._first_diagnostics_record = False
         self._diagnostics_count = 0
         self._total_diagnostic_records = 0
-        self._velocity_data_dict = {}
+        self._velocity_data_values = ()
         self._diagnostics_header_dict = {}
-        self._diagnostics_data_dict = {}
+        self._diagnostics_data_values = ()
         self._hardware_config_dict = VelptAbDataParticle.generate_empty_hardware_config_dict()
         self._head_config_dict = VelptAbDataParticle.generate_empty_head_config_dict()
         self._user_config_dict = VelptAbDataParticle.generate_empty_user_config_dict()
@@ -471,11 +471,11 @@ class VelptAbParser(SimpleParser):
                     self._diagnostics_count = 0
                     self._total_diagnostic_records = 0
 
-        velocity_data_dict = VelptAbDataParticle.generate_data_dict(self._current_record)
+        velocity_data_values = VelptAbDataParticle.generate_data_values(self._current_record)
 
         particle = self._extract_sample(self._velocity_data_class,
                                         None,
-                                        velocity_data_dict,
+                                        velocity_data_values,
                                         internal_timestamp=timestamp)
 
         self._record_buffer.append(particle)
@@ -491,7 +491,7 @@ class VelptAbParser(SimpleParser):
         timestamp = VelptAbDataParticle.get_timestamp(self._current_record)
         date_time_group = VelptAbDataParticle.get_date_time_string(self._current_record)
 
-        self._diagnostics_data_dict = VelptAbDataParticle.generate_data_dict(self._current_record)
+        self._diagnostics_data_values = VelptAbDataParticle.generate_data_values(self._current_record)
 
         # Check to see if the instrument metadata particle has been produced yet
         # If not, produce it now as this is the first diagnostics record. This assumes
@@ -528,7 +528,7 @@ class VelptAbParser(SimpleParser):
 
         particle = self._extract_sample(self._diagnostics_class,
                                         None,
-                                        self._diagnostics_data_dict,
+                                        self._diagnostics_data_values,
                                         internal_timestamp=timestamp)
 
         self._record_buffer.append(particle)
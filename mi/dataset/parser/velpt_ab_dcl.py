@@ -157,9 +157,9 @@ class VelptAbDclParser(SimpleParser):
         self._first_diagnostics_record = False
         self._diagnostics_count = 0
         self._total_diagnostic_records = 0
-        self._velocity_data_dict = {}
+        self._velocity_data_values = ()
         self._diagnostics_header_dict = {}
-        self._diagnostics_data_dict = {}
+        self._diagnostics_data_values = ()
         self._diagnostics_header_record = ''
         self._file_handle = file_handle
 
@@ -352,11 +352,11 @@ class VelptAbDclParser(SimpleParser):
                     self._diagnostics_count = 0
                     self._total_diagnostic_records = 0
 
-        velocity_data_dict = VelptAbDclDataParticle.generate_data_dict(self._current_record)
+        velocity_data_values = VelptAbDclDataParticle.generate_data_values(self._current_record)
 
         particle = self._extract_sample(self._velocity_data_class,
                                         None,
-                                        velocity_data_dict,
+                                        velocity_data_values,
                                         internal_timestamp=timestamp)
 
         self._record_buffer.append(particle)
@@ -372,7 +372,7 @@ class VelptAbDclParser(SimpleParser):
         timestamp = VelptAbDclDataParticle.get_timestamp(self._current_record)
         date_time_group = VelptAbDclDataParticle.get_date_time_string(self._current_record)
 
-        self._diagnostics_data_dict = VelptAbDclDataParticle.generate_data_dict(self._current_record)
+        self._diagnostics_data_values = VelptAbDclDataParticle.generate_data_values(self._current_record)
 
         # Upon encountering the first diagnostics record, use its timestamp
         # for diagnostics metadata particle. Produce that metadata particle now.
@@ -403,7 +403,7 @@ class VelptAbDclParser(SimpleParser):
 
         particle = self._extract_sample(self._diagnostics_class,
                                         None,
-                                        self._diagnostics_data_dict,
+                                        self._diagnostics_data_values,
                                         internal_timestamp=timestamp)
 
         self._record_buffer.append(particle)
@@ -64,6 +64,28 @@ class VelptAbDclDataParticleKey(BaseEnum):
     DISTANCE_BEAM4 = 'distance_beam4'                          # PD460
 
 
+# Parameters of the velocity and diagnostics data particles, in order, with their encoding
+DATA_SCHEMA = (
+    (VelptAbDclDataParticleKey.DATE_TIME_STRING, str),
+    (VelptAbDclDataParticleKey.ERROR_CODE, int),
+    (VelptAbDclDataParticleKey.ANALOG1, int),
+    (VelptAbDclDataParticleKey.BATTERY_VOLTAGE_DV, int),
+    (VelptAbDclDataParticleKey.SOUND_SPEED_DMS, int),
+    (VelptAbDclDataParticleKey.HEADING_DECIDEGREE, int),
+    (VelptAbDclDataParticleKey.PITCH_DECIDEGREE, int),
+    (VelptAbDclDataParticleKey.ROLL_DECIDEGREE, int),
+    (VelptAbDclDataParticleKey.PRESSURE_MBAR, int),
+    (VelptAbDclDataParticleKey.STATUS, int),
+    (VelptAbDclDataParticleKey.TEMPERATURE_CENTIDEGREE, int),
+    (VelptAbDclDataParticleKey.VELOCITY_BEAM1, int),
+    (VelptAbDclDataParticleKey.VELOCITY_BEAM2, int),
+    (VelptAbDclDataParticleKey.VELOCITY_BEAM3, int),
+    (VelptAbDclDataParticleKey.AMPLITUDE_BEAM1, int),
+    (VelptAbDclDataParticleKey.AMPLITUDE_BEAM2, int),
+    (VelptAbDclDataParticleKey.AMPLITUDE_BEAM3, int),
+)
+
+
 class VelptAbDclDataParticle(DataParticle):
     """
     Class for creating the metadata & data particles for velpt_ab_dcl
@@ -181,13 +203,12 @@ class VelptAbDclDataParticle(DataParticle):
                                           VelptAbDclDataParticle.cell_number_diagnostics_offset])[0]
 
     @staticmethod
-    def generate_data_dict(record):
+    def generate_data_values(record):
         """
         Pull the needed fields from the data file and convert them
-        to the format needed for the particle per the IDD. Then put
-        that data in a dictionary
+        to the format needed for the particle per the IDD.
         :param record: The record read from the file which contains the date and time
-        :return: The dictionary
+        :return: The tuple of values in DATA_SCHEMA order
         """
 
         date_time_string = VelptAbDclDataParticle.get_date_time_string(record)
@@ -212,23 +233,32 @@ class VelptAbDclDataParticle(DataParticle):
         amplitude_beam_2 = struct.unpack_from('B', record, VelptAbDclDataParticle.amplitude_beam2_offset)[0]
         amplitude_beam_3 = struct.unpack_from('B', record, VelptAbDclDataParticle.amplitude_beam3_offset)[0]
 
-        return {VelptAbDclDataParticleKey.DATE_TIME_STRING: date_time_string,
-                VelptAbDclDataParticleKey.ERROR_CODE: error_code,
-                VelptAbDclDataParticleKey.ANALOG1: analog_1,
-                VelptAbDclDataParticleKey.BATTERY_VOLTAGE_DV: battery_voltage,
-                VelptAbDclDataParticleKey.SOUND_SPEED_DMS: sound_speed_analog_2,
-                VelptAbDclDataParticleKey.HEADING_DECIDEGREE: heading,
-                VelptAbDclDataParticleKey.PITCH_DECIDEGREE: pitch,
-                VelptAbDclDataParticleKey.ROLL_DECIDEGREE: roll,
-                VelptAbDclDataParticleKey.PRESSURE_MBAR: pressure_mbar,
-                VelptAbDclDataParticleKey.STATUS: status,
-                VelptAbDclDataParticleKey.TEMPERATURE_CENTIDEGREE: temperature,
-                VelptAbDclDataParticleKey.VELOCITY_BEAM1: velocity_beam_1,
-                VelptAbDclDataParticleKey.VELOCITY_BEAM2: velocity_beam_2,
-                VelptAbDclDataParticleKey.VELOCITY_BEAM3: velocity_beam_3,
-                VelptAbDclDataParticleKey.AMPLITUDE_BEAM1: amplitude_beam_1,
-                VelptAbDclDataParticleKey.AMPLITUDE_BEAM2: amplitude_beam_2,
-                VelptAbDclDataParticleKey.AMPLITUDE_BEAM3: amplitude_beam_3}
+        return (date_time_string,
+                error_code,
+                analog_1,
+                battery_voltage,
+                sound_speed_analog_2,
+                heading,
+                pitch,
+                roll,
+                pressure_mbar,
+                status,
+                temperature,
+                velocity_beam_1,
+                velocity_beam_2,
+                velocity_beam_3,
+                amplitude_beam_1,
+                amplitude_beam_2,
+                amplitude_beam_3)
+
+    @staticmethod
+    def generate_data_dict(record):
+        """
+        Pull the needed fields from the data file and put them in a dictionary
+        :param record: The record read from the file which contains the date and time
+        :return: The dictionary
+        """
+        return dict(zip((name for name, _ in DATA_SCHEMA), VelptAbDclDataParticle.generate_data_values(record)))
 
     @staticmethod
     def generate_diagnostics_header_dict(date_time_string, record):
@@ -281,48 +311,7 @@ class VelptAbDclInstrumentDataParticle(VelptAbDclDataParticle):
     See the IDD
     """
     _data_particle_type = VelptAbDclDataParticleType.VELPT_AB_DCL_INSTRUMENT
-
-    def _build_parsed_values(self):
-
-        particle_parameters = []
-
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.DATE_TIME_STRING,
-                                                      self.raw_data[VelptAbDclDataParticleKey.DATE_TIME_STRING], str))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.ERROR_CODE,
-                                                      self.raw_data[VelptAbDclDataParticleKey.ERROR_CODE], int))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.ANALOG1,
-                                                      self.raw_data[VelptAbDclDataParticleKey.ANALOG1], int))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.BATTERY_VOLTAGE_DV,
-                                                      self.raw_data[VelptAbDclDataParticleKey.BATTERY_VOLTAGE_DV], int))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.SOUND_SPEED_DMS,
-                                                      self.raw_data[VelptAbDclDataParticleKey.SOUND_SPEED_DMS], int))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.HEADING_DECIDEGREE,
-                                                      self.raw_data[VelptAbDclDataParticleKey.HEADING_DECIDEGREE], int))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.PITCH_DECIDEGREE,
-                                                      self.raw_data[VelptAbDclDataParticleKey.PITCH_DECIDEGREE], int))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.ROLL_DECIDEGREE,
-                                                      self.raw_data[VelptAbDclDataParticleKey.ROLL_DECIDEGREE], int))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.PRESSURE_MBAR,
-                                                      self.raw_data[VelptAbDclDataParticleKey.PRESSURE_MBAR], int))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.STATUS,
-                                                      self.raw_data[VelptAbDclDataParticleKey.STATUS], int))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.TEMPERATURE_CENTIDEGREE,
-                                                      self.raw_data[VelptAbDclDataParticleKey.TEMPERATURE_CENTIDEGREE],
-                                                      int))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.VELOCITY_BEAM1,
-                                                      self.raw_data[VelptAbDclDataParticleKey.VELOCITY_BEAM1], int))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.VELOCITY_BEAM2,
-                                                      self.raw_data[VelptAbDclDataParticleKey.VELOCITY_BEAM2], int))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.VELOCITY_BEAM3,
-                                                      self.raw_data[VelptAbDclDataParticleKey.VELOCITY_BEAM3], int))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.AMPLITUDE_BEAM1,
-                                                      self.raw_data[VelptAbDclDataParticleKey.AMPLITUDE_BEAM1], int))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.AMPLITUDE_BEAM2,
-                                                      self.raw_data[VelptAbDclDataParticleKey.AMPLITUDE_BEAM2], int))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.AMPLITUDE_BEAM3,
-                                                      self.raw_data[VelptAbDclDataParticleKey.AMPLITUDE_BEAM3], int))
-
-        return particle_parameters
+    _schema = DATA_SCHEMA
 
 
 class VelptAbDclDiagnosticsHeaderParticle(VelptAbDclDataParticle):
@@ -387,48 +376,7 @@ class VelptAbDclDiagnosticsDataParticle(VelptAbDclDataParticle):
     See the IDD
     """
     _data_particle_type = VelptAbDclDataParticleType.VELPT_AB_DCL_DIAGNOSTICS
-
-    def _build_parsed_values(self):
-
-        particle_parameters = []
-
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.DATE_TIME_STRING,
-                                                      self.raw_data[VelptAbDclDataParticleKey.DATE_TIME_STRING], str))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.ERROR_CODE,
-                                                      self.raw_data[VelptAbDclDataParticleKey.ERROR_CODE], int))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.ANALOG1,
-                                                      self.raw_data[VelptAbDclDataParticleKey.ANALOG1], int))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.BATTERY_VOLTAGE_DV,
-                                                      self.raw_data[VelptAbDclDataParticleKey.BATTERY_VOLTAGE_DV], int))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.SOUND_SPEED_DMS,
-                                                      self.raw_data[VelptAbDclDataParticleKey.SOUND_SPEED_DMS], int))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.HEADING_DECIDEGREE,
-                                                      self.raw_data[VelptAbDclDataParticleKey.HEADING_DECIDEGREE], int))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.PITCH_DECIDEGREE,
-                                                      self.raw_data[VelptAbDclDataParticleKey.PITCH_DECIDEGREE], int))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.ROLL_DECIDEGREE,
-                                                      self.raw_data[VelptAbDclDataParticleKey.ROLL_DECIDEGREE], int))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.PRESSURE_MBAR,
-                                                      self.raw_data[VelptAbDclDataParticleKey.PRESSURE_MBAR], int))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.STATUS,
-                                                      self.raw_data[VelptAbDclDataParticleKey.STATUS], int))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.TEMPERATURE_CENTIDEGREE,
-                                                      self.raw_data[VelptAbDclDataParticleKey.TEMPERATURE_CENTIDEGREE],
-                                                      int))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.VELOCITY_BEAM1,
-                                                      self.raw_data[VelptAbDclDataParticleKey.VELOCITY_BEAM1], int))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.VELOCITY_BEAM2,
-                                                      self.raw_data[VelptAbDclDataParticleKey.VELOCITY_BEAM2], int))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.VELOCITY_BEAM3,
-                                                      self.raw_data[VelptAbDclDataParticleKey.VELOCITY_BEAM3], int))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.AMPLITUDE_BEAM1,
-                                                      self.raw_data[VelptAbDclDataParticleKey.AMPLITUDE_BEAM1], int))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.AMPLITUDE_BEAM2,
-                                                      self.raw_data[VelptAbDclDataParticleKey.AMPLITUDE_BEAM2], int))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.AMPLITUDE_BEAM3,
-                                                      self.raw_data[VelptAbDclDataParticleKey.AMPLITUDE_BEAM3], int))
-
-        return particle_parameters
+    _schema = DATA_SCHEMA
 
 
 class VelptAbDclInstrumentDataParticleRecovered(VelptAbDclDataParticle):
@@ -436,48 +384,7 @@ class VelptAbDclInstrumentDataParticleRecovered(VelptAbDclDataParticle):
     See the IDD
     """
     _data_particle_type = VelptAbDclDataParticleType.VELPT_AB_DCL_INSTRUMENT_RECOVERED
-
-    def _build_parsed_values(self):
-
-        particle_parameters = []
-
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.DATE_TIME_STRING,
-                                                      self.raw_data[VelptAbDclDataParticleKey.DATE_TIME_STRING], str))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.ERROR_CODE,
-                                                      self.raw_data[VelptAbDclDataParticleKey.ERROR_CODE], int))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.ANALOG1,
-                                                      self.raw_data[VelptAbDclDataParticleKey.ANALOG1], int))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.BATTERY_VOLTAGE_DV,
-                                                      self.raw_data[VelptAbDclDataParticleKey.BATTERY_VOLTAGE_DV], int))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.SOUND_SPEED_DMS,
-                                                      self.raw_data[VelptAbDclDataParticleKey.SOUND_SPEED_DMS], int))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.HEADING_DECIDEGREE,
-                                                      self.raw_data[VelptAbDclDataParticleKey.HEADING_DECIDEGREE], int))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.PITCH_DECIDEGREE,
-                                                      self.raw_data[VelptAbDclDataParticleKey.PITCH_DECIDEGREE], int))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.ROLL_DECIDEGREE,
-                                                      self.raw_data[VelptAbDclDataParticleKey.ROLL_DECIDEGREE], int))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.PRESSURE_MBAR,
-                                                      self.raw_data[VelptAbDclDataParticleKey.PRESSURE_MBAR], int))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.STATUS,
-                                                      self.raw_data[VelptAbDclDataParticleKey.STATUS], int))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.TEMPERATURE_CENTIDEGREE,
-                                                      self.raw_data[VelptAbDclDataParticleKey.TEMPERATURE_CENTIDEGREE],
-                                                      int))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.VELOCITY_BEAM1,
-                                                      self.raw_data[VelptAbDclDataParticleKey.VELOCITY_BEAM1], int))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.VELOCITY_BEAM2,
-                                                      self.raw_data[VelptAbDclDataParticleKey.VELOCITY_BEAM2], int))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.VELOCITY_BEAM3,
-                                                      self.raw_data[VelptAbDclDataParticleKey.VELOCITY_BEAM3], int))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.AMPLITUDE_BEAM1,
-                                                      self.raw_data[VelptAbDclDataParticleKey.AMPLITUDE_BEAM1], int))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.AMPLITUDE_BEAM2,
-                                                      self.raw_data[VelptAbDclDataParticleKey.AMPLITUDE_BEAM2], int))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.AMPLITUDE_BEAM3,
-                                                      self.raw_data[VelptAbDclDataParticleKey.AMPLITUDE_BEAM3], int))
-
-        return particle_parameters
+    _schema = DATA_SCHEMA
 
 
 class VelptAbDclDiagnosticsHeaderParticleRecovered(VelptAbDclDataParticle):
@@ -542,45 +449,4 @@ class VelptAbDclDiagnosticsDataParticleRecovered(VelptAbDclDataParticle):
     See the IDD
     """
     _data_particle_type = VelptAbDclDataParticleType.VELPT_AB_DCL_DIAGNOSTICS_RECOVERED
-
-    def _build_parsed_values(self):
-
-        particle_parameters = []
-
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.DATE_TIME_STRING,
-                                                      self.raw_data[VelptAbDclDataParticleKey.DATE_TIME_STRING], str))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.ERROR_CODE,
-                                                      self.raw_data[VelptAbDclDataParticleKey.ERROR_CODE], int))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.ANALOG1,
-                                                      self.raw_data[VelptAbDclDataParticleKey.ANALOG1], int))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.BATTERY_VOLTAGE_DV,
-                                                      self.raw_data[VelptAbDclDataParticleKey.BATTERY_VOLTAGE_DV], int))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.SOUND_SPEED_DMS,
-                                                      self.raw_data[VelptAbDclDataParticleKey.SOUND_SPEED_DMS], int))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.HEADING_DECIDEGREE,
-                                                      self.raw_data[VelptAbDclDataParticleKey.HEADING_DECIDEGREE], int))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.PITCH_DECIDEGREE,
-                                                      self.raw_data[VelptAbDclDataParticleKey.PITCH_DECIDEGREE], int))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.ROLL_DECIDEGREE,
-                                                      self.raw_data[VelptAbDclDataParticleKey.ROLL_DECIDEGREE], int))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.PRESSURE_MBAR,
-                                                      self.raw_data[VelptAbDclDataParticleKey.PRESSURE_MBAR], int))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.STATUS,
-                                                      self.raw_data[VelptAbDclDataParticleKey.STATUS], int))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.TEMPERATURE_CENTIDEGREE,
-                                                      self.raw_data[VelptAbDclDataParticleKey.TEMPERATURE_CENTIDEGREE],
-                                                      int))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.VELOCITY_BEAM1,
-                                                      self.raw_data[VelptAbDclDataParticleKey.VELOCITY_BEAM1], int))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.VELOCITY_BEAM2,
-                                                      self.raw_data[VelptAbDclDataParticleKey.VELOCITY_BEAM2], int))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.VELOCITY_BEAM3,
-                                                      self.raw_data[VelptAbDclDataParticleKey.VELOCITY_BEAM3], int))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.AMPLITUDE_BEAM1,
-                                                      self.raw_data[VelptAbDclDataParticleKey.AMPLITUDE_BEAM1], int))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.AMPLITUDE_BEAM2,
-                                                      self.raw_data[VelptAbDclDataParticleKey.AMPLITUDE_BEAM2], int))
-        particle_parameters.append(self._encode_value(VelptAbDclDataParticleKey.AMPLITUDE_BEAM3,
-                                                      self.raw_data[VelptAbDclDataParticleKey.AMPLITUDE_BEAM3], int))
-
-        return particle_parameters
\ No newline at end of file
+    _schema = DATA_SCHEMA
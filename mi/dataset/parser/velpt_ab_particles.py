@@ -114,6 +114,28 @@ class VelptAbDataParticleKey(BaseEnum):
     CORRELATION_THRESHOLD = 'correlation_threshold'                              # PD533
 
 
+# Parameters of the velocity and diagnostics data particles, in order, with their encoding
+DATA_SCHEMA = (
+    (VelptAbDataParticleKey.DATE_TIME_STRING, str),
+    (VelptAbDataParticleKey.ERROR_CODE, int),
+    (VelptAbDataParticleKey.ANALOG1, int),
+    (VelptAbDataParticleKey.BATTERY_VOLTAGE_DV, int),
+    (VelptAbDataParticleKey.SOUND_SPEED_DMS, int),
+    (VelptAbDataParticleKey.HEADING_DECIDEGREE, int),
+    (VelptAbDataParticleKey.PITCH_DECIDEGREE, int),
+    (VelptAbDataParticleKey.ROLL_DECIDEGREE, int),
+    (VelptAbDataParticleKey.PRESSURE_MBAR, int),
+    (VelptAbDataParticleKey.STATUS, int),
+    (VelptAbDataParticleKey.TEMPERATURE_CENTIDEGREE, int),
+    (VelptAbDataParticleKey.VELOCITY_BEAM1, int),
+    (VelptAbDataParticleKey.VELOCITY_BEAM2, int),
+    (VelptAbDataParticleKey.VELOCITY_BEAM3, int),
+    (VelptAbDataParticleKey.AMPLITUDE_BEAM1, int),
+    (VelptAbDataParticleKey.AMPLITUDE_BEAM2, int),
+    (VelptAbDataParticleKey.AMPLITUDE_BEAM3, int),
+)
+
+
 class VelptAbDataParticle(DataParticle):
     """
     Class for creating the metadata & data particles for velpt_ab
@@ -304,13 +326,12 @@ class VelptAbDataParticle(DataParticle):
                                           VelptAbDataParticle.cell_number_diagnostics_offset])[0]
 
     @staticmethod
-    def generate_data_dict(record):
+    def generate_data_values(record):
         """
         Pull the needed fields from the data file and convert them
-        to the format needed for the particle per the IDD. Then put
-        that data in a dictionary
+        to the format needed for the particle per the IDD.
         :param record: The record read from the file which contains the date and time
-        :return: The dictionary
+        :return: The tuple of values in DATA_SCHEMA order
         """
 
         date_time_string = VelptAbDataParticle.get_date_time_string(record)
@@ -335,23 +356,32 @@ class VelptAbDataParticle(DataParticle):
         amplitude_beam_2 = struct.unpack_from('B', record, VelptAbDataParticle.amplitude_beam2_offset)[0]
         amplitude_beam_3 = struct.unpack_from('B', record, VelptAbDataParticle.amplitude_beam3_offset)[0]
 
-        return {VelptAbDataParticleKey.DATE_TIME_STRING: date_time_string,
-                VelptAbDataParticleKey.ERROR_CODE: error_code,
-                VelptAbDataParticleKey.ANALOG1: analog_1,
-                VelptAbDataParticleKey.BATTERY_VOLTAGE_DV: battery_voltage,
-                VelptAbDataParticleKey.SOUND_SPEED_DMS: sound_speed_analog_2,
-                VelptAbDataParticleKey.HEADING_DECIDEGREE: heading,
-                VelptAbDataParticleKey.PITCH_DECIDEGREE: pitch,
-                VelptAbDataParticleKey.ROLL_DECIDEGREE: roll,
-                VelptAbDataParticleKey.PRESSURE_MBAR: pressure_mbar,
-                VelptAbDataParticleKey.STATUS: status,
-                VelptAbDataParticleKey.TEMPERATURE_CENTIDEGREE: temperature,
-                VelptAbDataParticleKey.VELOCITY_BEAM1: velocity_beam_1,
-                VelptAbDataParticleKey.VELOCITY_BEAM2: velocity_beam_2,
-                VelptAbDataParticleKey.VELOCITY_BEAM3: velocity_beam_3,
-                VelptAbDataParticleKey.AMPLITUDE_BEAM1: amplitude_beam_1,
-                VelptAbDataParticleKey.AMPLITUDE_BEAM2: amplitude_beam_2,
-                VelptAbDataParticleKey.AMPLITUDE_BEAM3: amplitude_beam_3}
+        return (date_time_string,
+                error_code,
+                analog_1,
+                battery_voltage,
+                sound_speed_analog_2,
+                heading,
+                pitch,
+                roll,
+                pressure_mbar,
+                status,
+                temperature,
+                velocity_beam_1,
+                velocity_beam_2,
+                velocity_beam_3,
+                amplitude_beam_1,
+                amplitude_beam_2,
+                amplitude_beam_3)
+
+    @staticmethod
+    def generate_data_dict(record):
+        """
+        Pull the needed fields from the data file and put them in a dictionary
+        :param record: The record read from the file which contains the date and time
+        :return: The dictionary
+        """
+        return dict(zip((name for name, _ in DATA_SCHEMA), VelptAbDataParticle.generate_data_values(record)))
 
     @staticmethod
     def generate_diagnostics_header_dict(date_time_string, record):
@@ -664,48 +694,7 @@ class VelptAbDiagnosticsDataParticle(VelptAbDataParticle):
     See the IDD
     """
     _data_particle_type = VelptAbDataParticleType.VELPT_AB_DIAGNOSTICS_RECOVERED
-
-    def _build_parsed_values(self):
-
-        particle_parameters = []
-
-        particle_parameters.append(self._encode_value(VelptAbDataParticleKey.DATE_TIME_STRING,
-                                                      self.raw_data[VelptAbDataParticleKey.DATE_TIME_STRING], str))
-        particle_parameters.append(self._encode_value(VelptAbDataParticleKey.ERROR_CODE,
-                                                      self.raw_data[VelptAbDataParticleKey.ERROR_CODE], int))
-        particle_parameters.append(self._encode_value(VelptAbDataParticleKey.ANALOG1,
-                                                      self.raw_data[VelptAbDataParticleKey.ANALOG1], int))
-        particle_parameters.append(self._encode_value(VelptAbDataParticleKey.BATTERY_VOLTAGE_DV,
-                                                      self.raw_data[VelptAbDataParticleKey.BATTERY_VOLTAGE_DV], int))
-        particle_parameters.append(self._encode_value(VelptAbDataParticleKey.SOUND_SPEED_DMS,
-                                                      self.raw_data[VelptAbDataParticleKey.SOUND_SPEED_DMS], int))
-        particle_parameters.append(self._encode_value(VelptAbDataParticleKey.HEADING_DECIDEGREE,
-                                                      self.raw_data[VelptAbDataParticleKey.HEADING_DECIDEGREE], int))
-        particle_parameters.append(self._encode_value(VelptAbDataParticleKey.PITCH_DECIDEGREE,
-                                                      self.raw_data[VelptAbDataParticleKey.PITCH_DECIDEGREE], int))
-        particle_parameters.append(self._encode_value(VelptAbDataParticleKey.ROLL_DECIDEGREE,
-                                                      self.raw_data[VelptAbDataParticleKey.ROLL_DECIDEGREE], int))
-        particle_parameters.append(self._encode_value(VelptAbDataParticleKey.PRESSURE_MBAR,
-                                                      self.raw_data[VelptAbDataParticleKey.PRESSURE_MBAR], int))
-        particle_parameters.append(self._encode_value(VelptAbDataParticleKey.STATUS,
-                                                      self.raw_data[VelptAbDataParticleKey.STATUS], int))
-        particle_parameters.append(self._encode_value(VelptAbDataParticleKey.TEMPERATURE_CENTIDEGREE,
-                                                      self.raw_data[VelptAbDataParticleKey.TEMPERATURE_CENTIDEGREE],
-                                                      int))
-        particle_parameters.append(self._encode_value(VelptAbDataParticleKey.VELOCITY_BEAM1,
-                                                      self.raw_data[VelptAbDataParticleKey.VELOCITY_BEAM1], int))
-        particle_parameters.append(self._encode_value(VelptAbDataParticleKey.VELOCITY_BEAM2,
-                                                      self.raw_data[VelptAbDataParticleKey.VELOCITY_BEAM2], int))
-        particle_parameters.append(self._encode_value(VelptAbDataParticleKey.VELOCITY_BEAM3,
-                                                      self.raw_data[VelptAbDataParticleKey.VELOCITY_BEAM3], int))
-        particle_parameters.append(self._encode_value(VelptAbDataParticleKey.AMPLITUDE_BEAM1,
-                                                      self.raw_data[VelptAbDataParticleKey.AMPLITUDE_BEAM1], int))
-        particle_parameters.append(self._encode_value(VelptAbDataParticleKey.AMPLITUDE_BEAM2,
-                                                      self.raw_data[VelptAbDataParticleKey.AMPLITUDE_BEAM2], int))
-        particle_parameters.append(self._encode_value(VelptAbDataParticleKey.AMPLITUDE_BEAM3,
-                                                      self.raw_data[VelptAbDataParticleKey.AMPLITUDE_BEAM3], int))
-
-        return particle_parameters
+    _schema = DATA_SCHEMA
 
 
 class VelptAbInstrumentMetadataParticle(VelptAbDataParticle):
@@ -857,46 +846,5 @@ class VelptAbInstrumentDataParticle(VelptAbDataParticle):
     See the IDD
     """
     _data_particle_type = VelptAbDataParticleType.VELPT_AB_INSTRUMENT_RECOVERED
-
-    def _build_parsed_values(self):
-
-        particle_parameters = []
-
-        particle_parameters.append(self._encode_value(VelptAbDataParticleKey.DATE_TIME_STRING,
-                                                      self.raw_data[VelptAbDataParticleKey.DATE_TIME_STRING], str))
-        particle_parameters.append(self._encode_value(VelptAbDataParticleKey.ERROR_CODE,
-                                                      self.raw_data[VelptAbDataParticleKey.ERROR_CODE], int))
-        particle_parameters.append(self._encode_value(VelptAbDataParticleKey.ANALOG1,
-                                                      self.raw_data[VelptAbDataParticleKey.ANALOG1], int))
-        particle_parameters.append(self._encode_value(VelptAbDataParticleKey.BATTERY_VOLTAGE_DV,
-                                                      self.raw_data[VelptAbDataParticleKey.BATTERY_VOLTAGE_DV], int))
-        particle_parameters.append(self._encode_value(VelptAbDataParticleKey.SOUND_SPEED_DMS,
-                                                      self.raw_data[VelptAbDataParticleKey.SOUND_SPEED_DMS], int))
-        particle_parameters.append(self._encode_value(VelptAbDataParticleKey.HEADING_DECIDEGREE,
-                                                      self.raw_data[VelptAbDataParticleKey.HEADING_DECIDEGREE], int))
-        particle_parameters.append(self._encode_value(VelptAbDataParticleKey.PITCH_DECIDEGREE,
-                                                      self.raw_data[VelptAbDataParticleKey.PITCH_DECIDEGREE], int))
-        particle_parameters.append(self._encode_value(VelptAbDataParticleKey.ROLL_DECIDEGREE,
-                                                      self.raw_data[VelptAbDataParticleKey.ROLL_DECIDEGREE], int))
-        particle_parameters.append(self._encode_value(VelptAbDataParticleKey.PRESSURE_MBAR,
-                                                      self.raw_data[VelptAbDataParticleKey.PRESSURE_MBAR], int))
-        particle_parameters.append(self._encode_value(VelptAbDataParticleKey.STATUS,
-                                                      self.raw_data[VelptAbDataParticleKey.STATUS], int))
-        particle_parameters.append(self._encode_value(VelptAbDataParticleKey.TEMPERATURE_CENTIDEGREE,
-                                                      self.raw_data[VelptAbDataParticleKey.TEMPERATURE_CENTIDEGREE],
-                                                      int))
-        particle_parameters.append(self._encode_value(VelptAbDataParticleKey.VELOCITY_BEAM1,
-                                                      self.raw_data[VelptAbDataParticleKey.VELOCITY_BEAM1], int))
-        particle_parameters.append(self._encode_value(VelptAbDataParticleKey.VELOCITY_BEAM2,
-                                                      self.raw_data[VelptAbDataParticleKey.VELOCITY_BEAM2], int))
-        particle_parameters.append(self._encode_value(VelptAbDataParticleKey.VELOCITY_BEAM3,
-                                                      self.raw_data[VelptAbDataParticleKey.VELOCITY_BEAM3], int))
-        particle_parameters.append(self._encode_value(VelptAbDataParticleKey.AMPLITUDE_BEAM1,
-                                                      self.raw_data[VelptAbDataParticleKey.AMPLITUDE_BEAM1], int))
-        particle_parameters.append(self._encode_value(VelptAbDataParticleKey.AMPLITUDE_BEAM2,
-                                                      self.raw_data[VelptAbDataParticleKey.AMPLITUDE_BEAM2], int))
-        particle_parameters.append(self._encode_value(VelptAbDataParticleKey.AMPLITUDE_BEAM3,
-                                                      self.raw_data[VelptAbDataParticleKey.AMPLITUDE_BEAM3], int))
-
-        return particle_parameters
+    _schema = DATA_SCHEMA
 
@@ -57,7 +57,7 @@ class WfpEngStcImodemParser(WfpEFileParser):
         if not (StateKey.POSITION in state_obj):
             raise DatasetParserException("Invalid state keys")
         self._chunker.clean_all_chunks()
-        self._record_buffer = []
+        self._clear_record_buffer()
         self._saved_header = None
         self._state = state_obj
         self._read_state = state_obj
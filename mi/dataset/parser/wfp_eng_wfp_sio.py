@@ -345,6 +345,8 @@ class WfpEngWfpSioParser(SioParser):
         @retval a list of tuples with sample particles encountered in this
             parsing, plus the state. An empty list of nothing was parsed.
         """
+        # return only the particles parsed from the chunks in this call
+        self._result_particles = []
         (timestamp, chunk, start, end) = self._chunker.get_next_data_with_index(clean=True)
 
         while chunk is not None:
@@ -45,6 +45,7 @@ from ctypes import *
 from mi.core.exceptions import SampleException, RecoverableSampleException
 from mi.core.instrument.dataset_data_particle import DataParticle, DataParticleKey
 from mi.core.log import get_logger, get_logging_metaclass
+from mi.dataset.binary_file import BinaryFile
 from mi.dataset.dataset_parser import SimpleParser
 from mi.core.common import BaseEnum
 from datetime import datetime
@@ -60,6 +61,9 @@ __license__ = 'Apache 2.0'
 
 PROFILE_DATA_DELIMITER = '\xfd\x02'  # Byte Offset 0 and 1
 
+# Number of records indexed before their data is decoded
+DECODE_BATCH_SIZE = 500
+
 
 class DataParticleType(BaseEnum):
     # ZPLSC_C_PARTICLE_TYPE = 'zplsc_c_recovered'
@@ -163,6 +167,10 @@ class AzfpProfileHeader(BigEndianStructure):
         ]
 
 
+# Profile headers of a batch of records, in an array
+PROFILE_HEADER_DTYPE = np.dtype(AzfpProfileHeader)
+
+
 def generate_image_file_path(filepath, output_path=None):
     # Extract the file time from the file name
     absolute_path = os.path.abspath(filepath)
@@ -197,131 +205,238 @@ class ZplscCParser(SimpleParser):
         self._particle_type = None
         self._gen = None
         self.ph = None  # The profile header of the current record being processed.
+        self._header_data = None  # The bytes of the profile header.
+        self._file = None
+        self._position = 0
         self.cc = ZplscCCalibrationCoefficients()
         self.is_first_record = True
         self.hourly_avg_temp = 0
         self.zplsc_echogram = ZPLSCCEchogram()
 
+    def _open_file(self):
+        self._file = BinaryFile(self._stream_handle)
+        self._position = self._file.start
+
+    def _read(self, size):
+        """
+        Move past size bytes of the file, or to the end of the file if fewer remain
+        :return: the position before the move
+        """
+        position = self._position
+        self._position = min(position + size, self._file.size)
+        return position
+
+    def _read_profile_header(self):
+        """
+        Read the profile header at the current position into self.ph, zero filled if the file ends first.
+        :return: the number of header bytes read
+        """
+        position = self._read(sizeof(AzfpProfileHeader))
+        header = self._file[position:self._position]
+        self._header_data = header.ljust(sizeof(AzfpProfileHeader), '\0')
+        self.ph = AzfpProfileHeader.from_buffer_copy(self._header_data)
+        return len(header)
+
+    def _skip_values(self, value_format, count):
+        """
+        Move past count big endian values of a struct format character, without unpacking them.
+        :return: the position of the values
+        @throws struct.error if the file ends before the values
+        """
+        values_format = '>%d%s' % (count, value_format)
+        size = struct.calcsize(values_format)
+        position = self._read(size)
+        if self._position - position < size:
+            # Fails the same way as unpacking the truncated values
+            self._file.unpack_at(values_format, position)
+        return position
+
+    def _read_values(self, positions, dtype, count):
+        """
+        Read count values of dtype at each of the positions.
+        :return: (positions x count) array
+        """
+        size = np.dtype(dtype).itemsize * count
+        data = ''.join([self._file[position:position + size] for position in positions])
+        return np.frombuffer(data, dtype).reshape(len(positions), count)
+
     def find_next_record(self):
-        good_delimiter = True
-        delimiter = self._stream_handle.read(2)
-        while delimiter not in [PROFILE_DATA_DELIMITER, '']:
-            good_delimiter = False
-            delimiter = delimiter[1:2]
-            delimiter += self._stream_handle.read(1)
+        position = self._file.find(PROFILE_DATA_DELIMITER, self._position)
+        if position == -1:
+            good_delimiter = self._position == self._file.size
+            self._position = self._file.size
+        else:
+            good_delimiter = position == self._position
+            self._position = position + len(PROFILE_DATA_DELIMITER)
 
         if not good_delimiter:
             self._exception_callback('Invalid record delimiter found.\n')
 
-    def parse_record(self):
+    def index_records(self, error_callback):
+        """
+        First pass over the profile data records of the zplsc-c data file. Read the header of up to
+        DECODE_BATCH_SIZE records from the current position and find the data of each channel, without unpacking it.
+
+        :param error_callback: Called with the struct.error or ValueError of each record that can not be parsed.
+        :return: List of (profile header data, profile header, channel data positions, timestamp) of each record.
+        """
+        records = []
+        while len(records) < DECODE_BATCH_SIZE and self._read_profile_header():
+            try:
+                # Averaged data is stored as 32 bit linear sums followed by 8 bit overflow counts,
+                # otherwise as 16 bit values.
+                positions = []
+                for chan in range(self.ph.num_channels):
+                    num_bins = self.ph.num_bins[chan]
+                    if self.ph.is_averaged_data[chan]:
+                        positions.append((self._skip_values('I', num_bins), self._skip_values('B', num_bins)))
+                    else:
+                        positions.append((self._skip_values('H', num_bins), None))
+
+                # Convert the date and time parameters to a epoch time from 01-01-1900.
+                timestamp = (datetime(self.ph.year, self.ph.month, self.ph.day,
+                                      self.ph.hour, self.ph.minute, self.ph.second,
+                                      (self.ph.hundredths * 10000)) - datetime(1900, 1, 1)).total_seconds()
+
+                records.append((self._header_data, self.ph, positions, timestamp))
+
+            except (struct.error, exceptions.ValueError) as ex:
+                error_callback(ex)
+
+            # Find the next record.
+            self.find_next_record()
+
+        return records
+
+    def decode_records(self, records):
         """
-        Parse one profile data record of the zplsc-c data file.
+        Second pass over indexed profile data records. The data of all records with the same channels and bins is
+        unpacked into a (records x bins) array per channel, and the volume backscatter is computed once per channel.
+
+        :param records: Records returned by index_records.
+        :return: List of (channel values, depth range) of each record, with an array of bins per channel.
         """
-        chan_values = [[], [], [], []]
-        overflow_values = [[], [], [], []]
-
-        # Parse the data values portion of the record.
-        for chan in range(self.ph.num_channels):
-            num_bins = self.ph.num_bins[chan]
-
-            # Set the data structure format for the scientific data, based on whether
-            # the data is averaged or not. Construct the data structure and read the
-            # data bytes for the current channel. Unpack the data based on the structure.
-            if self.ph.is_averaged_data[chan]:
-                data_struct_format = '>' + str(num_bins) + 'I'
-            else:
-                data_struct_format = '>' + str(num_bins) + 'H'
-            data_struct = struct.Struct(data_struct_format)
-            data = self._stream_handle.read(data_struct.size)
-            chan_values[chan] = data_struct.unpack(data)
-
-            # If the data type is for averaged data, calculate the averaged data taking the
-            # the linear sum channel values and overflow values and using calculations from
-            # ASL MatLab code.
-            if self.ph.is_averaged_data[chan]:
-                overflow_struct_format = '>' + str(num_bins) + 'B'
-                overflow_struct = struct.Struct(overflow_struct_format)
-                overflow_data = self._stream_handle.read(num_bins)
-                overflow_values[chan] = overflow_struct.unpack(overflow_data)
-
-                if self.ph.is_averaged_pings:
-                    divisor = self.ph.num_pings_profile * self.ph.range_samples[chan]
+        layouts = {}
+        for record_num, (_, ph, _, _) in enumerate(records):
+            layout = (ph.num_channels, tuple(ph.num_bins[:ph.num_channels]),
+                      tuple(ph.is_averaged_data[:ph.num_channels]))
+            layouts.setdefault(layout, []).append(record_num)
+
+        decoded = [None] * len(records)
+        for (num_channels, num_bins, is_averaged_data), record_nums in layouts.iteritems():
+            profile_hdrs = np.frombuffer(''.join([records[num][0] for num in record_nums]), PROFILE_HEADER_DTYPE)
+
+            chan_values = []
+            for chan in range(num_channels):
+                data_positions, overflow_positions = zip(*[records[num][2][chan] for num in record_nums])
+
+                # If the data type is for averaged data, calculate the averaged data taking the
+                # the linear sum channel values and overflow values and using calculations from
+                # ASL MatLab code.
+                if is_averaged_data[chan]:
+                    linear_sum_values = self._read_values(data_positions, '>u4', num_bins[chan]).astype(np.int64)
+                    linear_overflow_values = self._read_values(overflow_positions, 'u1', num_bins[chan]).astype(
+                        np.int64)
+
+                    range_samples = profile_hdrs['range_samples'][:, chan].astype(np.int64)
+                    divisor = np.where(profile_hdrs['is_averaged_pings'] != 0,
+                                       profile_hdrs['num_pings_profile'].astype(np.int64) * range_samples,
+                                       range_samples)[:, np.newaxis]
+
+                    values = (linear_sum_values + (linear_overflow_values * 0xFFFFFFFF))/divisor
+                    values = (np.log10(values) - 2.5) * (8*0xFFFF) * self.cc.DS[chan]
+                    values[np.isinf(values)] = 0
                 else:
-                    divisor = self.ph.range_samples[chan]
+                    values = self._read_values(data_positions, '>u2', num_bins[chan]).astype(np.int64)
+
+                chan_values.append(values)
 
-                linear_sum_values = np.array(chan_values[chan])
-                linear_overflow_values = np.array(overflow_values[chan])
+            sound_speed, depth_range, sea_absorb = self.zplsc_echogram.compute_echogram_metadata(profile_hdrs)
 
-                values = (linear_sum_values + (linear_overflow_values * 0xFFFFFFFF))/divisor
-                values = (np.log10(values) - 2.5) * (8*0xFFFF) * self.cc.DS[chan]
-                values[np.isinf(values)] = 0
-                chan_values[chan] = values
+            chan_values = self.zplsc_echogram.compute_backscatter(profile_hdrs, chan_values, sound_speed,
+                                                                  depth_range, sea_absorb)
 
-        # Convert the date and time parameters to a epoch time from 01-01-1900.
-        timestamp = (datetime(self.ph.year, self.ph.month, self.ph.day,
-                              self.ph.hour, self.ph.minute, self.ph.second,
-                              (self.ph.hundredths * 10000)) - datetime(1900, 1, 1)).total_seconds()
+            for row, record_num in enumerate(record_nums):
+                decoded[record_num] = ([values[row] for values in chan_values],
+                                       [depths[row] for depths in depth_range])
 
-        sound_speed, depth_range, sea_absorb = self.zplsc_echogram.compute_echogram_metadata(self.ph)
+        return decoded
 
-        chan_values = self.zplsc_echogram.compute_backscatter(self.ph, chan_values, sound_speed, depth_range,
-                                                              sea_absorb)
+    def parse_records(self, error_callback):
+        """
+        Parse the profile data records of the zplsc-c data file in batches, indexing a batch of records and then
+        decoding them.
 
-        zplsc_particle_data = {
+        :param error_callback: Called with the struct.error or ValueError of each record that can not be parsed.
+        :return: Generator of (profile header, timestamp, channel values, depth range) of each record.
+        """
+        self._open_file()
+        self.find_next_record()
+
+        records = self.index_records(error_callback)
+        while records:
+            for (_, ph, _, timestamp), (chan_values, depth_range) in zip(records, self.decode_records(records)):
+                yield ph, timestamp, chan_values, depth_range
+
+            records = self.index_records(error_callback)
+
+    @staticmethod
+    def particle_data(ph, timestamp, chan_values, depth_range):
+        """
+        Particle data of one profile data record.
+        """
+        return {
             ZplscCParticleKey.TRANS_TIMESTAMP: timestamp,
-            ZplscCParticleKey.SERIAL_NUMBER: str(self.ph.serial_num),
-            ZplscCParticleKey.PHASE: self.ph.phase,
-            ZplscCParticleKey.BURST_NUMBER: self.ph.burst_num,
-            ZplscCParticleKey.TILT_X: self.ph.tilt_x,
-            ZplscCParticleKey.TILT_Y: self.ph.tilt_y,
-            ZplscCParticleKey.BATTERY_VOLTAGE: self.ph.battery_voltage,
-            ZplscCParticleKey.PRESSURE: self.ph.pressure,
-            ZplscCParticleKey.TEMPERATURE: self.ph.temperature,
-            ZplscCParticleKey.IS_AVERAGED_DATA: list(self.ph.is_averaged_data),
-            ZplscCParticleKey.FREQ_CHAN_1: float(self.ph.frequency[0]),
+            ZplscCParticleKey.SERIAL_NUMBER: str(ph.serial_num),
+            ZplscCParticleKey.PHASE: ph.phase,
+            ZplscCParticleKey.BURST_NUMBER: ph.burst_num,
+            ZplscCParticleKey.TILT_X: ph.tilt_x,
+            ZplscCParticleKey.TILT_Y: ph.tilt_y,
+            ZplscCParticleKey.BATTERY_VOLTAGE: ph.battery_voltage,
+            ZplscCParticleKey.PRESSURE: ph.pressure,
+            ZplscCParticleKey.TEMPERATURE: ph.temperature,
+            ZplscCParticleKey.IS_AVERAGED_DATA: list(ph.is_averaged_data),
+            ZplscCParticleKey.FREQ_CHAN_1: float(ph.frequency[0]),
             ZplscCParticleKey.VALS_CHAN_1: list(chan_values[0]),
             ZplscCParticleKey.DEPTH_CHAN_1: list(depth_range[0]),
-            ZplscCParticleKey.FREQ_CHAN_2: float(self.ph.frequency[1]),
+            ZplscCParticleKey.FREQ_CHAN_2: float(ph.frequency[1]),
             ZplscCParticleKey.VALS_CHAN_2: list(chan_values[1]),
             ZplscCParticleKey.DEPTH_CHAN_2: list(depth_range[1]),
-            ZplscCParticleKey.FREQ_CHAN_3: float(self.ph.frequency[2]),
+            ZplscCParticleKey.FREQ_CHAN_3: float(ph.frequency[2]),
             ZplscCParticleKey.VALS_CHAN_3: list(chan_values[2]),
             ZplscCParticleKey.DEPTH_CHAN_3: list(depth_range[2]),
-            ZplscCParticleKey.FREQ_CHAN_4: float(self.ph.frequency[3]),
+            ZplscCParticleKey.FREQ_CHAN_4: float(ph.frequency[3]),
             ZplscCParticleKey.VALS_CHAN_4: list(chan_values[3]),
             ZplscCParticleKey.DEPTH_CHAN_4: list(depth_range[3])
         }
 
-        return zplsc_particle_data, timestamp, chan_values, depth_range
+    def _record_error(self, ex):
+        if isinstance(ex, struct.error):
+            self._exception_callback('Unpacking the data from the data structure: %s' % ex.message)
+        else:
+            self._exception_callback('Transition timestamp has invalid format: %s' % ex.message)
 
-    def parse_file(self):
-        self.ph = AzfpProfileHeader()
-        self.find_next_record()
-        while self._stream_handle.readinto(self.ph):
-            try:
-                # Parse the current record
-                zplsc_particle_data, timestamp, _, _ = self.parse_record()
+    def iter_particles(self):
+        """
+        Parse the file in batches of records, yielding a particle for each record
+        """
+        try:
+            for ph, timestamp, chan_values, depth_range in self.parse_records(self._record_error):
+                try:
+                    # Create the data particle
+                    particle = self._extract_sample(ZplscCRecoveredDataParticle, None,
+                                                    self.particle_data(ph, timestamp, chan_values, depth_range),
+                                                    timestamp, timestamp, DataParticleKey.PORT_TIMESTAMP)
+                except (SampleException, RecoverableSampleException) as ex:
+                    self._exception_callback('Creating data particle: %s' % ex.message)
+                    continue
 
-                # Create the data particle
-                particle = self._extract_sample(ZplscCRecoveredDataParticle, None, zplsc_particle_data, timestamp,
-                                                timestamp, DataParticleKey.PORT_TIMESTAMP)
                 if particle is not None:
                     log.trace('Parsed particle: %s' % particle.generate_dict())
-                    self._record_buffer.append(particle)
-
-            except (IOError, OSError) as ex:
-                self._exception_callback('Reading stream handle: %s: %s\n' % (self._stream_handle.name, ex.message))
-                return
-            except struct.error as ex:
-                self._exception_callback('Unpacking the data from the data structure: %s' % ex.message)
-            except exceptions.ValueError as ex:
-                self._exception_callback('Transition timestamp has invalid format: %s' % ex.message)
-            except (SampleException, RecoverableSampleException) as ex:
-                self._exception_callback('Creating data particle: %s' % ex.message)
-
-            # Clear the profile header data structure and find the next record.
-            self.ph = AzfpProfileHeader()
-            self.find_next_record()
+                    yield particle
+
+        except (IOError, OSError) as ex:
+            self._exception_callback('Reading stream handle: %s: %s\n' % (self._stream_handle.name, ex.message))
 
     def create_echogram(self, echogram_file_path=None):
         """
@@ -340,35 +455,21 @@ class ZplscCParser(SimpleParser):
         log.info('Begin processing echogram data: %r', input_file_path)
         image_path = generate_image_file_path(input_file_path, echogram_file_path)
 
-        self.ph = AzfpProfileHeader()
-        self.find_next_record()
-        while self._stream_handle.readinto(self.ph):
-            try:
-                _, timestamp, chan_data, depth_range = self.parse_record()
-
+        try:
+            for ph, timestamp, chan_data, depth_range in self.parse_records(self._exception_callback):
                 if not sv_dict:
                     range_chan_data = range(1, len(chan_data)+1)
                     sv_dict = {channel: [] for channel in range_chan_data}
-                    frequencies = {channel: float(self.ph.frequency[channel-1]) for channel in range_chan_data}
+                    frequencies = {channel: float(ph.frequency[channel-1]) for channel in range_chan_data}
 
                 for channel in sv_dict:
                     sv_dict[channel].append(chan_data[channel-1])
 
                 data_times.append(timestamp)
 
-            except (IOError, OSError) as ex:
-                self._exception_callback(ex)
-                return
-            except struct.error as ex:
-                self._exception_callback(ex)
-            except exceptions.ValueError as ex:
-                self._exception_callback(ex)
-            except (SampleException, RecoverableSampleException) as ex:
-                self._exception_callback(ex)
-
-            # Clear the profile header data structure and find the next record.
-            self.ph = AzfpProfileHeader()
-            self.find_next_record()
+        except (IOError, OSError) as ex:
+            self._exception_callback(ex)
+            return
 
         log.info('Completed processing all data: %r', input_file_path)
 
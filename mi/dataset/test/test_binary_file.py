@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+
+"""
+@package mi.dataset.test.test_binary_file
+@file mi/dataset/test/test_binary_file.py
+@brief Test code for random access to binary dataset files
+"""
+
+__license__ = 'Apache 2.0'
+
+import os
+import struct
+import tempfile
+from StringIO import StringIO
+
+from nose.plugins.attrib import attr
+
+from mi.core.unit_test import MiUnitTest
+from mi.dataset.binary_file import BinaryFile
+
+CONTENTS = 'head' + struct.pack('>HI', 7, 123456) + '\xfd\x02tail'
+
+
+class StreamReader(object):
+    """
+    Stream which can only be read
+    """
+    def __init__(self, data):
+        self._stream = StringIO(data)
+
+    def read(self, size=-1):
+        return self._stream.read(size)
+
+
+@attr('UNIT', group='mi')
+class BinaryFileUnitTestCase(MiUnitTest):
+
+    def setUp(self):
+        handle, self.file_path = tempfile.mkstemp()
+        os.write(handle, CONTENTS)
+        os.close(handle)
+        self.addCleanup(os.remove, self.file_path)
+
+    def check_access(self, binary_file):
+        self.assertEqual(len(binary_file), len(CONTENTS))
+        self.assertEqual(binary_file[4:6], CONTENTS[4:6])
+        self.assertEqual(binary_file.find('\xfd\x02'), 10)
+        self.assertEqual(binary_file.find('\xfd\x02', 11), -1)
+        self.assertEqual(binary_file.find('tail', 0, 15), -1)
+        self.assertEqual(binary_file.unpack_at('>HI', 4), (7, 123456))
+        self.assertEqual(binary_file.unpack_at(struct.Struct('>I'), 6), (123456,))
+        self.assertRaises(struct.error, binary_file.unpack_at, '>I', len(CONTENTS) - 2)
+        self.assertEqual(str(binary_file.view(12)), 'tail')
+        self.assertEqual(str(binary_file.view(14, 100)), 'il')
+        self.assertEqual(str(binary_file.view(100)), '')
+
+    def test_file(self):
+        with open(self.file_path, 'rb') as stream_handle:
+            stream_handle.read(4)
+            binary_file = BinaryFile(stream_handle)
+            self.check_access(binary_file)
+            # offsets are from the start of the file, the stream is left at the end
+            self.assertEqual(binary_file.start, 4)
+            self.assertEqual(stream_handle.read(), '')
+
+    def test_stream(self):
+        stream_handle = StringIO(CONTENTS)
+        stream_handle.read(4)
+        binary_file = BinaryFile(stream_handle)
+        self.check_access(binary_file)
+        self.assertEqual(binary_file.start, 4)
+        self.assertEqual(stream_handle.read(), '')
+
+        # a stream which can not seek is read from its current position
+        stream_handle = StreamReader('skip' + CONTENTS)
+        stream_handle.read(4)
+        binary_file = BinaryFile(stream_handle)
+        self.check_access(binary_file)
+        self.assertEqual(binary_file.start, 0)
+
+    def test_empty_file(self):
+        with open(self.file_path, 'wb'):
+            pass
+        with open(self.file_path, 'rb') as stream_handle:
+            binary_file = BinaryFile(stream_handle)
+            self.assertEqual(len(binary_file), 0)
+            self.assertEqual(binary_file.find('\xfd\x02'), -1)
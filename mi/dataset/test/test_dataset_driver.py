@@ -0,0 +1,250 @@
+#!/usr/bin/env python
+
+"""
+@package mi.dataset.test.test_dataset_driver
+@file mi/dataset/test/test_dataset_driver.py
+@brief Test code for record retrieval by the dataset parser and driver base classes
+"""
+
+__license__ = 'Apache 2.0'
+
+import json
+import timeit
+
+from nose.plugins.attrib import attr
+
+from mi.core.instrument.dataset_data_particle import DataParticle, DataParticleKey, ParticleBatch
+from mi.core.unit_test import MiUnitTest
+from mi.dataset.dataset_driver import DataSetDriver, ParticleDataHandler, ParticleFormat
+from mi.dataset.dataset_parser import SimpleParser
+from mi.logging import log
+
+
+class CountParticle(DataParticle):
+    __slots__ = ()
+    _data_particle_type = 'test_count'
+    _schema = (('count', int),)
+
+
+class OtherCountParticle(CountParticle):
+    __slots__ = ()
+    _data_particle_type = 'test_other'
+
+
+class CountParser(SimpleParser):
+    """
+    Parser producing one particle per line of the stream
+    """
+    def parse_file(self):
+        for line in self._stream_handle:
+            self._record_buffer.append(CountParticle((line,), preferred_timestamp=DataParticleKey.DRIVER_TIMESTAMP))
+
+
+class StreamingCountParser(SimpleParser):
+    """
+    CountParser with a streaming iter_particles
+    """
+    def iter_particles(self):
+        for line in self._stream_handle:
+            yield CountParticle((line,), preferred_timestamp=DataParticleKey.DRIVER_TIMESTAMP)
+
+
+class MixedCountParser(SimpleParser):
+    """
+    Parser producing a run of three test_count particles then two test_other particles for every five lines
+    """
+    def parse_file(self):
+        for line in self._stream_handle:
+            particle_class = CountParticle if int(line) % 5 < 3 else OtherCountParticle
+            self._record_buffer.append(particle_class((line,), preferred_timestamp=DataParticleKey.DRIVER_TIMESTAMP))
+
+
+class FailingParser(CountParser):
+    """
+    Parser which fails on a line which is not a number
+    """
+    def get_records(self, number_requested=1):
+        records = super(FailingParser, self).get_records(number_requested)
+        for record in records:
+            int(record.raw_data[0])
+        return records
+
+
+class DictHandler(ParticleDataHandler):
+    particle_format = ParticleFormat.DICT
+
+
+class BatchHandler(ParticleDataHandler):
+    """
+    Handler accepting one JSON array for each run of particles of a stream
+    """
+    particle_format = ParticleFormat.JSON_BATCH
+
+    def __init__(self):
+        super(BatchHandler, self).__init__()
+        self.batches = []
+
+    def addParticleSamples(self, sample_type, samples):
+        self.batches.append((sample_type, samples))
+        super(BatchHandler, self).addParticleSamples(sample_type, samples)
+
+
+@attr('UNIT', group='mi')
+class DataSetDriverUnitTestCase(MiUnitTest):
+
+    def make_parser(self, count, parser_class=CountParser):
+        return parser_class({}, [str(i) for i in xrange(count)], None)
+
+    def test_get_records(self):
+        """
+        Records are returned in order, in batches of the requested size
+        """
+        parser = self.make_parser(25)
+        self.assertEqual(parser.get_records(0), [])
+        values = []
+        for size in (1, 10, 3, 100, 5):
+            records = parser.get_records(size)
+            self.assertEqual(len(records), min(size, 25 - len(values)))
+            values.extend(record.raw_data[0] for record in records)
+        self.assertEqual(values, [str(i) for i in xrange(25)])
+        self.assertEqual(parser._buffered_record_count(), 0)
+
+    def test_iter_records(self):
+        parser = self.make_parser(2500)
+        self.assertEqual([record.raw_data[0] for record in parser.iter_records(7)],
+                         [str(i) for i in xrange(2500)])
+        self.assertEqual(list(parser.iter_records()), [])
+
+    def test_streaming_iter_particles(self):
+        """
+        A streaming iter_particles is only consumed as far as the records requested
+        """
+        lines = iter([str(i) for i in xrange(25)])
+        parser = StreamingCountParser({}, lines, None)
+        records = parser.get_records(10)
+        self.assertEqual([record.raw_data[0] for record in records], [str(i) for i in xrange(10)])
+        self.assertEqual(next(lines), '10')
+        self.assertEqual(parser._buffered_record_count(), 0)
+
+        self.assertEqual([record.raw_data[0] for record in parser.iter_records(4)],
+                         [str(i) for i in xrange(11, 25)])
+        self.assertEqual(parser.get_records(1), [])
+
+    def test_streaming_parser_parse_file(self):
+        """
+        parse_file of a streaming parser parses the whole file into the record buffer
+        """
+        parser = self.make_parser(25, StreamingCountParser)
+        parser.parse_file()
+        parser._file_parsed = True
+        self.assertEqual([record.raw_data[0] for record in parser.get_records(30)], [str(i) for i in xrange(25)])
+
+    def test_process_file_stream(self):
+        """
+        All records are passed to the handler and a parser failure is reported
+        """
+        handler = ParticleDataHandler()
+        DataSetDriver(self.make_parser(10), handler, batch_size=3).processFileStream()
+        self.assertEqual(len(handler._samples['test_count']), 10)
+        self.assertFalse(handler._failure)
+
+        handler = ParticleDataHandler()
+        parser = FailingParser({}, ['1', '2', 'x'], None)
+        DataSetDriver(parser, handler, batch_size=1).processFileStream()
+        self.assertEqual(len(handler._samples['test_count']), 2)
+        self.assertTrue(handler._failure)
+
+    def test_batch_driver_timestamp(self):
+        """
+        Each batch of records built by a streaming parser is stamped with its own driver timestamp
+        """
+        class BatchRecordingHandler(DictHandler):
+            def __init__(self):
+                super(BatchRecordingHandler, self).__init__()
+                self.batches = []
+
+            def addParticleSample(self, sample_type, sample):
+                batch = ParticleBatch.current()
+                if not self.batches or self.batches[-1][0] is not batch:
+                    self.batches.append((batch, []))
+                self.batches[-1][1].append(sample[DataParticleKey.DRIVER_TIMESTAMP])
+
+        handler = BatchRecordingHandler()
+        DataSetDriver(self.make_parser(25, StreamingCountParser), handler, batch_size=10).processFileStream()
+        self.assertEqual([len(stamps) for _, stamps in handler.batches], [10, 10, 5])
+        self.assertEqual(len(set(id(batch) for batch, _ in handler.batches)), 3)
+        for batch, stamps in handler.batches:
+            self.assertEqual(set(stamps), {batch.driver_timestamp})
+        self.assertIsNone(ParticleBatch.current())
+
+    def test_particle_format(self):
+        """
+        Particles are passed as JSON by default, or in the format the handler asks for
+        """
+        def process(handler, count=3, **kwargs):
+            DataSetDriver(self.make_parser(count), handler, **kwargs).processFileStream()
+            return handler
+
+        def strip(samples):
+            # each file is stamped with a different driver timestamp
+            for sample in samples:
+                del sample[DataParticleKey.DRIVER_TIMESTAMP]
+            return samples
+
+        expected = strip([json.loads(sample) for sample in process(ParticleDataHandler())._samples['test_count']])
+        self.assertEqual([sample['values'] for sample in expected],
+                         [[{'value_id': 'count', 'value': i}] for i in xrange(3)])
+
+        self.assertEqual(strip(process(DictHandler())._samples['test_count']), expected)
+
+        batches = process(BatchHandler(), count=2500, batch_size=1000).batches
+        self.assertEqual([(stream, len(json.loads(samples))) for stream, samples in batches],
+                         [('test_count', 1000), ('test_count', 1000), ('test_count', 500)])
+        self.assertEqual(strip(json.loads(batches[0][1])[:3]), expected)
+
+        # runs of each stream are passed in file order, a batch can hold several runs of the same stream
+        handler = BatchHandler()
+        DataSetDriver(self.make_parser(12, MixedCountParser), handler, batch_size=5).processFileStream()
+        self.assertEqual([(stream, [sample['values'][0]['value'] for sample in json.loads(samples)])
+                          for stream, samples in handler.batches],
+                         [('test_count', [0, 1, 2]), ('test_other', [3, 4]),
+                          ('test_count', [5, 6, 7]), ('test_other', [8, 9]),
+                          ('test_count', [10, 11])])
+        self.assertEqual([sample['values'][0]['value'] for sample in handler._samples['test_count']],
+                         [0, 1, 2, 5, 6, 7, 10, 11])
+
+        # the driver argument overrides the handler
+        samples = process(DictHandler(), particle_format=ParticleFormat.JSON)._samples['test_count']
+        self.assertEqual(strip([json.loads(sample) for sample in samples]), expected)
+
+        self.assertRaises(ValueError, DataSetDriver, self.make_parser(3), DictHandler(), particle_format='xml')
+
+    def test_particle_format_rate(self):
+        """
+        Log the cost of passing particles to the handler in each format
+        """
+        count = 20000
+        for handler_class in (ParticleDataHandler, DictHandler, BatchHandler):
+            parser = self.make_parser(count)
+            parser.parse_file()
+            parser._file_parsed = True
+            driver = DataSetDriver(parser, handler_class())
+            records = parser.get_records(count)
+            elapsed = timeit.timeit(lambda: driver._publish_records(records), number=1)
+            log.info('%s: %.0f particles/s', handler_class.__name__, count / elapsed)
+
+    def test_record_rate(self):
+        """
+        Draining the record buffer one record at a time is linear in the number of records
+        """
+        def drain(count):
+            parser = self.make_parser(count)
+            parser.parse_file()
+            parser._file_parsed = True
+            return timeit.timeit(lambda: list(parser.iter_records(1)), number=1)
+
+        small = drain(20000)
+        large = drain(200000)
+        log.info('records drained one at a time: %.0f/s', 200000 / large)
+        # quadratic draining would be around 100 times slower
+        self.assertLess(large, small * 30)
@@ -16,6 +16,7 @@ import re
 import math
 import time
 
+from mi.core.checksum import byte_sum
 from mi.core.log import get_logger
 
 log = get_logger()
@@ -73,8 +74,7 @@ def checksum(data):
     Calculate checksum on value string.
     @retval checksum - base 10 integer representing last two hexadecimal digits of the checksum
     """
-    total = sum([ord(x) for x in data])
-    return total & 0xff
+    return byte_sum(data) & 0xff
 
 
 def valid_response(line):
@@ -1166,11 +1166,16 @@ _NEW_DATFILE_PARTICLE_BODY_MATCHER = re.compile(
 # )
 
 
+# Marks the new ".dat" format. The sieve is handed a read only buffer, which does not support substring tests with
+# "in", so the marker is found with a regex.
+_NEW_DATFILE_MARKER = re.compile(r"<OOI-ts:")
+
+
 def _is_probably_new_datfile_format(raw_data):
     """
     Return true if the input data string is probably taken from a new ".dat" file.
     """
-    return "<OOI-ts:" in raw_data
+    return _NEW_DATFILE_MARKER.search(raw_data) is not None
 
 
 # This regex extracts the timestamp of a particle from the old ".dat" / ".txt" format shown below.
@@ -1230,11 +1235,15 @@ _OLD_DATFILE_PARTICLE_BODY_MATCHER = re.compile(
 # )
 
 
+# Marks the old ".dat" / ".txt" format, found with a regex for the same reason as _NEW_DATFILE_MARKER.
+_OLD_DATFILE_MARKER = re.compile(r"UTC")
+
+
 def _is_probably_old_datfile_format(raw_data):
     """
     Return true if the input data string is probably taken from a an old ".dat" / ".txt" file.
     """
-    return not _is_probably_new_datfile_format(raw_data) and "UTC" in raw_data
+    return not _is_probably_new_datfile_format(raw_data) and _OLD_DATFILE_MARKER.search(raw_data) is not None
 
 
 class PlaybackProtocol(Protocol):
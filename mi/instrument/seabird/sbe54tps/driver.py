@@ -25,7 +25,7 @@ from mi.core.instrument.protocol_param_dict import ParameterDictVisibility
 from mi.core.instrument.protocol_param_dict import ParameterDictType
 from mi.core.instrument.driver_dict import DriverDictKey
 from mi.core.instrument.data_particle import DataParticle, DataParticleKey, CommonDataParticleType
-from mi.core.instrument.chunker import StringChunker
+from mi.core.instrument.chunker import RegexSieve, StringChunker
 
 from mi.core.exceptions import InstrumentParameterException
 from mi.core.exceptions import InstrumentProtocolException
@@ -983,48 +983,47 @@ class Protocol(SeaBirdProtocol):
                 command = 'set'
                 self._direct_commands[label] = command
 
-    @staticmethod
-    def sieve_function(raw_data):
-        """
-        The method that splits samples
-        """
-        return_list = []
-
-        sieve_matchers = [STATUS_DATA_REGEX_MATCHER,
-                          CONFIGURATION_DATA_REGEX_MATCHER,
-                          EVENT_COUNTER_DATA_REGEX_MATCHER,
-                          HARDWARE_DATA_REGEX_MATCHER,
-                          SAMPLE_DATA_REGEX_MATCHER,
-                          SAMPLE_REF_OSC_MATCHER,
-                          RECOVER_AUTOSAMPLE_MATCHER]
-
-        for matcher in sieve_matchers:
-            for match in matcher.finditer(raw_data):
-                return_list.append((match.start(), match.end()))
-
-        return return_list
+    # all samples are found in a single pass, which also tells _got_chunk which regex matched
+    sieve_function = RegexSieve([STATUS_DATA_REGEX_MATCHER,
+                                 CONFIGURATION_DATA_REGEX_MATCHER,
+                                 EVENT_COUNTER_DATA_REGEX_MATCHER,
+                                 HARDWARE_DATA_REGEX_MATCHER,
+                                 SAMPLE_DATA_REGEX_MATCHER,
+                                 SAMPLE_REF_OSC_MATCHER,
+                                 RECOVER_AUTOSAMPLE_MATCHER])
+
+    particle_classes = {
+        STATUS_DATA_REGEX_MATCHER: SBE54tpsStatusDataParticle,
+        CONFIGURATION_DATA_REGEX_MATCHER: SBE54tpsConfigurationDataParticle,
+        EVENT_COUNTER_DATA_REGEX_MATCHER: SBE54tpsEventCounterDataParticle,
+        HARDWARE_DATA_REGEX_MATCHER: SBE54tpsHardwareDataParticle,
+        SAMPLE_DATA_REGEX_MATCHER: SBE54tpsSampleDataParticle,
+        SAMPLE_REF_OSC_MATCHER: SBE54tpsSampleRefOscDataParticle,
+    }
 
     def _got_chunk(self, chunk, timestamp):
         """
         The base class got_data has gotten a chunk from the chunker.  Pass it to extract_sample
         with the appropriate particle objects and REGEXes.
         """
+        regex, _ = self.sieve_function.match(chunk)
+
         # This instrument will automatically put itself back into autosample mode after a couple minutes idle
         # in command mode.  If a message is seen, figure out if an event to needs to be raised to adjust
         # the state machine.
-        if RECOVER_AUTOSAMPLE_MATCHER.match(chunk) and self._protocol_fsm.get_current_state() == ProtocolState.COMMAND:
-            log.debug("Instrument has started sampling, update state to autosample")
-            self._async_raise_fsm_event(ProtocolEvent.RECOVER_AUTOSAMPLE)
-
-        if self._extract_sample(SBE54tpsSampleDataParticle, SAMPLE_DATA_REGEX_MATCHER, chunk, timestamp):
+        if regex is RECOVER_AUTOSAMPLE_MATCHER:
             if self._protocol_fsm.get_current_state() == ProtocolState.COMMAND:
+                log.debug("Instrument has started sampling, update state to autosample")
                 self._async_raise_fsm_event(ProtocolEvent.RECOVER_AUTOSAMPLE)
             return
-        if self._extract_sample(SBE54tpsStatusDataParticle, STATUS_DATA_REGEX_MATCHER, chunk, timestamp): return
-        if self._extract_sample(SBE54tpsConfigurationDataParticle, CONFIGURATION_DATA_REGEX_MATCHER, chunk, timestamp): return
-        if self._extract_sample(SBE54tpsEventCounterDataParticle, EVENT_COUNTER_DATA_REGEX_MATCHER, chunk, timestamp): return
-        if self._extract_sample(SBE54tpsHardwareDataParticle, HARDWARE_DATA_REGEX_MATCHER, chunk, timestamp): return
-        if self._extract_sample(SBE54tpsSampleRefOscDataParticle, SAMPLE_REF_OSC_MATCHER, chunk, timestamp): return
+
+        if regex is None:
+            return
+
+        if self._extract_sample(self.particle_classes[regex], regex, chunk, timestamp):
+            if regex is SAMPLE_DATA_REGEX_MATCHER and \
+                    self._protocol_fsm.get_current_state() == ProtocolState.COMMAND:
+                self._async_raise_fsm_event(ProtocolEvent.RECOVER_AUTOSAMPLE)
 
     def _filter_capabilities(self, events):
         """
@@ -24,6 +24,7 @@ from mi.core.exceptions import InstrumentTimeoutException
 from mi.core.driver_scheduler import DriverSchedulerConfigKey, TriggerType
 
 from mi.core.util import dict_equal
+from mi.core.checksum import hex_sum
 from mi.core.common import BaseEnum, Units
 from mi.core.instrument.data_particle import DataParticle
 from mi.core.instrument.data_particle import DataParticleKey
@@ -1879,11 +1880,7 @@ class SamiProtocol(CommandResponseInstrumentProtocol):
         @param s: string for check-sum analysis.
         """
 
-        cs = 0
-        for index in xrange(0, len(s), 2):
-            cs += int(s[index:index + 2], 16)
-        cs &= 0xFF
-        return cs
+        return hex_sum(s) & 0xFF
 
     def _build_param_dict(self):
         """
@@ -8,15 +8,15 @@ Release notes:
 Generic Driver for ADCPS-K, ADCPS-I, ADCPT-B and ADCPT-DE
 """
 import time
-import struct
 import re
 from contextlib import contextmanager
 
 from mi.core.log import get_logger
+from mi.core.checksum import byte_sum
 from mi.core.common import Units, Prefixes
 from mi.core.instrument.protocol_param_dict import ParameterDictVisibility
 from mi.core.instrument.protocol_param_dict import ParameterDictType
-from mi.core.instrument.chunker import StringChunker
+from mi.core.instrument.chunker import FrameSieve, StringChunker
 from mi.core.common import BaseEnum
 from mi.core.time_tools import get_timestamp_delayed
 from mi.core.exceptions import InstrumentParameterException, InstrumentTimeoutException, InstrumentException, \
@@ -769,6 +769,9 @@ parameter_defaults = {
 #
 ADCP_PD0_PARSED_REGEX = r'\x7f\x7f(..)'
 ADCP_PD0_PARSED_REGEX_MATCHER = re.compile(ADCP_PD0_PARSED_REGEX, re.DOTALL)
+# PD0 length field excludes the trailing 2 byte checksum, a sum of all preceding bytes
+ADCP_PD0_FRAME_SIEVE = FrameSieve('\x7f\x7f', '<H', length_adjust=2,
+                                  checksum_format='<H', checksum_fn=byte_sum)
 ADCP_SYSTEM_CONFIGURATION_REGEX = r'Instrument S/N.*?>'
 ADCP_SYSTEM_CONFIGURATION_REGEX_MATCHER = re.compile(ADCP_SYSTEM_CONFIGURATION_REGEX, re.DOTALL)
 ADCP_COMPASS_CALIBRATION_REGEX = r'ACTIVE FLUXGATE CALIBRATION MATRICES in NVRAM.*?>'
@@ -920,33 +923,14 @@ class WorkhorseProtocol(CommandResponseInstrumentProtocol):
         sieve_matchers = [ADCP_SYSTEM_CONFIGURATION_REGEX_MATCHER,
                           ADCP_COMPASS_CALIBRATION_REGEX_MATCHER,
                           ADCP_ANCILLARY_SYSTEM_DATA_REGEX_MATCHER,
-                          ADCP_TRANSMIT_PATH_REGEX_MATCHER,
-                          ADCP_PD0_PARSED_REGEX_MATCHER]
+                          ADCP_TRANSMIT_PATH_REGEX_MATCHER]
 
-        return_list = []
+        # variable length binary PD0 records are located by their length and checksum
+        return_list = ADCP_PD0_FRAME_SIEVE(raw_data)
 
         for matcher in sieve_matchers:
-            if matcher == ADCP_PD0_PARSED_REGEX_MATCHER:
-                #
-                # Have to cope with variable length binary records...
-                # lets grab the length, then write a proper query to
-                # snag it.
-                #
-                matcher2 = re.compile(r'\x7f\x7f(..)', re.DOTALL)
-                for match in matcher2.finditer(raw_data):
-                    length = struct.unpack('<H', match.group(1))[0]
-                    end_index = match.start() + length
-                    # read the checksum and compute our own
-                    # if they match we have a PD0 record
-                    if len(raw_data) > end_index + 1:
-                        checksum = struct.unpack_from('<H', raw_data, end_index)[0]
-                        calculated = sum(bytearray(raw_data[match.start():end_index])) & 0xffff
-                        if checksum == calculated:
-                            # include the checksum in our match... (2 bytes)
-                            return_list.append((match.start(), end_index + 2))
-            else:
-                for match in matcher.finditer(raw_data):
-                    return_list.append((match.start(), match.end()))
+            for match in matcher.finditer(raw_data):
+                return_list.append((match.start(), match.end()))
 
         return return_list
 
@@ -30,7 +30,7 @@ from mi.core.instrument.instrument_driver import \
     SingleConnectionInstrumentDriver, DriverEvent, DriverAsyncEvent, DriverProtocolState, DriverParameter
 from mi.core.instrument.data_particle import CommonDataParticleType, DataParticleKey, DataParticle, DataParticleValue
 from mi.core.instrument.chunker import StringChunker
-from mi.instrument.uw.hpies.crclib import crc3kerm
+from mi.core.checksum import crc16_kermit
 
 __author__ = 'Dan Mergens'
 __license__ = 'Apache 2.0'
@@ -72,7 +72,7 @@ def build_command(address, command, *args):
 
     if formatted_list:
         s += ' ' + ' '.join([str(x) for x in formatted_list])
-    s = s + str.format('*{0:04x}', crc3kerm(s)) + NEWLINE
+    s = s + str.format('*{0:04x}', crc16_kermit(s)) + NEWLINE
     return s
 
 
@@ -91,7 +91,7 @@ def calc_crc(line):
         return 0, 0
     resp_crc = int(matches.group('crc'), 16)
     data = matches.group('resp')
-    crc = crc3kerm(data)
+    crc = crc16_kermit(data)
     return crc, resp_crc
 
 
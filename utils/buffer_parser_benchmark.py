@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+"""
+Replay the resource files of every driver built on a BufferLoadingParser and print the parse rate of each driver.
+Run it before and after a change to the chunker or the parser base classes to check for a regression:
+
+    python utils/buffer_parser_benchmark.py --repeat 3
+"""
+
+import importlib
+import inspect
+import os
+import timeit
+
+import click as click
+
+from mi.core.log import get_logger
+from mi.dataset.dataset_driver import ParticleDataHandler
+from mi.dataset.dataset_parser import BufferLoadingParser
+
+log = get_logger()
+base_path = os.path.dirname(os.path.dirname(__file__))
+driver_path = os.path.join(base_path, 'mi', 'dataset', 'driver')
+
+# resource files which hold expected results or notes rather than instrument data
+SKIP_EXTENSIONS = ('.yml', '.py', '.pyc', '.txt', '.xml', '.json')
+
+
+class CountingHandler(ParticleDataHandler):
+    """
+    Particle handler which only counts the particles, so the benchmark measures the parser
+    """
+    def __init__(self):
+        super(CountingHandler, self).__init__()
+        self.count = 0
+
+    def addParticleSample(self, sample_type, sample):
+        self.count += 1
+
+
+def find_drivers():
+    """
+    :return: sorted list of (driver module name, parser class names) for the drivers which import a
+        BufferLoadingParser subclass
+    """
+    drivers = []
+    for dir_path, _, file_names in os.walk(driver_path):
+        if 'test' in dir_path.split(os.sep):
+            continue
+        for file_name in file_names:
+            if not file_name.endswith('driver.py'):
+                continue
+            module_name = os.path.relpath(os.path.join(dir_path, file_name[:-3]), base_path).replace(os.sep, '.')
+            try:
+                module = importlib.import_module(module_name)
+            except Exception:
+                log.warn('Unable to import driver: %s', module_name)
+                continue
+            parsers = sorted(name for name, value in vars(module).iteritems()
+                             if inspect.isclass(value) and issubclass(value, BufferLoadingParser)
+                             and value is not BufferLoadingParser)
+            if parsers and hasattr(module, 'parse'):
+                drivers.append((module_name, parsers))
+    return sorted(drivers)
+
+
+def resource_files(module_name):
+    """
+    :return: the data files in the resource directory nearest the driver
+    """
+    path = os.path.dirname(os.path.join(base_path, *module_name.split('.')))
+    while path.startswith(driver_path):
+        resource_path = os.path.join(path, 'resource')
+        if os.path.isdir(resource_path):
+            return sorted(os.path.join(resource_path, name) for name in os.listdir(resource_path)
+                          if not name.endswith(SKIP_EXTENSIONS) and os.path.isfile(os.path.join(resource_path, name)))
+        path = os.path.dirname(path)
+    return []
+
+
+def replay(module_name, files, repeat):
+    """
+    Parse each file with the driver, the best of repeat runs is kept for each file
+    :return: (particles, bytes, seconds) totals over the files
+    """
+    module = importlib.import_module(module_name)
+    particles = size = elapsed = 0
+    for file_path in files:
+        handler = CountingHandler()
+        try:
+            elapsed += min(timeit.repeat(lambda: module.parse(base_path, file_path, handler), number=1, repeat=repeat))
+        except Exception:
+            log.warn('Exception parsing: %s', file_path)
+            continue
+        particles += handler.count / repeat
+        size += os.path.getsize(file_path)
+    return particles, size, elapsed
+
+
+@click.command()
+@click.option('--repeat', type=int, default=1, help='parse each file this many times and keep the best')
+@click.argument('drivers', nargs=-1)
+def main(repeat, drivers):
+    """
+    Replay the resource files of each driver, or the named drivers, and print the parse rate
+    """
+    print '%-80s %10s %12s %10s %12s' % ('driver', 'particles', 'bytes', 'seconds', 'particles/s')
+    for module_name, parsers in find_drivers():
+        if drivers and module_name not in drivers:
+            continue
+        particles, size, elapsed = replay(module_name, resource_files(module_name), repeat)
+        rate = particles / elapsed if elapsed else 0
+        print '%-80s %10d %12d %10.3f %12.0f' % (module_name, particles, size, elapsed, rate)
+
+
+if __name__ == '__main__':
+    main()
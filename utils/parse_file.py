@@ -2,16 +2,20 @@
 
 import importlib
 import json
+import multiprocessing
 import os
+import shutil
+import tempfile
+import traceback
 from functools import wraps
 
 import click as click
 import datetime
-import pandas as pd
-import xarray as xr
-import numpy as np
 
+from mi.core.instrument.chunked_writer import ROW_GROUP_SIZE, WRITERS, StreamWriters
+from mi.core.instrument.particle_columns import StreamColumns
 from mi.core.log import get_logger, LoggerManager
+from mi.dataset.dataset_driver import ParticleFormat
 
 try:
     import cPickle as pickle
@@ -46,20 +50,6 @@ class StopWatch(object):
         log.info(self)
 
 
-def monkey_patch_particles():
-    """
-    Monkey patch DataParticle.generate to skip the JSON-encoding
-    :return:
-    """
-    log.info('Monkey patching DataParticle.generate')
-    import mi.core.instrument.dataset_data_particle
-
-    def _generate(self, sorted=False):
-        return self.generate_dict()
-
-    mi.core.instrument.dataset_data_particle.DataParticle.generate = _generate
-
-
 def log_timing(func):
     """
     Decorator which will log the time elapsed while executing a function call
@@ -75,17 +65,27 @@ def log_timing(func):
 
 class ParticleHandler(object):
     """
-    Particle handler which flattens all data particle "values" lists to key: value pairs in the parent dictionary
-    Also contains a method to output the particle data as a dictionary of pandas dataframes
+    Particle handler which stores the particles of each stream in columns, with all data particle "values" lists
+    flattened to one column per value_id.
+    Also contains methods to output the particle data as pandas dataframes or xarray datasets
+    The chunked formats (netcdf, parquet) write each stream in row groups as particles arrive instead of holding them
+    all until write is called.
     """
-    def __init__(self, output_path=None, formatter=None):
+    # have DataSetDriver pass particle dictionaries rather than JSON
+    particle_format = ParticleFormat.DICT
+
+    def __init__(self, output_path=None, formatter=None, row_group_size=ROW_GROUP_SIZE):
         self.samples = {}
         self.failure = False
+        self.particle_count = 0
         if output_path is None:
             output_path = os.getcwd()
         self.output_path = output_path
         self.formatter = formatter
         self.check_output_path()
+        self.writers = None
+        if formatter in WRITERS:
+            self.writers = StreamWriters(WRITERS[formatter], output_path, row_group_size)
 
     def check_output_path(self):
         op = self.output_path
@@ -96,16 +96,34 @@ class ParticleHandler(object):
         else:
             os.makedirs(op)
 
-    @staticmethod
-    def flatten(sample):
-        values = sample.pop('values')
-        for each in values:
-            sample[each['value_id']] = each['value']
-        return sample
-
     def addParticleSample(self, sample_type, sample):
-        sample = self.flatten(sample)
-        self.samples.setdefault(sample_type, []).append(sample)
+        if isinstance(sample, basestring):
+            sample = json.loads(sample)
+        stream = self.samples.get(sample_type)
+        if stream is None:
+            stream = self.samples[sample_type] = StreamColumns()
+        stream.append(sample)
+        self.particle_count += 1
+        if self.writers is not None and stream.size >= self.writers.row_group_size:
+            self.writers.flush(self.samples, sample_type)
+
+    def addParticleSamples(self, sample_type, samples):
+        """
+        Append a run of particles of one stream, as passed in the JSON_BATCH format
+        """
+        if isinstance(samples, basestring):
+            samples = json.loads(samples)
+        for sample in samples:
+            self.addParticleSample(sample_type, sample)
+
+    def add_columns(self, sample_type, columns):
+        """
+        Append the particles of a StreamColumns, as collected by another handler
+        """
+        self.samples.setdefault(sample_type, StreamColumns()).extend(columns)
+        self.particle_count += columns.size
+        if self.writers is not None:
+            self.writers.flush(self.samples, sample_type)
 
     def setParticleDataCaptureFailure(self):
         self.failure = True
@@ -114,30 +132,15 @@ class ParticleHandler(object):
     def to_dataframes(self):
         data_frames = {}
         for particle_type in self.samples:
-            data_frames[particle_type] = self.fix_arrays(pd.DataFrame(self.samples[particle_type]))
+            data_frames[particle_type] = self.samples[particle_type].to_dataset().to_dataframe()
         return data_frames
 
     def to_datasets(self):
         datasets = {}
         for particle_type in self.samples:
-            datasets[particle_type] = self.fix_arrays(pd.DataFrame(self.samples[particle_type]), return_as_xr=True)
+            datasets[particle_type] = self.samples[particle_type].to_dataset()
         return datasets
 
-    @staticmethod
-    @log_timing
-    def fix_arrays(data_frame, return_as_xr=False):
-        # round-trip the dataframe through xray to get the multidimensional indexing correct
-        new_ds = xr.Dataset()
-        for each in data_frame:
-            if data_frame[each].dtype == 'object' and isinstance(data_frame[each].values[0], list):
-                data = np.array([np.array(x) for x in data_frame[each].values])
-                new_ds[each] = xr.DataArray(data)
-            else:
-                new_ds[each] = data_frame[each]
-        if return_as_xr:
-            return new_ds
-        return new_ds.to_dataframe()
-
     @log_timing
     def to_csv(self):
         dataframes = self.to_dataframes()
@@ -150,7 +153,12 @@ class ParticleHandler(object):
         for particle_type in self.samples:
             file_path = os.path.join(self.output_path, '%s.json' % particle_type)
             with open(file_path, 'w') as fh:
-                json.dump(self.samples[particle_type], fh)
+                fh.write('[')
+                for index, record in enumerate(self.samples[particle_type].iter_records()):
+                    if index:
+                        fh.write(', ')
+                    json.dump(record, fh)
+                fh.write(']')
 
     @log_timing
     def to_pd_pickle(self):
@@ -169,6 +177,9 @@ class ParticleHandler(object):
                 pickle.dump(datasets[particle_type], fh, protocol=-1)
 
     def write(self):
+        if self.writers is not None:
+            self.writers.close(self.samples)
+            return
         option_map = {
             'csv': self.to_csv,
             'json': self.to_json,
@@ -190,26 +201,121 @@ def find_driver(driver_string):
     raise Exception('Unable to locate driver: %r', driver_string)
 
 
-def run(driver, files, fmt, out):
-    monkey_patch_particles()
-    log.info('Importing driver: %s', driver)
-    module = find_driver(driver)
-    particle_handler = ParticleHandler(output_path=out, formatter=fmt)
-    for file_path in files:
+def parse_into(module, file_path, particle_handler):
+    """
+    Parse a single file into particle_handler. An exception from the driver is logged and reported rather than
+    raised, so the remaining files are still parsed.
+    :return: report dictionary for this file
+    """
+    report = {'file': file_path, 'failure': False, 'error': None, 'particles': 0}
+    # the handler failure flag covers every file parsed into it, track this file on its own
+    failed_before = particle_handler.failure
+    particle_handler.failure = False
+    particle_count = particle_handler.particle_count
+
+    try:
         log.info('Begin parsing: %s', file_path)
         with StopWatch('Parsing file: %s took' % file_path):
             module.parse(base_path, file_path, particle_handler)
+    except Exception:
+        log.exception('Exception parsing: %s', file_path)
+        report['error'] = traceback.format_exc()
+
+    report['failure'] = particle_handler.failure or report['error'] is not None
+    report['particles'] = particle_handler.particle_count - particle_count
+    particle_handler.failure = failed_before or report['failure']
+    return report
+
+
+def parse_one(args):
+    """
+    Parse a single file in a worker process and pickle the particle columns to a partial output file
+    :param args: tuple of (driver, file_path, partial_path)
+    :return: report dictionary for this file
+    """
+    driver, file_path, partial_path = args
+    particle_handler = ParticleHandler(output_path=os.path.dirname(partial_path))
+
+    try:
+        module = find_driver(driver)
+    except Exception:
+        log.exception('Exception importing driver: %s', driver)
+        report = {'file': file_path, 'failure': True, 'error': traceback.format_exc(), 'particles': 0}
+    else:
+        report = parse_into(module, file_path, particle_handler)
+    report['partial'] = partial_path
+
+    with open(partial_path, 'wb') as fh:
+        pickle.dump(particle_handler.samples, fh, protocol=-1)
+
+    return report
+
+
+def run_parallel(driver, files, particle_handler, jobs):
+    """
+    Parse the files in a pool of jobs worker processes. Each worker writes a partial output per file, the partials
+    are merged into particle_handler in the order the files were given, so the output does not depend on which
+    worker finishes first.
+    :return: list of per file report dictionaries, in file order
+    """
+    partial_dir = tempfile.mkdtemp(prefix='partial_', dir=particle_handler.output_path)
+    tasks = [(driver, file_path, os.path.join(partial_dir, '%d.pickle' % index))
+             for index, file_path in enumerate(files)]
+    reports = []
+
+    pool = multiprocessing.Pool(jobs)
+    try:
+        # imap returns results in task order, merge each file as soon as it and all files before it are done
+        for report in pool.imap(parse_one, tasks):
+            with open(report.pop('partial'), 'rb') as fh:
+                samples = pickle.load(fh)
+            for particle_type in samples:
+                particle_handler.add_columns(particle_type, samples[particle_type])
+            reports.append(report)
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
+        shutil.rmtree(partial_dir, ignore_errors=True)
+
+    return reports
+
+
+def write_report(reports, output_path):
+    """
+    Log any files which failed to parse and write the per file report as parse_report.json
+    """
+    for report in reports:
+        if report['failure']:
+            log.error('Failed parsing: %s %s', report['file'], report['error'] or '')
+    log.info('Parsed %d files, %d failed', len(reports), sum(report['failure'] for report in reports))
+
+    with open(os.path.join(output_path, 'parse_report.json'), 'w') as fh:
+        json.dump(reports, fh, indent=2)
+
+
+def run(driver, files, fmt, out, jobs=1):
+    particle_handler = ParticleHandler(output_path=out, formatter=fmt)
+
+    if jobs > 1:
+        reports = run_parallel(driver, files, particle_handler, jobs)
+    else:
+        log.info('Importing driver: %s', driver)
+        module = find_driver(driver)
+        reports = [parse_into(module, file_path, particle_handler) for file_path in files]
 
+    write_report(reports, particle_handler.output_path)
     particle_handler.write()
 
 
 @click.command()
-@click.option('--fmt', type=click.Choice(['csv', 'json', 'pd-pickle', 'xr-pickle']), default='csv')
+@click.option('--fmt', type=click.Choice(['csv', 'json', 'pd-pickle', 'xr-pickle', 'netcdf', 'parquet']), default='csv')
 @click.option('--out', type=click.Path(exists=False), default=None)
+@click.option('--jobs', type=int, default=1, help='number of worker processes to parse files with')
 @click.argument('driver', nargs=1)
 @click.argument('files', nargs=-1, type=click.Path(exists=True))
-def main(driver, files, fmt, out):
-    run(driver, files, fmt, out)
+def main(driver, files, fmt, out, jobs):
+    run(driver, files, fmt, out, jobs)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+
+"""
+@package utils.test.test_parse_file
+@file utils/test/test_parse_file.py
+@brief Test cases for the parse_file utility
+"""
+
+__license__ = 'Apache 2.0'
+
+import json
+import os
+import shutil
+import tempfile
+
+from nose.plugins.attrib import attr
+
+from mi.core.unit_test import MiUnitTestCase
+from utils.parse_file import run
+
+DRIVER = 'mi.dataset.driver.velpt_ab.dcl.velpt_ab_dcl_recovered_driver'
+RESOURCE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+                             'mi', 'dataset', 'driver', 'velpt_ab', 'dcl', 'resource')
+# the diagnostics header checksum of the second file is bad, the parser reports it to the exception callback
+FILES = [os.path.join(RESOURCE_PATH, name) for name in ('20140813.velpt.log',
+                                                         'bad_diag_hdr_checksum_20140813.velpt.log',
+                                                         '20150428.velpt2.log')]
+
+
+@attr('UNIT', group='mi')
+class TestParseFile(MiUnitTestCase):
+    """
+    Test the sequential and parallel parse_file runs
+    """
+    def setUp(self):
+        self.output_path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.output_path)
+
+    def run_files(self, name, jobs):
+        out = os.path.join(self.output_path, name)
+        run(DRIVER, FILES, 'json', out, jobs)
+        outputs = {}
+        for file_name in os.listdir(out):
+            with open(os.path.join(out, file_name)) as fh:
+                outputs[file_name] = json.load(fh)
+        return outputs
+
+    def test_parallel(self):
+        sequential = self.run_files('sequential', 1)
+        parallel = self.run_files('parallel', 2)
+
+        # the merged output is the single process output, in file order. The driver timestamp is the time the
+        # particle was built so it differs between the two runs
+        self.assertEqual(sorted(parallel), sorted(sequential))
+        for file_name in sequential:
+            for outputs in (sequential, parallel):
+                for record in outputs[file_name]:
+                    if isinstance(record, dict):
+                        record.pop('driver_timestamp', None)
+            self.assertEqual(parallel[file_name], sequential[file_name], file_name)
+
+        for outputs in (sequential, parallel):
+            reports = outputs['parse_report.json']
+            self.assertEqual([report['file'] for report in reports], FILES)
+            self.assertEqual([report['failure'] for report in reports], [False, True, False])
+            self.assertTrue(all(report['particles'] for report in reports))